@@ -21,23 +21,25 @@ import logging
 import random
 import string
 import asyncio
+import time
 import json
-import uuid
+import tempfile
 from datetime import datetime, timezone
-from typing import Optional, List, Dict, Any, cast
+from typing import Optional, List, Dict, Any, Callable, Iterable, Tuple, cast
 from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
-from fastapi import FastAPI, HTTPException, Depends, WebSocket, WebSocketDisconnect, Header, Query, Body
+from fastapi import FastAPI, HTTPException, Depends, WebSocket, WebSocketDisconnect, Header, Query, Body, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field, validator
 import psycopg2
 from psycopg2.extras import RealDictCursor
-from qdrant_client import QdrantClient, models
+from qdrant_client import AsyncQdrantClient, models
 from sentence_transformers import SentenceTransformer
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 import google.generativeai as genai
@@ -78,6 +80,90 @@ from app.services.gotham import (
     get_gus_summary_for_prompt,
     get_regional_demographics,
 )
+from app.services.rag import (
+    build_search_params,
+    create_async_qdrant_client,
+    describe_qdrant_target,
+    ensure_collection_async,
+    is_embedded_mode,
+    merge_search_results,
+    probe_qdrant,
+    select_informative_notes,
+    GoldenMatch,
+    GoldenStandardIndex,
+    LexicalIndex,
+    reciprocal_rank_fusion,
+    drain_outbox_batch,
+    enqueue_delete,
+    enqueue_upsert,
+    ensure_outbox_table,
+    golden_standard_point_id,
+    nugget_point_id,
+    outbox_last_processed,
+    outbox_stats,
+    purge_done_outbox,
+    ensure_alias_async,
+    resolve_alias_async,
+    ImportJob,
+    ImportJobRegistry,
+    iter_upload_items,
+    GOLDEN_LIST_FIELDS,
+    RAG_LIST_FIELDS,
+    ensure_golden_listing_indexes,
+    list_golden_standards_page,
+    list_rag_nuggets_page,
+    parse_list_fields,
+)
+from app.services.feedback import (
+    FEEDBACK_CLUSTER_BATCH_SIZE,
+    FEEDBACK_SEARCH_SORTS,
+    assign_pending_feedback,
+    clusters_needing_names,
+    ensure_feedback_cluster_tables,
+    ensure_feedback_search_indexes,
+    load_feedback_groups,
+    pending_feedback_count,
+    save_cluster_names,
+    search_feedback,
+)
+from app.services.analytics import (
+    EXPORT_MEDIA_TYPES,
+    SLOW_PATH_RETENTION_DAYS,
+    check_export_format,
+    compact_all_slow_path_history,
+    end_session_with_rollup,
+    ensure_analytics_schema,
+    ensure_slow_path_history_schema,
+    iter_slow_path_export,
+    load_analytics_dashboard,
+    load_latest_slow_path,
+    record_slow_path_result,
+)
+from app.services.sessions import (
+    CONVERSATION_ARCHIVE_AFTER_DAYS,
+    MailboxFull,
+    SessionActors,
+    SessionRegistry,
+    archive_ended_conversations,
+    ensure_conversation_partitions,
+    ensure_conversation_schema,
+    etag_matches,
+    insert_new_session,
+    load_conversation,
+    load_session_language,
+    load_session_snapshot,
+    load_session_version,
+    parse_session_fields,
+    session_etag,
+)
+from app.services.database import ReadReplicaRouter
+from app.services.slow_path import (
+    SlowPathGateDecision,
+    ensure_slow_path_cache_schema,
+    evaluate_slow_path_gate,
+    load_cached_slow_path,
+    slow_path_cache_key,
+)
 
 # =============================================================================
 # Configuration and Logging
@@ -98,6 +184,10 @@ POSTGRES_DB = os.getenv("POSTGRES_DB", "ultra_db")
 
 QDRANT_HOST = os.getenv("QDRANT_HOST", "localhost")
 QDRANT_PORT = int(os.getenv("QDRANT_PORT", "6333"))
+QDRANT_MODE = os.getenv("QDRANT_MODE", "remote")  # remote | local | memory
+QDRANT_PATH = os.getenv("QDRANT_PATH", "./qdrant_data")
+QDRANT_GRPC_PORT = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
+QDRANT_PREFER_GRPC = os.getenv("QDRANT_PREFER_GRPC", "true").lower() in ("1", "true", "yes")
 
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 OLLAMA_CLOUD_URL = os.getenv("OLLAMA_CLOUD_URL", "https://ollama.com")
@@ -108,19 +198,63 @@ CORS_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:5173,http://localhost
 
 # AI Model Configuration (PEGT Module 11)
 EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL_NAME", "paraphrase-multilingual-MiniLM-L12-v2")
-QDRANT_COLLECTION_NAME = "ultra_rag_v1"
+QDRANT_COLLECTION_NAME = "ultra_rag_v1"  # Initial physical collection (seed.py)
+# All reads/writes go through this alias - reindex_qdrant_collection.py swaps it
+QDRANT_COLLECTION_ALIAS = os.getenv("QDRANT_COLLECTION_ALIAS", "ultra_rag")
+VECTOR_DIMENSION = 384  # paraphrase-multilingual-MiniLM-L12-v2
 GEMINI_MODEL = os.getenv("GEMINI_MODEL_NAME", "gemini-1.5-flash")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL_NAME", "deepseek-v3.1:671b-cloud")
 
+# Slow Path multi-query retrieval
+SLOW_PATH_RAG_QUERIES = 4  # Max seller notes embedded per Slow Path run
+SLOW_PATH_RAG_BUDGET_CHARS = 4000  # Context budget (Fast Path query_rag uses 2000)
+
+# Part of the Slow Path result cache key - bump when Prompt 4 changes
+SLOW_PATH_PROMPT_VERSION = "prompt4-gotham-bhs-v1"
+
+# Golden Standard instant answers: also run Gemini in the background and push
+# its suggestion over the WebSocket (off by default - zero quota on a hit)
+GOLDEN_STANDARD_BACKGROUND_LLM = os.getenv("GOLDEN_STANDARD_BACKGROUND_LLM", "false").lower() in ("1", "true", "yes")
+
+# AI Dojo feedback clustering: background refresh interval (new notes also wake it)
+FEEDBACK_CLUSTER_INTERVAL = float(os.getenv("FEEDBACK_CLUSTER_INTERVAL", "300"))
+
+# Slow Path retention: compaction run interval (SLOW_PATH_RETENTION_DAYS=0 disables it)
+SLOW_PATH_RETENTION_INTERVAL = float(os.getenv("SLOW_PATH_RETENTION_INTERVAL", "21600"))
+RAG_OUTBOX_PURGE_INTERVAL = 3600.0  # Seconds between purges of old done outbox rows
+
+# Lexical + Golden Standard indexes: change check interval (seed.py, sync, other
+# API workers) and forced rebuild age (Qdrant edits that keep the point count)
+KNOWLEDGE_INDEX_CHECK_INTERVAL = float(os.getenv("KNOWLEDGE_INDEX_CHECK_INTERVAL", "60"))
+KNOWLEDGE_INDEX_MAX_AGE = float(os.getenv("KNOWLEDGE_INDEX_MAX_AGE", "3600"))
+
+# conversation_log maintenance: monthly partitions + cold archival of ended sessions
+CONVERSATION_MAINTENANCE_INTERVAL = float(os.getenv("CONVERSATION_MAINTENANCE_INTERVAL", "3600"))
+
 # Timeouts (PEGT Module 11.2)
 FAST_PATH_TIMEOUT = 10  # seconds
 SLOW_PATH_TIMEOUT = 90  # seconds (increased for Ollama Cloud deep analysis)
 
 # Global clients (initialized in lifespan)
 db_conn: Optional[psycopg2.extensions.connection] = None
-qdrant_client: Optional[QdrantClient] = None
+qdrant_client: Optional[AsyncQdrantClient] = None  # Shared async (gRPC) client
 embedding_model: Optional[SentenceTransformer] = None
+golden_index = GoldenStandardIndex()  # Trigger embeddings for instant answers
+lexical_index = LexicalIndex()  # BM25 over nugget title/keywords/content (hybrid RAG)
+rag_outbox_wakeup = asyncio.Event()  # Set by admin writes - drain the outbox now
+rag_outbox_task: Optional[asyncio.Task] = None
+knowledge_index_task: Optional[asyncio.Task] = None
+import_jobs = ImportJobRegistry()  # Streaming bulk import jobs (this process)
+feedback_cluster_wakeup = asyncio.Event()  # Set by new `down` feedback - cluster it now
+feedback_cluster_task: Optional[asyncio.Task] = None
+slow_path_retention_task: Optional[asyncio.Task] = None
+conversation_maintenance_task: Optional[asyncio.Task] = None
+session_registry = SessionRegistry()  # Known session ids (all workers, via LISTEN/NOTIFY)
+session_registry_task: Optional[asyncio.Task] = None
+session_actors = SessionActors()  # Per-session ordered execution of sends (bounded mailboxes)
+read_router = ReadReplicaRouter()  # Replica-safe reads → POSTGRES_REPLICA_DSN (if set)
 websocket_connections: Dict[str, WebSocket] = {}
+slow_path_inflight: set = set()  # Cache keys of analyses running in this process
 
 # =============================================================================
 # Database Connection Helper
@@ -146,6 +280,16 @@ def get_fresh_db_connection():
         logger.error(f"✗ Failed to create fresh DB connection: {e}")
         return None
 
+def get_transaction_db_connection():
+    """
+    Get a fresh PostgreSQL connection with autocommit DISABLED.
+    Used where several statements must commit atomically (domain row + outbox row).
+    """
+    conn = get_fresh_db_connection()
+    if conn is not None:
+        conn.autocommit = False
+    return conn
+
 # =============================================================================
 # Application Lifespan
 # =============================================================================
@@ -183,17 +327,42 @@ async def lifespan(app: FastAPI):
         logger.error(f"✗ PostgreSQL connection failed: {e}")
         db_conn = None
 
-    # Initialize Qdrant
+    if read_router.enabled:
+        logger.info(f"✓ Read replica routing enabled (max lag {read_router.max_lag_seconds}s)")
+
+    # Initialize Qdrant (remote server over gRPC or embedded local/:memory: mode)
     try:
-        if QDRANT_HOST.startswith('http'):
-            qdrant_client = QdrantClient(url=QDRANT_HOST)
+        qdrant_client = create_async_qdrant_client(
+            QDRANT_MODE,
+            path=QDRANT_PATH,
+            host=QDRANT_HOST,
+            port=QDRANT_PORT,
+            grpc_port=QDRANT_GRPC_PORT,
+            prefer_grpc=QDRANT_PREFER_GRPC
+        )
+        probe = await probe_qdrant(qdrant_client)
+        if probe["status"] == "ok":
+            logger.info(f"✓ Qdrant connected ({describe_qdrant_target(QDRANT_MODE, QDRANT_PATH, QDRANT_HOST, QDRANT_PORT)}, grpc={QDRANT_PREFER_GRPC}, {probe['latency_ms']}ms)")
         else:
-            qdrant_client = QdrantClient(host=QDRANT_HOST, port=QDRANT_PORT)
-        logger.info("✓ Qdrant connected")
+            logger.warning(f"⚠ Qdrant not reachable yet ({probe.get('error')}) - RAG will retry on first query")
+
+        # Embedded storage has no separate seeding service - make sure the
+        # collection exists so admin imports and RAG queries work out of the box
+        if is_embedded_mode(QDRANT_MODE):
+            await ensure_collection_async(qdrant_client, QDRANT_COLLECTION_NAME, VECTOR_DIMENSION)
+
+        # Blue/green reindexing swaps this alias; bootstrap it on first start
+        active_collection = await ensure_alias_async(qdrant_client, QDRANT_COLLECTION_ALIAS, QDRANT_COLLECTION_NAME)
+        if active_collection:
+            logger.info(f"✓ RAG collection alias '{QDRANT_COLLECTION_ALIAS}' → '{active_collection}'")
     except Exception as e:
         logger.error(f"✗ Qdrant connection failed: {e}")
         qdrant_client = None
 
+    # Build the BM25 index from nugget payloads (hybrid retrieval)
+    if qdrant_client is not None:
+        await refresh_lexical_index()
+
     # Load embedding model
     try:
         embedding_model = SentenceTransformer(EMBEDDING_MODEL_NAME)
@@ -201,15 +370,115 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"✗ Embedding model load failed: {e}")
         embedding_model = None
+
+    # Precompute Golden Standard trigger embeddings (instant Fast Path answers)
+    if db_conn is not None:
+        await refresh_golden_index()
+
+    # RAG ingestion outbox worker (admin writes → batched Qdrant upserts)
+    global rag_outbox_task
+    if db_conn is not None:
+        try:
+            ensure_outbox_table(db_conn)
+            rag_outbox_task = asyncio.create_task(run_rag_outbox_worker())
+            logger.info("✓ RAG outbox worker started")
+        except Exception as e:
+            logger.error(f"✗ RAG outbox setup failed: {e}")
+
+    # Lexical + Golden Standard index refresh (writes made outside this process)
+    global knowledge_index_task
+    knowledge_index_task = asyncio.create_task(run_knowledge_index_worker())
+    logger.info("✓ Knowledge index refresh worker started")
+
+    # AI Dojo feedback clustering worker (new notes → materialized clusters)
+    global feedback_cluster_task
+    if db_conn is not None:
+        try:
+            ensure_feedback_cluster_tables(db_conn)
+            feedback_cluster_task = asyncio.create_task(run_feedback_cluster_worker())
+            logger.info("✓ Feedback clustering worker started")
+        except Exception as e:
+            logger.error(f"✗ Feedback clustering setup failed: {e}")
+
+        # Analytics columns + daily rollups (v1 dashboard)
+        try:
+            ensure_analytics_schema(db_conn)
+            logger.info("✓ Analytics rollups ready")
+        except Exception as e:
+            logger.error(f"✗ Analytics schema setup failed: {e}")
+
+        # Latest-analysis pointer + Slow Path retention (compaction worker)
+        global slow_path_retention_task
+        try:
+            ensure_slow_path_history_schema(db_conn)
+            if SLOW_PATH_RETENTION_DAYS > 0:
+                slow_path_retention_task = asyncio.create_task(run_slow_path_retention_worker())
+                logger.info(f"✓ Slow Path retention worker started ({SLOW_PATH_RETENTION_DAYS} days)")
+        except Exception as e:
+            logger.error(f"✗ Slow Path history setup failed: {e}")
+
+        # Content-addressed Slow Path results (retries over an unchanged history)
+        try:
+            ensure_slow_path_cache_schema(db_conn)
+            logger.info("✓ Slow Path result cache ready")
+        except Exception as e:
+            logger.error(f"✗ Slow Path cache setup failed: {e}")
+
+        # Session registry: warmed + kept current by the LISTEN worker
+        global session_registry_task
+        session_registry_task = asyncio.create_task(run_session_registry_listener())
+        logger.info("✓ Session registry listener started")
+
+        # conversation_log history index, archive table, partitions + archival worker
+        global conversation_maintenance_task
+        try:
+            ensure_conversation_schema(db_conn)
+            conversation_maintenance_task = asyncio.create_task(run_conversation_maintenance_worker())
+            logger.info("✓ Conversation store maintenance worker started")
+        except Exception as e:
+            logger.error(f"✗ Conversation store setup failed: {e}")
+
+        # pg_trgm may need a superuser on first install - search still works unindexed
+        try:
+            ensure_feedback_search_indexes(db_conn)
+            logger.info("✓ Feedback search indexes ready (pg_trgm)")
+        except Exception as e:
+            logger.warning(f"⚠ Feedback search indexes unavailable (run seed.py as a superuser): {e}")
+
+        try:
+            ensure_golden_listing_indexes(db_conn)
+            logger.info("✓ Golden Standard listing indexes ready")
+        except Exception as e:
+            logger.warning(f"⚠ Golden Standard listing indexes unavailable (run seed.py as a superuser): {e}")
     
     logger.info("🎯 ULTRA v3.0 Backend ready!")
     
     yield
     
     # Cleanup
+    for task in (
+        rag_outbox_task, knowledge_index_task, feedback_cluster_task, slow_path_retention_task,
+        conversation_maintenance_task, session_registry_task
+    ):
+        if task is None:
+            continue
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    await session_actors.close()
+
     if db_conn:
         db_conn.close()
         logger.info("✓ PostgreSQL disconnected")
+    read_router.close()
+
+    if qdrant_client is not None:
+        # Releases the file lock held by embedded local storage
+        await qdrant_client.close()
+        logger.info("✓ Qdrant disconnected")
     
     logger.info("👋 ULTRA v3.0 Backend shutdown complete")
 
@@ -231,7 +500,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],  # Session polling revalidates with If-None-Match
 )
+app.add_middleware(GZipMiddleware, minimum_size=1024)  # Admin listings, session payloads, exports
 
 # =============================================================================
 # Utility Functions
@@ -241,11 +512,32 @@ def generate_session_id() -> str:
     """
     Generate unique session ID (PEGT Module 2.2)
     Format: S-XXX-NNN (e.g., S-PYR-334)
+    Skips ids already in the session registry (no database round trip)
     """
     prefix = "S"
-    letters = ''.join(random.choices(string.ascii_uppercase, k=3))
-    numbers = ''.join(random.choices(string.digits, k=3))
-    return f"{prefix}-{letters}-{numbers}"
+    while True:
+        letters = ''.join(random.choices(string.ascii_uppercase, k=3))
+        numbers = ''.join(random.choices(string.digits, k=3))
+        session_id = f"{prefix}-{letters}-{numbers}"
+        if session_id not in session_registry:
+            return session_id
+
+def create_session_record() -> str:
+    """
+    Allocate a session id and persist it (if database available) - retried
+    on a collision with another worker, announced to all workers' registries
+    """
+    if db_conn is None:
+        session_id = generate_session_id()
+        session_registry.add(session_id)
+        return session_id
+    cursor = db_conn.cursor()
+    try:
+        session_id = insert_new_session(cursor, session_registry, generate_session_id, datetime.now(timezone.utc))
+    finally:
+        cursor.close()
+    read_router.note_write(session_id)
+    return session_id
 
 def normalize_language(language: Optional[str]) -> str:
     """
@@ -268,11 +560,7 @@ def validate_session_id(session_id: str) -> bool:
         return True
     
     try:
-        cursor = db_conn.cursor()
-        cursor.execute("SELECT 1 FROM sessions WHERE session_id = %s", (session_id,))
-        exists = cursor.fetchone() is not None
-        cursor.close()
-        return exists
+        return session_registry.exists(db_conn, session_id)  # PostgreSQL only on a registry miss
     except Exception as e:
         logger.error(f"Session validation error: {e}")
         return False
@@ -290,30 +578,61 @@ async def verify_admin_key(x_admin_key: str = Header(None)):
 # RAG Functions (PEGT Module 11.1)
 # =============================================================================
 
-def query_rag(query_text: str, language: str = "pl", top_k: int = 3) -> str:
+async def embed_text(text: str) -> List[float]:
+    """
+    Encode text with the shared SentenceTransformer off the event loop
+    (model inference is CPU-bound and would otherwise stall other requests)
+    """
+    if embedding_model is None:
+        raise ValueError("Embedding model not loaded")
+    embedding_result = await asyncio.to_thread(embedding_model.encode, text)
+    # Convert to list of floats - handle both numpy arrays and tensors
+    return embedding_result.tolist() if hasattr(embedding_result, 'tolist') else list(embedding_result)  # type: ignore[union-attr]
+
+async def query_rag(
+    query_text: str,
+    language: str = "pl",
+    top_k: int = 3,
+    query_vector: Optional[List[float]] = None
+) -> str:
     """
     Query Qdrant for relevant knowledge nuggets
     Returns concatenated context string for AI prompts
+    query_vector: precomputed embedding of query_text (skips the encoder pass)
+
+    Hybrid retrieval: a selective curated keyword in the query (model names,
+    programs, jargon) answers straight from the lexical index without an
+    embedding pass; otherwise vector hits and BM25 hits are merged with
+    reciprocal rank fusion
     """
+    lexical_hits: List[Any] = []
     try:
+        # Exact curated keyword hit - no embedding, no Qdrant round trip
+        exact_ids = lexical_index.exact_keyword_hits(query_text, language, top_k=top_k)
+        if exact_ids:
+            contents = [lexical_index.payload(doc_id)['content'] for doc_id in exact_ids]
+            logger.info(f"📚 RAG exact keyword hit: {len(exact_ids)} nuggets")
+            return "\n---\n".join(contents)[:2000]  # Max 2000 chars (W21)
+
+        lexical_hits = lexical_index.search(query_text, language, top_k=top_k * 3)
+
         # Check if embedding model is loaded
         if embedding_model is None:
             logger.error("Embedding model not loaded")
-            return "No specific product knowledge available. Use general sales principles."
+            return build_hybrid_context([], lexical_hits, top_k)
         
         # Check if Qdrant client is available
         if qdrant_client is None:
             logger.error("Qdrant client not initialized")
-            return "No specific product knowledge available. Use general sales principles."
+            return build_hybrid_context([], lexical_hits, top_k)
         
-        # Generate query embedding
-        embedding_result = embedding_model.encode(query_text)
-        # Convert to list of floats - handle both numpy arrays and tensors
-        query_vector: List[float] = embedding_result.tolist() if hasattr(embedding_result, 'tolist') else list(embedding_result)  # type: ignore[union-attr]
+        # Generate query embedding (unless the caller already has it)
+        if query_vector is None:
+            query_vector = await embed_text(query_text)
         
         # Search with language filter
-        results = qdrant_client.search(
-            collection_name=QDRANT_COLLECTION_NAME,
+        results = await qdrant_client.search(
+            collection_name=QDRANT_COLLECTION_ALIAS,
             query_vector=query_vector,
             query_filter=models.Filter(
                 must=[
@@ -323,22 +642,415 @@ def query_rag(query_text: str, language: str = "pl", top_k: int = 3) -> str:
                     )
                 ]
             ),
-            limit=top_k,
+            search_params=build_search_params(),  # HNSW ef + int8 rescoring (QDRANT_HNSW_PROFILE)
+            limit=top_k * 3,  # Extra candidates for rank fusion
             score_threshold=0.50  # Lowered to 0.50 to capture more queries (leasing/subsidies score ~0.50-0.60)
         )
-        
-        if not results:
-            # (T12) Fallback when no results
-            return "No specific product knowledge available. Use general sales principles."
-        
-        # Concatenate top results (PEGT Module 11.1)
-        context = "\n---\n".join([hit.payload['content'] for hit in results[:3]])
-        return context[:2000]  # Max 2000 chars (W21)
+
+        return build_hybrid_context(results, lexical_hits, top_k)
         
     except Exception as e:
+        # Vector search down (or mid model swap) - lexical hits still give context
         logger.error(f"RAG query failed: {e}")
+        return build_hybrid_context([], lexical_hits, top_k)
+
+def build_hybrid_context(vector_hits: List[Any], lexical_hits: List[Any], top_k: int = 3) -> str:
+    """
+    Fuse vector hits (ScoredPoint) and BM25 hits ((doc_id, score)) with
+    reciprocal rank fusion and concatenate the top contents
+    """
+    payloads = {str(hit.id): hit.payload for hit in vector_hits}
+    fused = reciprocal_rank_fusion([
+        [str(hit.id) for hit in vector_hits],
+        [doc_id for doc_id, _ in lexical_hits],
+    ])
+
+    contents = []
+    for doc_id in fused[:top_k]:
+        payload = payloads.get(doc_id) or lexical_index.payload(doc_id) or {}
+        if payload.get('content'):
+            contents.append(payload['content'])
+
+    if not contents:
+        # (T12) Fallback when no results
         return "No specific product knowledge available. Use general sales principles."
 
+    # Concatenate top results (PEGT Module 11.1)
+    return "\n---\n".join(contents)[:2000]  # Max 2000 chars (W21)
+
+async def refresh_lexical_index():
+    """
+    Rebuild the BM25 lexical index from the Qdrant collection payloads
+    Called at startup, after admin nugget changes and by the knowledge index
+    worker when the collection changed elsewhere
+    """
+    if qdrant_client is None:
+        return
+
+    try:
+        points: List[Any] = []
+        offset = None
+        while True:
+            batch, offset = await qdrant_client.scroll(
+                collection_name=QDRANT_COLLECTION_ALIAS,
+                limit=256,
+                offset=offset,
+                with_payload=True,
+                with_vectors=False
+            )
+            points.extend(batch)
+            if offset is None:
+                break
+
+        await asyncio.to_thread(lexical_index.build, [(point.id, point.payload) for point in points])
+    except Exception as e:
+        logger.warning(f"⚠ Lexical index refresh failed (vector-only RAG): {e}")
+
+async def lexical_index_fingerprint() -> Tuple[Any, ...]:
+    """
+    Cheap change marker for the lexical index: alias target, exact point
+    count and the newest processed outbox row (any API worker)
+    """
+    collection = await resolve_alias_async(qdrant_client, QDRANT_COLLECTION_ALIAS)
+    counted = await qdrant_client.count(collection_name=QDRANT_COLLECTION_ALIAS, exact=True)
+
+    def last_processed() -> Any:
+        conn = get_fresh_db_connection()
+        if conn is None:
+            return None
+        try:
+            return outbox_last_processed(conn)
+        finally:
+            conn.close()
+
+    return collection, counted.count, await asyncio.to_thread(last_processed)
+
+def golden_index_fingerprint() -> Optional[Tuple[Any, ...]]:
+    """Cheap change marker for the Golden Standard index (row count, newest id / edit)"""
+    conn = get_fresh_db_connection()
+    if conn is None:
+        return None
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*), MAX(gs_id), MAX(updated_at) FROM golden_standards")
+        row = cursor.fetchone()
+        cursor.close()
+        return tuple(row)
+    finally:
+        conn.close()
+
+async def run_knowledge_index_worker(
+    poll_interval: float = KNOWLEDGE_INDEX_CHECK_INTERVAL,
+    max_age: float = KNOWLEDGE_INDEX_MAX_AGE
+):
+    """
+    Keep the lexical and Golden Standard indexes current with writes made
+    outside this process (seed.py, sync_knowledge.py, direct_import.py, other
+    API workers): compares cheap fingerprints every poll_interval seconds and
+    rebuilds on change, unconditionally after max_age seconds
+    """
+    lexical_seen = golden_seen = None
+    rebuilt_at = time.monotonic()  # Both indexes were just built in lifespan
+    while True:
+        expired = time.monotonic() - rebuilt_at >= max_age
+        if expired:
+            rebuilt_at = time.monotonic()
+
+        if qdrant_client is not None:
+            try:
+                fingerprint = await lexical_index_fingerprint()
+                if expired or (lexical_seen is not None and fingerprint != lexical_seen):
+                    await refresh_lexical_index()
+                lexical_seen = fingerprint
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠ Lexical index change check failed: {e}")
+
+        try:
+            fingerprint = await asyncio.to_thread(golden_index_fingerprint)
+            if expired or (golden_seen is not None and fingerprint != golden_seen):
+                await refresh_golden_index()
+            golden_seen = fingerprint
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"⚠ Golden standard index change check failed: {e}")
+
+        await asyncio.sleep(poll_interval)
+
+def get_rag_outbox_health() -> Dict[str, Any]:
+    """Outbox backlog for /health (pending rows = Qdrant not yet converged)"""
+    conn = get_fresh_db_connection()
+    if conn is None:
+        return {"status": "unavailable"}
+    try:
+        return {"status": "ok", **outbox_stats(conn)}
+    except Exception as e:
+        return {"status": "unavailable", "error": str(e)}
+    finally:
+        conn.close()
+
+async def run_rag_outbox_worker(poll_interval: float = 2.0):
+    """
+    Drain the rag_outbox table: batched embeddings + one Qdrant upsert per batch
+    Woken immediately by admin writes, otherwise polls (picks up retries and
+    rows written by other API workers); purges old done rows hourly
+    """
+    conn = None
+    purged_at = 0.0
+    while True:
+        try:
+            if conn is None or conn.closed:
+                conn = get_transaction_db_connection()
+            if conn is None or qdrant_client is None or embedding_model is None:
+                raise RuntimeError("PostgreSQL, Qdrant or embedding model unavailable")
+
+            if time.monotonic() - purged_at >= RAG_OUTBOX_PURGE_INTERVAL:
+                purged_at = time.monotonic()
+                purged = await asyncio.to_thread(purge_done_outbox, conn)
+                if purged:
+                    logger.info(f"✓ RAG outbox retention: {purged} done rows deleted")
+
+            stats = await drain_outbox_batch(conn, qdrant_client, QDRANT_COLLECTION_ALIAS, embedding_model.encode)
+            if stats["upserted"] or stats["deleted"]:
+                logger.info(f"✓ RAG outbox: {stats['upserted']} upserted, {stats['deleted']} deleted")
+                asyncio.create_task(refresh_lexical_index())
+            if stats["claimed"] and not stats["failed"]:
+                continue  # More rows may be waiting - keep draining
+        except asyncio.CancelledError:
+            if conn is not None:
+                conn.close()
+            raise
+        except Exception as e:
+            logger.warning(f"⚠ RAG outbox worker error: {e}")
+            if conn is not None:
+                conn.close()
+            conn = None
+
+        try:
+            await asyncio.wait_for(rag_outbox_wakeup.wait(), timeout=poll_interval)
+        except asyncio.TimeoutError:
+            pass
+        rag_outbox_wakeup.clear()
+
+def refresh_feedback_clusters(language: str) -> Dict[str, int]:
+    """
+    Assign all unclustered `down` notes of a language to clusters (batch by
+    batch), then name new / grown clusters with ONE Prompt 5 call
+    """
+    if embedding_model is None:
+        raise RuntimeError("Embedding model unavailable")
+    conn = get_transaction_db_connection()
+    if conn is None:
+        raise RuntimeError("PostgreSQL unavailable")
+
+    totals = {"assigned": 0, "created": 0, "named": 0}
+    try:
+        while True:
+            stats = assign_pending_feedback(conn, language, embedding_model.encode, EMBEDDING_MODEL_NAME)
+            totals["assigned"] += stats["assigned"]
+            totals["created"] += stats["created"]
+            if stats["assigned"] < FEEDBACK_CLUSTER_BATCH_SIZE:
+                break
+
+        to_name = clusters_needing_names(conn, language)
+        conn.rollback()  # Release the read snapshot before the (slow) LLM call
+        if to_name and GEMINI_API_KEY:
+            try:
+                result = call_gemini_fast_path(build_prompt_5_cluster_naming(language, to_name))
+                wanted = {cluster["cluster_id"] for cluster in to_name}
+                names = {
+                    int(item["cluster_id"]): str(item["theme_name"]).strip()
+                    for item in result.get("names", [])
+                    if item.get("cluster_id") in wanted and str(item.get("theme_name") or "").strip()
+                }
+                totals["named"] = save_cluster_names(conn, names)
+            except Exception as e:
+                # Unnamed clusters still show their representative note
+                logger.warning(f"⚠ Feedback cluster naming failed: {e}")
+        return totals
+    finally:
+        conn.close()
+
+async def run_feedback_cluster_worker(poll_interval: float = FEEDBACK_CLUSTER_INTERVAL):
+    """
+    Keep the AI Dojo feedback clusters current: woken by new `down`
+    feedback, otherwise refreshes every poll_interval seconds (picks up
+    notes written by other API workers)
+    """
+    while True:
+        for language in ("pl", "en"):
+            try:
+                totals = await asyncio.to_thread(refresh_feedback_clusters, language)
+                if totals["assigned"] or totals["named"]:
+                    logger.info(
+                        f"✓ Feedback clusters ({language}): {totals['assigned']} notes assigned, "
+                        f"{totals['created']} new clusters, {totals['named']} named"
+                    )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠ Feedback clustering worker error ({language}): {e}")
+
+        try:
+            await asyncio.wait_for(feedback_cluster_wakeup.wait(), timeout=poll_interval)
+        except asyncio.TimeoutError:
+            pass
+        feedback_cluster_wakeup.clear()
+
+def compact_slow_path_logs() -> Dict[str, int]:
+    """Compact superseded Slow Path analyses older than SLOW_PATH_RETENTION_DAYS"""
+    conn = get_transaction_db_connection()
+    if conn is None:
+        raise RuntimeError("PostgreSQL unavailable")
+    try:
+        return compact_all_slow_path_history(conn, SLOW_PATH_RETENTION_DAYS)
+    finally:
+        conn.close()
+
+async def run_slow_path_retention_worker(poll_interval: float = SLOW_PATH_RETENTION_INTERVAL):
+    """Keep slow_path_logs bounded: compaction pass every poll_interval seconds"""
+    while True:
+        try:
+            totals = await asyncio.to_thread(compact_slow_path_logs)
+            if totals["compacted"]:
+                logger.info(f"✓ Slow Path retention: {totals['compacted']} analyses archived")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"⚠ Slow Path retention worker error: {e}")
+        await asyncio.sleep(poll_interval)
+
+async def run_session_registry_listener(timeout: float = 5.0):
+    """
+    Keep the session registry coherent across API workers: LISTEN for
+    sessions created anywhere, re-warm from `sessions` after every
+    (re)connect so nothing created while disconnected is missed
+    """
+    conn = None
+    while True:
+        try:
+            if conn is None:
+                conn = get_fresh_db_connection()
+                if conn is None:
+                    raise RuntimeError("PostgreSQL unavailable")
+                session_registry.listen(conn)  # Before warming - no gap
+                size = await asyncio.to_thread(session_registry.warm, conn)
+                logger.info(f"✓ Session registry warmed: {size} sessions")
+            await asyncio.to_thread(session_registry.drain_notifications, conn, timeout)
+        except asyncio.CancelledError:
+            if conn is not None:
+                conn.close()
+            raise
+        except Exception as e:
+            logger.warning(f"⚠ Session registry listener error: {e}")
+            if conn is not None:
+                conn.close()
+            conn = None
+            await asyncio.sleep(timeout)
+
+def maintain_conversation_store() -> Dict[str, int]:
+    """
+    Create upcoming monthly conversation_log partitions, then archive
+    sessions ended more than CONVERSATION_ARCHIVE_AFTER_DAYS ago
+    """
+    conn = get_transaction_db_connection()
+    if conn is None:
+        raise RuntimeError("PostgreSQL unavailable")
+    totals = {"partitions": 0, "sessions": 0, "messages": 0}
+    try:
+        totals["partitions"] = len(ensure_conversation_partitions(conn))
+        while CONVERSATION_ARCHIVE_AFTER_DAYS > 0:
+            stats = archive_ended_conversations(conn, CONVERSATION_ARCHIVE_AFTER_DAYS)
+            if not stats["sessions"]:
+                break
+            totals["sessions"] += stats["sessions"]
+            totals["messages"] += stats["messages"]
+        return totals
+    finally:
+        conn.close()
+
+async def run_conversation_maintenance_worker(poll_interval: float = CONVERSATION_MAINTENANCE_INTERVAL):
+    """Partition upkeep + cold archival of conversation_log every poll_interval seconds"""
+    while True:
+        try:
+            totals = await asyncio.to_thread(maintain_conversation_store)
+            if totals["partitions"] or totals["sessions"]:
+                logger.info(
+                    f"✓ Conversation store: {totals['partitions']} partitions created, "
+                    f"{totals['sessions']} sessions ({totals['messages']} messages) archived"
+                )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"⚠ Conversation store maintenance error: {e}")
+        await asyncio.sleep(poll_interval)
+
+async def query_rag_multi(
+    query_texts: List[str],
+    language: str = "pl",
+    top_k: int = 3,
+    budget_chars: int = SLOW_PATH_RAG_BUDGET_CHARS
+) -> str:
+    """
+    Multi-query RAG for Slow Path: embeds all queries in ONE batch and runs
+    them through Qdrant search_batch in ONE round trip, then merges and
+    deduplicates the hits under the context budget
+    """
+    fallback = "No specific product knowledge available. Use general sales principles."
+    try:
+        queries = [q for q in query_texts if q]
+        if not queries:
+            return fallback
+
+        if embedding_model is None:
+            logger.error("Embedding model not loaded")
+            return fallback
+
+        if qdrant_client is None:
+            logger.error("Qdrant client not initialized")
+            return fallback
+
+        # One batched encoder pass for all queries
+        embedding_result = await asyncio.to_thread(embedding_model.encode, queries)
+        vectors: List[List[float]] = embedding_result.tolist() if hasattr(embedding_result, 'tolist') else [list(v) for v in embedding_result]  # type: ignore[union-attr]
+
+        language_filter = models.Filter(
+            must=[
+                models.FieldCondition(
+                    key="language",
+                    match=models.MatchValue(value=language)
+                )
+            ]
+        )
+        batch_results = await qdrant_client.search_batch(
+            collection_name=QDRANT_COLLECTION_ALIAS,
+            requests=[
+                models.SearchRequest(
+                    vector=vector,
+                    filter=language_filter,
+                    params=build_search_params(),
+                    limit=top_k,
+                    score_threshold=0.50,  # Same threshold as query_rag
+                    with_payload=True
+                )
+                for vector in vectors
+            ]
+        )
+
+        context = merge_search_results(batch_results, budget_chars=budget_chars)
+        if not context:
+            # (T12) Fallback when no results
+            return fallback
+
+        logger.info(f"📚 Multi-query RAG: {len(queries)} queries → {len(context)} chars")
+        return context
+
+    except Exception as e:
+        logger.error(f"Multi-query RAG failed: {e}")
+        return fallback
+
 def get_smart_session_history(db_conn, session_id: str, max_recent: int = 20) -> str:
     """
     Get session history with smart truncation for Fast Path v2.0:
@@ -348,16 +1060,7 @@ def get_smart_session_history(db_conn, session_id: str, max_recent: int = 20) ->
     """
     try:
         cursor = db_conn.cursor(cursor_factory=RealDictCursor)
-        cursor.execute(
-            """
-            SELECT timestamp, role, content
-            FROM conversation_log
-            WHERE session_id = %s
-            ORDER BY timestamp ASC
-            """,
-            (session_id,)
-        )
-        logs = cursor.fetchall()
+        logs = load_conversation(cursor, session_id)  # Hot rows + cold archive
         cursor.close()
 
         if len(logs) <= max_recent:
@@ -883,22 +1586,29 @@ Output ONLY this exact JSON structure. No additional text.
 IMPORTANT: You MUST always include "suggested_stage" in your response, even if confidence is low.
 """
 
-def build_prompt_5_feedback_grouping(language: str, feedback_notes: List[str]) -> str:
+def build_prompt_5_cluster_naming(language: str, clusters: List[Dict[str, Any]]) -> str:
     """
-    Prompt 5: Fast Path - AI Dojo Feedback Grouping (SUPER-BLUEPRINT Section 4.5)
+    Prompt 5: Fast Path - AI Dojo Feedback Theme Naming (SUPER-BLUEPRINT Section 4.5)
+    Notes are already grouped locally (embedding clusters) - the LLM only names
+    the new / grown clusters from a few representative notes each
     """
-    notes_str = ", ".join([f'"{note}"' for note in feedback_notes])
+    clusters_str = "\n".join(
+        f'- cluster_id {cluster["cluster_id"]} ({cluster["size"]} notes): '
+        + ", ".join(f'"{note}"' for note in cluster["notes"])
+        for cluster in clusters
+    )
     
-    return f"""You are a world-class Sales Master Analyst. Your task is to analyze a raw list of feedback notes from sellers and group them into logical themes. Keep theme names short (2–3 words). Respond ONLY in JSON. Respond in the language defined by 'language'.
+    return f"""You are a world-class Sales Master Analyst. Sellers' feedback notes have already been grouped into clusters of similar complaints. Your task is to give every cluster a short theme name (2–3 words) that captures what its notes have in common. Respond ONLY in JSON. Respond in the language defined by 'language'.
 
 Context:
 - Language: {language}
-- Feedback Notes: [{notes_str}]
+- Clusters (representative notes):
+{clusters_str}
 
 Respond ONLY in this JSON format:
 {{
-  "groups": [
-    {{ "theme_name": "string", "count": number, "representative_note": "string" }}
+  "names": [
+    {{ "cluster_id": number, "theme_name": "string" }}
   ]
 }}
 """
@@ -925,6 +1635,8 @@ class RefineRequest(BaseModel):
 
 class RetrySlowPathRequest(BaseModel):
     session_id: str
+    force: bool = True  # False: only rerun if the trigger gate sees new significant notes
+    journey_stage: Optional[str] = None  # Default: the session's stored stage
 
 class EndSessionRequest(BaseModel):
     session_id: str
@@ -953,17 +1665,8 @@ async def create_new_session():
     Returns session_id immediately for Optimistic UI
     """
     try:
-        session_id = generate_session_id()
-        
-        # If database available, persist session
-        if db_conn is not None:
-            cursor = db_conn.cursor()
-            cursor.execute(
-                "INSERT INTO sessions (session_id, created_at) VALUES (%s, %s)",
-                (session_id, datetime.now(timezone.utc))
-            )
-            db_conn.commit()
-            cursor.close()
+        # Persisted (if database available) under a collision-checked id
+        session_id = create_session_record()
         
         logger.info(f"✓ Created session: {session_id}")
 
@@ -987,10 +1690,21 @@ async def create_new_session():
 # =============================================================================
 
 @app.get("/api/v1/sessions/{session_id}")
-async def get_session(session_id: str):
+async def get_session(
+    session_id: str,
+    response: Response,
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous conversation page"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Conversation entries per page (default: all)"),
+    fields: Optional[str] = Query(None, description="Comma separated: conversation_log, slow_path_log, slow_path_status"),
+    if_none_match: Optional[str] = Header(None)
+):
     """
     Retrieve session conversation history and latest Slow Path analysis
     Rejects TEMP-* IDs (K8)
+
+    Keyset-paginated conversation (cursor / limit), projected sections
+    (fields) and a weak ETag from the newest message + analysis ids -
+    If-None-Match answers 304 without reading the payload
     """
     if session_id.startswith("TEMP-"):
         raise HTTPException(
@@ -1006,44 +1720,39 @@ async def get_session(session_id: str):
         )
     
     try:
-        cursor = db_conn.cursor(cursor_factory=RealDictCursor)
-        
-        # Get conversation log
-        cursor.execute(
-            """
-            SELECT log_id, session_id, timestamp, role, content, language
-            FROM conversation_log
-            WHERE session_id = %s
-            ORDER BY timestamp ASC
-            """,
-            (session_id,)
-        )
-        conversation_log = cursor.fetchall()
-        
-        # Get latest slow path log
-        cursor.execute(
-            """
-            SELECT log_id, session_id, timestamp, json_output, status
-            FROM slow_path_logs
-            WHERE session_id = %s
-            ORDER BY timestamp DESC
-            LIMIT 1
-            """,
-            (session_id,)
-        )
-        slow_path_log = cursor.fetchone()
-        
-        cursor.close()
-        
-        if not conversation_log and not slow_path_log:
-            raise HTTPException(status_code=404, detail="Session not found")
+        selected = parse_session_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    def read_session(conn):
+        with conn.cursor(cursor_factory=RealDictCursor) as db_cursor:
+            # Cheap version lookup first - unchanged sessions never read the payload
+            version = load_session_version(db_cursor, session_id)
+            if version is None or (
+                version["last_log_id"] is None and not version["archived_count"]
+                and load_latest_slow_path(db_cursor, session_id) is None
+            ):
+                raise HTTPException(status_code=404, detail="Session not found")
+            
+            etag = session_etag(version, (",".join(selected), cursor, limit))
+            if etag_matches(if_none_match, etag):
+                return etag, None
+            
+            try:
+                return etag, load_session_snapshot(db_cursor, session_id, selected, after=cursor, limit=limit)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        # Replica when it has replayed this session's latest write (read-your-writes)
+        etag, data = await asyncio.to_thread(read_router.run, db_conn, read_session, session_id=session_id)
+        if data is None:
+            return Response(status_code=304, headers={"ETag": etag})
         
+        response.headers["ETag"] = etag
         return GlobalAPIResponse(
             status="success",
-            data={
-                "conversation_log": conversation_log,
-                "slow_path_log": slow_path_log
-            }
+            data=data
         )
         
     except HTTPException:
@@ -1055,6 +1764,209 @@ async def get_session(session_id: str):
             message=str(e)
         )
 
+# =============================================================================
+# Fast Path Helpers (LLM + Golden Standard instant answers)
+# =============================================================================
+
+def build_golden_fast_path_data(session_id: str, journey_stage: str, match: GoldenMatch) -> Dict[str, Any]:
+    """
+    Fast Path response served straight from a Golden Standard (no LLM call)
+    Labeled via source="golden_standard" and the confidence reason
+    """
+    return {
+        "session_id": session_id,
+        "journey_stage": journey_stage,
+        "suggested_response": match.golden_response,
+        "suggested_questions": [],
+        "optional_followup": None,
+        "seller_questions": [],
+        "client_style": "spontaneous",
+        "confidence_score": round(match.score, 3),
+        "confidence_reason": f"Golden Standard ({match.category or 'curated'}): {match.trigger_context[:120]}",
+        "source": "golden_standard",
+        "golden_standard_id": match.gs_id,
+    }
+
+def build_fast_path_error_data(session_id: str, journey_stage: str, error: Exception) -> Dict[str, Any]:
+    """
+    Fallback Fast Path payload when Gemini fails
+    ENHANCED: Provide detailed error message based on exception type
+    """
+    error_message = "Fast Path temporarily unavailable. Please continue your note."
+
+    # Check if it's a rate limit error (429)
+    if "429" in str(error) or "Too Many Requests" in str(error):
+        error_message = "⚠️ Gemini API rate limit exceeded. Slow Path analysis will continue. Try again in a few minutes."
+    # Check if it's an authentication error (401)
+    elif "401" in str(error) or "Unauthorized" in str(error):
+        error_message = "⚠️ Gemini API authentication failed. Please check API key configuration."
+    # Check if it's a timeout
+    elif "timeout" in str(error).lower():
+        error_message = "⚠️ Gemini API timeout. Slow Path analysis will continue."
+
+    return {
+        "session_id": session_id,
+        "journey_stage": journey_stage,
+        "suggested_response": error_message,
+        "suggested_questions": [],
+        "optional_followup": None,
+        "seller_questions": [],
+        "client_style": "spontaneous",
+        "confidence_score": 0.0,
+        "confidence_reason": "Fast Path service unavailable",
+        "source": "error",
+    }
+
+async def generate_fast_path_llm(
+    session_id: str,
+    language: str,
+    user_input: str,
+    session_history: str,
+    journey_stage: str,
+    query_vector: Optional[List[float]] = None
+) -> Dict[str, Any]:
+    """
+    Fast Path v2.0: RAG + unified JARVIS prompt + Gemini
+    Raises on Gemini failure (caller decides on the fallback payload)
+    """
+    # Query RAG for context
+    rag_context = await query_rag(user_input, language, query_vector=query_vector)
+    logger.info(f"📚 RAG context retrieved ({len(rag_context)} chars): {rag_context[:200]}...")
+
+    # Build unified prompt
+    prompt = build_prompt_1(language, session_history, user_input, rag_context)
+
+    # Call Gemini (blocking HTTP - keep it off the event loop)
+    result = await asyncio.to_thread(call_gemini_fast_path, prompt)
+
+    # Extract all fields from new JSON structure
+    suggested_response = result.get("suggested_response", "")
+    optional_followup = result.get("optional_followup")  # Can be null
+    seller_questions = result.get("seller_questions", [])
+    client_style = result.get("client_style", "spontaneous")
+    confidence_score = result.get("confidence_score", 0.5)
+    confidence_reason = result.get("confidence_reason", "")
+
+    # Legacy compatibility: put optional_followup in suggested_questions
+    suggested_questions = []
+    if optional_followup:
+        suggested_questions.append(optional_followup)
+
+    logger.info(f"✅ Fast Path complete - confidence: {confidence_score}, style: {client_style}")
+
+    return {
+        "session_id": session_id,  # W30: Return session_id for TEMP-* conversion
+        "journey_stage": journey_stage,  # Current journey stage
+        "suggested_response": suggested_response,
+        "suggested_questions": suggested_questions,  # Legacy field
+        "optional_followup": optional_followup,
+        "seller_questions": seller_questions,
+        "client_style": client_style,
+        "confidence_score": confidence_score,
+        "confidence_reason": confidence_reason,
+        "source": "llm",
+    }
+
+def save_fast_path_response(session_id: str, language: str, fast_path_data: Dict[str, Any]) -> None:
+    """
+    Save Fast Path responses to conversation_log (if database available)
+    Best effort - responses are already in fast_path_data
+    """
+    if db_conn is None:
+        return
+    try:
+        cursor = db_conn.cursor()
+        cursor.execute(
+            """
+            INSERT INTO conversation_log (session_id, timestamp, role, content, language)
+            VALUES (%s, %s, %s, %s, %s)
+            """,
+            (session_id, datetime.now(timezone.utc), "FastPath",
+             fast_path_data["suggested_response"], language)
+        )
+        # Save metadata as JSON
+        metadata_json = json.dumps({
+            "optional_followup": fast_path_data.get("optional_followup"),
+            "seller_questions": fast_path_data.get("seller_questions", []),
+            "client_style": fast_path_data.get("client_style"),
+            "confidence_score": fast_path_data.get("confidence_score"),
+            "confidence_reason": fast_path_data.get("confidence_reason"),
+            "source": fast_path_data.get("source", "llm"),
+            "golden_standard_id": fast_path_data.get("golden_standard_id"),
+        })
+        cursor.execute(
+            """
+            INSERT INTO conversation_log (session_id, timestamp, role, content, language)
+            VALUES (%s, %s, %s, %s, %s)
+            """,
+            (session_id, datetime.now(timezone.utc), "FastPath-Metadata",
+             metadata_json, language)
+        )
+        db_conn.commit()
+        cursor.close()
+        read_router.note_write(session_id)
+    except Exception as db_err:
+        logger.warning(f"⚠️ Could not save Fast Path responses to database: {db_err}")
+
+async def run_fast_path_background(
+    session_id: str,
+    language: str,
+    user_input: str,
+    session_history: str,
+    journey_stage: str,
+    query_vector: Optional[List[float]] = None
+):
+    """
+    Optional LLM Fast Path after a Golden Standard instant answer
+    (GOLDEN_STANDARD_BACKGROUND_LLM=true). The LLM suggestion is pushed over
+    the session WebSocket as "fast_path_complete" - not stored in the log.
+    """
+    try:
+        fast_path_data = await generate_fast_path_llm(
+            session_id, language, user_input, session_history, journey_stage, query_vector
+        )
+        if session_id in websocket_connections:
+            await websocket_connections[session_id].send_json({
+                "type": "fast_path_complete",
+                "status": "Success",
+                "data": fast_path_data,
+                "message": "LLM suggestion (after Golden Standard answer)"
+            })
+    except Exception as e:
+        logger.warning(f"⚠️ Background Fast Path failed for {session_id}: {e}")
+
+async def refresh_golden_index():
+    """
+    Rebuild the Golden Standard instant-answer index from PostgreSQL
+    Called at startup, after golden standards change and by the knowledge
+    index worker when rows changed elsewhere
+    """
+    if embedding_model is None:
+        return
+
+    def load_and_rebuild() -> int:
+        conn = get_fresh_db_connection()
+        if conn is None:
+            return len(golden_index)
+        try:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            cursor.execute(
+                """
+                SELECT gs_id, trigger_context, golden_response, category, language
+                FROM golden_standards
+                """
+            )
+            rows = cursor.fetchall()
+            cursor.close()
+        finally:
+            conn.close()
+        return golden_index.rebuild(rows, encode_fn=embedding_model.encode)
+
+    try:
+        await asyncio.to_thread(load_and_rebuild)
+    except Exception as e:
+        logger.warning(f"⚠️ Golden standard index refresh failed: {e}")
+
 # =============================================================================
 # Endpoint 3: [POST] /api/v1/sessions/send (F-2.2)
 # =============================================================================
@@ -1066,6 +1978,19 @@ async def send_message(request: SendRequest):
     - Returns Fast Path response immediately (<2s)
     - Triggers Slow Path asynchronously
     - Handles TEMP-* ID conversion (K8)
+    - Notes of one session are processed in arrival order (session actor);
+      429 when too many notes of the session are already queued
+    """
+    try:
+        return await session_actors.run(request.session_id, lambda: handle_send_message(request))
+    except MailboxFull as e:
+        logger.warning(f"⚠ {e} - rejecting note")
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "2"})
+
+async def handle_send_message(request: SendRequest):
+    """
+    Body of /sessions/send - runs inside the session's actor, so history
+    reads and writes of consecutive notes never interleave
     """
     try:
         session_id = request.session_id
@@ -1087,23 +2012,16 @@ async def send_message(request: SendRequest):
         # Handle TEMP-* ID conversion
         if session_id.startswith("TEMP-"):
             # Create new permanent session
-            new_session_id = generate_session_id()
-
-            # If database available, persist session
             if db_conn is not None:
                 try:
-                    cursor = db_conn.cursor()
-                    cursor.execute(
-                        "INSERT INTO sessions (session_id, created_at) VALUES (%s, %s)",
-                        (new_session_id, datetime.now(timezone.utc))
-                    )
-                    db_conn.commit()
-                    cursor.close()
+                    new_session_id = create_session_record()
                     logger.info(f"✓ Converted {request.session_id} → {new_session_id} (saved to DB)")
                 except Exception as db_err:
+                    new_session_id = generate_session_id()
                     logger.warning(f"⚠️ Could not save session to database: {db_err}")
                     # Continue anyway - session ID conversion still succeeds
             else:
+                new_session_id = create_session_record()
                 logger.info(f"✓ Converted {request.session_id} → {new_session_id} (demo mode, no DB)")
 
             session_id = new_session_id
@@ -1121,6 +2039,7 @@ async def send_message(request: SendRequest):
                 )
                 db_conn.commit()
                 cursor.close()
+                read_router.note_write(session_id)
             except Exception as db_err:
                 logger.warning(f"⚠️ Could not save seller note to database: {db_err}")
                 # Continue anyway - Fast Path can still work
@@ -1134,112 +2053,51 @@ async def send_message(request: SendRequest):
             # No database - use only current message
             session_history = f"[{datetime.now(timezone.utc)}] Sprzedawca: {request.user_input}"
         
-        # === FAST PATH v2.0: Single Unified Prompt (JARVIS) ===
-
-        # Query RAG for context
-        rag_context = query_rag(request.user_input, language)
-        logger.info(f"📚 RAG context retrieved ({len(rag_context)} chars): {rag_context[:200]}...")
-
-        # Build unified prompt
-        prompt = build_prompt_1(language, session_history, request.user_input, rag_context)
-
-        # Call Gemini
-        try:
-            result = call_gemini_fast_path(prompt)
-
-            # Extract all fields from new JSON structure
-            suggested_response = result.get("suggested_response", "")
-            optional_followup = result.get("optional_followup")  # Can be null
-            seller_questions = result.get("seller_questions", [])
-            client_style = result.get("client_style", "spontaneous")
-            confidence_score = result.get("confidence_score", 0.5)
-            confidence_reason = result.get("confidence_reason", "")
-
-            # Legacy compatibility: put optional_followup in suggested_questions
-            suggested_questions = []
-            if optional_followup:
-                suggested_questions.append(optional_followup)
-
-            logger.info(f"✅ Fast Path complete - confidence: {confidence_score}, style: {client_style}")
-
-            # Prepare response data
-            fast_path_data = {
-                "session_id": session_id,  # W30: Return session_id for TEMP-* conversion
-                "journey_stage": current_journey_stage,  # Current journey stage
-                "suggested_response": suggested_response,
-                "suggested_questions": suggested_questions,  # Legacy field
-                "optional_followup": optional_followup,
-                "seller_questions": seller_questions,
-                "client_style": client_style,
-                "confidence_score": confidence_score,
-                "confidence_reason": confidence_reason,
-            }
-
-            # Save Fast Path responses to conversation_log (if database available)
-            if db_conn is not None:
-                try:
-                    cursor = db_conn.cursor()
-                    cursor.execute(
-                        """
-                        INSERT INTO conversation_log (session_id, timestamp, role, content, language)
-                        VALUES (%s, %s, %s, %s, %s)
-                        """,
-                        (session_id, datetime.now(timezone.utc), "FastPath",
-                         suggested_response, language)
-                    )
-                    # Save metadata as JSON
-                    metadata_json = json.dumps({
-                        "optional_followup": optional_followup,
-                        "seller_questions": seller_questions,
-                        "client_style": client_style,
-                        "confidence_score": confidence_score,
-                        "confidence_reason": confidence_reason
-                    })
-                    cursor.execute(
-                        """
-                        INSERT INTO conversation_log (session_id, timestamp, role, content, language)
-                        VALUES (%s, %s, %s, %s, %s)
-                        """,
-                        (session_id, datetime.now(timezone.utc), "FastPath-Metadata",
-                         metadata_json, language)
-                    )
-                    db_conn.commit()
-                    cursor.close()
-                except Exception as db_err:
-                    logger.warning(f"⚠️ Could not save Fast Path responses to database: {db_err}")
-                    # Continue anyway - responses are already in fast_path_data
-            
-        except Exception as e:
-            logger.error(f"✗ Fast Path failed: {e}")
-
-            # ENHANCED: Provide detailed error message based on exception type
-            error_message = "Fast Path temporarily unavailable. Please continue your note."
-
-            # Check if it's a rate limit error (429)
-            if "429" in str(e) or "Too Many Requests" in str(e):
-                error_message = "⚠️ Gemini API rate limit exceeded. Slow Path analysis will continue. Try again in a few minutes."
-            # Check if it's an authentication error (401)
-            elif "401" in str(e) or "Unauthorized" in str(e):
-                error_message = "⚠️ Gemini API authentication failed. Please check API key configuration."
-            # Check if it's a timeout
-            elif "timeout" in str(e).lower():
-                error_message = "⚠️ Gemini API timeout. Slow Path analysis will continue."
-
-            fast_path_data = {
-                "session_id": session_id,
-                "journey_stage": current_journey_stage,
-                "suggested_response": error_message,
-                "suggested_questions": [],
-                "optional_followup": None,
-                "seller_questions": [],
-                "client_style": "spontaneous",
-                "confidence_score": 0.0,
-                "confidence_reason": "Fast Path service unavailable"
-            }
+        # === GOLDEN STANDARD INSTANT ANSWER (no LLM call) ===
+        # The note embedding is computed once and reused by query_rag on a miss
+        note_vector: Optional[List[float]] = None
+        golden_match: Optional[GoldenMatch] = None
+        if embedding_model is not None and len(golden_index):
+            try:
+                note_vector = await embed_text(request.user_input)
+                golden_match = golden_index.match(note_vector, language)
+            except Exception as golden_err:
+                logger.warning(f"⚠️ Golden standard lookup failed: {golden_err}")
+
+        if golden_match is not None:
+            logger.info(f"🏆 Golden standard hit (gs_id={golden_match.gs_id}, score={golden_match.score:.3f}) - skipping Gemini")
+            fast_path_data = build_golden_fast_path_data(session_id, current_journey_stage, golden_match)
+            save_fast_path_response(session_id, language, fast_path_data)
+
+            if GOLDEN_STANDARD_BACKGROUND_LLM:
+                asyncio.create_task(run_fast_path_background(
+                    session_id, language, request.user_input, session_history, current_journey_stage, note_vector
+                ))
+        else:
+            # === FAST PATH v2.0: Single Unified Prompt (JARVIS) ===
+            try:
+                fast_path_data = await generate_fast_path_llm(
+                    session_id, language, request.user_input, session_history, current_journey_stage, note_vector
+                )
+                save_fast_path_response(session_id, language, fast_path_data)
+            except Exception as e:
+                logger.error(f"✗ Fast Path failed: {e}")
+                fast_path_data = build_fast_path_error_data(session_id, current_journey_stage, e)
         
         # === SLOW PATH: Trigger asynchronously (only if database available) ===
+        # Gated: notes that do not change the picture keep the current analysis
+        slow_path_gate = SlowPathGateDecision(False, "database_unavailable")
         if db_conn is not None:
-            asyncio.create_task(run_slow_path(session_id, language, request.journey_stage))
+            slow_path_gate = await asyncio.to_thread(
+                evaluate_slow_path_gate, db_conn, session_id,
+                embedding_model.encode if embedding_model is not None else None
+            )
+            if slow_path_gate.run:
+                asyncio.create_task(run_slow_path(session_id, language, request.journey_stage))
+            else:
+                logger.info(f"⏭ Slow Path skipped for {session_id} ({slow_path_gate.reason})")
+        fast_path_data["slow_path_queued"] = slow_path_gate.run
+        fast_path_data["slow_path_gate"] = slow_path_gate.as_dict()
         
         return GlobalAPIResponse(
             status="success",
@@ -1253,37 +2111,58 @@ async def send_message(request: SendRequest):
             message=str(e)
         )
 
+async def wait_for_websocket(session_id: str, max_wait: float = 10) -> bool:
+    """
+    Active check if the session's WebSocket connected (polls every 0.5s)
+    """
+    import time
+    wait_start = time.time()
+    while session_id not in websocket_connections:
+        if time.time() - wait_start > max_wait:
+            logger.warning(f"⚠️ WebSocket never connected for {session_id} after {max_wait}s")
+            break
+        await asyncio.sleep(0.5)
+
+    if session_id in websocket_connections:
+        logger.info(f"✅ WebSocket connected for {session_id}")
+        return True
+    logger.warning(f"⚠️ Proceeding without WebSocket for {session_id} - results will be DB-only")
+    return False
+
+async def send_slow_path_result(session_id: str, opus_magnum: Dict[str, Any], cached: bool = False) -> None:
+    """
+    Send a Slow Path result via WebSocket if connected
+    """
+    if session_id in websocket_connections:
+        try:
+            ws = websocket_connections[session_id]
+            await ws.send_json({
+                "type": "slow_path_complete",
+                "status": "Success",
+                "data": opus_magnum,
+                "message": "Analysis complete (cached)" if cached else "Analysis complete",
+                "cached": cached
+            })
+            logger.info(f"📡 Sent Slow Path results via WebSocket for {session_id}")
+        except Exception as ws_err:
+            logger.warning(f"⚠ WebSocket send failed for {session_id}: {ws_err}")
+    else:
+        logger.warning(f"⚠ No WebSocket connection for {session_id} - results saved to DB only")
+
 async def run_slow_path(session_id: str, language: str, journey_stage: str):
     """
     Asynchronous Slow Path AI analysis
     Runs DeepSeek 671B via Ollama Cloud
     Sends results via WebSocket
     ENHANCED: Comprehensive error handling to prevent server crashes
+    An unchanged history (same cache key) is answered from the stored
+    analysis without a model call; identical runs in flight are not repeated
     """
+    cache_key: Optional[str] = None
+    analyzed_log_id: Optional[int] = None
     try:
         logger.info(f"🧠 Starting Slow Path for {session_id}...")
 
-        # CRITICAL FIX: Wait for WebSocket to connect
-        # Give frontend time to establish WebSocket connection after receiving HTTP response
-        # Increased to 5.0s for maximum reliability
-        await asyncio.sleep(5.0)
-        logger.info(f"⏳ Waited 5s for WebSocket connection for {session_id}")
-
-        # Active check if WebSocket actually connected
-        import time
-        max_wait = 10  # seconds
-        wait_start = time.time()
-        while session_id not in websocket_connections:
-            if time.time() - wait_start > max_wait:
-                logger.warning(f"⚠️ WebSocket never connected for {session_id} after {max_wait}s")
-                break
-            await asyncio.sleep(0.5)
-
-        if session_id in websocket_connections:
-            logger.info(f"✅ WebSocket connected for {session_id}")
-        else:
-            logger.warning(f"⚠️ Proceeding without WebSocket for {session_id} - results will be DB-only")
-
         # Check if database is available
         if db_conn is None:
             error_msg = "PostgreSQL not available - Slow Path requires database connection"
@@ -1291,22 +2170,18 @@ async def run_slow_path(session_id: str, language: str, journey_stage: str):
             raise Exception(error_msg)
 
         # Get full session history from PostgreSQL (SUPER-BLUEPRINT Section 2.1)
+        # Through the session actor: notes queued before this run are written first
+        async def read_history():
+            with db_conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                return load_conversation(cursor, session_id)
+
         try:
-            cursor = db_conn.cursor(cursor_factory=RealDictCursor)
-            cursor.execute(
-                """
-                SELECT timestamp, role, content
-                FROM conversation_log
-                WHERE session_id = %s
-                ORDER BY timestamp ASC
-                """,
-                (session_id,)
-            )
-            history = cursor.fetchall()
-            cursor.close()
+            history = await session_actors.run(session_id, read_history, block=True)
         except Exception as db_err:
             logger.error(f"❌ Database query failed for {session_id}: {db_err}")
             raise Exception(f"Failed to fetch session history: {str(db_err)}")
+        # Gate watermark: notes after this row are new for the next trigger
+        analyzed_log_id = max((h["log_id"] for h in history if h.get("log_id") is not None), default=None)
 
         # Format history for prompt
         session_history = "\n".join([
@@ -1314,9 +2189,40 @@ async def run_slow_path(session_id: str, language: str, journey_stage: str):
             for h in history
         ])
 
-        # Get latest seller note for RAG context
-        latest_note = next((h['content'] for h in reversed(history) if h['role'] == "Sprzedawca"), "")
-        rag_context = query_rag(latest_note, language)
+        # === RESULT CACHE: same history, stage, language and prompt → stored analysis ===
+        # Stage as the prompt sees it (Polish and English names share an entry)
+        key = slow_path_cache_key(
+            session_history, STAGE_TO_EN.get(journey_stage, journey_stage), language,
+            f"{SLOW_PATH_PROMPT_VERSION}|{OLLAMA_MODEL}"
+        )
+
+        def read_cached(conn):
+            with conn.cursor() as cursor:
+                return load_cached_slow_path(cursor, session_id, key)
+
+        cached = await asyncio.to_thread(read_router.run, db_conn, read_cached, session_id=session_id)
+        if cached is not None:
+            logger.info(f"♻️ Slow Path cache hit for {session_id} (log_id={cached['log_id']}) - skipping model call")
+            await wait_for_websocket(session_id)
+            await send_slow_path_result(session_id, cached["json_output"], cached=True)
+            return
+        if key in slow_path_inflight:
+            logger.info(f"⏭ Identical Slow Path already running for {session_id} - it will deliver the result")
+            return
+        cache_key = key
+        slow_path_inflight.add(cache_key)
+
+        # CRITICAL FIX: Wait for WebSocket to connect
+        # Give frontend time to establish WebSocket connection after receiving HTTP response
+        # Increased to 5.0s for maximum reliability
+        await asyncio.sleep(5.0)
+        logger.info(f"⏳ Waited 5s for WebSocket connection for {session_id}")
+        await wait_for_websocket(session_id)
+
+        # Multi-query RAG over the most informative seller notes of the session
+        seller_notes = [h['content'] for h in history if h['role'] == "Sprzedawca"]
+        rag_queries = select_informative_notes(seller_notes, k=SLOW_PATH_RAG_QUERIES)
+        rag_context = await query_rag_multi(rag_queries, language)
 
         # Generate Gotham Strategic Context (Tesla-Gotham v4.0)
         try:
@@ -1427,18 +2333,18 @@ UŻYJ tych danych do wzmocnienia argumentacji TCO i pilności zakupu w analizie.
         if opus_magnum is None:
             raise Exception("Opus Magnum analysis failed - no valid response from any model")
         
-        # Save to slow_path_logs
+        # Save to slow_path_logs (+ analytics columns and daily rollups, one statement)
         try:
             cursor = db_conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO slow_path_logs (session_id, timestamp, json_output, status)
-                VALUES (%s, %s, %s, %s)
-                """,
-                (session_id, datetime.now(timezone.utc), json.dumps(opus_magnum), "Success")
+            # Fallback (Gemini) results are not reused - a retry tries the primary model again
+            record_slow_path_result(
+                cursor, session_id, datetime.now(timezone.utc), opus_magnum, "Success",
+                cache_key=None if opus_magnum.get("_fallback_used") else cache_key,
+                analyzed_log_id=analyzed_log_id
             )
             db_conn.commit()
             cursor.close()
+            read_router.note_write(session_id)
             logger.info(f"💾 Saved Slow Path results to database for {session_id}")
 
             # Update journey_stage if AI suggested a change
@@ -1463,20 +2369,7 @@ UŻYJ tych danych do wzmocnienia argumentacji TCO i pilności zakupu w analizie.
             # Continue anyway - WebSocket delivery is more important
         
         # Send via WebSocket if connected
-        if session_id in websocket_connections:
-            try:
-                ws = websocket_connections[session_id]
-                await ws.send_json({
-                    "type": "slow_path_complete",
-                    "status": "Success",
-                    "data": opus_magnum,
-                    "message": "Analysis complete"
-                })
-                logger.info(f"📡 Sent Slow Path results via WebSocket for {session_id}")
-            except Exception as ws_err:
-                logger.warning(f"⚠ WebSocket send failed for {session_id}: {ws_err}")
-        else:
-            logger.warning(f"⚠ No WebSocket connection for {session_id} - results saved to DB only")
+        await send_slow_path_result(session_id, opus_magnum)
         
         logger.info(f"✓ Slow Path complete for {session_id}")
         
@@ -1488,16 +2381,14 @@ UŻYJ tych danych do wzmocnienia argumentacji TCO i pilności zakupu w analizie.
         try:
             if db_conn is not None:
                 cursor = db_conn.cursor()
-                cursor.execute(
-                    """
-                    INSERT INTO slow_path_logs (session_id, timestamp, json_output, status)
-                    VALUES (%s, %s, %s, %s)
-                    """,
-                    (session_id, datetime.now(timezone.utc), 
-                     json.dumps({"error": str(e), "error_type": type(e).__name__}), "Error")
+                record_slow_path_result(
+                    cursor, session_id, datetime.now(timezone.utc),
+                    {"error": str(e), "error_type": type(e).__name__}, "Error",
+                    analyzed_log_id=analyzed_log_id
                 )
                 db_conn.commit()
                 cursor.close()
+                read_router.note_write(session_id)
                 logger.info(f"💾 Saved error to database for {session_id}")
         except Exception as db_err:
             logger.error(f"⚠ Could not save error to database for {session_id}: {db_err}")
@@ -1518,6 +2409,9 @@ UŻYJ tych danych do wzmocnienia argumentacji TCO i pilności zakupu w analizie.
         
         # IMPORTANT: Do NOT re-raise - this would crash the async task and potentially the server
         logger.info(f"🛡️ Slow Path error handled gracefully for {session_id} - server remains stable")
+    finally:
+        if cache_key is not None:
+            slow_path_inflight.discard(cache_key)
 
 # =============================================================================
 # Endpoint 4: [POST] /api/v1/sessions/refine (F-2.3)
@@ -1560,6 +2454,7 @@ async def refine_suggestion(request: RefineRequest):
         )
         db_conn.commit()
         cursor.close()
+        feedback_cluster_wakeup.set()
         
         logger.info(f"✓ Refined suggestion for {request.session_id}")
         
@@ -1594,29 +2489,36 @@ async def retry_slow_path(request: RetrySlowPathRequest):
     try:
         # Get last journey stage from conversation_log (W9)
         cursor = db_conn.cursor()
-        cursor.execute(
-            """
-            SELECT language FROM conversation_log
-            WHERE session_id = %s
-            ORDER BY timestamp DESC
-            LIMIT 1
-            """,
-            (request.session_id,)
-        )
-        row = cursor.fetchone()
+        language = load_session_language(cursor, request.session_id, latest=True)
+        journey_stage = request.journey_stage
+        if language and not journey_stage:
+            cursor.execute("SELECT journey_stage FROM sessions WHERE session_id = %s", (request.session_id,))
+            row = cursor.fetchone()
+            journey_stage = row[0] if row and row[0] else "Discovery"
         cursor.close()
         
-        if not row:
+        if not language:
             raise HTTPException(status_code=404, detail="Session not found")
         
-        language = row[0]
+        if not request.force:
+            slow_path_gate = await asyncio.to_thread(
+                evaluate_slow_path_gate, db_conn, request.session_id,
+                embedding_model.encode if embedding_model is not None else None
+            )
+            if not slow_path_gate.run:
+                return GlobalAPIResponse(
+                    status="success",
+                    data={"message": "Slow path is up to date", "slow_path_queued": False,
+                          "slow_path_gate": slow_path_gate.as_dict()}
+                )
         
-        # Trigger Slow Path
-        asyncio.create_task(run_slow_path(request.session_id, language, "Discovery"))
+        # Trigger Slow Path (forced retries bypass the trigger gate; an
+        # unchanged history is answered from the result cache)
+        asyncio.create_task(run_slow_path(request.session_id, language, journey_stage))
         
         return GlobalAPIResponse(
             status="success",
-            data={"message": "Slow path retry triggered"}
+            data={"message": "Slow path retry triggered", "slow_path_queued": True}
         )
         
     except HTTPException:
@@ -1646,17 +2548,20 @@ async def end_session(request: EndSessionRequest):
         )
     
     try:
-        cursor = db_conn.cursor()
-        cursor.execute(
-            """
-            UPDATE sessions
-            SET ended_at = %s, status = %s
-            WHERE session_id = %s
-            """,
-            (datetime.now(timezone.utc), request.final_status, request.session_id)
-        )
-        db_conn.commit()
-        cursor.close()
+        # Also moves the session's analyses into the outcome rollups (charts 2 + 3);
+        # own transaction - the session row lock spans two statements
+        conn = get_transaction_db_connection()
+        if conn is None:
+            raise RuntimeError("Database unavailable")
+        try:
+            with conn.cursor() as cursor:
+                end_session_with_rollup(cursor, request.session_id, request.final_status, datetime.now(timezone.utc))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
         
         logger.info(f"✓ Ended session {request.session_id} with status: {request.final_status}")
         
@@ -1696,12 +2601,7 @@ async def submit_feedback(request: FeedbackRequest):
         
         # Get language from session
         cursor = db_conn.cursor()
-        cursor.execute(
-            "SELECT language FROM conversation_log WHERE session_id = %s LIMIT 1",
-            (request.session_id,)
-        )
-        result = cursor.fetchone()
-        language = result[0] if result else "pl"
+        language = load_session_language(cursor, request.session_id) or "pl"
         
         # Insert feedback into database
         cursor.execute(
@@ -1717,6 +2617,8 @@ async def submit_feedback(request: FeedbackRequest):
         )
         db_conn.commit()
         cursor.close()
+        if feedback_type == "down":
+            feedback_cluster_wakeup.set()
         
         logger.info(f"✓ Feedback submitted for session {request.session_id}: {feedback_type}")
         
@@ -1737,43 +2639,32 @@ async def submit_feedback(request: FeedbackRequest):
 # =============================================================================
 
 @app.get("/api/v1/admin/feedback/grouped", dependencies=[Depends(verify_admin_key)])
-async def get_feedback_grouped(language: str = Query("pl")):
+async def get_feedback_grouped(
+    language: str = Query("pl"),
+    min_size: int = Query(1, ge=1),
+    limit: int = Query(50, ge=1, le=500),
+    refresh: bool = Query(False, description="Cluster pending notes before answering")
+):
     """
     Get AI-grouped feedback themes
-    Uses Prompt 5 for intelligent grouping
+    Reads the materialized clusters (no LLM call on the request path);
+    the background worker clusters new notes and names them with Prompt 5
     """
     try:
         language = normalize_language(language)
         
-        # Get all feedback notes for language
-        cursor = db_conn.cursor()
-        cursor.execute(
-            """
-            SELECT feedback_note
-            FROM feedback_logs
-            WHERE language = %s AND feedback_type = 'down'
-            ORDER BY created_at DESC
-            """,
-            (language,)
-        )
-        notes = [row[0] for row in cursor.fetchall()]
-        cursor.close()
-        
-        if not notes:
-            return GlobalAPIResponse(
-                status="success",
-                data={"groups": []}
-            )
-        
-        # Build Prompt 5
-        prompt5 = build_prompt_5_feedback_grouping(language, notes)
-        
-        # Call Gemini
-        result = call_gemini_fast_path(prompt5)
+        if refresh:
+            await asyncio.to_thread(refresh_feedback_clusters, language)
+            # Just written on the primary - do not read a lagging replica
+            groups = await asyncio.to_thread(load_feedback_groups, db_conn, language, min_size, limit)
+            pending = await asyncio.to_thread(pending_feedback_count, db_conn, language)
+        else:
+            groups = await asyncio.to_thread(read_router.run, db_conn, load_feedback_groups, language, min_size, limit)
+            pending = await asyncio.to_thread(read_router.run, db_conn, pending_feedback_count, language)
         
         return GlobalAPIResponse(
             status="success",
-            data=result
+            data={"groups": groups, "pending": pending}
         )
         
     except Exception as e:
@@ -1788,29 +2679,30 @@ async def get_feedback_grouped(language: str = Query("pl")):
 # =============================================================================
 
 @app.get("/api/v1/admin/feedback/details", dependencies=[Depends(verify_admin_key)])
-async def get_feedback_details(note: str = Query(...), language: str = Query("pl")):
+async def get_feedback_details(
+    note: str = Query(...),
+    language: str = Query("pl"),
+    feedback_type: Optional[str] = Query(None, pattern="^(up|down)$"),
+    sort: str = Query("recent", description=f"One of {', '.join(FEEDBACK_SEARCH_SORTS)}"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    with_total: bool = Query(True, description="Compute the total (skip when paging further)")
+):
     """
     Get detailed feedback entries for a specific theme
+    Trigram-indexed substring / fuzzy search, ranked (score), one keyset page
+    at a time; `total` is exact for small result sets, an estimate otherwise
     """
     try:
         language = normalize_language(language)
         
-        cursor = db_conn.cursor(cursor_factory=RealDictCursor)
-        cursor.execute(
-            """
-            SELECT feedback_id, original_input, bad_suggestion, feedback_note
-            FROM feedback_logs
-            WHERE feedback_note ILIKE %s AND language = %s
-            ORDER BY created_at DESC
-            """,
-            (f"%{note}%", language)
+        page = await asyncio.to_thread(
+            read_router.run, db_conn, search_feedback, note, language, feedback_type, sort, limit, cursor, with_total
         )
-        details = cursor.fetchall()
-        cursor.close()
         
         return GlobalAPIResponse(
             status="success",
-            data={"details": details}
+            data=page
         )
         
     except Exception as e:
@@ -1828,7 +2720,8 @@ async def get_feedback_details(note: str = Query(...), language: str = Query("pl
 async def create_golden_standard(request: CreateStandardRequest):
     """
     Create Golden Standard from feedback
-    Saves to both PostgreSQL and Qdrant (transactionally, W28)
+    Saves to PostgreSQL and queues the Qdrant upsert in the SAME transaction
+    (W28) - the outbox worker embeds and writes the point in the background
     """
     try:
         language = normalize_language(request.language)
@@ -1837,7 +2730,10 @@ async def create_golden_standard(request: CreateStandardRequest):
         trigger_context = ' '.join(request.trigger_context.split())
         
         # Start transaction
-        cursor = db_conn.cursor()
+        conn = get_transaction_db_connection()
+        if conn is None:
+            raise RuntimeError("Database unavailable")
+        cursor = conn.cursor()
         
         try:
             # Insert into PostgreSQL
@@ -1852,53 +2748,44 @@ async def create_golden_standard(request: CreateStandardRequest):
                  language, datetime.now(timezone.utc))
             )
             
-            # Check if embedding model is loaded
-            if embedding_model is None:
-                raise ValueError("Embedding model not loaded")
-            
-            # Generate embedding and insert into Qdrant
-            embedding_result = embedding_model.encode(request.golden_response)
-            # Convert to list of floats - handle both numpy arrays and tensors
-            vector: List[float] = embedding_result.tolist() if hasattr(embedding_result, 'tolist') else list(embedding_result)  # type: ignore[union-attr]
-            
-            point_id = f"GS-{int(datetime.now(timezone.utc).timestamp())}"
-            
-            qdrant_client.upsert(
-                collection_name=QDRANT_COLLECTION_NAME,
-                points=[
-                    models.PointStruct(
-                        id=point_id,
-                        vector=vector,
-                        payload={
-                            "title": f"Golden Standard: {request.category}",
-                            "content": request.golden_response,
-                            "keywords": request.category.lower(),
-                            "language": language,
-                            "type": "golden_standard",
-                            "tags": ["golden_standard", request.category],
-                            "trigger_context": trigger_context
-                        }
-                    )
-                ],
-                wait=True
+            # Queue the Qdrant point (deterministic id - retries overwrite, never duplicate)
+            point_id = golden_standard_point_id(trigger_context, language)
+            outbox_id = enqueue_upsert(
+                cursor,
+                point_id,
+                request.golden_response,
+                {
+                    "title": f"Golden Standard: {request.category}",
+                    "content": request.golden_response,
+                    "keywords": request.category.lower(),
+                    "language": language,
+                    "type": "golden_standard",
+                    "tags": ["golden_standard", request.category],
+                    "trigger_context": trigger_context
+                }
             )
             
             # Commit PostgreSQL transaction
-            db_conn.commit()
-            cursor.close()
-            
-            logger.info(f"✓ Created Golden Standard: {request.category}")
-            
-            return GlobalAPIResponse(
-                status="success",
-                data={"message": "Golden standard created"}
-            )
+            conn.commit()
             
         except Exception as e:
             # Rollback on error (W28)
-            db_conn.rollback()
-            cursor.close()
+            conn.rollback()
             raise e
+        finally:
+            cursor.close()
+            conn.close()
+            
+        logger.info(f"✓ Created Golden Standard: {request.category} (outbox #{outbox_id})")
+
+        # Refresh instant-answer triggers and wake the outbox worker
+        asyncio.create_task(refresh_golden_index())
+        rag_outbox_wakeup.set()
+        
+        return GlobalAPIResponse(
+            status="success",
+            data={"message": "Golden standard created", "point_id": point_id, "outbox_id": outbox_id}
+        )
             
     except Exception as e:
         logger.error(f"✗ Create Golden Standard failed: {e}")
@@ -1912,68 +2799,42 @@ async def create_golden_standard(request: CreateStandardRequest):
 # =============================================================================
 
 @app.get("/api/v1/admin/golden-standards/list", dependencies=[Depends(verify_admin_key)])
-async def list_golden_standards(language: str = Query("pl")):
+async def list_golden_standards(
+    language: str = Query("pl"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(100, ge=1, le=500),
+    search: Optional[str] = Query(None, description="Substring of trigger_context / golden_response"),
+    category: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None, description=f"Comma separated subset of: {', '.join(GOLDEN_LIST_FIELDS)}")
+):
     """
-    List all Golden Standards from PostgreSQL
-    Returns paginated list of golden standards with their metadata
+    List Golden Standards from PostgreSQL, newest first
+    Keyset-paginated (cursor), filtered server-side (search / category),
+    projected (e.g. fields=trigger_context,category for list views)
     """
-    conn = None
     try:
         language = normalize_language(language)
+        selected = parse_list_fields(fields, GOLDEN_LIST_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-        # Get fresh connection using helper
-        conn = get_fresh_db_connection()
-        if not conn:
+    try:
+        if db_conn is None:
             raise Exception("Could not establish database connection")
 
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        cursor.execute(
-            """
-            SELECT
-                gs_id,
-                trigger_context,
-                golden_response,
-                tags,
-                category,
-                language,
-                created_at
-            FROM golden_standards
-            WHERE language = %s
-            ORDER BY created_at DESC
-            """,
-            (language,)
+        page = await asyncio.to_thread(
+            read_router.run, db_conn, list_golden_standards_page, language, cursor, limit, search, category, selected
         )
-        standards = cursor.fetchall()
-        cursor.close()
-        conn.close()
-
-        # Format response
-        formatted_standards = []
-        for std in standards:
-            formatted_standards.append({
-                "id": std["gs_id"],
-                "trigger_context": std["trigger_context"],
-                "golden_response": std["golden_response"],
-                "tags": std["tags"] if std["tags"] else [],
-                "category": std["category"],
-                "language": std["language"],
-                "created_at": std["created_at"].isoformat() if std["created_at"] else None
-            })
 
-        logger.info(f"✓ Listed {len(formatted_standards)} golden standards for language: {language}")
+        logger.info(f"✓ Listed {len(page['standards'])} golden standards for language: {language}")
 
         return GlobalAPIResponse(
             status="success",
-            data={
-                "standards": formatted_standards,
-                "total": len(formatted_standards)
-            }
+            data=page
         )
 
     except Exception as e:
         logger.error(f"✗ List golden standards failed: {e}")
-        if conn:
-            conn.close()
         return GlobalAPIResponse(
             status="error",
             message=str(e)
@@ -1984,45 +2845,34 @@ async def list_golden_standards(language: str = Query("pl")):
 # =============================================================================
 
 @app.get("/api/v1/admin/rag/list", dependencies=[Depends(verify_admin_key)])
-async def list_rag_nuggets(language: str = Query("pl")):
+async def list_rag_nuggets(
+    language: str = Query("pl"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(100, ge=1, le=500),
+    search: Optional[str] = Query(None, description="Words in the title / keywords"),
+    type: Optional[str] = Query(None, description="Nugget type"),
+    fields: Optional[str] = Query(None, description=f"Comma separated subset of: {', '.join(RAG_LIST_FIELDS)}")
+):
     """
-    List all RAG nuggets for a language
+    List RAG nuggets for a language
+    Paginated with the Qdrant scroll offset (cursor) - nothing is silently
+    truncated; search / type filtered server-side, payload projected
+    (e.g. fields=title,type for list views)
     """
     try:
         language = normalize_language(language)
-        
-        # Scroll through Qdrant collection
-        points, _ = qdrant_client.scroll(
-            collection_name=QDRANT_COLLECTION_NAME,
-            scroll_filter=models.Filter(
-                must=[
-                    models.FieldCondition(
-                        key="language",
-                        match=models.MatchValue(value=language)
-                    )
-                ]
-            ),
-            limit=1000,
-            with_payload=True,
-            with_vectors=False
+        selected = parse_list_fields(fields, RAG_LIST_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        page = await list_rag_nuggets_page(
+            qdrant_client, QDRANT_COLLECTION_ALIAS, language, cursor, limit, search, type, selected
         )
         
-        nuggets = [
-            {
-                "nugget_id": str(point.id),
-                "title": point.payload.get("title", ""),
-                "content": point.payload.get("content", ""),
-                "keywords": point.payload.get("keywords", ""),
-                "language": point.payload.get("language", "pl"),
-                "type": point.payload.get("type", "unknown"),
-                "tags": point.payload.get("tags", [])
-            }
-            for point in points
-        ]
-        
         return GlobalAPIResponse(
             status="success",
-            data={"nuggets": nuggets}
+            data=page
         )
         
     except Exception as e:
@@ -2039,31 +2889,24 @@ async def list_rag_nuggets(language: str = Query("pl")):
 @app.post("/api/v1/admin/rag/add", dependencies=[Depends(verify_admin_key)])
 async def add_rag_nugget(request: AddRAGRequest):
     """
-    Add new RAG nugget to Qdrant
+    Add new RAG nugget to Qdrant (queued through the RAG outbox)
     """
     try:
         language = normalize_language(request.language)
         
-        # Check if embedding model is loaded
-        if embedding_model is None:
-            raise ValueError("Embedding model not loaded")
-        
-        # Generate embedding
-        embedding_result = embedding_model.encode(request.content)
-        # Convert to list of floats - handle both numpy arrays and tensors
-        vector: List[float] = embedding_result.tolist() if hasattr(embedding_result, 'tolist') else list(embedding_result)  # type: ignore[union-attr]
-        
-        # Generate unique ID
-        point_id = f"CUSTOM-{int(datetime.now(timezone.utc).timestamp())}"
-        
-        # Insert into Qdrant
-        qdrant_client.upsert(
-            collection_name=QDRANT_COLLECTION_NAME,
-            points=[
-                models.PointStruct(
-                    id=point_id,
-                    vector=vector,
-                    payload={
+        # Content-addressed ID - re-submitting the same nugget overwrites it
+        point_id = nugget_point_id(request.title, request.content, language)
+        
+        conn = get_transaction_db_connection()
+        if conn is None:
+            raise RuntimeError("Database unavailable")
+        try:
+            with conn.cursor() as cursor:
+                outbox_id = enqueue_upsert(
+                    cursor,
+                    point_id,
+                    request.content,
+                    {
                         "title": request.title,
                         "content": request.content,
                         "keywords": request.keywords,  # (W24) CSV string
@@ -2072,15 +2915,16 @@ async def add_rag_nugget(request: AddRAGRequest):
                         "tags": request.keywords.split(",")
                     }
                 )
-            ],
-            wait=True
-        )
+            conn.commit()
+        finally:
+            conn.close()
         
-        logger.info(f"✓ Added RAG nugget: {request.title}")
+        logger.info(f"✓ Queued RAG nugget: {request.title} (outbox #{outbox_id})")
+        rag_outbox_wakeup.set()
         
         return GlobalAPIResponse(
             status="success",
-            data={"message": "Nugget added"}
+            data={"message": "Nugget added", "point_id": point_id, "outbox_id": outbox_id}
         )
         
     except Exception as e:
@@ -2099,16 +2943,21 @@ async def delete_rag_nugget(nugget_id: str):
     """
     Delete RAG nugget from Qdrant only
     Does not touch golden_standards table (T11)
+    Queued through the RAG outbox so it stays ordered after pending upserts
     """
     try:
-        qdrant_client.delete(
-            collection_name=QDRANT_COLLECTION_NAME,
-            points_selector=models.PointIdsList(
-                points=[nugget_id]
-            )
-        )
+        conn = get_transaction_db_connection()
+        if conn is None:
+            raise RuntimeError("Database unavailable")
+        try:
+            with conn.cursor() as cursor:
+                enqueue_delete(cursor, nugget_id)
+            conn.commit()
+        finally:
+            conn.close()
         
-        logger.info(f"✓ Deleted RAG nugget: {nugget_id}")
+        logger.info(f"✓ Queued RAG nugget deletion: {nugget_id}")
+        rag_outbox_wakeup.set()
         
         return GlobalAPIResponse(
             status="success",
@@ -2122,6 +2971,118 @@ async def delete_rag_nugget(nugget_id: str):
             message=str(e)
         )
 
+# =============================================================================
+# Bulk Import Helpers (shared by the JSON-body and streaming imports)
+# =============================================================================
+
+BULK_IMPORT_CHUNK_SIZE = 500  # Items per transaction (streaming imports commit per chunk)
+
+def import_rag_nugget_item(cursor, nugget: Dict[str, Any], language: str) -> str:
+    """Validate one nugget and queue it in the RAG outbox; returns the point id"""
+    if not isinstance(nugget, dict) or "title" not in nugget or "content" not in nugget:
+        raise ValueError("Missing title or content")
+
+    # Content-addressed point id (re-importing a file does not duplicate nuggets)
+    point_id = nugget_point_id(nugget["title"], nugget["content"], language)
+    payload = {
+        "title": nugget["title"],
+        "content": nugget["content"],
+        "type": nugget.get("type", "general"),
+        "tags": nugget.get("tags", []),
+        "language": language,
+        "keywords": nugget.get("keywords", ""),
+        "archetype_filter": nugget.get("archetype_filter", []),
+        "created_at": datetime.now(timezone.utc).isoformat()
+    }
+    enqueue_upsert(cursor, point_id, f"{nugget['title']} {nugget['content']}", payload)
+    return point_id
+
+def import_golden_standard_item(cursor, standard: Dict[str, Any], language: str) -> str:
+    """Insert one golden standard and queue its Qdrant point; returns the point id"""
+    if not isinstance(standard, dict) or "trigger_context" not in standard or "golden_response" not in standard:
+        raise ValueError("Missing trigger_context or golden_response")
+
+    cursor.execute(
+        """
+        INSERT INTO golden_standards
+        (trigger_context, golden_response, tags, language, created_at)
+        VALUES (%s, %s, %s, %s, %s)
+        """,
+        (
+            standard["trigger_context"],
+            standard["golden_response"],
+            standard.get("tags", []),
+            language,
+            datetime.now(timezone.utc)
+        )
+    )
+
+    # Queue the Qdrant point (embedded in batches by the outbox worker)
+    point_id = golden_standard_point_id(standard["trigger_context"], language)
+    enqueue_upsert(
+        cursor,
+        point_id,
+        f"{standard['trigger_context']} {standard['golden_response']}",
+        {
+            "title": f"Golden Standard: {standard['trigger_context'][:50]}...",
+            "content": standard["golden_response"],
+            "type": "golden_standard",
+            "tags": standard.get("tags", []),
+            "language": language,
+            "trigger_context": standard["trigger_context"],
+            "created_at": datetime.now(timezone.utc).isoformat()
+        }
+    )
+    return point_id
+
+BULK_IMPORT_HANDLERS = {
+    "rag": import_rag_nugget_item,
+    "golden_standards": import_golden_standard_item,
+}
+
+def run_bulk_import(
+    job: ImportJob,
+    items: Iterable[Tuple[int, Any]],
+    on_chunk: Optional[Callable[[ImportJob], None]] = None,
+    chunk_size: int = BULK_IMPORT_CHUNK_SIZE
+) -> ImportJob:
+    """
+    Write (position, item) pairs for job.kind, one transaction per chunk
+    A failed item is rolled back to its savepoint and counted - it never
+    aborts the chunk. Blocking: run it in a worker thread.
+    """
+    handler = BULK_IMPORT_HANDLERS[job.kind]
+    conn = get_transaction_db_connection()
+    if conn is None:
+        raise RuntimeError("Database unavailable")
+
+    try:
+        cursor = conn.cursor()
+        for position, item in items:
+            job.processed += 1
+            if isinstance(item, Exception):
+                job.add_error(f"Item {position}: {item}")
+            else:
+                cursor.execute("SAVEPOINT bulk_item")
+                try:
+                    handler(cursor, item, job.language)
+                    cursor.execute("RELEASE SAVEPOINT bulk_item")
+                    job.success_count += 1
+                except Exception as e:
+                    cursor.execute("ROLLBACK TO SAVEPOINT bulk_item")
+                    job.add_error(f"Item {position}: {str(e)}")
+
+            if job.processed % chunk_size == 0:
+                conn.commit()
+                if on_chunk:
+                    on_chunk(job)
+
+        conn.commit()
+        cursor.close()
+    finally:
+        conn.close()
+    return job
+
 # =============================================================================
 # Endpoint 12.5: [POST] /api/v1/admin/rag/bulk-import (Bulk Import RAG Nuggets)
 # =============================================================================
@@ -2135,71 +3096,23 @@ async def bulk_import_rag_nuggets(request: BulkRagImportRequest):
     """
     Bulk import RAG nuggets from JSON array
     Expected format: [{"title": "...", "content": "...", "type": "...", ...}, ...]
+    Queued through the RAG outbox - embeddings and Qdrant upserts run in batches
+    (large files: use /api/v1/admin/rag/bulk-import/stream)
     """
     try:
-        language = normalize_language(request.language)
-
-        # Validate and prepare points for Qdrant
-        points_to_upsert = []
-        success_count = 0
-        error_count = 0
-        errors = []
-
-        for idx, nugget in enumerate(request.nuggets):
-            try:
-                # Validate required fields
-                if "title" not in nugget or "content" not in nugget:
-                    errors.append(f"Item {idx+1}: Missing title or content")
-                    error_count += 1
-                    continue
-
-                # Generate embedding for content using SentenceTransformer
-                content_to_embed = f"{nugget['title']} {nugget['content']}"
-                if embedding_model is None:
-                    raise Exception("Embedding model not available")
-                embedding = embedding_model.encode(content_to_embed).tolist()
-
-                # Create point
-                point_id = str(uuid.uuid4())
-                payload = {
-                    "title": nugget["title"],
-                    "content": nugget["content"],
-                    "type": nugget.get("type", "general"),
-                    "tags": nugget.get("tags", []),
-                    "language": language,
-                    "keywords": nugget.get("keywords", ""),
-                    "archetype_filter": nugget.get("archetype_filter", []),
-                    "created_at": datetime.now(timezone.utc).isoformat()
-                }
-
-                points_to_upsert.append(
-                    models.PointStruct(
-                        id=point_id,
-                        vector=embedding,
-                        payload=payload
-                    )
-                )
-                success_count += 1
-
-            except Exception as e:
-                errors.append(f"Item {idx+1}: {str(e)}")
-                error_count += 1
-
-        # Upsert all valid points to Qdrant
-        if points_to_upsert:
-            qdrant_client.upsert(
-                collection_name=QDRANT_COLLECTION_NAME,
-                points=points_to_upsert
-            )
+        job = ImportJob(job_id="inline", kind="rag", language=normalize_language(request.language), source_name="request")
+        await asyncio.to_thread(run_bulk_import, job, enumerate(request.nuggets, start=1))
+        if job.success_count:
+            rag_outbox_wakeup.set()
 
-        logger.info(f"✓ Bulk import completed: {success_count} success, {error_count} errors")
+        logger.info(f"✓ Bulk import completed: {job.success_count} success, {job.error_count} errors")
 
         return GlobalAPIResponse(
-            status="success" if error_count == 0 else "partial",
+            status="success" if job.error_count == 0 else "partial",
             data={
-                "success_count": success_count,
-                "error_count": error_count,
-                "errors": errors[:10]  # Return first 10 errors
+                "success_count": job.success_count,
+                "error_count": job.error_count,
+                "errors": job.errors[:10]  # Return first 10 errors
             }
         )
 
@@ -2223,96 +3136,146 @@ async def bulk_import_golden_standards(request: BulkGoldenStandardRequest):
     """
     Bulk import golden standards from JSON array
     Expected format: [{"trigger_context": "...", "golden_response": "...", "tags": []}, ...]
+    Rows and their RAG outbox entries commit in one transaction (per-item savepoints)
+    (large files: use /api/v1/admin/golden-standards/bulk-import/stream)
     """
     try:
-        language = normalize_language(request.language)
-        cursor = db_conn.cursor()
-
-        success_count = 0
-        error_count = 0
-        errors = []
-
-        for idx, standard in enumerate(request.standards):
-            try:
-                # Validate required fields
-                if "trigger_context" not in standard or "golden_response" not in standard:
-                    errors.append(f"Item {idx+1}: Missing trigger_context or golden_response")
-                    error_count += 1
-                    continue
-
-                # Insert into database
-                cursor.execute(
-                    """
-                    INSERT INTO golden_standards
-                    (trigger_context, golden_response, tags, language, created_at)
-                    VALUES (%s, %s, %s, %s, %s)
-                    """,
-                    (
-                        standard["trigger_context"],
-                        standard["golden_response"],
-                        standard.get("tags", []),
-                        language,
-                        datetime.now(timezone.utc)
-                    )
-                )
-
-                # Generate embedding and add to Qdrant using SentenceTransformer
-                embedding_content = f"{standard['trigger_context']} {standard['golden_response']}"
-                if embedding_model is None:
-                    raise Exception("Embedding model not available")
-                embedding = embedding_model.encode(embedding_content).tolist()
-
-                point_id = str(uuid.uuid4())
-                qdrant_client.upsert(
-                    collection_name=QDRANT_COLLECTION_NAME,
-                    points=[
-                        models.PointStruct(
-                            id=point_id,
-                            vector=embedding,
-                            payload={
-                                "title": f"Golden Standard: {standard['trigger_context'][:50]}...",
-                                "content": standard["golden_response"],
-                                "type": "golden_standard",
-                                "tags": standard.get("tags", []),
-                                "language": language,
-                                "trigger_context": standard["trigger_context"],
-                                "created_at": datetime.now(timezone.utc).isoformat()
-                            }
-                        )
-                    ]
-                )
-
-                success_count += 1
+        job = ImportJob(job_id="inline", kind="golden_standards", language=normalize_language(request.language), source_name="request")
+        await asyncio.to_thread(run_bulk_import, job, enumerate(request.standards, start=1), None, len(request.standards) + 1)
 
-            except Exception as e:
-                errors.append(f"Item {idx+1}: {str(e)}")
-                error_count += 1
-
-        # Commit all database changes
-        db_conn.commit()
-        cursor.close()
+        # Refresh instant-answer triggers and wake the outbox worker
+        if job.success_count:
+            asyncio.create_task(refresh_golden_index())
+            rag_outbox_wakeup.set()
 
-        logger.info(f"✓ Bulk golden standard import completed: {success_count} success, {error_count} errors")
+        logger.info(f"✓ Bulk golden standard import completed: {job.success_count} success, {job.error_count} errors")
 
         return GlobalAPIResponse(
-            status="success" if error_count == 0 else "partial",
+            status="success" if job.error_count == 0 else "partial",
             data={
-                "success_count": success_count,
-                "error_count": error_count,
-                "errors": errors[:10]  # Return first 10 errors
+                "success_count": job.success_count,
+                "error_count": job.error_count,
+                "errors": job.errors[:10]  # Return first 10 errors
             }
         )
 
     except Exception as e:
         logger.error(f"✗ Bulk golden standard import failed: {e}")
-        if 'cursor' in locals():
-            db_conn.rollback()
-            cursor.close()
         return GlobalAPIResponse(
             status="error",
             message=str(e)
         )
 
+# =============================================================================
+# Endpoint 12.7: [POST] /api/v1/admin/{rag|golden-standards}/bulk-import/stream
+# =============================================================================
+
+async def spool_upload(request: Request) -> Tuple[str, str]:
+    """
+    Stream an NDJSON body or a multipart `file` field to a temp file
+    Returns (path, source name) - the upload is never held in memory
+    """
+    content_type = request.headers.get("content-type", "")
+    spool = tempfile.NamedTemporaryFile(prefix="ultra_import_", suffix=".ndjson", delete=False)
+    source_name = "request.ndjson"
+    try:
+        if content_type.startswith("multipart/form-data"):
+            form = await request.form()
+            upload = form.get("file")
+            if upload is None or isinstance(upload, str):
+                raise HTTPException(status_code=400, detail="Multipart upload needs a 'file' field")
+            source_name = upload.filename or "upload"
+            while chunk := await upload.read(1024 * 1024):
+                spool.write(chunk)
+        else:
+            async for chunk in request.stream():
+                spool.write(chunk)
+    except Exception:
+        spool.close()
+        os.remove(spool.name)
+        raise
+    spool.close()
+    return spool.name, source_name
+
+async def run_import_job(job: ImportJob, path: str):
+    """Background import job - progress goes to the job table and the admin WebSocket"""
+    loop = asyncio.get_running_loop()
+
+    def on_chunk(current: ImportJob):
+        loop.call_soon_threadsafe(rag_outbox_wakeup.set)  # Let the outbox worker start embedding
+        import_jobs.publish_threadsafe(current, loop)
+
+    job.status = "running"
+    job.started_at = datetime.now(timezone.utc).isoformat()
+    await import_jobs.publish(job)
+    try:
+        await asyncio.to_thread(run_bulk_import, job, iter_upload_items(path), on_chunk)
+        job.status = "completed"
+        logger.info(f"✓ Import job {job.job_id} completed: {job.success_count} success, {job.error_count} errors")
+    except Exception as e:
+        job.status = "failed"
+        job.message = str(e)
+        logger.error(f"✗ Import job {job.job_id} failed: {e}")
+    finally:
+        job.finished_at = datetime.now(timezone.utc).isoformat()
+        os.remove(path)
+        if job.success_count:
+            rag_outbox_wakeup.set()
+            if job.kind == "golden_standards":
+                asyncio.create_task(refresh_golden_index())
+        await import_jobs.publish(job)
+
+async def start_streaming_import(request: Request, kind: str, language: str) -> GlobalAPIResponse:
+    try:
+        path, source_name = await spool_upload(request)
+        job = import_jobs.create(kind, normalize_language(language), source_name)
+        asyncio.create_task(run_import_job(job, path))
+        logger.info(f"📥 Import job {job.job_id} queued ({kind}, {source_name})")
+        return GlobalAPIResponse(status="success", data=job.to_dict())
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"✗ Streaming import upload failed: {e}")
+        return GlobalAPIResponse(status="error", message=str(e))
+
+@app.post("/api/v1/admin/rag/bulk-import/stream", dependencies=[Depends(verify_admin_key)])
+async def stream_import_rag_nuggets(request: Request, language: str = Query("pl")):
+    """
+    Streaming bulk import of RAG nuggets
+    Body: NDJSON (one nugget per line) or multipart/form-data with a `file`
+    (NDJSON or JSON array). Returns a job - poll /api/v1/admin/import-jobs/{job_id}
+    or listen on /api/v1/ws/admin
+    """
+    return await start_streaming_import(request, "rag", language)
+
+@app.post("/api/v1/admin/golden-standards/bulk-import/stream", dependencies=[Depends(verify_admin_key)])
+async def stream_import_golden_standards(request: Request, language: str = Query("pl")):
+    """
+    Streaming bulk import of golden standards (same formats as the RAG stream import)
+    """
+    return await start_streaming_import(request, "golden_standards", language)
+
+# =============================================================================
+# Endpoint 12.8: [GET] /api/v1/admin/import-jobs[/{job_id}] (Import Job Status)
+# =============================================================================
+
+@app.get("/api/v1/admin/import-jobs", dependencies=[Depends(verify_admin_key)])
+async def list_import_jobs():
+    """
+    Recent bulk import jobs of this API process (newest first)
+    """
+    return GlobalAPIResponse(status="success", data=[job.to_dict() for job in import_jobs.list()])
+
+@app.get("/api/v1/admin/import-jobs/{job_id}", dependencies=[Depends(verify_admin_key)])
+async def get_import_job(job_id: str):
+    """
+    Progress and error counts of one bulk import job
+    """
+    job = import_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return GlobalAPIResponse(status="success", data=job.to_dict())
+
 # =============================================================================
 # Endpoint 13: [GET] /api/v1/admin/analytics/v1_dashboard (F-3.3, W18, K13)
 # =============================================================================
@@ -2325,71 +3288,16 @@ async def get_analytics_dashboard(
 ):
     """
     Analytics dashboard with 3 charts
-    Requires complex JSONB queries (K13)
+    Reads the daily rollups maintained on Slow Path insert / end_session
+    (K13 JSONB fields are extracted at write time) - constant time in the
+    size of slow_path_logs
     """
     try:
-        cursor = db_conn.cursor(cursor_factory=RealDictCursor)
-        
-        # Build date filter
-        date_filter = ""
-        params = []
-        if date_from and date_to:
-            date_filter = "AND slow_path_logs.timestamp BETWEEN %s AND %s"
-            params = [date_from, date_to]
-        
-        # Chart 1: Playbook Effectiveness (K13)
-        cursor.execute(f"""
-            SELECT 
-                jsonb_array_elements(json_output->'modules'->'strategic_playbook'->'plays')->>'title' as playbook_title,
-                COUNT(*) as usage_count
-            FROM slow_path_logs
-            WHERE status = 'Success' {date_filter}
-            GROUP BY playbook_title
-            ORDER BY usage_count DESC
-            LIMIT 10
-        """, params)
-        chart1_data = cursor.fetchall()
-        
-        # Chart 2: DISC Correlation (K13)
-        cursor.execute(f"""
-            SELECT 
-                json_output->'modules'->'psychometric_profile'->'dominant_disc'->>'type' as disc_type,
-                sessions.status,
-                COUNT(*) as count
-            FROM slow_path_logs
-            JOIN sessions ON slow_path_logs.session_id = sessions.session_id
-            WHERE slow_path_logs.status = 'Success' 
-              AND sessions.status IS NOT NULL
-              {date_filter}
-            GROUP BY disc_type, sessions.status
-        """, params)
-        chart2_data = cursor.fetchall()
-        
-        # Chart 3: Temperature Validation (K13)
-        cursor.execute(f"""
-            SELECT 
-                (json_output->'modules'->'tactical_indicators'->'purchase_temperature'->>'value')::int as temperature,
-                sessions.status,
-                COUNT(*) as count
-            FROM slow_path_logs
-            JOIN sessions ON slow_path_logs.session_id = sessions.session_id
-            WHERE slow_path_logs.status = 'Success'
-              AND sessions.status IS NOT NULL
-              {date_filter}
-            GROUP BY temperature, sessions.status
-            ORDER BY temperature DESC
-        """, params)
-        chart3_data = cursor.fetchall()
-        
-        cursor.close()
+        charts = await asyncio.to_thread(read_router.run, db_conn, load_analytics_dashboard, date_from, date_to)
         
         return GlobalAPIResponse(
             status="success",
-            data={
-                "chart1_data": chart1_data,
-                "chart2_data": chart2_data,
-                "chart3_data": chart3_data
-            }
+            data=charts
         )
         
     except Exception as e:
@@ -2399,6 +3307,52 @@ async def get_analytics_dashboard(
             message=str(e)
         )
 
+# =============================================================================
+# Endpoint 13.1: [GET] /api/v1/admin/analytics/export (BI extracts)
+# =============================================================================
+
+def parse_export_date(value: str, name: str) -> datetime:
+    """ISO date / datetime query parameter (naive values are UTC)"""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"{name} must be an ISO date (YYYY-MM-DD) or datetime")
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+@app.get("/api/v1/admin/analytics/export", dependencies=[Depends(verify_admin_key)])
+async def export_analytics(
+    date_from: str = Query(..., description="Inclusive start (ISO date or datetime)"),
+    date_to: str = Query(..., description="Exclusive end (ISO date or datetime)"),
+    format: str = Query("ndjson", description="ndjson | csv | parquet"),
+    status: str = Query("Success", pattern="^(Success|Error|all)$")
+):
+    """
+    Stream Slow Path results joined with their sessions for BI extracts
+    Server-side cursor + chunked encoding: memory use is one chunk,
+    independent of the date range
+    """
+    start = parse_export_date(date_from, "date_from")
+    end = parse_export_date(date_to, "date_to")
+    if end <= start:
+        raise HTTPException(status_code=400, detail="date_to must be after date_from")
+    try:
+        check_export_format(format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    filename = f"slow_path_export_{start:%Y%m%d}_{end:%Y%m%d}.{format}"
+    return StreamingResponse(
+        iter_slow_path_export(
+            read_router.connection_factory(get_transaction_db_connection),
+            start,
+            end,
+            export_format=format,
+            status=None if status == "all" else status
+        ),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
 # =============================================================================
 # Endpoint 14: [WebSocket] /api/v1/ws/sessions/{session_id} (F-2.4, K2, W30)
 # =============================================================================
@@ -2419,10 +3373,8 @@ async def websocket_session(websocket: WebSocket, session_id: str):
     # If database available, validate session exists
     if db_conn is not None:
         try:
-            cursor = db_conn.cursor()
-            cursor.execute("SELECT 1 FROM sessions WHERE session_id = %s", (session_id,))
-            exists = cursor.fetchone() is not None
-            cursor.close()
+            # Registry hit → no database round trip on the handshake
+            exists = session_registry.exists(db_conn, session_id)
 
             if not exists:
                 logger.warning(f"🔌 WebSocket rejected: Session {session_id} not found in database")
@@ -2451,6 +3403,41 @@ async def websocket_session(websocket: WebSocket, session_id: str):
         if session_id in websocket_connections:
             del websocket_connections[session_id]
 
+# =============================================================================
+# Endpoint 14.5: [WebSocket] /api/v1/ws/admin (Admin Import Job Progress)
+# =============================================================================
+
+@app.websocket("/api/v1/ws/admin")
+async def websocket_admin(websocket: WebSocket, key: str = Query(None)):
+    """
+    Admin WebSocket: pushes {"type": "import_job", "data": job} on every
+    import job progress update
+    Browsers cannot set X-Admin-Key on a WebSocket - the key is a query param
+    """
+    if not key or key != ADMIN_API_KEY:
+        logger.warning("🔌 Admin WebSocket rejected: invalid key")
+        await websocket.close(code=4001, reason="Unauthorized")
+        return
+
+    await websocket.accept()
+
+    async def send_job(job: Dict[str, Any]):
+        await websocket.send_json({"type": "import_job", "data": job})
+
+    import_jobs.subscribe(send_job)
+    logger.info("🔌 Admin WebSocket connected")
+    try:
+        # Catch up on jobs that are still running
+        for job in import_jobs.list():
+            if job.status in ("queued", "running"):
+                await send_job(job.to_dict())
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        logger.info("🔌 Admin WebSocket disconnected")
+    finally:
+        import_jobs.unsubscribe(send_job)
+
 # =============================================================================
 # Endpoint 15: [POST] /api/v1/gotham/burning-house-score (Tesla-Gotham v4.0)
 # =============================================================================
@@ -2761,8 +3748,16 @@ async def get_gus_summary_endpoint(voivodeship: str):
 async def health_check():
     """
     Health check for Railway/Docker
+    Includes a Qdrant connection probe (degraded RAG does not fail the container)
     """
-    return {"status": "healthy", "version": "4.5.0"}
+    return {
+        "status": "healthy",
+        "version": "4.5.0",
+        "qdrant": await probe_qdrant(qdrant_client),
+        "rag_outbox": await asyncio.to_thread(get_rag_outbox_health),
+        "read_replica": read_router.status(),
+        "session_actors": session_actors.stats()
+    }
 
 # =============================================================================
 # Root Endpoint
@@ -0,0 +1,74 @@
+"""
+Analytics Layer
+===============
+
+Slow Path (Opus Magnum) analytics for the admin dashboard:
+
+1. Rollups - incrementally maintained dashboard aggregates
+   - analytics columns extracted when a Slow Path result is written
+   - daily playbook / outcome rollups updated on insert and end_session
+   - batched backfill for rows written before the columns existed
+
+2. Export - streaming BI extracts of Slow Path results
+   - named server-side cursor, one chunk in memory at a time
+   - NDJSON / CSV / Parquet with flattened Opus Magnum module columns
+
+3. History - bounded Slow Path history per session
+   - sessions.latest_slow_path_id moved atomically on insert (O(1) loads)
+   - superseded analyses older than N days compacted into per-session archives
+"""
+
+from .rollups import (
+    ANALYTICS_SCHEMA_SQL,
+    backfill_analytics,
+    end_session_with_rollup,
+    ensure_analytics_schema,
+    extract_analytics_fields,
+    load_analytics_dashboard,
+    record_slow_path_result,
+    reset_analytics_rollups,
+)
+from .export import (
+    EXPORT_COLUMNS,
+    EXPORT_FORMATS,
+    EXPORT_MEDIA_TYPES,
+    check_export_format,
+    flatten_slow_path_row,
+    iter_slow_path_export,
+)
+from .history import (
+    SLOW_PATH_HISTORY_SCHEMA_SQL,
+    SLOW_PATH_RETENTION_DAYS,
+    backfill_latest_slow_path_ids,
+    compact_all_slow_path_history,
+    compact_slow_path_history,
+    ensure_slow_path_history_schema,
+    load_latest_slow_path,
+)
+
+__all__ = [
+    # Rollups
+    "ANALYTICS_SCHEMA_SQL",
+    "backfill_analytics",
+    "end_session_with_rollup",
+    "ensure_analytics_schema",
+    "extract_analytics_fields",
+    "load_analytics_dashboard",
+    "record_slow_path_result",
+    "reset_analytics_rollups",
+    # Export
+    "EXPORT_COLUMNS",
+    "EXPORT_FORMATS",
+    "EXPORT_MEDIA_TYPES",
+    "check_export_format",
+    "flatten_slow_path_row",
+    "iter_slow_path_export",
+    # History
+    "SLOW_PATH_HISTORY_SCHEMA_SQL",
+    "SLOW_PATH_RETENTION_DAYS",
+    "backfill_latest_slow_path_ids",
+    "compact_all_slow_path_history",
+    "compact_slow_path_history",
+    "ensure_slow_path_history_schema",
+    "load_latest_slow_path",
+]
@@ -0,0 +1,311 @@
+"""
+Analytics Export
+================
+
+Streaming export of Slow Path results (slow_path_logs JOIN sessions) for
+BI extracts. Rows are read through a NAMED (server-side) cursor in chunks
+of EXPORT_CHUNK_SIZE and encoded chunk by chunk, so the API process holds
+at most one chunk regardless of the date range:
+
+- ndjson  - one JSON object per line (module lists kept as arrays)
+- csv     - fixed header, lists / objects JSON-encoded in their cell
+- parquet - one row group per chunk (needs the optional pyarrow package)
+
+Opus Magnum modules are flattened into fixed `module__field` columns
+(EXPORT_MODULE_FIELDS), so every format has the same stable schema.
+"""
+
+import io
+import csv
+import json
+import uuid
+import logging
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from psycopg2.extras import RealDictCursor
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("ndjson", "csv", "parquet")
+EXPORT_CHUNK_SIZE = 1000
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+EXPORT_BASE_COLUMNS = [
+    "log_id",
+    "session_id",
+    "timestamp",
+    "status",
+    "session_status",
+    "session_created_at",
+    "session_ended_at",
+    "journey_stage",
+    "suggested_stage",
+]
+
+# (column, path inside json_output["modules"], kind) - kind "number" -> float column,
+# "text" -> string column (lists / objects JSON-encoded outside NDJSON)
+EXPORT_MODULE_FIELDS: List[Tuple[str, Tuple[str, ...], str]] = [
+    ("dna_client__main_motivation", ("dna_client", "main_motivation"), "text"),
+    ("dna_client__communication_style", ("dna_client", "communication_style"), "text"),
+    ("dna_client__red_flags", ("dna_client", "red_flags"), "text"),
+    ("dna_client__confidence_score", ("dna_client", "confidence_score"), "number"),
+    ("tactical__purchase_temperature", ("tactical_indicators", "purchase_temperature", "value"), "number"),
+    ("tactical__purchase_temperature_label", ("tactical_indicators", "purchase_temperature", "label"), "text"),
+    ("tactical__churn_risk_level", ("tactical_indicators", "churn_risk", "level"), "text"),
+    ("tactical__churn_risk_percentage", ("tactical_indicators", "churn_risk", "percentage"), "number"),
+    ("tactical__fun_drive_risk_level", ("tactical_indicators", "fun_drive_risk", "level"), "text"),
+    ("tactical__fun_drive_risk_percentage", ("tactical_indicators", "fun_drive_risk", "percentage"), "number"),
+    ("tactical__confidence_score", ("tactical_indicators", "confidence_score"), "number"),
+    ("psychometric__disc_type", ("psychometric_profile", "dominant_disc", "type"), "text"),
+    ("psychometric__openness", ("psychometric_profile", "big_five_traits", "openness", "score"), "number"),
+    ("psychometric__conscientiousness", ("psychometric_profile", "big_five_traits", "conscientiousness", "score"), "number"),
+    ("psychometric__extraversion", ("psychometric_profile", "big_five_traits", "extraversion", "score"), "number"),
+    ("psychometric__agreeableness", ("psychometric_profile", "big_five_traits", "agreeableness", "score"), "number"),
+    ("psychometric__neuroticism", ("psychometric_profile", "big_five_traits", "neuroticism", "score"), "number"),
+    ("psychometric__confidence_score", ("psychometric_profile", "confidence_score"), "number"),
+    ("deep_motivation__key_insight", ("deep_motivation", "key_insight"), "text"),
+    ("deep_motivation__tesla_hook", ("deep_motivation", "tesla_hook"), "text"),
+    ("deep_motivation__confidence_score", ("deep_motivation", "confidence_score"), "number"),
+    ("predictive_paths__paths", ("predictive_paths", "paths"), "text"),
+    ("predictive_paths__confidence_score", ("predictive_paths", "confidence_score"), "number"),
+    ("playbook__titles", ("strategic_playbook", "plays", "*title"), "text"),
+    ("playbook__confidence_score", ("strategic_playbook", "confidence_score"), "number"),
+    ("decision_vectors__stakeholders", ("decision_vectors", "vectors", "*stakeholder"), "text"),
+    ("decision_vectors__confidence_score", ("decision_vectors", "confidence_score"), "number"),
+]
+
+EXPORT_COLUMNS = EXPORT_BASE_COLUMNS + [column for column, _, _ in EXPORT_MODULE_FIELDS]
+
+_EXPORT_SQL = """
+    SELECT l.log_id, l.session_id, l.timestamp, l.status, l.json_output,
+           s.status AS session_status, s.created_at AS session_created_at,
+           s.ended_at AS session_ended_at, s.journey_stage
+    FROM slow_path_logs l
+    JOIN sessions s ON s.session_id = l.session_id
+    WHERE l.timestamp >= %(date_from)s AND l.timestamp < %(date_to)s
+      {status_filter}
+    ORDER BY l.timestamp, l.log_id
+"""
+
+
+def _module_value(modules: Any, path: Tuple[str, ...]) -> Any:
+    node = modules
+    for key in path:
+        if key.startswith("*"):
+            # "*field" - collect `field` from every element of a list
+            field = key[1:]
+            return [item.get(field) for item in node if isinstance(item, dict)] if isinstance(node, list) else None
+        node = node.get(key) if isinstance(node, dict) else None
+    return node
+
+
+def flatten_slow_path_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """slow_path_logs + sessions row -> flat dict with EXPORT_COLUMNS keys"""
+    output = row.get("json_output") or {}
+    modules = output.get("modules") if isinstance(output, dict) else None
+    flat = {column: row.get(column) for column in EXPORT_BASE_COLUMNS}
+    flat["suggested_stage"] = output.get("suggested_stage") if isinstance(output, dict) else None
+    for column, path, _ in EXPORT_MODULE_FIELDS:
+        flat[column] = _module_value(modules, path)
+    return flat
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _cell(value: Any) -> Any:
+    """Scalar for CSV / Parquet cells (lists and objects JSON-encoded)"""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False, default=_json_default)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+# =============================================================================
+# Chunk Encoders
+# =============================================================================
+
+def _encode_ndjson(rows: List[Dict[str, Any]]) -> bytes:
+    return "".join(
+        json.dumps(row, ensure_ascii=False, default=_json_default) + "\n" for row in rows
+    ).encode("utf-8")
+
+
+class _CsvEncoder:
+    def __init__(self):
+        self._header_written = False
+
+    def __call__(self, rows: List[Dict[str, Any]]) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if not self._header_written:
+            writer.writerow(EXPORT_COLUMNS)
+            self._header_written = True
+        for row in rows:
+            writer.writerow([_cell(row[column]) for column in EXPORT_COLUMNS])
+        return buffer.getvalue().encode("utf-8")
+
+
+class _ByteSink:
+    """Write-only file for pyarrow that hands out bytes as they are written"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position  # Absolute offset - Parquet footers reference it
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class _ParquetEncoder:
+    def __init__(self):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError("Parquet export requires the 'pyarrow' package")
+        self._pa = pa
+        self._sink = _ByteSink()
+        # Every column nullable, in EXPORT_COLUMNS order
+        base_types = {
+            "log_id": pa.int64(),
+            "timestamp": pa.timestamp("us", tz="UTC"),
+            "session_created_at": pa.timestamp("us", tz="UTC"),
+            "session_ended_at": pa.timestamp("us", tz="UTC"),
+        }
+        self._schema = pa.schema(
+            [(column, base_types.get(column, pa.string())) for column in EXPORT_BASE_COLUMNS]
+            + [(column, pa.float64() if kind == "number" else pa.string()) for column, _, kind in EXPORT_MODULE_FIELDS]
+        )
+        self._writer = pq.ParquetWriter(self._sink, self._schema, compression="snappy")
+
+    def _value(self, column: str, value: Any) -> Any:
+        field_type = self._schema.field(column).type
+        if value is None:
+            return None
+        if self._pa.types.is_floating(field_type):
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return None
+        if self._pa.types.is_string(field_type):
+            value = _cell(value)
+            return value if isinstance(value, str) else str(value)
+        return value
+
+    def __call__(self, rows: List[Dict[str, Any]]) -> bytes:
+        columns = {
+            name: [self._value(name, row[name]) for row in rows]
+            for name in self._schema.names
+        }
+        self._writer.write_table(self._pa.Table.from_pydict(columns, schema=self._schema))
+        return self._sink.drain()
+
+    def finish(self) -> bytes:
+        self._writer.close()
+        return self._sink.drain()
+
+
+# =============================================================================
+# Export Stream
+# =============================================================================
+
+def check_export_format(export_format: str) -> None:
+    """
+    Raise ValueError for an unknown format or a missing optional dependency -
+    call BEFORE starting the response (errors inside the stream cannot
+    change the status code anymore)
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"format must be one of {EXPORT_FORMATS}")
+    if export_format == "parquet":
+        try:
+            import pyarrow.parquet  # noqa: F401
+        except ImportError:
+            raise ValueError("Parquet export requires the 'pyarrow' package")
+
+
+def iter_slow_path_export(
+    conn_factory: Callable[[], Any],
+    date_from: datetime,
+    date_to: datetime,
+    export_format: str = "ndjson",
+    status: Optional[str] = "Success",
+    chunk_size: int = EXPORT_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    Yield the encoded export chunk by chunk (for a StreamingResponse).
+
+    The connection is opened lazily (first chunk) and always closed, also
+    when the client disconnects mid-stream.
+
+    Args:
+        conn_factory: Returns a NEW psycopg2 connection with autocommit
+            DISABLED (named cursors live inside a transaction)
+        date_from / date_to: Half-open range on slow_path_logs.timestamp
+        export_format: 'ndjson' | 'csv' | 'parquet'
+        status: 'Success' | 'Error' | None (both)
+        chunk_size: Rows fetched from the server-side cursor per round trip
+    """
+    check_export_format(export_format)
+    encoder = {"ndjson": lambda: _encode_ndjson, "csv": _CsvEncoder, "parquet": _ParquetEncoder}[export_format]()
+
+    conn = conn_factory()
+    if conn is None:
+        raise RuntimeError("PostgreSQL unavailable")
+    exported = 0
+    try:
+        with conn.cursor(name=f"slow_path_export_{uuid.uuid4().hex[:12]}", cursor_factory=RealDictCursor) as cursor:
+            cursor.itersize = chunk_size
+            cursor.execute(
+                _EXPORT_SQL.format(status_filter="AND l.status = %(status)s" if status else ""),
+                {"date_from": date_from, "date_to": date_to, "status": status}
+            )
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                exported += len(rows)
+                yield encoder([flatten_slow_path_row(row) for row in rows])
+        if isinstance(encoder, _ParquetEncoder):
+            yield encoder.finish()
+        elif not exported:
+            yield encoder([])  # CSV header of an empty extract
+        logger.info(f"✓ Analytics export ({export_format}): {exported} rows")
+    finally:
+        conn.rollback()
+        conn.close()
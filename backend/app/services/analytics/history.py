@@ -0,0 +1,219 @@
+"""
+Slow Path History
+=================
+
+Bounded slow_path_logs for a table that gets a new row on every message:
+
+1. Latest pointer - sessions.latest_slow_path_id is moved forward in the
+   SAME statement that inserts a Slow Path result (record_slow_path_result),
+   so loading a session's current analysis is a primary key lookup instead
+   of `ORDER BY timestamp DESC LIMIT 1` over all of its analyses.
+2. Retention - analyses of ENDED sessions superseded by a newer one and
+   older than SLOW_PATH_RETENTION_DAYS are moved into one archive row per
+   session (slow_path_archives) and deleted. Archives keep the dashboard
+   fields and the suggested stage, not the full Opus Magnum JSON.
+
+Only rows already counted in the daily rollups (under the session's final
+status) are compacted; re-ending a session also moves its archived entries
+(end_session_with_rollup). A full rollup rebuild cannot see archived rows
+and is refused once archives exist. The BI export covers live rows only.
+"""
+
+import os
+import logging
+from typing import Any, Dict, Optional
+
+from psycopg2.extras import RealDictCursor
+
+logger = logging.getLogger(__name__)
+
+SLOW_PATH_RETENTION_DAYS = int(os.getenv("SLOW_PATH_RETENTION_DAYS", "30"))  # 0 disables compaction
+SLOW_PATH_COMPACTION_BATCH_SIZE = 1000
+
+SLOW_PATH_HISTORY_SCHEMA_SQL = """
+ALTER TABLE sessions ADD COLUMN IF NOT EXISTS latest_slow_path_id INT NULL
+    REFERENCES slow_path_logs(log_id) ON DELETE SET NULL;
+-- ON DELETE SET NULL looks the pointer up on every compacted slow_path_logs row
+CREATE INDEX IF NOT EXISTS idx_sessions_latest_slow_path ON sessions(latest_slow_path_id);
+CREATE INDEX IF NOT EXISTS idx_slow_path_logs_session_log ON slow_path_logs(session_id, log_id);
+
+-- entries: [{log_id, timestamp, status, suggested_stage, disc_type, purchase_temperature, playbook_titles}]
+CREATE TABLE IF NOT EXISTS slow_path_archives (
+    session_id TEXT PRIMARY KEY REFERENCES sessions(session_id) ON DELETE CASCADE,
+    entries JSONB NOT NULL DEFAULT '[]'::jsonb,
+    archived_count INT NOT NULL DEFAULT 0,
+    first_timestamp TIMESTAMP WITH TIME ZONE NOT NULL,
+    last_timestamp TIMESTAMP WITH TIME ZONE NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+);
+"""
+
+
+def ensure_slow_path_history_schema(conn) -> None:
+    """Add the latest pointer and the archive table if missing (idempotent)"""
+    with conn.cursor() as cursor:
+        cursor.execute(SLOW_PATH_HISTORY_SCHEMA_SQL)
+    if not conn.autocommit:
+        conn.commit()
+
+
+# =============================================================================
+# Latest Pointer
+# =============================================================================
+
+def load_latest_slow_path(cursor, session_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Current analysis of a session through sessions.latest_slow_path_id.
+    Sessions whose pointer was never set (rows written before it existed)
+    fall back to the newest row on the (session_id, log_id) index.
+
+    Returns:
+        {"log_id", "session_id", "timestamp", "json_output", "status"} or None
+    """
+    cursor.execute(
+        """
+        SELECT l.log_id, l.session_id, l.timestamp, l.json_output, l.status
+        FROM sessions s
+        JOIN LATERAL (
+            SELECT log_id, session_id, timestamp, json_output, status
+            FROM slow_path_logs
+            WHERE log_id = s.latest_slow_path_id
+            UNION ALL
+            (SELECT log_id, session_id, timestamp, json_output, status
+             FROM slow_path_logs
+             WHERE s.latest_slow_path_id IS NULL AND session_id = s.session_id
+             ORDER BY log_id DESC
+             LIMIT 1)
+        ) l ON true
+        WHERE s.session_id = %s
+        LIMIT 1
+        """,
+        (session_id,)
+    )
+    row = cursor.fetchone()
+    return dict(row) if row else None
+
+
+def backfill_latest_slow_path_ids(conn) -> int:
+    """
+    Point every session at its newest analysis (sessions created before the
+    pointer existed). Idempotent; never moves a pointer backwards.
+
+    Returns:
+        Number of sessions updated
+    """
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                """
+                UPDATE sessions s
+                SET latest_slow_path_id = latest.log_id
+                FROM (SELECT session_id, MAX(log_id) AS log_id FROM slow_path_logs GROUP BY session_id) latest
+                WHERE s.session_id = latest.session_id
+                  AND (s.latest_slow_path_id IS NULL OR s.latest_slow_path_id < latest.log_id)
+                """
+            )
+            updated = cursor.rowcount
+        if not conn.autocommit:
+            conn.commit()
+        return updated
+    except Exception:
+        if not conn.autocommit:
+            conn.rollback()
+        raise
+
+
+# =============================================================================
+# Retention
+# =============================================================================
+
+def compact_slow_path_history(
+    conn,
+    older_than_days: int = SLOW_PATH_RETENTION_DAYS,
+    batch_size: int = SLOW_PATH_COMPACTION_BATCH_SIZE
+) -> Dict[str, int]:
+    """
+    Move one batch of superseded analyses older than `older_than_days` into
+    the per-session archives - ONE statement (archive upsert + delete).
+    Call repeatedly until "compacted" == 0; SKIP LOCKED lets it run next to
+    live Slow Path writes and other compactions.
+
+    A row is superseded when its session's latest pointer is set and newer;
+    open sessions (outcome not counted yet) and rows still waiting for the
+    analytics backfill are left alone.
+
+    Returns:
+        {"compacted": n, "sessions": n}
+    """
+    try:
+        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            cursor.execute(
+                """
+                WITH victims AS (
+                    SELECT l.log_id
+                    FROM slow_path_logs l
+                    JOIN sessions s ON s.session_id = l.session_id
+                    WHERE l.timestamp < now() - make_interval(days => %(days)s)
+                      AND s.ended_at IS NOT NULL
+                      AND s.latest_slow_path_id IS NOT NULL
+                      AND l.log_id < s.latest_slow_path_id
+                      AND (l.status <> 'Success' OR l.rolled_up_at IS NOT NULL)
+                    ORDER BY l.log_id
+                    LIMIT %(batch_size)s
+                    FOR UPDATE OF l SKIP LOCKED
+                ),
+                moved AS (
+                    DELETE FROM slow_path_logs l
+                    USING victims v
+                    WHERE l.log_id = v.log_id
+                    RETURNING l.session_id, l.log_id, l.timestamp,
+                              jsonb_build_object(
+                                  'log_id', l.log_id,
+                                  'timestamp', l.timestamp,
+                                  'status', l.status,
+                                  'suggested_stage', l.json_output->>'suggested_stage',
+                                  'disc_type', l.disc_type,
+                                  'purchase_temperature', l.purchase_temperature,
+                                  'playbook_titles', l.playbook_titles
+                              ) AS entry
+                ),
+                archived AS (
+                    INSERT INTO slow_path_archives (session_id, entries, archived_count, first_timestamp, last_timestamp)
+                    SELECT session_id, jsonb_agg(entry ORDER BY log_id), COUNT(*), MIN(timestamp), MAX(timestamp)
+                    FROM moved
+                    GROUP BY session_id
+                    ON CONFLICT (session_id) DO UPDATE
+                    SET entries = slow_path_archives.entries || EXCLUDED.entries,
+                        archived_count = slow_path_archives.archived_count + EXCLUDED.archived_count,
+                        first_timestamp = LEAST(slow_path_archives.first_timestamp, EXCLUDED.first_timestamp),
+                        last_timestamp = GREATEST(slow_path_archives.last_timestamp, EXCLUDED.last_timestamp),
+                        updated_at = now()
+                )
+                SELECT COUNT(*) AS compacted, COUNT(DISTINCT session_id) AS sessions FROM moved
+                """,
+                {"days": older_than_days, "batch_size": batch_size}
+            )
+            row = cursor.fetchone()
+        if not conn.autocommit:
+            conn.commit()
+        return {"compacted": row["compacted"], "sessions": row["sessions"]}
+    except Exception:
+        if not conn.autocommit:
+            conn.rollback()
+        raise
+
+
+def compact_all_slow_path_history(
+    conn,
+    older_than_days: int = SLOW_PATH_RETENTION_DAYS,
+    batch_size: int = SLOW_PATH_COMPACTION_BATCH_SIZE
+) -> Dict[str, int]:
+    """Backfill missing pointers, then compact batch by batch until done"""
+    totals = {"pointers": backfill_latest_slow_path_ids(conn), "compacted": 0, "sessions": 0}
+    while True:
+        stats = compact_slow_path_history(conn, older_than_days, batch_size)
+        if not stats["compacted"]:
+            break
+        totals["compacted"] += stats["compacted"]
+        totals["sessions"] += stats["sessions"]  # Sessions touched per batch (may repeat)
+    return totals
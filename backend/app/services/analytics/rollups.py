@@ -0,0 +1,438 @@
+"""
+Analytics Rollups
+=================
+
+Incrementally maintained aggregates behind the v1 analytics dashboard
+(Endpoint 13). Instead of running jsonb_array_elements over every
+slow_path_logs row per request:
+
+1. Extracted columns - playbook_titles, disc_type and purchase_temperature
+   are written next to json_output when a Slow Path result is stored
+2. Daily rollups, updated in the SAME statement as the write:
+   - analytics_playbook_daily: playbook usage per day (chart 1)
+   - analytics_outcome_daily: DISC type / purchase temperature x final
+     session status per day (charts 2 + 3) - added when a session ends,
+     moved between statuses if it is ended again
+3. Backfill - rows written before the columns existed (rolled_up_at IS
+   NULL) are extracted and rolled up in batches (backfill_analytics.py)
+
+The dashboard reads only the rollups: cost depends on the date range and
+the number of distinct values, not on the size of slow_path_logs.
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from psycopg2.extras import Json, RealDictCursor
+
+logger = logging.getLogger(__name__)
+
+ANALYTICS_BACKFILL_BATCH_SIZE = 500
+
+ANALYTICS_SCHEMA_SQL = """
+ALTER TABLE slow_path_logs ADD COLUMN IF NOT EXISTS playbook_titles TEXT[] NULL;
+ALTER TABLE slow_path_logs ADD COLUMN IF NOT EXISTS disc_type TEXT NULL;
+ALTER TABLE slow_path_logs ADD COLUMN IF NOT EXISTS purchase_temperature INT NULL;
+ALTER TABLE slow_path_logs ADD COLUMN IF NOT EXISTS rolled_up_at TIMESTAMP WITH TIME ZONE NULL;
+CREATE INDEX IF NOT EXISTS idx_slow_path_logs_backfill ON slow_path_logs(log_id) WHERE rolled_up_at IS NULL AND status = 'Success';
+CREATE INDEX IF NOT EXISTS idx_slow_path_logs_timestamp ON slow_path_logs(timestamp, log_id);  -- Export date ranges
+
+CREATE TABLE IF NOT EXISTS analytics_playbook_daily (
+    day DATE NOT NULL,
+    playbook_title TEXT NOT NULL,
+    usage_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, playbook_title)
+);
+
+-- value '' = not present in the analysis (NULL in the chart)
+CREATE TABLE IF NOT EXISTS analytics_outcome_daily (
+    day DATE NOT NULL,
+    dimension TEXT NOT NULL CHECK (dimension IN ('disc','temperature')),
+    value TEXT NOT NULL,
+    status TEXT NOT NULL,
+    count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, dimension, value, status)
+);
+"""
+
+# Rows of one dimension pair per analysis (shared by insert, end_session and backfill)
+_OUTCOME_VALUES_SQL = """
+    CROSS JOIN LATERAL (VALUES
+        ('disc', COALESCE({alias}.disc_type, '')),
+        ('temperature', COALESCE({alias}.purchase_temperature::text, ''))
+    ) AS dims(dimension, value)
+"""
+
+_UPSERT_PLAYBOOK_SQL = """
+    ON CONFLICT (day, playbook_title) DO UPDATE
+    SET usage_count = analytics_playbook_daily.usage_count + EXCLUDED.usage_count
+"""
+
+_UPSERT_OUTCOME_SQL = """
+    ON CONFLICT (day, dimension, value, status) DO UPDATE
+    SET count = analytics_outcome_daily.count + EXCLUDED.count
+"""
+
+
+def ensure_analytics_schema(conn) -> None:
+    """Add the extracted columns and rollup tables if missing (idempotent)"""
+    with conn.cursor() as cursor:
+        cursor.execute(ANALYTICS_SCHEMA_SQL)
+    if not conn.autocommit:
+        conn.commit()
+
+
+def extract_analytics_fields(json_output: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Dashboard fields of an Opus Magnum result (missing / malformed -> None).
+
+    Returns:
+        {"playbook_titles": [str] | None, "disc_type": str | None, "purchase_temperature": int | None}
+    """
+    modules = json_output.get("modules") if isinstance(json_output, dict) else None
+    if not isinstance(modules, dict):
+        return {"playbook_titles": None, "disc_type": None, "purchase_temperature": None}
+
+    def section(*path: str) -> Any:
+        node: Any = modules
+        for key in path:
+            node = node.get(key) if isinstance(node, dict) else None
+        return node
+
+    plays = section("strategic_playbook", "plays")
+    titles = [play["title"] for play in plays if isinstance(play, dict) and isinstance(play.get("title"), str)] \
+        if isinstance(plays, list) else None
+
+    disc_type = section("psychometric_profile", "dominant_disc", "type")
+
+    temperature = section("tactical_indicators", "purchase_temperature", "value")
+    try:
+        temperature = int(temperature) if temperature is not None else None
+    except (TypeError, ValueError):
+        temperature = None
+
+    return {
+        "playbook_titles": titles,
+        "disc_type": disc_type if isinstance(disc_type, str) else None,
+        "purchase_temperature": temperature,
+    }
+
+
+# =============================================================================
+# Write Path
+# =============================================================================
+
+def record_slow_path_result(
+    cursor,
+    session_id: str,
+    timestamp: datetime,
+    json_output: Dict[str, Any],
+    status: str,
+    cache_key: Optional[str] = None,
+    analyzed_log_id: Optional[int] = None
+) -> int:
+    """
+    Insert a slow_path_logs row with its analytics columns, roll it up and
+    move sessions.latest_slow_path_id to it - ONE statement, so it is atomic
+    even on an autocommit connection.
+
+    `cache_key` makes the result reusable (slow_path.slow_path_cache_key);
+    `analyzed_log_id` is the last conversation_log row the analysis read.
+
+    Returns:
+        log_id of the new row
+    """
+    fields = extract_analytics_fields(json_output) if status == "Success" else {
+        "playbook_titles": None, "disc_type": None, "purchase_temperature": None
+    }
+    cursor.execute(
+        f"""
+        WITH inserted AS (
+            INSERT INTO slow_path_logs
+            (session_id, timestamp, json_output, status, playbook_titles, disc_type, purchase_temperature,
+             rolled_up_at, cache_key, analyzed_log_id)
+            VALUES (%(session_id)s, %(timestamp)s, %(json_output)s, %(status)s,
+                    %(playbook_titles)s, %(disc_type)s, %(purchase_temperature)s,
+                    CASE WHEN %(status)s = 'Success' THEN now() END, %(cache_key)s, %(analyzed_log_id)s)
+            RETURNING log_id, session_id, timestamp, status, playbook_titles, disc_type, purchase_temperature
+        ),
+        plays AS (
+            INSERT INTO analytics_playbook_daily (day, playbook_title, usage_count)
+            SELECT (i.timestamp AT TIME ZONE 'UTC')::date, t.title, COUNT(*)
+            FROM inserted i, unnest(i.playbook_titles) AS t(title)
+            WHERE i.status = 'Success'
+            GROUP BY 1, 2
+            {_UPSERT_PLAYBOOK_SQL}
+        ),
+        session_row AS (
+            -- Row lock: waits for a concurrent end_session_with_rollup and reads
+            -- the status it committed, not the statement snapshot's
+            SELECT session_id, status FROM sessions WHERE session_id = %(session_id)s FOR SHARE
+        ),
+        outcomes AS (
+            -- Analysis of an already ended session counts towards its outcome right away
+            INSERT INTO analytics_outcome_daily (day, dimension, value, status, count)
+            SELECT (i.timestamp AT TIME ZONE 'UTC')::date, dims.dimension, dims.value, s.status, 1
+            FROM inserted i
+            JOIN session_row s ON s.session_id = i.session_id
+            {_OUTCOME_VALUES_SQL.format(alias="i")}
+            WHERE i.status = 'Success' AND s.status IS NOT NULL
+            {_UPSERT_OUTCOME_SQL}
+        ),
+        latest AS (
+            -- Every result (also Error) becomes the session's current analysis
+            UPDATE sessions s
+            SET latest_slow_path_id = i.log_id
+            FROM inserted i
+            WHERE s.session_id = i.session_id
+              AND (s.latest_slow_path_id IS NULL OR s.latest_slow_path_id < i.log_id)
+        )
+        SELECT log_id FROM inserted
+        """,
+        {
+            "session_id": session_id,
+            "timestamp": timestamp,
+            "json_output": Json(json_output),
+            "status": status,
+            "cache_key": cache_key,
+            "analyzed_log_id": analyzed_log_id,
+            **fields,
+        }
+    )
+    return cursor.fetchone()[0]
+
+
+def end_session_with_rollup(cursor, session_id: str, final_status: str, ended_at: datetime) -> bool:
+    """
+    Set the final session status and move the session's analyses into the
+    outcome rollup (out of the previous status when a session is re-ended).
+
+    The session row is locked by a separate first statement, so the rollup
+    statement's snapshot includes every analysis committed by a concurrent
+    record_slow_path_result (which holds the row FOR SHARE); later ones wait
+    for this transaction and read the new status themselves. `cursor` must
+    belong to a connection with autocommit DISABLED; the caller commits.
+
+    Archived analyses (slow_path_archives) are moved along with live ones.
+
+    Returns:
+        False if the session does not exist
+    """
+    cursor.execute("SELECT 1 FROM sessions WHERE session_id = %s FOR UPDATE", (session_id,))
+    cursor.execute(
+        f"""
+        WITH updated AS (
+            UPDATE sessions s
+            SET ended_at = %(ended_at)s, status = %(status)s
+            FROM (SELECT session_id, status FROM sessions WHERE session_id = %(session_id)s FOR UPDATE) previous
+            WHERE s.session_id = previous.session_id
+            RETURNING previous.status AS previous_status
+        ),
+        logs AS (
+            SELECT (l.timestamp AT TIME ZONE 'UTC')::date AS day, dims.dimension, dims.value
+            FROM slow_path_logs l
+            {_OUTCOME_VALUES_SQL.format(alias="l")}
+            WHERE l.session_id = %(session_id)s AND l.status = 'Success' AND l.rolled_up_at IS NOT NULL
+            UNION ALL
+            -- Compacted analyses (archived only after they were rolled up)
+            SELECT ((e.entry->>'timestamp')::timestamptz AT TIME ZONE 'UTC')::date, dims.dimension, dims.value
+            FROM slow_path_archives a
+            CROSS JOIN LATERAL jsonb_array_elements(a.entries) AS e(entry)
+            CROSS JOIN LATERAL (
+                SELECT e.entry->>'disc_type' AS disc_type, e.entry->>'purchase_temperature' AS purchase_temperature
+            ) x
+            {_OUTCOME_VALUES_SQL.format(alias="x")}
+            WHERE a.session_id = %(session_id)s AND e.entry->>'status' = 'Success'
+        ),
+        deltas AS (
+            SELECT logs.day, logs.dimension, logs.value, u.previous_status AS status, -1 AS delta
+            FROM logs CROSS JOIN updated u
+            WHERE u.previous_status IS NOT NULL
+            UNION ALL
+            SELECT logs.day, logs.dimension, logs.value, %(status)s, 1
+            FROM logs CROSS JOIN updated u
+            WHERE %(status)s IS NOT NULL
+        ),
+        outcomes AS (
+            INSERT INTO analytics_outcome_daily (day, dimension, value, status, count)
+            SELECT day, dimension, value, status, SUM(delta)
+            FROM deltas
+            GROUP BY day, dimension, value, status
+            HAVING SUM(delta) <> 0
+            {_UPSERT_OUTCOME_SQL}
+        )
+        SELECT COUNT(*) FROM updated
+        """,
+        {"session_id": session_id, "status": final_status, "ended_at": ended_at}
+    )
+    return cursor.fetchone()[0] > 0
+
+
+# =============================================================================
+# Backfill
+# =============================================================================
+
+def backfill_analytics(conn, batch_size: int = ANALYTICS_BACKFILL_BATCH_SIZE) -> Dict[str, int]:
+    """
+    Extract + roll up one batch of Success rows not rolled up yet.
+    Call repeatedly until "rows" == 0 (each batch is one transaction;
+    SKIP LOCKED lets several backfills run side by side).
+
+    Args:
+        conn: psycopg2 connection with autocommit DISABLED
+
+    Returns:
+        {"rows": n, "playbook_uses": n}
+    """
+    try:
+        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            cursor.execute(
+                """
+                SELECT log_id, json_output
+                FROM slow_path_logs
+                WHERE rolled_up_at IS NULL AND status = 'Success'
+                ORDER BY log_id
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+                """,
+                (batch_size,)
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                conn.rollback()
+                return {"rows": 0, "playbook_uses": 0}
+
+            playbook_uses = 0
+            for row in rows:
+                fields = extract_analytics_fields(row["json_output"])
+                playbook_uses += len(fields["playbook_titles"] or [])
+                cursor.execute(
+                    """
+                    UPDATE slow_path_logs
+                    SET playbook_titles = %s, disc_type = %s, purchase_temperature = %s
+                    WHERE log_id = %s
+                    """,
+                    (fields["playbook_titles"], fields["disc_type"], fields["purchase_temperature"], row["log_id"])
+                )
+
+            log_ids = [row["log_id"] for row in rows]
+            cursor.execute(
+                f"""
+                INSERT INTO analytics_playbook_daily (day, playbook_title, usage_count)
+                SELECT (l.timestamp AT TIME ZONE 'UTC')::date, t.title, COUNT(*)
+                FROM slow_path_logs l, unnest(l.playbook_titles) AS t(title)
+                WHERE l.log_id = ANY(%s)
+                GROUP BY 1, 2
+                {_UPSERT_PLAYBOOK_SQL}
+                """,
+                (log_ids,)
+            )
+            cursor.execute(
+                f"""
+                INSERT INTO analytics_outcome_daily (day, dimension, value, status, count)
+                SELECT (l.timestamp AT TIME ZONE 'UTC')::date, dims.dimension, dims.value, s.status, COUNT(*)
+                FROM slow_path_logs l
+                JOIN sessions s ON s.session_id = l.session_id
+                {_OUTCOME_VALUES_SQL.format(alias="l")}
+                WHERE l.log_id = ANY(%s) AND s.status IS NOT NULL
+                GROUP BY 1, 2, 3, 4
+                {_UPSERT_OUTCOME_SQL}
+                """,
+                (log_ids,)
+            )
+            cursor.execute("UPDATE slow_path_logs SET rolled_up_at = now() WHERE log_id = ANY(%s)", (log_ids,))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    return {"rows": len(rows), "playbook_uses": playbook_uses}
+
+
+def reset_analytics_rollups(conn) -> None:
+    """
+    Empty the rollups and mark every row for backfill (full rebuild).
+
+    Raises:
+        RuntimeError: Compacted analyses exist (slow_path_archives) - the
+            backfill only sees live rows and would drop them from the charts
+    """
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT to_regclass('slow_path_archives') IS NOT NULL")
+        if cursor.fetchone()[0]:
+            cursor.execute("SELECT EXISTS (SELECT 1 FROM slow_path_archives WHERE archived_count > 0)")
+            if cursor.fetchone()[0]:
+                conn.rollback()
+                raise RuntimeError(
+                    "Cannot rebuild the rollups: compacted Slow Path analyses exist in "
+                    "slow_path_archives and would be dropped from the dashboard"
+                )
+        cursor.execute("TRUNCATE analytics_playbook_daily, analytics_outcome_daily")
+        cursor.execute("UPDATE slow_path_logs SET rolled_up_at = NULL WHERE rolled_up_at IS NOT NULL")
+    conn.commit()
+
+
+# =============================================================================
+# Dashboard Read
+# =============================================================================
+
+def load_analytics_dashboard(conn, date_from: Optional[str] = None, date_to: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    The three v1 dashboard charts from the rollups (same row shapes as the
+    former JSONB queries). The date range is applied per UTC day.
+    """
+    day_filter = ""
+    params: List[Any] = []
+    if date_from and date_to:
+        day_filter = "AND day BETWEEN %s::date AND %s::date"
+        params = [date_from, date_to]
+
+    with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+        # Chart 1: Playbook Effectiveness (K13)
+        cursor.execute(
+            f"""
+            SELECT playbook_title, SUM(usage_count)::int AS usage_count
+            FROM analytics_playbook_daily
+            WHERE TRUE {day_filter}
+            GROUP BY playbook_title
+            HAVING SUM(usage_count) > 0
+            ORDER BY usage_count DESC
+            LIMIT 10
+            """,
+            params
+        )
+        chart1_data = cursor.fetchall()
+
+        # Chart 2: DISC Correlation (K13)
+        cursor.execute(
+            f"""
+            SELECT NULLIF(value, '') AS disc_type, status, SUM(count)::int AS count
+            FROM analytics_outcome_daily
+            WHERE dimension = 'disc' {day_filter}
+            GROUP BY value, status
+            HAVING SUM(count) > 0
+            """,
+            params
+        )
+        chart2_data = cursor.fetchall()
+
+        # Chart 3: Temperature Validation (K13)
+        cursor.execute(
+            f"""
+            SELECT NULLIF(value, '')::int AS temperature, status, SUM(count)::int AS count
+            FROM analytics_outcome_daily
+            WHERE dimension = 'temperature' {day_filter}
+            GROUP BY value, status
+            HAVING SUM(count) > 0
+            ORDER BY temperature DESC
+            """,
+            params
+        )
+        chart3_data = cursor.fetchall()
+
+    return {
+        "chart1_data": chart1_data,
+        "chart2_data": chart2_data,
+        "chart3_data": chart3_data,
+    }
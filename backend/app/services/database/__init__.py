@@ -0,0 +1,25 @@
+"""
+Database Access Layer
+=====================
+
+Connection routing shared by the API endpoints and workers:
+
+1. Read replica routing - optional read-only PostgreSQL for replica-safe reads
+   - lag-aware fallback to the primary (sampled replay lag)
+   - read-your-writes for sessions written by this process
+   - unreachable replica skipped for a retry interval
+   - pooled replica connections (REPLICA_POOL_SIZE), short routing lock
+"""
+
+from .replica import (
+    POSTGRES_REPLICA_DSN,
+    REPLICA_MAX_LAG_SECONDS,
+    ReadReplicaRouter,
+)
+
+__all__ = [
+    # Read replica routing
+    "POSTGRES_REPLICA_DSN",
+    "REPLICA_MAX_LAG_SECONDS",
+    "ReadReplicaRouter",
+]
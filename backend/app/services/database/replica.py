@@ -0,0 +1,279 @@
+"""
+Read Replica Routing
+====================
+
+Sends replica-safe reads (admin listings, feedback search, analytics
+dashboard / exports, session history) to an optional read-only PostgreSQL
+(POSTGRES_REPLICA_DSN) so they stop competing with the Fast Path writes on
+the primary:
+
+- lag-aware - replay lag is sampled on the replica at most every
+  REPLICA_LAG_CHECK_INTERVAL seconds; above REPLICA_MAX_LAG_SECONDS every
+  read goes to the primary until the replica catches up
+- read-your-writes - sessions written by this process less than the
+  sampled lag (+ margin) ago are read from the primary
+- failover - a replica that cannot be reached (or drops mid-query) is
+  skipped for REPLICA_RETRY_INTERVAL seconds and the read is retried on
+  the primary
+- pooled - replica reads run on up to REPLICA_POOL_SIZE connections of
+  their own; the router lock only covers the routing decision and the lag
+  sample, so a slow admin read never holds up another read
+
+Without POSTGRES_REPLICA_DSN every read simply uses the primary. Any
+second PostgreSQL with the same schema works for local testing (a server
+that is not in recovery reports zero lag).
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+import psycopg2
+
+logger = logging.getLogger(__name__)
+
+POSTGRES_REPLICA_DSN = os.getenv("POSTGRES_REPLICA_DSN", "")
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+REPLICA_LAG_CHECK_INTERVAL = float(os.getenv("REPLICA_LAG_CHECK_INTERVAL", "2"))
+REPLICA_RETRY_INTERVAL = float(os.getenv("REPLICA_RETRY_INTERVAL", "30"))
+REPLICA_POOL_SIZE = int(os.getenv("REPLICA_POOL_SIZE", "4"))
+
+# Seconds a session stays pinned to the primary on top of the sampled lag
+# (covers the time between two lag samples)
+_READ_YOUR_WRITES_MARGIN = 1.0
+
+# Caught-up standby (received == replayed) reports 0 even when the primary is
+# idle; a server that is not in recovery (plain second PostgreSQL) reports 0
+REPLICA_LAG_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+_REPLICA_ERRORS = (psycopg2.OperationalError, psycopg2.InterfaceError)
+
+
+class ReadReplicaRouter:
+    """Chooses the primary or the replica connection for each read"""
+
+    def __init__(
+        self,
+        dsn: str = POSTGRES_REPLICA_DSN,
+        max_lag_seconds: float = REPLICA_MAX_LAG_SECONDS,
+        lag_check_interval: float = REPLICA_LAG_CHECK_INTERVAL,
+        retry_interval: float = REPLICA_RETRY_INTERVAL,
+        pool_size: int = REPLICA_POOL_SIZE
+    ):
+        self.dsn = dsn
+        self.max_lag_seconds = max_lag_seconds
+        self.lag_check_interval = lag_check_interval
+        self.retry_interval = retry_interval
+        self.pool_size = max(1, pool_size)
+        self._lag_conn = None  # Lag samples only
+        self._idle: List[Any] = []  # Pooled read connections
+        self._in_use = 0
+        self._lock = threading.Lock()
+        self._lag: Optional[float] = None
+        self._lag_checked_at = 0.0
+        self._down_until = 0.0
+        self._last_error: Optional[str] = None
+        self._session_writes: Dict[str, float] = {}
+        self.reads = {"replica": 0, "primary": 0, "fallback": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.dsn)
+
+    # -------------------------------------------------------------------------
+    # Connections
+    # -------------------------------------------------------------------------
+
+    def _connect(self, autocommit: bool = True):
+        conn = psycopg2.connect(self.dsn, connect_timeout=3, application_name="ultra_read_replica")
+        conn.set_session(readonly=True, autocommit=autocommit)
+        return conn
+
+    @staticmethod
+    def _close_quietly(conn) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _mark_down(self, error: Exception) -> None:
+        """Drop the idle connections and skip the replica for retry_interval; lock held"""
+        self._last_error = str(error)
+        self._down_until = time.monotonic() + self.retry_interval
+        self._lag = None
+        for conn in [self._lag_conn] + self._idle:
+            if conn is not None:
+                self._close_quietly(conn)
+        self._lag_conn = None
+        self._idle = []
+        logger.warning(f"⚠ Read replica unavailable for {self.retry_interval:.0f}s: {error}")
+
+    def _replica_lag(self) -> Optional[float]:
+        """Sampled replay lag in seconds (None = replica unusable); lock held"""
+        now = time.monotonic()
+        if now < self._down_until:
+            return None
+        if self._lag is not None and now - self._lag_checked_at < self.lag_check_interval:
+            return self._lag
+        try:
+            if self._lag_conn is None or self._lag_conn.closed:
+                self._lag_conn = self._connect()
+            with self._lag_conn.cursor() as cursor:
+                cursor.execute(REPLICA_LAG_SQL)
+                self._lag = float(cursor.fetchone()[0])
+        except _REPLICA_ERRORS as e:
+            self._mark_down(e)
+            return None
+        self._lag_checked_at = now
+        self._prune_session_writes(now)
+        return self._lag
+
+    def _prune_session_writes(self, now: float) -> None:
+        horizon = now - self.max_lag_seconds - _READ_YOUR_WRITES_MARGIN
+        stale = [session_id for session_id, written_at in self._session_writes.items() if written_at < horizon]
+        for session_id in stale:
+            del self._session_writes[session_id]
+
+    def _replica_usable(self, session_id: Optional[str]) -> bool:
+        """Replica reachable, within max lag and (for a session) past its last write; lock held"""
+        lag = self._replica_lag()
+        if lag is None or lag > self.max_lag_seconds:
+            return False
+        if session_id is not None:
+            written_at = self._session_writes.get(session_id)
+            if written_at is not None and time.monotonic() - written_at <= lag + _READ_YOUR_WRITES_MARGIN:
+                return False
+        return True
+
+    def _acquire(self):
+        """Idle pooled connection, a new one, or None when the pool is exhausted"""
+        with self._lock:
+            while self._idle:
+                conn = self._idle.pop()
+                if not conn.closed:
+                    self._in_use += 1
+                    return conn
+            if self._in_use >= self.pool_size:
+                return None
+            self._in_use += 1
+        try:
+            return self._connect()  # Outside the lock (connect_timeout)
+        except BaseException:
+            with self._lock:
+                self._in_use -= 1
+            raise
+
+    def _release(self, conn, broken: bool = False) -> None:
+        with self._lock:
+            self._in_use -= 1
+            if not broken and not conn.closed and time.monotonic() >= self._down_until:
+                self._idle.append(conn)
+                return
+        self._close_quietly(conn)
+
+    # -------------------------------------------------------------------------
+    # Routing
+    # -------------------------------------------------------------------------
+
+    def note_write(self, session_id: str) -> None:
+        """Pin a session's reads to the primary until the replica has replayed this write"""
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        self._session_writes[session_id] = now
+        if len(self._session_writes) > 10000:  # replica down - no lag samples prune it
+            with self._lock:
+                self._prune_session_writes(now)
+
+    def run(self, primary_conn, read: Callable[..., Any], *args, session_id: Optional[str] = None, **kwargs) -> Any:
+        """
+        Run `read(conn, *args, **kwargs)` on a pooled replica connection
+        when it is safe, otherwise (pool exhausted, or after a replica
+        connection error) on `primary_conn`.
+
+        Blocking - call it from a worker thread (asyncio.to_thread).
+        """
+        if not self.enabled:
+            return read(primary_conn, *args, **kwargs)
+        with self._lock:
+            usable = self._replica_usable(session_id)
+        if usable:
+            conn = None
+            try:
+                conn = self._acquire()
+                if conn is not None:
+                    result = read(conn, *args, **kwargs)
+                    self._release(conn)
+                    self.reads["replica"] += 1
+                    return result
+            except _REPLICA_ERRORS as e:
+                if conn is not None:
+                    self._release(conn, broken=True)
+                with self._lock:
+                    self._mark_down(e)
+                self.reads["fallback"] += 1
+            except BaseException:
+                if conn is not None:
+                    self._release(conn)
+                raise
+        self.reads["primary"] += 1
+        return read(primary_conn, *args, **kwargs)
+
+    def connection_factory(self, primary_factory: Callable[[], Any]) -> Callable[[], Any]:
+        """
+        Factory of NEW connections (autocommit disabled, e.g. streaming
+        exports): the replica when it is safe, else `primary_factory()`.
+        """
+        def factory():
+            if self.enabled:
+                with self._lock:
+                    usable = self._replica_usable(None)
+                if usable:
+                    try:
+                        conn = self._connect(autocommit=False)
+                        self.reads["replica"] += 1
+                        return conn
+                    except _REPLICA_ERRORS as e:
+                        with self._lock:
+                            self._mark_down(e)
+                        self.reads["fallback"] += 1
+            self.reads["primary"] += 1
+            return primary_factory()
+        return factory
+
+    def status(self) -> Dict[str, Any]:
+        """Health summary (no database round trip)"""
+        if not self.enabled:
+            return {"status": "disabled"}
+        available = time.monotonic() >= self._down_until
+        if not available:
+            state = "unavailable"
+        elif self._lag is not None and self._lag > self.max_lag_seconds:
+            state = "lagging"
+        else:
+            state = "ok"
+        return {
+            "status": state,
+            "lag_seconds": None if self._lag is None else round(self._lag, 3),
+            "max_lag_seconds": self.max_lag_seconds,
+            "pinned_sessions": len(self._session_writes),
+            "pool": {"in_use": self._in_use, "idle": len(self._idle), "size": self.pool_size},
+            "reads": dict(self.reads),
+            "last_error": self._last_error,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            for conn in [self._lag_conn] + self._idle:
+                if conn is not None:
+                    self._close_quietly(conn)
+            self._lag_conn = None
+            self._idle = []
@@ -0,0 +1,51 @@
+"""
+AI Dojo Feedback Layer
+======================
+
+Analysis of seller feedback (feedback_logs) for the admin AI Dojo:
+
+1. Clustering - incremental, persisted grouping of `down` notes
+   - notes embedded once and assigned to running-mean centroids
+   - clusters materialized in PostgreSQL for millisecond dashboard loads
+   - LLM names only new or grown clusters
+
+2. Search - pg_trgm indexed note search for the AI Dojo details view
+   - ranked substring / fuzzy matches
+   - keyset pagination on (created_at, feedback_id) + total count estimate
+"""
+
+from .clustering import (
+    FEEDBACK_CLUSTER_BATCH_SIZE,
+    FEEDBACK_CLUSTER_SCHEMA_SQL,
+    FEEDBACK_CLUSTER_THRESHOLD,
+    assign_pending_feedback,
+    clusters_needing_names,
+    ensure_feedback_cluster_tables,
+    load_feedback_groups,
+    pending_feedback_count,
+    save_cluster_names,
+)
+from .search import (
+    FEEDBACK_SEARCH_SCHEMA_SQL,
+    FEEDBACK_SEARCH_SORTS,
+    ensure_feedback_search_indexes,
+    search_feedback,
+)
+
+__all__ = [
+    # Clustering
+    "FEEDBACK_CLUSTER_BATCH_SIZE",
+    "FEEDBACK_CLUSTER_SCHEMA_SQL",
+    "FEEDBACK_CLUSTER_THRESHOLD",
+    "assign_pending_feedback",
+    "clusters_needing_names",
+    "ensure_feedback_cluster_tables",
+    "load_feedback_groups",
+    "pending_feedback_count",
+    "save_cluster_names",
+    # Search
+    "FEEDBACK_SEARCH_SCHEMA_SQL",
+    "FEEDBACK_SEARCH_SORTS",
+    "ensure_feedback_search_indexes",
+    "search_feedback",
+]
@@ -0,0 +1,310 @@
+"""
+Feedback Clustering
+===================
+
+Incremental, persisted clustering of negative seller feedback (AI Dojo).
+Instead of sending every `down` note to the LLM on each dashboard load:
+
+1. New notes (no row in feedback_cluster_members yet) are embedded in one
+   batch and assigned to the nearest centroid of their language when the
+   cosine similarity reaches FEEDBACK_CLUSTER_THRESHOLD, otherwise they seed
+   a new cluster. Centroids are running means, so assignment is O(new notes
+   x clusters) and old notes are never re-embedded.
+2. Clusters live in PostgreSQL (feedback_clusters + feedback_cluster_members)
+   - the admin dashboard reads them with one indexed query.
+3. The LLM only names clusters that are new or grew by more than
+   FEEDBACK_RENAME_GROWTH since they were last named.
+
+Clusters are tied to the embedding model that built them; after a model
+change the language is re-clustered from scratch.
+"""
+
+import os
+import logging
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+from psycopg2.extras import RealDictCursor
+
+logger = logging.getLogger(__name__)
+
+FEEDBACK_CLUSTER_THRESHOLD = float(os.getenv("FEEDBACK_CLUSTER_THRESHOLD", "0.72"))
+FEEDBACK_CLUSTER_BATCH_SIZE = int(os.getenv("FEEDBACK_CLUSTER_BATCH_SIZE", "256"))
+FEEDBACK_RENAME_GROWTH = 0.5  # Re-name once a cluster grew by 50% since its last name
+FEEDBACK_NAMING_SAMPLES = 5   # Notes per cluster shown to the LLM
+
+FEEDBACK_CLUSTER_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS feedback_clusters (
+    cluster_id SERIAL PRIMARY KEY,
+    language TEXT NOT NULL CHECK (language IN ('pl','en')),
+    embedding_model TEXT NOT NULL,
+    centroid DOUBLE PRECISION[] NOT NULL,
+    size INT NOT NULL DEFAULT 0,
+    theme_name TEXT NULL,
+    named_size INT NOT NULL DEFAULT 0,
+    representative_note TEXT NOT NULL,
+    representative_similarity DOUBLE PRECISION NOT NULL DEFAULT 1,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS idx_feedback_clusters_language ON feedback_clusters(language, size DESC);
+
+CREATE TABLE IF NOT EXISTS feedback_cluster_members (
+    feedback_id INT PRIMARY KEY REFERENCES feedback_logs(feedback_id) ON DELETE CASCADE,
+    cluster_id INT NOT NULL REFERENCES feedback_clusters(cluster_id) ON DELETE CASCADE,
+    similarity DOUBLE PRECISION NOT NULL,
+    assigned_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS idx_feedback_cluster_members_cluster ON feedback_cluster_members(cluster_id, similarity DESC);
+"""
+
+# Notes still waiting for a cluster (anti-join on the members primary key)
+_PENDING_SQL = """
+    FROM feedback_logs f
+    WHERE f.language = %s AND f.feedback_type = 'down' AND btrim(f.feedback_note) <> ''
+      AND NOT EXISTS (SELECT 1 FROM feedback_cluster_members m WHERE m.feedback_id = f.feedback_id)
+"""
+
+
+def ensure_feedback_cluster_tables(conn) -> None:
+    """Create the cluster tables if missing (idempotent)"""
+    with conn.cursor() as cursor:
+        cursor.execute(FEEDBACK_CLUSTER_SCHEMA_SQL)
+    if not conn.autocommit:
+        conn.commit()
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+# =============================================================================
+# Incremental Assignment
+# =============================================================================
+
+def assign_pending_feedback(
+    conn,
+    language: str,
+    encode_fn: Callable[[List[str]], Any],
+    model_name: str,
+    threshold: float = FEEDBACK_CLUSTER_THRESHOLD,
+    batch_size: int = FEEDBACK_CLUSTER_BATCH_SIZE
+) -> Dict[str, int]:
+    """
+    Cluster one batch of unassigned `down` notes of a language.
+
+    Runs in one transaction under a per-language advisory lock, so several
+    API workers never build competing centroids.
+
+    Args:
+        conn: Dedicated psycopg2 connection with autocommit DISABLED
+        language: 'pl' | 'en'
+        encode_fn: Batch encoder (SentenceTransformer.encode)
+        model_name: Embedding model id stored with the clusters
+        threshold: Min cosine similarity to join an existing cluster
+        batch_size: Max notes per call (call again while "assigned" == batch_size)
+
+    Returns:
+        {"assigned": n, "created": n, "reset": n}
+    """
+    stats = {"assigned": 0, "created": 0, "reset": 0}
+    try:
+        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (f"feedback_clusters:{language}",))
+
+            # Centroids from another embedding model are not comparable - start over
+            cursor.execute(
+                "DELETE FROM feedback_clusters WHERE language = %s AND embedding_model <> %s",
+                (language, model_name)
+            )
+            stats["reset"] = cursor.rowcount
+
+            cursor.execute(
+                f"SELECT f.feedback_id, f.feedback_note {_PENDING_SQL} ORDER BY f.feedback_id LIMIT %s",
+                (language, batch_size)
+            )
+            pending = cursor.fetchall()
+            if not pending:
+                conn.rollback()
+                return stats
+
+            cursor.execute(
+                """
+                SELECT cluster_id, centroid, size, representative_similarity
+                FROM feedback_clusters
+                WHERE language = %s
+                ORDER BY cluster_id
+                """,
+                (language,)
+            )
+            clusters = [dict(row) for row in cursor.fetchall()]
+
+            embeddings = _normalize(np.asarray(encode_fn([row["feedback_note"] for row in pending]), dtype=np.float64))
+            centroids = (
+                np.asarray([row["centroid"] for row in clusters], dtype=np.float64)
+                if clusters else np.empty((0, embeddings.shape[1]))
+            )
+            touched = set()
+
+            for row, vector in zip(pending, embeddings):
+                best = -1
+                similarity = 0.0
+                if len(clusters):
+                    scores = _normalize(centroids) @ vector
+                    best = int(np.argmax(scores))
+                    similarity = float(scores[best])
+
+                if best >= 0 and similarity >= threshold:
+                    cluster = clusters[best]
+                    cluster["size"] += 1
+                    centroids[best] += (vector - centroids[best]) / cluster["size"]  # Running mean
+                    if similarity > cluster["representative_similarity"]:
+                        cluster["representative_similarity"] = similarity
+                        cluster["representative_note"] = row["feedback_note"]
+                    touched.add(best)
+                else:
+                    cursor.execute(
+                        """
+                        INSERT INTO feedback_clusters
+                        (language, embedding_model, centroid, size, representative_note, representative_similarity)
+                        VALUES (%s, %s, %s, 1, %s, 1)
+                        RETURNING cluster_id
+                        """,
+                        (language, model_name, vector.tolist(), row["feedback_note"])
+                    )
+                    clusters.append({
+                        "cluster_id": cursor.fetchone()["cluster_id"],
+                        "size": 1,
+                        "representative_similarity": 1.0,
+                    })
+                    centroids = np.vstack([centroids, vector])
+                    best = len(clusters) - 1
+                    similarity = 1.0
+                    stats["created"] += 1
+
+                cursor.execute(
+                    "INSERT INTO feedback_cluster_members (feedback_id, cluster_id, similarity) VALUES (%s, %s, %s)",
+                    (row["feedback_id"], clusters[best]["cluster_id"], similarity)
+                )
+                stats["assigned"] += 1
+
+            for index in touched:
+                cluster = clusters[index]
+                cursor.execute(
+                    """
+                    UPDATE feedback_clusters
+                    SET centroid = %s,
+                        size = %s,
+                        representative_note = COALESCE(%s, representative_note),
+                        representative_similarity = %s,
+                        updated_at = now()
+                    WHERE cluster_id = %s
+                    """,
+                    (centroids[index].tolist(), cluster["size"], cluster.get("representative_note"),
+                     cluster["representative_similarity"], cluster["cluster_id"])
+                )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    return stats
+
+
+def pending_feedback_count(conn, language: str) -> int:
+    """`down` notes of a language not clustered yet"""
+    with conn.cursor() as cursor:
+        cursor.execute(f"SELECT COUNT(*) {_PENDING_SQL}", (language,))
+        return cursor.fetchone()[0]
+
+
+# =============================================================================
+# Naming (LLM only for new / grown clusters)
+# =============================================================================
+
+def clusters_needing_names(
+    conn,
+    language: str,
+    growth: float = FEEDBACK_RENAME_GROWTH,
+    samples: int = FEEDBACK_NAMING_SAMPLES,
+    limit: int = 20
+) -> List[Dict[str, Any]]:
+    """
+    Unnamed clusters and clusters that grew past `growth` since their last
+    name, largest first, with the notes closest to each centroid.
+
+    Returns:
+        [{"cluster_id", "size", "theme_name", "notes": [str]}]
+    """
+    with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+        cursor.execute(
+            """
+            SELECT c.cluster_id, c.size, c.theme_name,
+                   ARRAY(
+                       SELECT f.feedback_note
+                       FROM feedback_cluster_members m
+                       JOIN feedback_logs f ON f.feedback_id = m.feedback_id
+                       WHERE m.cluster_id = c.cluster_id
+                       ORDER BY m.similarity DESC
+                       LIMIT %s
+                   ) AS notes
+            FROM feedback_clusters c
+            WHERE c.language = %s
+              AND (c.theme_name IS NULL OR c.size >= CEIL(c.named_size * (1 + %s)))
+            ORDER BY c.size DESC
+            LIMIT %s
+            """,
+            (samples, language, growth, limit)
+        )
+        return [dict(row) for row in cursor.fetchall()]
+
+
+def save_cluster_names(conn, names: Dict[int, str]) -> int:
+    """Store LLM theme names; `named_size` freezes the size they describe"""
+    if not names:
+        return 0
+    with conn.cursor() as cursor:
+        for cluster_id, theme_name in names.items():
+            cursor.execute(
+                "UPDATE feedback_clusters SET theme_name = %s, named_size = size, updated_at = now() WHERE cluster_id = %s",
+                (theme_name[:100], cluster_id)
+            )
+    if not conn.autocommit:
+        conn.commit()
+    return len(names)
+
+
+# =============================================================================
+# Dashboard Read
+# =============================================================================
+
+def load_feedback_groups(conn, language: str, min_size: int = 1, limit: int = 50) -> List[Dict[str, Any]]:
+    """
+    Materialized groups for the admin dashboard (same shape Prompt 5 used
+    to return). Unnamed clusters fall back to their representative note.
+    """
+    with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+        cursor.execute(
+            """
+            SELECT cluster_id, theme_name, size, representative_note, updated_at
+            FROM feedback_clusters
+            WHERE language = %s AND size >= %s
+            ORDER BY size DESC, cluster_id
+            LIMIT %s
+            """,
+            (language, min_size, limit)
+        )
+        rows = cursor.fetchall()
+
+    return [
+        {
+            "cluster_id": row["cluster_id"],
+            "theme_name": row["theme_name"] or row["representative_note"][:60],
+            "count": row["size"],
+            "representative_note": row["representative_note"],
+            "named": row["theme_name"] is not None,
+            "updated_at": row["updated_at"].isoformat() if row["updated_at"] else None,
+        }
+        for row in rows
+    ]
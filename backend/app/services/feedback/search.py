@@ -0,0 +1,192 @@
+"""
+Feedback Search
+===============
+
+Indexed search over feedback_logs.feedback_note for the AI Dojo details
+view (replaces an unbounded `ILIKE '%note%'` sequential scan):
+
+- pg_trgm GIN index - serves both substring (ILIKE) and fuzzy word
+  similarity (`<%`) matches; used instead of a tsvector because stock
+  PostgreSQL ships no Polish text search dictionary
+- ranked results - `word_similarity(query, note)` is returned as `score`
+- keyset pagination - `(created_at, feedback_id)` for sort=recent,
+  `(score, feedback_id)` for sort=relevance; the cursor is opaque
+- total count - exact up to FEEDBACK_SEARCH_EXACT_COUNT_CAP matches,
+  planner estimate (EXPLAIN) beyond that
+"""
+
+import json
+import base64
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from psycopg2.extras import RealDictCursor
+
+logger = logging.getLogger(__name__)
+
+FEEDBACK_SEARCH_SORTS = ("recent", "relevance")
+FEEDBACK_SEARCH_MAX_LIMIT = 200
+FEEDBACK_SEARCH_EXACT_COUNT_CAP = 1000  # Count exactly up to here, estimate above
+
+FEEDBACK_SEARCH_SCHEMA_SQL = """
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS idx_feedback_logs_note_trgm ON feedback_logs USING gin (feedback_note gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_feedback_logs_language_keyset ON feedback_logs(language, created_at DESC, feedback_id DESC);
+"""
+
+
+def ensure_feedback_search_indexes(conn) -> None:
+    """Create pg_trgm + search indexes if missing (idempotent)"""
+    with conn.cursor() as cursor:
+        cursor.execute(FEEDBACK_SEARCH_SCHEMA_SQL)
+    if not conn.autocommit:
+        conn.commit()
+
+
+# =============================================================================
+# Cursor Encoding
+# =============================================================================
+
+def encode_search_cursor(sort: str, row: Dict[str, Any]) -> str:
+    """Opaque keyset cursor pointing after `row`"""
+    key = row["created_at"].isoformat() if sort == "recent" else row["score"]
+    raw = json.dumps({"s": sort, "k": key, "id": row["feedback_id"]})
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_search_cursor(cursor: str, sort: str) -> Tuple[Any, int]:
+    """(sort key, feedback_id) of a cursor; ValueError if invalid or from another sort"""
+    try:
+        state = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if state["s"] != sort:
+            raise ValueError("cursor belongs to another sort order")
+        key = datetime.fromisoformat(state["k"]) if sort == "recent" else float(state["k"])
+        return key, int(state["id"])
+    except (KeyError, TypeError, ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+
+def _like_pattern(query: str) -> str:
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+# =============================================================================
+# Search
+# =============================================================================
+
+def _estimate_rows(cursor, where_sql: str, params: Dict[str, Any]) -> int:
+    """Planner row estimate for the filter (no scan)"""
+    cursor.execute(f"EXPLAIN (FORMAT JSON) SELECT 1 FROM feedback_logs WHERE {where_sql}", params)
+    plan = cursor.fetchone()
+    plan = plan["QUERY PLAN"] if isinstance(plan, dict) else plan[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_feedback_matches(cursor, where_sql: str, params: Dict[str, Any]) -> Tuple[int, bool]:
+    """
+    (total, is_estimate): exact when at most FEEDBACK_SEARCH_EXACT_COUNT_CAP
+    rows match (capped scan through the index), planner estimate otherwise
+    """
+    cursor.execute(
+        f"SELECT COUNT(*) AS total FROM (SELECT 1 FROM feedback_logs WHERE {where_sql} LIMIT %(count_cap)s) capped",
+        {**params, "count_cap": FEEDBACK_SEARCH_EXACT_COUNT_CAP + 1}
+    )
+    row = cursor.fetchone()
+    total = row["total"] if isinstance(row, dict) else row[0]
+    if total <= FEEDBACK_SEARCH_EXACT_COUNT_CAP:
+        return total, False
+    return max(total, _estimate_rows(cursor, where_sql, params)), True
+
+
+def search_feedback(
+    conn,
+    query: str,
+    language: str,
+    feedback_type: Optional[str] = None,
+    sort: str = "recent",
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    with_total: bool = True
+) -> Dict[str, Any]:
+    """
+    One page of feedback entries matching `query` (substring or fuzzy word match).
+
+    Args:
+        conn: psycopg2 connection
+        query: Search text ('' lists everything)
+        language: 'pl' | 'en'
+        feedback_type: 'up' | 'down' | None (both)
+        sort: 'recent' (newest first) | 'relevance' (best score first)
+        limit: Page size (capped at FEEDBACK_SEARCH_MAX_LIMIT)
+        cursor: next_cursor of the previous page
+        with_total: Also compute the total (skip it when paging further)
+
+    Returns:
+        {"details": [...], "next_cursor": str | None, "total": int | None, "total_is_estimate": bool}
+    """
+    if sort not in FEEDBACK_SEARCH_SORTS:
+        raise ValueError(f"sort must be one of {FEEDBACK_SEARCH_SORTS}")
+    limit = max(1, min(limit, FEEDBACK_SEARCH_MAX_LIMIT))
+    query = " ".join(query.split())
+
+    params: Dict[str, Any] = {"language": language, "query": query, "like": _like_pattern(query), "limit": limit + 1}
+    filters = ["language = %(language)s"]
+    if feedback_type:
+        filters.append("feedback_type = %(feedback_type)s")
+        params["feedback_type"] = feedback_type
+    if query:
+        # Both predicates are served by the trigram GIN index
+        filters.append("(feedback_note ILIKE %(like)s OR %(query)s <%% feedback_note)")
+    where_sql = " AND ".join(filters)
+
+    # float8 so the score round-trips exactly through the cursor
+    score_sql = "word_similarity(%(query)s, feedback_note)::float8" if query else "0.0::float8"
+    if sort == "recent":
+        order_sql = "created_at DESC, feedback_id DESC"
+        keyset_sql = "(created_at, feedback_id) < (%(after_key)s, %(after_id)s)"
+    else:
+        order_sql = "score DESC, feedback_id DESC"
+        keyset_sql = "(score, feedback_id) < (%(after_key)s, %(after_id)s)"
+
+    page_filter = ""
+    if cursor:
+        params["after_key"], params["after_id"] = decode_search_cursor(cursor, sort)
+        page_filter = f"WHERE {keyset_sql}"
+
+    with conn.cursor(cursor_factory=RealDictCursor) as db_cursor:
+        db_cursor.execute(
+            f"""
+            SELECT * FROM (
+                SELECT feedback_id, feedback_type, original_input, bad_suggestion, feedback_note,
+                       created_at, {score_sql} AS score
+                FROM feedback_logs
+                WHERE {where_sql}
+            ) matches
+            {page_filter}
+            ORDER BY {order_sql}
+            LIMIT %(limit)s
+            """,
+            params
+        )
+        rows: List[Dict[str, Any]] = [dict(row) for row in db_cursor.fetchall()]
+
+        total, is_estimate = (None, False)
+        if with_total:
+            total, is_estimate = count_feedback_matches(db_cursor, where_sql, params)
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_search_cursor(sort, rows[-1]) if has_more else None
+    for row in rows:
+        row["score"] = round(float(row["score"]), 4)
+
+    return {
+        "details": rows,
+        "next_cursor": next_cursor,
+        "total": total,
+        "total_is_estimate": is_estimate,
+    }
@@ -0,0 +1,218 @@
+"""
+RAG Knowledge Layer
+===================
+
+Shared building blocks for the Qdrant-backed knowledge base, used by the
+FastAPI app, seed.py and the import tooling:
+
+1. Vector Store - Qdrant client factory
+   - remote server (QDRANT_HOST / QDRANT_PORT)
+   - embedded on-disk (QDRANT_PATH) or in-memory mode for single-node
+     showroom boxes and offline benchmarks
+   - async gRPC client for the API + connection health probe
+
+2. Collection - provisioning and tuning
+   - keyword payload indexes on `language` / `type`
+   - int8 scalar quantization with rescoring
+   - HNSW profiles (fast / balanced / accurate)
+
+3. Retrieval - multi-query helpers for Slow Path context
+   - informative seller note selection
+   - merge / dedupe of batched search results under a context budget
+
+4. Golden Index - precomputed trigger_context embeddings for instant
+   Golden Standard answers that bypass the Fast Path LLM
+
+5. Lexical Index - BM25 over nugget title / keywords / content
+   - Polish-aware normalization with diacritics folding
+   - exact curated-keyword hits that skip the embedding pass
+   - reciprocal rank fusion with vector results
+
+6. Outbox - transactional ingestion queue (rag_outbox table)
+   - admin writes commit PostgreSQL only, a worker batches embeddings and
+     Qdrant upserts with retries
+   - deterministic UUIDv5 point ids (idempotent re-delivery)
+   - done rows purged after RAG_OUTBOX_RETENTION_DAYS
+
+7. Reindex - blue/green re-embedding into a versioned collection
+   - streaming scroll, batched re-embedding, chunked upserts
+   - outbox replay of writes made during the copy, final replay with the
+     outbox workers paused
+   - atomic swap of the collection alias the API reads from
+
+8. Sync - incremental diff-sync of the knowledge JSON files
+   - content hashes in point payloads, only new / changed items re-embedded
+   - changes queued through rag_outbox (+ golden_standards rows)
+
+9. Seeding - pipelined, resumable bulk loader for seed.py
+   - streaming JSON input, batched encoding, bounded concurrent upserts
+   - checkpoint file for resuming interrupted runs
+
+10. Import Jobs - background jobs for streaming (NDJSON / file) bulk imports
+    - incremental parsing, progress registry with admin WebSocket listeners
+
+11. Listing - paginated admin listings of nuggets and Golden Standards
+    - Qdrant scroll offset / PostgreSQL keyset cursors
+    - server-side search and type / category filters, field projection
+"""
+
+from .vector_store import (
+    QDRANT_MODE,
+    QDRANT_MODES,
+    QDRANT_PATH,
+    create_async_qdrant_client,
+    create_qdrant_client,
+    describe_qdrant_target,
+    is_embedded_mode,
+    probe_qdrant,
+    resolve_qdrant_mode,
+)
+from .collection import (
+    HNSW_PROFILES,
+    HnswProfile,
+    build_search_params,
+    ensure_collection,
+    ensure_collection_async,
+    estimate_vector_memory,
+    get_hnsw_profile,
+    migrate_collection,
+)
+from .retrieval import merge_search_results, select_informative_notes
+from .golden_index import GOLDEN_MATCH_THRESHOLD, GoldenMatch, GoldenStandardIndex
+from .lexical_index import LexicalIndex, fold_text, reciprocal_rank_fusion, tokenize
+from .outbox import (
+    OUTBOX_SCHEMA_SQL,
+    drain_outbox_batch,
+    enqueue_delete,
+    enqueue_upsert,
+    ensure_outbox_table,
+    golden_standard_point_id,
+    nugget_point_id,
+    outbox_changes_since,
+    outbox_clock,
+    outbox_last_processed,
+    outbox_paused,
+    outbox_stats,
+    purge_done_outbox,
+)
+from .reindex import (
+    QDRANT_COLLECTION_ALIAS,
+    ensure_alias_async,
+    reindex_collection,
+    replay_and_swap,
+    replay_outbox,
+    resolve_alias,
+    resolve_alias_async,
+    swap_alias,
+    versioned_collection_name,
+)
+from .sync import (
+    SyncItem,
+    SyncPlan,
+    apply_sync,
+    content_hash,
+    golden_sync_items,
+    nugget_sync_items,
+    plan_sync,
+    scan_collection,
+    seed_point_id,
+    sync_golden_standards_postgres,
+)
+from .seeding import SeedCheckpoint, SeedStats, file_fingerprint, iter_json_array, run_seed_pipeline
+from .import_jobs import ImportJob, ImportJobRegistry, iter_upload_items
+from .listing import (
+    GOLDEN_LISTING_SCHEMA_SQL,
+    GOLDEN_LIST_FIELDS,
+    RAG_LIST_FIELDS,
+    ensure_golden_listing_indexes,
+    list_golden_standards_page,
+    list_rag_nuggets_page,
+    parse_list_fields,
+)
+
+__all__ = [
+    # Vector Store
+    "QDRANT_MODE",
+    "QDRANT_MODES",
+    "QDRANT_PATH",
+    "create_async_qdrant_client",
+    "create_qdrant_client",
+    "describe_qdrant_target",
+    "is_embedded_mode",
+    "probe_qdrant",
+    "resolve_qdrant_mode",
+    # Collection
+    "HNSW_PROFILES",
+    "HnswProfile",
+    "build_search_params",
+    "ensure_collection",
+    "ensure_collection_async",
+    "estimate_vector_memory",
+    "get_hnsw_profile",
+    "migrate_collection",
+    # Retrieval
+    "merge_search_results",
+    "select_informative_notes",
+    # Golden Index
+    "GOLDEN_MATCH_THRESHOLD",
+    "GoldenMatch",
+    "GoldenStandardIndex",
+    # Lexical Index
+    "LexicalIndex",
+    "fold_text",
+    "reciprocal_rank_fusion",
+    "tokenize",
+    # Outbox
+    "OUTBOX_SCHEMA_SQL",
+    "drain_outbox_batch",
+    "enqueue_delete",
+    "enqueue_upsert",
+    "ensure_outbox_table",
+    "golden_standard_point_id",
+    "nugget_point_id",
+    "outbox_changes_since",
+    "outbox_clock",
+    "outbox_last_processed",
+    "outbox_paused",
+    "outbox_stats",
+    "purge_done_outbox",
+    # Reindex
+    "QDRANT_COLLECTION_ALIAS",
+    "ensure_alias_async",
+    "reindex_collection",
+    "replay_and_swap",
+    "replay_outbox",
+    "resolve_alias",
+    "resolve_alias_async",
+    "swap_alias",
+    "versioned_collection_name",
+    # Sync
+    "SyncItem",
+    "SyncPlan",
+    "apply_sync",
+    "content_hash",
+    "golden_sync_items",
+    "nugget_sync_items",
+    "plan_sync",
+    "scan_collection",
+    "seed_point_id",
+    "sync_golden_standards_postgres",
+    # Seeding
+    "SeedCheckpoint",
+    "SeedStats",
+    "file_fingerprint",
+    "iter_json_array",
+    "run_seed_pipeline",
+    # Import Jobs
+    "ImportJob",
+    "ImportJobRegistry",
+    "iter_upload_items",
+    # Listing
+    "GOLDEN_LISTING_SCHEMA_SQL",
+    "GOLDEN_LIST_FIELDS",
+    "RAG_LIST_FIELDS",
+    "ensure_golden_listing_indexes",
+    "list_golden_standards_page",
+    "list_rag_nuggets_page",
+    "parse_list_fields",
+]
@@ -0,0 +1,276 @@
+"""
+RAG Collection Provisioning & Tuning
+====================================
+
+Creates and migrates the Qdrant RAG collection with a tuned layout:
+
+1. Payload indexes (keyword) on `language` and `type`
+   - every query_rag search and list_rag_nuggets scroll filters on `language`
+   - full-text (lowercased word tokens) on `title` / `keywords` for the
+     admin listing search
+2. int8 scalar quantization (quantized vectors kept in RAM, rescored
+   against the original float32 vectors)
+3. HNSW profiles - `m` / `ef_construct` at build time, `ef` at query time
+
+Profiles are selected with QDRANT_HNSW_PROFILE (fast | balanced | accurate),
+quantization with QDRANT_QUANTIZATION (int8 | none) and original-vector
+placement with QDRANT_VECTORS_ON_DISK (true keeps only int8 vectors in RAM).
+
+NOTE: Embedded local/:memory: Qdrant (see vector_store.py) performs exact
+search and ignores HNSW, quantization and payload index settings - they are
+still stored so a later move to a Qdrant server keeps the same layout.
+"""
+
+import os
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from qdrant_client import AsyncQdrantClient, QdrantClient, models
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# Tuning Profiles
+# =============================================================================
+
+@dataclass(frozen=True)
+class HnswProfile:
+    """HNSW graph parameters (build time) and search beam width (query time)"""
+    m: int  # Edges per node - higher = better recall, more RAM
+    ef_construct: int  # Build-time beam width - higher = better graph, slower indexing
+    ef: int  # Query-time beam width - higher = better recall, slower search
+
+
+HNSW_PROFILES: Dict[str, HnswProfile] = {
+    "fast": HnswProfile(m=16, ef_construct=100, ef=64),
+    "balanced": HnswProfile(m=16, ef_construct=200, ef=128),
+    "accurate": HnswProfile(m=32, ef_construct=400, ef=256),
+}
+
+# Payload fields filtered in query_rag / list_rag_nuggets
+KEYWORD_INDEX_FIELDS: List[str] = ["language", "type"]
+TEXT_INDEX_FIELDS: List[str] = ["title", "keywords"]
+
+_TEXT_INDEX_PARAMS = models.TextIndexParams(
+    type=models.TextIndexType.TEXT,
+    tokenizer=models.TokenizerType.WORD,
+    min_token_len=2,
+    lowercase=True
+)
+
+QDRANT_HNSW_PROFILE = os.getenv("QDRANT_HNSW_PROFILE", "balanced").lower()
+QDRANT_QUANTIZATION = os.getenv("QDRANT_QUANTIZATION", "int8").lower()
+QDRANT_VECTORS_ON_DISK = os.getenv("QDRANT_VECTORS_ON_DISK", "false").lower() in ("1", "true", "yes")
+
+# Rescoring fetches limit * oversampling int8 candidates, then re-ranks them
+# with the original vectors - keeps recall at float32 level
+QUANTIZATION_OVERSAMPLING = 2.0
+
+
+def get_hnsw_profile(name: Optional[str] = None) -> HnswProfile:
+    """
+    Look up an HNSW profile by name (defaults to QDRANT_HNSW_PROFILE).
+
+    Raises:
+        ValueError: If the profile is unknown
+    """
+    resolved = (name or QDRANT_HNSW_PROFILE).lower()
+    if resolved not in HNSW_PROFILES:
+        raise ValueError(f"Unknown HNSW profile '{resolved}' (expected one of: {', '.join(HNSW_PROFILES)})")
+    return HNSW_PROFILES[resolved]
+
+
+def _quantization_enabled(quantization: Optional[str]) -> bool:
+    return (quantization or QDRANT_QUANTIZATION) == "int8"
+
+
+def build_quantization_config(quantization: Optional[str] = None) -> Optional[models.ScalarQuantization]:
+    """int8 scalar quantization config, or None when disabled"""
+    if not _quantization_enabled(quantization):
+        return None
+    return models.ScalarQuantization(
+        scalar=models.ScalarQuantizationConfig(
+            type=models.ScalarType.INT8,
+            quantile=0.99,  # Clip outliers so the int8 range is not wasted
+            always_ram=True
+        )
+    )
+
+
+def build_search_params(
+    profile: Optional[str] = None,
+    quantization: Optional[str] = None
+) -> models.SearchParams:
+    """Query-time parameters matching the collection profile (ef + rescoring)"""
+    hnsw = get_hnsw_profile(profile)
+    quantization_params = None
+    if _quantization_enabled(quantization):
+        quantization_params = models.QuantizationSearchParams(
+            ignore=False,
+            rescore=True,
+            oversampling=QUANTIZATION_OVERSAMPLING
+        )
+    return models.SearchParams(hnsw_ef=hnsw.ef, quantization=quantization_params)
+
+
+# =============================================================================
+# Provisioning & Migration
+# =============================================================================
+
+def _collection_layout(
+    vector_size: int,
+    profile: Optional[str],
+    quantization: Optional[str],
+    vectors_on_disk: Optional[bool]
+) -> Dict[str, Any]:
+    """create_collection() kwargs for the tuned layout"""
+    hnsw = get_hnsw_profile(profile)
+    return {
+        "vectors_config": models.VectorParams(
+            size=vector_size,
+            distance=models.Distance.COSINE,
+            on_disk=QDRANT_VECTORS_ON_DISK if vectors_on_disk is None else vectors_on_disk
+        ),
+        "hnsw_config": models.HnswConfigDiff(m=hnsw.m, ef_construct=hnsw.ef_construct),
+        "quantization_config": build_quantization_config(quantization),
+    }
+
+
+def create_payload_indexes(client: QdrantClient, collection_name: str) -> None:
+    """Create keyword / full-text payload indexes on filtered fields (idempotent)"""
+    for field_name in KEYWORD_INDEX_FIELDS:
+        client.create_payload_index(
+            collection_name=collection_name,
+            field_name=field_name,
+            field_schema=models.PayloadSchemaType.KEYWORD,
+            wait=True
+        )
+    for field_name in TEXT_INDEX_FIELDS:
+        client.create_payload_index(
+            collection_name=collection_name,
+            field_name=field_name,
+            field_schema=_TEXT_INDEX_PARAMS,
+            wait=True
+        )
+
+
+def ensure_collection(
+    client: QdrantClient,
+    collection_name: str,
+    vector_size: int,
+    profile: Optional[str] = None,
+    quantization: Optional[str] = None,
+    vectors_on_disk: Optional[bool] = None
+) -> bool:
+    """
+    Create the RAG collection with the tuned layout if it does not exist yet (K10).
+
+    Returns:
+        True if the collection was created, False if it already existed
+    """
+    if client.collection_exists(collection_name=collection_name):
+        return False
+
+    client.create_collection(
+        collection_name=collection_name,
+        **_collection_layout(vector_size, profile, quantization, vectors_on_disk)
+    )
+    create_payload_indexes(client, collection_name)
+    logger.info(f"✓ Qdrant collection '{collection_name}' created (profile={profile or QDRANT_HNSW_PROFILE})")
+    return True
+
+
+async def ensure_collection_async(
+    client: AsyncQdrantClient,
+    collection_name: str,
+    vector_size: int,
+    profile: Optional[str] = None,
+    quantization: Optional[str] = None,
+    vectors_on_disk: Optional[bool] = None
+) -> bool:
+    """Async variant of ensure_collection() for the API's shared AsyncQdrantClient"""
+    if await client.collection_exists(collection_name=collection_name):
+        return False
+
+    await client.create_collection(
+        collection_name=collection_name,
+        **_collection_layout(vector_size, profile, quantization, vectors_on_disk)
+    )
+    for field_name in KEYWORD_INDEX_FIELDS:
+        await client.create_payload_index(
+            collection_name=collection_name,
+            field_name=field_name,
+            field_schema=models.PayloadSchemaType.KEYWORD,
+            wait=True
+        )
+    for field_name in TEXT_INDEX_FIELDS:
+        await client.create_payload_index(
+            collection_name=collection_name,
+            field_name=field_name,
+            field_schema=_TEXT_INDEX_PARAMS,
+            wait=True
+        )
+    logger.info(f"✓ Qdrant collection '{collection_name}' created (profile={profile or QDRANT_HNSW_PROFILE})")
+    return True
+
+
+def migrate_collection(
+    client: QdrantClient,
+    collection_name: str,
+    profile: Optional[str] = None,
+    quantization: Optional[str] = None
+) -> Dict[str, object]:
+    """
+    Apply payload indexes, quantization and HNSW profile to an EXISTING collection.
+
+    Qdrant rebuilds the HNSW graph and quantized vectors in the background;
+    the collection stays searchable during the optimization.
+
+    Returns:
+        Summary of the applied settings
+    """
+    hnsw = get_hnsw_profile(profile)
+    quantization_config = build_quantization_config(quantization)
+
+    client.update_collection(
+        collection_name=collection_name,
+        vectors_config={"": models.VectorParamsDiff(on_disk=QDRANT_VECTORS_ON_DISK)},
+        hnsw_config=models.HnswConfigDiff(m=hnsw.m, ef_construct=hnsw.ef_construct),
+        quantization_config=quantization_config or models.Disabled.DISABLED
+    )
+    create_payload_indexes(client, collection_name)
+
+    logger.info(f"✓ Qdrant collection '{collection_name}' migrated (hnsw m={hnsw.m}, ef_construct={hnsw.ef_construct}, quantization={'int8' if quantization_config else 'none'})")
+    return {
+        "collection": collection_name,
+        "hnsw_m": hnsw.m,
+        "hnsw_ef_construct": hnsw.ef_construct,
+        "hnsw_ef": hnsw.ef,
+        "quantization": "int8" if quantization_config else "none",
+        "vectors_on_disk": QDRANT_VECTORS_ON_DISK,
+        "payload_indexes": list(KEYWORD_INDEX_FIELDS),
+    }
+
+
+def estimate_vector_memory(
+    points_count: int,
+    vector_size: int,
+    quantization: Optional[str] = None,
+    vectors_on_disk: Optional[bool] = None
+) -> Dict[str, int]:
+    """
+    Rough RAM estimate (bytes) for vector storage - float32 originals vs int8 copies.
+
+    With vectors on disk (QDRANT_VECTORS_ON_DISK=true) only the int8 copies stay resident.
+    """
+    on_disk = QDRANT_VECTORS_ON_DISK if vectors_on_disk is None else vectors_on_disk
+    float32_bytes = points_count * vector_size * 4
+    int8_bytes = points_count * vector_size if _quantization_enabled(quantization) else 0
+    resident = int8_bytes if (int8_bytes and on_disk) else float32_bytes + int8_bytes
+    return {
+        "float32_bytes": float32_bytes,
+        "int8_bytes": int8_bytes,
+        "resident_bytes": resident,
+    }
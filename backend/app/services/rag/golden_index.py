@@ -0,0 +1,117 @@
+"""
+Golden Standard Instant-Answer Index
+====================================
+
+In-memory index of golden_standards trigger_context embeddings. When a
+seller note is (almost) the same situation as a curated trigger, Fast Path
+returns the curated golden_response immediately - no Gemini call, no quota.
+
+- Built once at startup from PostgreSQL, rebuilt after create_golden_standard
+  and the bulk import (standards change rarely, a full rebuild is cheap)
+- Vectors are L2-normalized, so a match is one matrix-vector product per
+  language (cosine similarity)
+- The threshold is deliberately HIGH - a wrong canned answer is worse than
+  a 2s wait for the LLM
+"""
+
+import os
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+GOLDEN_MATCH_THRESHOLD = float(os.getenv("GOLDEN_MATCH_THRESHOLD", "0.90"))
+
+
+@dataclass
+class GoldenMatch:
+    """Best golden standard for a seller note"""
+    gs_id: Any
+    trigger_context: str
+    golden_response: str
+    category: Optional[str]
+    score: float  # Cosine similarity 0.0-1.0
+
+
+class GoldenStandardIndex:
+    """
+    Per-language matrix of normalized trigger embeddings.
+
+    Usage:
+        index = GoldenStandardIndex()
+        index.rebuild(rows, encode_fn=embedding_model.encode)
+        match = index.match(note_vector, "pl")
+    """
+
+    def __init__(self, threshold: float = GOLDEN_MATCH_THRESHOLD):
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._vectors: Dict[str, np.ndarray] = {}
+        self._entries: Dict[str, List[Dict[str, Any]]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+        return matrix / np.where(norms == 0, 1.0, norms)
+
+    def rebuild(self, rows: Iterable[Dict[str, Any]], encode_fn: Callable[[List[str]], Any]) -> int:
+        """
+        Replace the index with embeddings of the given golden standards.
+
+        Args:
+            rows: Dicts with gs_id, trigger_context, golden_response, category, language
+            encode_fn: Batch encoder (SentenceTransformer.encode)
+
+        Returns:
+            Number of indexed standards
+        """
+        by_language: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            if row.get("trigger_context") and row.get("golden_response"):
+                by_language.setdefault(row.get("language") or "pl", []).append(row)
+
+        vectors: Dict[str, np.ndarray] = {}
+        for language, entries in by_language.items():
+            embeddings = np.asarray(encode_fn([e["trigger_context"] for e in entries]), dtype=np.float32)
+            vectors[language] = self._normalize(embeddings)
+
+        # Swap atomically - matches never see a half-built index
+        with self._lock:
+            self._vectors = vectors
+            self._entries = by_language
+
+        logger.info(f"✓ Golden standard index rebuilt: {len(self)} triggers ({', '.join(sorted(by_language)) or 'empty'})")
+        return len(self)
+
+    def match(self, vector: Any, language: str, threshold: Optional[float] = None) -> Optional[GoldenMatch]:
+        """
+        Best trigger for a note embedding, or None below the threshold.
+        """
+        with self._lock:
+            matrix = self._vectors.get(language)
+            entries = self._entries.get(language)
+        if matrix is None or not entries:
+            return None
+
+        query = self._normalize(np.asarray(vector, dtype=np.float32))
+        scores = matrix @ query
+        best = int(np.argmax(scores))
+        score = float(scores[best])
+        if score < (self.threshold if threshold is None else threshold):
+            return None
+
+        entry = entries[best]
+        return GoldenMatch(
+            gs_id=entry.get("gs_id"),
+            trigger_context=entry["trigger_context"],
+            golden_response=entry["golden_response"],
+            category=entry.get("category"),
+            score=score
+        )
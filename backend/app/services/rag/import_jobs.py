@@ -0,0 +1,130 @@
+"""
+Bulk Import Jobs
+================
+
+Background jobs for streaming bulk imports (RAG nuggets, golden standards).
+The upload endpoint only spools the request body to a temp file and
+returns a job id; the job parses the file incrementally and writes items
+in chunks (one transaction per chunk, via the RAG outbox), so neither the
+request nor the worker ever holds the whole upload in memory.
+
+- iter_upload_items: NDJSON (one object per line) or a JSON array file
+- ImportJob: progress counters, first errors, lifecycle timestamps
+- ImportJobRegistry: in-process job table + listeners (admin WebSocket)
+"""
+
+import json
+import uuid
+import asyncio
+import logging
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from .seeding import iter_json_array
+
+logger = logging.getLogger(__name__)
+
+MAX_JOB_ERRORS = 20  # Error messages kept per job (counts are always exact)
+
+
+def iter_upload_items(path: str) -> Iterator[Tuple[int, Any]]:
+    """
+    Yield (line_or_index, item) from an NDJSON or JSON-array file.
+
+    Malformed NDJSON lines are yielded as (line_no, ValueError) so the job
+    can count them without aborting the import.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        head = f.read(1024).lstrip()
+
+    if head.startswith("["):
+        for index, item in enumerate(iter_json_array(path, skip_comment_lines=False), start=1):
+            yield index, item
+        return
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield line_no, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_no, ValueError(f"Invalid JSON: {e.msg}")
+
+
+@dataclass
+class ImportJob:
+    """State of one bulk import job"""
+    job_id: str
+    kind: str  # rag | golden_standards
+    language: str
+    source_name: str
+    status: str = "queued"  # queued | running | completed | failed
+    processed: int = 0
+    success_count: int = 0
+    error_count: int = 0
+    errors: List[str] = field(default_factory=list)
+    message: Optional[str] = None
+    created_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
+    def add_error(self, error: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_JOB_ERRORS:
+            self.errors.append(error)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class ImportJobRegistry:
+    """
+    In-process job table (newest `max_jobs` kept) with async listeners.
+
+    Usage:
+        job = registry.create("rag", "pl", "nuggets.ndjson")
+        registry.subscribe(send_to_admin_socket)
+        await registry.publish(job)
+    """
+
+    def __init__(self, max_jobs: int = 50):
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, ImportJob]" = OrderedDict()
+        self._listeners: Set[Callable[[Dict[str, Any]], Awaitable[None]]] = set()
+
+    def create(self, kind: str, language: str, source_name: str) -> ImportJob:
+        job = ImportJob(job_id=f"IMP-{uuid.uuid4().hex[:12]}", kind=kind, language=language, source_name=source_name)
+        self._jobs[job.job_id] = job
+        while len(self._jobs) > self.max_jobs:
+            self._jobs.popitem(last=False)
+        return job
+
+    def get(self, job_id: str) -> Optional[ImportJob]:
+        return self._jobs.get(job_id)
+
+    def list(self) -> List[ImportJob]:
+        return list(reversed(self._jobs.values()))
+
+    def subscribe(self, listener: Callable[[Dict[str, Any]], Awaitable[None]]) -> None:
+        self._listeners.add(listener)
+
+    def unsubscribe(self, listener: Callable[[Dict[str, Any]], Awaitable[None]]) -> None:
+        self._listeners.discard(listener)
+
+    async def publish(self, job: ImportJob) -> None:
+        """Push the job state to every listener (a failing listener is dropped)"""
+        snapshot = job.to_dict()
+        for listener in list(self._listeners):
+            try:
+                await listener(snapshot)
+            except Exception as e:
+                logger.warning(f"⚠ Import job listener dropped: {e}")
+                self._listeners.discard(listener)
+
+    def publish_threadsafe(self, job: ImportJob, loop: asyncio.AbstractEventLoop) -> None:
+        """publish() from a worker thread (fire-and-forget)"""
+        asyncio.run_coroutine_threadsafe(self.publish(job), loop)
@@ -0,0 +1,251 @@
+"""
+RAG Lexical Index - BM25 over nugget title / keywords / content
+================================================================
+
+Compact in-memory inverted index built at startup from the Qdrant payloads.
+Complements dense search where embeddings are weak: model names ("Model Y
+Juniper"), jargon ("NaszEauto", "leasing operacyjny", "V2L") and short
+keyword queries that barely clear query_rag's 0.50 score threshold.
+
+- Polish-aware normalization: lowercase, diacritics folding (ą→a, ł→l, ż→z)
+  and light suffix stripping so "leasingu" / "leasingiem" hit "leasing"
+- Field weighting: keywords x3, title x2, content x1
+- Exact keyword hits: a curated `keywords` / `tags` phrase that appears
+  verbatim in the query AND is selective (few nuggets carry it) lets
+  query_rag answer without an embedding pass
+- reciprocal_rank_fusion merges BM25 and vector rankings
+"""
+
+import math
+import re
+import logging
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# BM25 parameters (standard Okapi defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+FIELD_WEIGHTS = {"keywords": 3, "title": 2, "content": 1}
+
+# A keyword phrase only short-circuits retrieval when at most this many
+# nuggets carry it ("DISC" on 40 nuggets is a topic, "NaszEauto" on 3 is an
+# answer). Single-word phrases must also be that rare in the whole corpus
+# text - "model" is a curated keyword on a few nuggets but appears everywhere
+EXACT_MAX_DOC_FREQ = 8
+EXACT_MIN_PHRASE_CHARS = 3
+
+# Reciprocal rank fusion constant (Cormack et al.)
+RRF_K = 60
+
+_POLISH_FOLD = str.maketrans("ąćęłńóśźż", "acelnoszz")
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Inflection endings (after folding), longest first; a stem keeps >= 4 chars
+_SUFFIXES = sorted([
+    "owie", "ami", "ach", "owi", "iem", "ego", "emu", "ych", "ymi", "ich", "imi",
+    "ow", "om", "em", "ie", "ej", "a", "e", "i", "o", "u", "y",
+], key=len, reverse=True)
+_MIN_STEM = 4
+
+
+def fold_text(text: str) -> str:
+    """Lowercase and strip diacritics (Polish letters first, then any combining marks)"""
+    folded = text.lower().translate(_POLISH_FOLD)
+    decomposed = unicodedata.normalize("NFKD", folded)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def stem_token(token: str) -> str:
+    """Strip one common Polish inflection ending (digits and short tokens untouched)"""
+    if token.isdigit() or len(token) <= _MIN_STEM:
+        return token
+    for suffix in _SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= _MIN_STEM:
+            return token[:-len(suffix)]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Normalized, stemmed tokens of a text"""
+    return [stem_token(token) for token in _TOKEN_RE.findall(fold_text(text or ""))]
+
+
+def _keyword_phrases(payload: Dict[str, Any]) -> List[Tuple[str, ...]]:
+    """Curated keyword phrases (CSV `keywords` + `tags`) as token tuples"""
+    raw: List[str] = []
+    keywords = payload.get("keywords") or ""
+    if isinstance(keywords, str):
+        raw.extend(keywords.split(","))
+    elif isinstance(keywords, list):
+        raw.extend(str(k) for k in keywords)
+    raw.extend(str(t) for t in (payload.get("tags") or []))
+
+    phrases = set()
+    for item in raw:
+        tokens = tuple(tokenize(item))
+        if tokens and len("".join(tokens)) >= EXACT_MIN_PHRASE_CHARS:
+            phrases.add(tokens)
+    return list(phrases)
+
+
+def _contains_phrase(tokens: Sequence[str], phrase: Tuple[str, ...]) -> bool:
+    size = len(phrase)
+    return any(tuple(tokens[i:i + size]) == phrase for i in range(len(tokens) - size + 1))
+
+
+def reciprocal_rank_fusion(rankings: Iterable[Sequence[str]], k: int = RRF_K) -> List[str]:
+    """
+    Fuse several ranked id lists: score(id) = sum(1 / (k + rank)).
+
+    Returns:
+        Ids ordered by fused score
+    """
+    scores: Dict[str, float] = defaultdict(float)
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] += 1.0 / (k + rank)
+    return sorted(scores, key=lambda doc_id: scores[doc_id], reverse=True)
+
+
+class LexicalIndex:
+    """
+    BM25 inverted index partitioned by language.
+
+    Usage:
+        index = LexicalIndex()
+        index.build([(point_id, payload), ...])
+        index.exact_keyword_hits("Ile wynosi dopłata NaszEauto?", "pl")
+        index.search("leasing operacyjny dla firmy", "pl", top_k=10)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._docs: Dict[str, Dict[str, Any]] = {}
+        self._postings: Dict[str, Dict[str, List[Tuple[str, int]]]] = {}
+        self._doc_len: Dict[str, int] = {}
+        self._avg_len: Dict[str, float] = {}
+        self._doc_count: Dict[str, int] = {}
+        self._phrases: Dict[str, Dict[Tuple[str, ...], List[str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def build(self, points: Iterable[Tuple[Any, Dict[str, Any]]]) -> int:
+        """
+        Rebuild the index from (point_id, payload) pairs.
+
+        Returns:
+            Number of indexed documents
+        """
+        docs: Dict[str, Dict[str, Any]] = {}
+        postings: Dict[str, Dict[str, List[Tuple[str, int]]]] = defaultdict(lambda: defaultdict(list))
+        doc_len: Dict[str, int] = {}
+        lengths_by_language: Dict[str, List[int]] = defaultdict(list)
+        phrases: Dict[str, Dict[Tuple[str, ...], List[str]]] = defaultdict(lambda: defaultdict(list))
+
+        for point_id, payload in points:
+            payload = payload or {}
+            if not payload.get("content"):
+                continue
+            doc_id = str(point_id)
+            language = payload.get("language", "pl")
+
+            term_freq: Counter = Counter()
+            for field, weight in FIELD_WEIGHTS.items():
+                value = payload.get(field) or ""
+                if isinstance(value, list):
+                    value = " ".join(str(v) for v in value)
+                for token in tokenize(str(value)):
+                    term_freq[token] += weight
+
+            for term, freq in term_freq.items():
+                postings[language][term].append((doc_id, freq))
+            doc_len[doc_id] = sum(term_freq.values())
+            lengths_by_language[language].append(doc_len[doc_id])
+
+            for phrase in _keyword_phrases(payload):
+                phrases[language][phrase].append(doc_id)
+
+            docs[doc_id] = {"language": language, "payload": payload}
+
+        # Keep only selective phrases for exact-hit short-circuiting
+        def is_selective(language: str, phrase: Tuple[str, ...], doc_ids: List[str]) -> bool:
+            if len(doc_ids) > EXACT_MAX_DOC_FREQ:
+                return False
+            return len(phrase) > 1 or len(postings[language].get(phrase[0], ())) <= EXACT_MAX_DOC_FREQ
+
+        selective = {
+            language: {phrase: ids for phrase, ids in by_phrase.items() if is_selective(language, phrase, ids)}
+            for language, by_phrase in phrases.items()
+        }
+
+        with self._lock:
+            self._docs = docs
+            self._postings = {language: dict(terms) for language, terms in postings.items()}
+            self._doc_len = doc_len
+            self._avg_len = {language: sum(lengths) / len(lengths) for language, lengths in lengths_by_language.items()}
+            self._doc_count = {language: len(lengths) for language, lengths in lengths_by_language.items()}
+            self._phrases = selective
+
+        logger.info(f"✓ Lexical index built: {len(docs)} nuggets, {sum(len(t) for t in self._postings.values())} terms")
+        return len(docs)
+
+    def payload(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        doc = self._docs.get(doc_id)
+        return doc["payload"] if doc else None
+
+    def search(self, query: str, language: str, top_k: int = 10) -> List[Tuple[str, float]]:
+        """
+        BM25 ranking for a query within one language.
+
+        Returns:
+            [(doc_id, score), ...] best first
+        """
+        with self._lock:
+            postings = self._postings.get(language)
+            avg_len = self._avg_len.get(language, 1.0)
+            doc_count = self._doc_count.get(language, 0)
+            doc_len = self._doc_len
+        if not postings:
+            return []
+
+        scores: Dict[str, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            entries = postings.get(term)
+            if not entries:
+                continue
+            idf = math.log(1 + (doc_count - len(entries) + 0.5) / (len(entries) + 0.5))
+            for doc_id, freq in entries:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_len[doc_id] / avg_len)
+                scores[doc_id] += idf * freq * (BM25_K1 + 1) / (freq + norm)
+
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+
+    def exact_keyword_hits(self, query: str, language: str, top_k: int = 3) -> List[str]:
+        """
+        Nuggets whose selective curated keyword phrase appears verbatim in the query.
+
+        Ranked by number of matched phrases, then BM25 score.
+        """
+        with self._lock:
+            phrases = self._phrases.get(language)
+        if not phrases:
+            return []
+
+        query_tokens = tokenize(query)
+        matched: Counter = Counter()
+        for phrase, doc_ids in phrases.items():
+            if _contains_phrase(query_tokens, phrase):
+                for doc_id in doc_ids:
+                    matched[doc_id] += 1
+        if not matched:
+            return []
+
+        bm25 = dict(self.search(query, language, top_k=len(matched) + 50))
+        ranked = sorted(matched, key=lambda doc_id: (matched[doc_id], bm25.get(doc_id, 0.0)), reverse=True)
+        return ranked[:top_k]
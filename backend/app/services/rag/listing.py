@@ -0,0 +1,267 @@
+"""
+Admin Knowledge Listing
+=======================
+
+Paginated, filtered and projected listings for the admin RAG and Golden
+Standard tabs (instead of one 1000-point scroll / one unbounded SELECT):
+
+- RAG nuggets - Qdrant scroll with its own `next_page_offset` as the
+  cursor; `type` filter on the keyword index, search on the full-text
+  `title` / `keywords` indexes; payload restricted to the requested fields
+- Golden Standards - keyset pagination on (created_at, gs_id) over the
+  (language, created_at DESC, gs_id DESC) index; substring search served
+  by pg_trgm indexes; only requested columns selected
+
+Cursors are opaque strings; totals and the filter options (nugget types /
+Golden Standard categories of the language) are computed for the first
+page only.
+"""
+
+import json
+import base64
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from psycopg2.extras import RealDictCursor
+from qdrant_client import AsyncQdrantClient, models
+
+logger = logging.getLogger(__name__)
+
+ADMIN_LIST_DEFAULT_LIMIT = 100
+ADMIN_LIST_MAX_LIMIT = 500
+
+RAG_LIST_FIELDS = ("title", "content", "keywords", "type", "tags", "language")
+GOLDEN_LIST_FIELDS = ("trigger_context", "golden_response", "tags", "category", "language", "created_at")
+
+GOLDEN_LISTING_SCHEMA_SQL = """
+CREATE INDEX IF NOT EXISTS idx_golden_standards_language_keyset ON golden_standards(language, created_at DESC, gs_id DESC);
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS idx_golden_standards_trigger_trgm ON golden_standards USING gin (trigger_context gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_golden_standards_response_trgm ON golden_standards USING gin (golden_response gin_trgm_ops);
+"""
+
+
+def ensure_golden_listing_indexes(conn) -> None:
+    """Keyset + trigram indexes for the Golden Standard listing (idempotent)"""
+    with conn.cursor() as cursor:
+        cursor.execute(GOLDEN_LISTING_SCHEMA_SQL)
+    if not conn.autocommit:
+        conn.commit()
+
+
+def parse_list_fields(fields: Optional[str], allowed: Sequence[str]) -> Tuple[str, ...]:
+    """Comma separated projection -> subset of `allowed` (None / '' = all)"""
+    if not fields:
+        return tuple(allowed)
+    requested = tuple(dict.fromkeys(part.strip() for part in fields.split(",") if part.strip()))
+    unknown = [field for field in requested if field not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields {unknown}; allowed: {', '.join(allowed)}")
+    return requested
+
+
+def _encode_cursor(state: Dict[str, Any]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(state).encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        state = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if not isinstance(state, dict):
+            raise ValueError("not an object")
+        return state
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+
+def _page_size(limit: int) -> int:
+    return max(1, min(limit, ADMIN_LIST_MAX_LIMIT))
+
+
+# =============================================================================
+# RAG Nuggets (Qdrant)
+# =============================================================================
+
+async def list_rag_nuggets_page(
+    client: AsyncQdrantClient,
+    collection_name: str,
+    language: str,
+    cursor: Optional[str] = None,
+    limit: int = ADMIN_LIST_DEFAULT_LIMIT,
+    search: Optional[str] = None,
+    nugget_type: Optional[str] = None,
+    fields: Sequence[str] = RAG_LIST_FIELDS
+) -> Dict[str, Any]:
+    """
+    One page of nuggets of a language.
+
+    Args:
+        search: Words that must appear in `title` or `keywords` (full-text index)
+        nugget_type: Exact payload `type`
+        fields: RAG_LIST_FIELDS subset returned next to `nugget_id`
+
+    Returns:
+        {"nuggets": [...], "next_cursor": str | None, "total": int | None,
+         "types": [...] | None}
+    """
+    must: List[models.Condition] = [
+        models.FieldCondition(key="language", match=models.MatchValue(value=language))
+    ]
+    if nugget_type:
+        must.append(models.FieldCondition(key="type", match=models.MatchValue(value=nugget_type)))
+    should: Optional[List[models.Condition]] = None
+    search = " ".join((search or "").split())
+    if search:
+        should = [
+            models.FieldCondition(key="title", match=models.MatchText(text=search)),
+            models.FieldCondition(key="keywords", match=models.MatchText(text=search)),
+        ]
+    scroll_filter = models.Filter(must=must, should=should)
+
+    offset: Optional[Union[str, int]] = _decode_cursor(cursor).get("o") if cursor else None
+    points, next_offset = await client.scroll(
+        collection_name=collection_name,
+        scroll_filter=scroll_filter,
+        limit=_page_size(limit),
+        offset=offset,
+        with_payload=list(fields) if fields else False,
+        with_vectors=False
+    )
+
+    defaults = {"title": "", "content": "", "keywords": "", "type": "unknown", "tags": [], "language": language}
+    nuggets = []
+    for point in points:
+        payload = point.payload or {}
+        nugget = {"nugget_id": str(point.id)}
+        nugget.update({field: payload.get(field, defaults[field]) for field in fields})
+        nuggets.append(nugget)
+
+    total = None
+    types = None
+    if cursor is None:
+        # Approximate count from the payload index statistics (cheap)
+        total = (await client.count(collection_name=collection_name, count_filter=scroll_filter, exact=False)).count
+        # Type dropdown: every type of the language, not just this page
+        try:
+            facets = await client.facet(
+                collection_name=collection_name,
+                key="type",
+                facet_filter=models.Filter(must=must[:1]),
+                limit=ADMIN_LIST_MAX_LIMIT
+            )
+            types = sorted(str(hit.value) for hit in facets.hits)
+        except Exception as e:  # qdrant-client / server without the facet API (< 1.12)
+            logger.debug(f"Nugget type facet unavailable: {e}")
+
+    return {
+        "nuggets": nuggets,
+        "next_cursor": _encode_cursor({"o": next_offset}) if next_offset is not None else None,
+        "total": total,
+        "types": types,
+    }
+
+
+# =============================================================================
+# Golden Standards (PostgreSQL)
+# =============================================================================
+
+def _like_pattern(query: str) -> str:
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def list_golden_standards_page(
+    conn,
+    language: str,
+    cursor: Optional[str] = None,
+    limit: int = ADMIN_LIST_DEFAULT_LIMIT,
+    search: Optional[str] = None,
+    category: Optional[str] = None,
+    fields: Sequence[str] = GOLDEN_LIST_FIELDS
+) -> Dict[str, Any]:
+    """
+    One page of Golden Standards of a language, newest first.
+
+    Args:
+        search: Substring of trigger_context or golden_response (case-insensitive)
+        category: Exact category
+        fields: GOLDEN_LIST_FIELDS subset returned next to `id`
+
+    Returns:
+        {"standards": [...], "next_cursor": str | None, "total": int | None,
+         "categories": [...] | None}
+    """
+    page_size = _page_size(limit)
+    params: Dict[str, Any] = {"language": language, "limit": page_size + 1}
+    filters = ["language = %(language)s"]
+    if category:
+        filters.append("category = %(category)s")
+        params["category"] = category
+    search = " ".join((search or "").split())
+    if search:
+        filters.append("(trigger_context ILIKE %(like)s OR golden_response ILIKE %(like)s)")
+        params["like"] = _like_pattern(search)
+    where_sql = " AND ".join(filters)
+
+    keyset_sql = ""
+    if cursor:
+        state = _decode_cursor(cursor)
+        try:
+            params["after_created"] = datetime.fromisoformat(state["t"])
+            params["after_id"] = int(state["id"])
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid cursor: {e}")
+        keyset_sql = "AND (created_at, gs_id) < (%(after_created)s, %(after_id)s)"
+
+    # Column names come from GOLDEN_LIST_FIELDS only (validated by the caller)
+    columns = ", ".join(dict.fromkeys(["gs_id", "created_at", *fields]))
+    with conn.cursor(cursor_factory=RealDictCursor) as db_cursor:
+        db_cursor.execute(
+            f"""
+            SELECT {columns}
+            FROM golden_standards
+            WHERE {where_sql} {keyset_sql}
+            ORDER BY created_at DESC, gs_id DESC
+            LIMIT %(limit)s
+            """,
+            params
+        )
+        rows = db_cursor.fetchall()
+
+        total = None
+        categories = None
+        if cursor is None:
+            db_cursor.execute(f"SELECT COUNT(*) AS total FROM golden_standards WHERE {where_sql}", params)
+            total = db_cursor.fetchone()["total"]
+            # Category dropdown: every category of the language (unfiltered)
+            db_cursor.execute(
+                """
+                SELECT DISTINCT category FROM golden_standards
+                WHERE language = %(language)s AND category IS NOT NULL
+                ORDER BY category
+                """,
+                params
+            )
+            categories = [row["category"] for row in db_cursor.fetchall()]
+
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = _encode_cursor({"t": last["created_at"].isoformat(), "id": last["gs_id"]})
+
+    standards = []
+    for row in rows:
+        standard = {"id": row["gs_id"]}
+        for field in fields:
+            value = row[field]
+            if field == "tags":
+                value = value or []
+            elif field == "created_at":
+                value = value.isoformat() if value else None
+            standard[field] = value
+        standards.append(standard)
+
+    return {"standards": standards, "next_cursor": next_cursor, "total": total, "categories": categories}
@@ -0,0 +1,400 @@
+"""
+RAG Ingestion Outbox
+====================
+
+Transactional outbox for knowledge ingestion (golden standards, admin
+nuggets, bulk imports). Admin endpoints only write PostgreSQL - the domain
+row and an `rag_outbox` row commit in ONE transaction and the request
+returns immediately. A background worker drains the outbox:
+
+1. Claims a batch of pending rows (FOR UPDATE SKIP LOCKED - safe with
+   several API workers)
+2. Encodes all texts in one batched SentenceTransformer pass
+3. Upserts all points to Qdrant in one call (wait=True)
+4. Marks the rows done; if the batch fails, retries it row by row so only
+   the rows that still fail bump `attempts` (exponential backoff, parked as
+   `failed` after OUTBOX_MAX_ATTEMPTS)
+5. Deletes done rows older than OUTBOX_RETENTION_DAYS (purge_done_outbox)
+
+Point ids are deterministic UUIDv5 values derived from the natural key
+(golden standard: language + trigger_context, nugget: language + title +
+content), so a retried batch or a re-submitted item overwrites the same
+point instead of creating a duplicate.
+
+Done rows double as a change log for blue/green reindexing: the reindex
+replays every row processed since it started into the new collection and
+holds OUTBOX_PAUSE_LOCK_KEY (workers skip their batches) for the final
+replay + alias swap.
+"""
+
+import os
+import uuid
+import asyncio
+import hashlib
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from psycopg2.extras import Json, RealDictCursor
+from qdrant_client import AsyncQdrantClient, models
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_BATCH_SIZE = int(os.getenv("RAG_OUTBOX_BATCH_SIZE", "64"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("RAG_OUTBOX_MAX_ATTEMPTS", "6"))
+OUTBOX_MAX_BACKOFF_SECONDS = 300
+# Done rows are the reindex replay log - keep them longer than a reindex runs
+OUTBOX_RETENTION_DAYS = int(os.getenv("RAG_OUTBOX_RETENTION_DAYS", "7"))
+OUTBOX_PURGE_BATCH_SIZE = 5000
+
+# Advisory lock: workers take it shared per batch, a reindex exclusively
+OUTBOX_PAUSE_LOCK_KEY = 0x7261675F  # "rag_"
+
+# Fixed namespace - changing it would re-key every point in the collection
+POINT_ID_NAMESPACE = uuid.UUID("5f0c3a8e-2b7d-4c1e-9a6f-0d4e8b1c7a2f")
+
+OUTBOX_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS rag_outbox (
+    outbox_id BIGSERIAL PRIMARY KEY,
+    point_id TEXT NOT NULL,
+    operation TEXT NOT NULL DEFAULT 'upsert' CHECK (operation IN ('upsert','delete')),
+    embed_text TEXT NULL,
+    payload JSONB NULL,
+    status TEXT NOT NULL DEFAULT 'pending' CHECK (status IN ('pending','done','failed')),
+    attempts INT NOT NULL DEFAULT 0,
+    last_error TEXT NULL,
+    next_attempt_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+    processed_at TIMESTAMP WITH TIME ZONE NULL
+);
+CREATE INDEX IF NOT EXISTS idx_rag_outbox_pending ON rag_outbox(next_attempt_at, outbox_id) WHERE status = 'pending';
+CREATE INDEX IF NOT EXISTS idx_rag_outbox_done ON rag_outbox(processed_at) WHERE status = 'done';
+"""
+
+
+# =============================================================================
+# Deterministic Point Ids
+# =============================================================================
+
+def _point_uuid(kind: str, *parts: str) -> str:
+    digest = hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+    return str(uuid.uuid5(POINT_ID_NAMESPACE, f"{kind}:{digest}"))
+
+
+def golden_standard_point_id(trigger_context: str, language: str) -> str:
+    """Point id for a golden standard (same key as UNIQUE(trigger_context, language))"""
+    return _point_uuid("golden_standard", language, " ".join(trigger_context.split()))
+
+
+def nugget_point_id(title: str, content: str, language: str) -> str:
+    """Point id for a knowledge nugget (content-addressed)"""
+    return _point_uuid("nugget", language, title.strip(), content.strip())
+
+
+# =============================================================================
+# Producer Side (inside the caller's transaction)
+# =============================================================================
+
+def ensure_outbox_table(conn) -> None:
+    """Create rag_outbox if missing (idempotent)"""
+    with conn.cursor() as cursor:
+        cursor.execute(OUTBOX_SCHEMA_SQL)
+    if not conn.autocommit:
+        conn.commit()
+
+
+def enqueue_upsert(cursor, point_id: str, embed_text: str, payload: Dict[str, Any]) -> int:
+    """
+    Queue a point upsert in the caller's transaction. `embed_text` is also
+    stored in the point payload, so a reindex re-embeds the same text.
+
+    Returns:
+        outbox_id of the queued row
+    """
+    payload = {**payload, "embed_text": embed_text}
+    cursor.execute(
+        """
+        INSERT INTO rag_outbox (point_id, operation, embed_text, payload)
+        VALUES (%s, 'upsert', %s, %s)
+        RETURNING outbox_id
+        """,
+        (point_id, embed_text, Json(payload))
+    )
+    return cursor.fetchone()[0]
+
+
+def enqueue_delete(cursor, point_id: str) -> int:
+    """Queue a point deletion (keeps ordering with pending upserts of the same id)"""
+    cursor.execute(
+        """
+        INSERT INTO rag_outbox (point_id, operation)
+        VALUES (%s, 'delete')
+        RETURNING outbox_id
+        """,
+        (point_id,)
+    )
+    return cursor.fetchone()[0]
+
+
+def outbox_stats(conn) -> Dict[str, int]:
+    """Row counts per status (pending / done / failed)"""
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT status, COUNT(*) FROM rag_outbox GROUP BY status")
+        counts = {status: count for status, count in cursor.fetchall()}
+    return {status: counts.get(status, 0) for status in ("pending", "done", "failed")}
+
+
+def outbox_last_processed(conn) -> Optional[datetime]:
+    """processed_at of the newest done row (any API worker) - cheap change marker"""
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT MAX(processed_at) FROM rag_outbox WHERE status = 'done'")
+        return cursor.fetchone()[0]
+
+
+# =============================================================================
+# Reindex Replay
+# =============================================================================
+
+def outbox_clock(conn) -> datetime:
+    """Database clock - replay watermark (compared with processed_at)"""
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT clock_timestamp()")
+        return cursor.fetchone()[0]
+
+
+def outbox_changes_since(conn, since: datetime) -> List[Dict[str, Any]]:
+    """
+    Latest processed operation per point since `since` (oldest first).
+
+    Returns:
+        [{"point_id", "operation", "embed_text", "payload"}, ...]
+    """
+    with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+        cursor.execute(
+            """
+            SELECT point_id, operation, embed_text, payload
+            FROM (
+                SELECT DISTINCT ON (point_id) point_id, operation, embed_text, payload, processed_at, outbox_id
+                FROM rag_outbox
+                WHERE status = 'done' AND processed_at >= %s
+                ORDER BY point_id, processed_at DESC, outbox_id DESC
+            ) latest
+            ORDER BY processed_at, outbox_id
+            """,
+            (since,)
+        )
+        return cursor.fetchall()
+
+
+@contextmanager
+def outbox_paused(conn) -> Iterator[None]:
+    """
+    Hold OUTBOX_PAUSE_LOCK_KEY (autocommit connection): waits for in-flight
+    batches, then every worker skips its batches until the block exits.
+    """
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_lock(%s)", (OUTBOX_PAUSE_LOCK_KEY,))
+    try:
+        yield
+    finally:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock(%s)", (OUTBOX_PAUSE_LOCK_KEY,))
+
+
+# =============================================================================
+# Consumer Side (background worker)
+# =============================================================================
+
+def _claim_batch(conn, batch_size: int) -> List[Dict[str, Any]]:
+    with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+        # A running reindex holds the lock exclusively (final replay + swap)
+        cursor.execute("SELECT pg_try_advisory_xact_lock_shared(%s)", (OUTBOX_PAUSE_LOCK_KEY,))
+        if not cursor.fetchone()["pg_try_advisory_xact_lock_shared"]:
+            return []
+        cursor.execute(
+            """
+            SELECT outbox_id, point_id, operation, embed_text, payload
+            FROM rag_outbox
+            WHERE status = 'pending' AND next_attempt_at <= now()
+            ORDER BY outbox_id
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+            """,
+            (batch_size,)
+        )
+        return cursor.fetchall()
+
+
+def _mark_done(conn, outbox_ids: List[int]) -> None:
+    with conn.cursor() as cursor:
+        cursor.execute(
+            # clock_timestamp(): after the Qdrant write (now() is the claim time)
+            "UPDATE rag_outbox SET status = 'done', processed_at = clock_timestamp(), last_error = NULL "
+            "WHERE outbox_id = ANY(%s)",
+            (outbox_ids,)
+        )
+
+
+def _mark_failed(conn, outbox_ids: List[int], error: str) -> None:
+    with conn.cursor() as cursor:
+        cursor.execute(
+            """
+            UPDATE rag_outbox
+            SET attempts = attempts + 1,
+                last_error = %s,
+                status = CASE WHEN attempts + 1 >= %s THEN 'failed' ELSE 'pending' END,
+                next_attempt_at = now() + make_interval(secs => LEAST(%s, power(2, attempts + 1)))
+            WHERE outbox_id = ANY(%s)
+            """,
+            (error[:1000], OUTBOX_MAX_ATTEMPTS, OUTBOX_MAX_BACKOFF_SECONDS, outbox_ids)
+        )
+
+
+def _finish_batch(conn, done_ids: List[int], failures: Dict[str, List[int]]) -> None:
+    """Record the batch outcome (failures: error -> outbox ids) in the claim transaction"""
+    try:
+        if done_ids:
+            _mark_done(conn, done_ids)
+        for error, outbox_ids in failures.items():
+            _mark_failed(conn, outbox_ids, error)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def purge_done_outbox(
+    conn,
+    retention_days: int = OUTBOX_RETENTION_DAYS,
+    batch_size: int = OUTBOX_PURGE_BATCH_SIZE
+) -> int:
+    """
+    Delete done rows processed more than retention_days ago, batch by batch
+    (one transaction each). Pending / failed rows are never purged.
+
+    Args:
+        conn: psycopg2 connection with autocommit DISABLED
+
+    Returns:
+        Number of deleted rows
+    """
+    deleted = 0
+    while True:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                """
+                DELETE FROM rag_outbox
+                WHERE outbox_id IN (
+                    SELECT outbox_id FROM rag_outbox
+                    WHERE status = 'done' AND processed_at < now() - make_interval(days => %s)
+                    LIMIT %s
+                )
+                """,
+                (retention_days, batch_size)
+            )
+            count = cursor.rowcount
+        conn.commit()
+        deleted += count
+        if count < batch_size:
+            return deleted
+
+
+async def _write_points(
+    client: AsyncQdrantClient,
+    collection_name: str,
+    encode_fn: Callable[[List[str]], Any],
+    upserts: List[Dict[str, Any]],
+    deletes: List[str]
+) -> None:
+    """Embed + upsert the upsert rows in one call, delete the delete point ids"""
+    if upserts:
+        embeddings = await asyncio.to_thread(encode_fn, [row["embed_text"] for row in upserts])
+        vectors = embeddings.tolist() if hasattr(embeddings, "tolist") else [list(v) for v in embeddings]
+        await client.upsert(
+            collection_name=collection_name,
+            points=[
+                models.PointStruct(id=row["point_id"], vector=vector, payload=row["payload"] or {})
+                for row, vector in zip(upserts, vectors)
+            ],
+            wait=True
+        )
+    if deletes:
+        await client.delete(
+            collection_name=collection_name,
+            points_selector=models.PointIdsList(points=deletes),
+            wait=True
+        )
+
+
+async def drain_outbox_batch(
+    conn,
+    client: AsyncQdrantClient,
+    collection_name: str,
+    encode_fn: Callable[[List[str]], Any],
+    batch_size: int = OUTBOX_BATCH_SIZE
+) -> Dict[str, Any]:
+    """
+    Process one batch of pending outbox rows.
+
+    Args:
+        conn: Dedicated psycopg2 connection with autocommit DISABLED
+        client: Shared AsyncQdrantClient
+        collection_name: Target collection
+        encode_fn: Batch encoder (SentenceTransformer.encode)
+        batch_size: Max rows per batch
+
+    Returns:
+        {"claimed": n, "upserted": n, "deleted": n, "failed": n, "types": set of payload types}
+    """
+    stats: Dict[str, Any] = {"claimed": 0, "upserted": 0, "deleted": 0, "failed": 0, "types": set()}
+
+    rows = await asyncio.to_thread(_claim_batch, conn, batch_size)
+    if not rows:
+        conn.rollback()
+        return stats
+    stats["claimed"] = len(rows)
+
+    # Latest operation per point wins (a re-submitted item inside one batch is written once)
+    latest: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        latest[row["point_id"]] = row
+    upserts = [row for row in latest.values() if row["operation"] == "upsert"]
+    deletes = [row["point_id"] for row in latest.values() if row["operation"] == "delete"]
+
+    errors: Dict[str, str] = {}  # point_id -> error of the rows that could not be written
+    try:
+        await _write_points(client, collection_name, encode_fn, upserts, deletes)
+    except Exception as e:
+        # Retry row by row (row locks are still held) so only a poison row
+        # accrues attempts - healthy rows of the batch are written now
+        logger.warning(f"⚠ RAG outbox batch failed ({len(rows)} rows), retrying row by row: {e}")
+        for row in upserts:
+            try:
+                await _write_points(client, collection_name, encode_fn, [row], [])
+            except Exception as row_error:
+                errors[row["point_id"]] = str(row_error)
+        for point_id in deletes:
+            try:
+                await _write_points(client, collection_name, encode_fn, [], [point_id])
+            except Exception as row_error:
+                errors[point_id] = str(row_error)
+
+    done_ids: List[int] = []
+    failures: Dict[str, List[int]] = {}
+    for row in rows:
+        if row["point_id"] in errors:
+            failures.setdefault(errors[row["point_id"]], []).append(row["outbox_id"])
+        else:
+            done_ids.append(row["outbox_id"])
+    await asyncio.to_thread(_finish_batch, conn, done_ids, failures)
+
+    written = [row for row in upserts if row["point_id"] not in errors]
+    stats["upserted"] = len(written)
+    stats["deleted"] = sum(1 for point_id in deletes if point_id not in errors)
+    stats["failed"] = len(rows) - len(done_ids)
+    stats["types"] = {(row["payload"] or {}).get("type") for row in written}
+    if errors:
+        logger.warning(f"⚠ RAG outbox: {stats['failed']} rows failed ({len(errors)} points, will retry)")
+
+    return stats
@@ -0,0 +1,304 @@
+"""
+RAG Blue/Green Reindex
+======================
+
+Re-embeds the knowledge base into a NEW versioned collection while the old
+one keeps serving, then atomically repoints the collection alias that the
+API reads from (QDRANT_COLLECTION_ALIAS, default `ultra_rag`).
+
+1. Streaming scroll of the source collection (payloads only, no vectors)
+2. Batched re-embedding with the new model
+3. Chunked upserts into `<base>_<model>_<timestamp>` (tuned layout from
+   collection.py)
+4. Catch-up - a second scroll for points created during the copy, then a
+   replay of every rag_outbox row processed since the copy started
+   (updates and deletes of already copied points included)
+5. Final replay with the outbox workers paused, then the alias swap:
+   delete + create in ONE update_collection_aliases call, so readers see
+   either the old or the new collection, never neither
+
+The old collection is kept (rollback = swap the alias back) until dropped
+explicitly.
+"""
+
+import re
+import os
+import time
+import logging
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from qdrant_client import AsyncQdrantClient, QdrantClient, models
+
+from .collection import ensure_collection
+from .outbox import outbox_changes_since, outbox_clock, outbox_paused
+
+logger = logging.getLogger(__name__)
+
+QDRANT_COLLECTION_ALIAS = os.getenv("QDRANT_COLLECTION_ALIAS", "ultra_rag")
+
+REINDEX_SCROLL_SIZE = 256
+REINDEX_BATCH_SIZE = 128
+
+
+def embedding_text(payload: Dict[str, Any]) -> str:
+    """
+    Text a point is (re-)embedded from - the stored `embed_text` (outbox
+    writes), else the nugget content as seed.py encodes it
+    """
+    return payload.get("embed_text") or payload.get("content") or payload.get("title") or ""
+
+
+def versioned_collection_name(base: str, model_name: str, now: Optional[datetime] = None) -> str:
+    """e.g. ultra_rag__paraphrase_multilingual_minilm_l12_v2__20261019t120000"""
+    slug = re.sub(r"[^a-z0-9]+", "_", model_name.split("/")[-1].lower()).strip("_")
+    stamp = (now or datetime.now(timezone.utc)).strftime("%Y%m%dt%H%M%S")
+    return f"{base}__{slug}__{stamp}"
+
+
+# =============================================================================
+# Aliases
+# =============================================================================
+
+def resolve_alias(client: QdrantClient, alias: str) -> Optional[str]:
+    """Collection currently behind an alias, or None"""
+    for description in client.get_aliases().aliases:
+        if description.alias_name == alias:
+            return description.collection_name
+    return None
+
+
+async def resolve_alias_async(client: AsyncQdrantClient, alias: str) -> Optional[str]:
+    """Async variant of resolve_alias() for the API's shared client"""
+    for description in (await client.get_aliases()).aliases:
+        if description.alias_name == alias:
+            return description.collection_name
+    return None
+
+
+async def ensure_alias_async(client: AsyncQdrantClient, alias: str, collection_name: str) -> Optional[str]:
+    """
+    Point the alias at collection_name if the alias does not exist yet
+    (first start after upgrading from a bare `ultra_rag_v1` deployment).
+
+    Returns:
+        Collection behind the alias, or None if neither exists
+    """
+    current = await resolve_alias_async(client, alias)
+    if current is not None:
+        return current
+    if not await client.collection_exists(collection_name=collection_name):
+        return None
+    await client.update_collection_aliases(change_aliases_operations=[
+        models.CreateAliasOperation(create_alias=models.CreateAlias(collection_name=collection_name, alias_name=alias))
+    ])
+    logger.info(f"✓ Qdrant alias '{alias}' → '{collection_name}' created")
+    return collection_name
+
+
+def swap_alias(client: QdrantClient, alias: str, collection_name: str) -> Optional[str]:
+    """
+    Atomically repoint an alias to collection_name.
+
+    Returns:
+        Previous collection behind the alias (None if the alias was new)
+    """
+    previous = resolve_alias(client, alias)
+    operations: List[Any] = []
+    if previous is not None:
+        operations.append(models.DeleteAliasOperation(delete_alias=models.DeleteAlias(alias_name=alias)))
+    operations.append(models.CreateAliasOperation(
+        create_alias=models.CreateAlias(collection_name=collection_name, alias_name=alias)
+    ))
+    client.update_collection_aliases(change_aliases_operations=operations)
+    logger.info(f"✓ Qdrant alias '{alias}' swapped: {previous} → {collection_name}")
+    return previous
+
+
+# =============================================================================
+# Reindex
+# =============================================================================
+
+def _upsert_embedded(
+    client: QdrantClient,
+    target: str,
+    encode_fn: Callable[[List[str]], Any],
+    points: List[Tuple[Any, Dict[str, Any]]],
+    extra_payload: Dict[str, Any]
+) -> None:
+    """Embed (id, payload) pairs with the new model and upsert them into target"""
+    embeddings = encode_fn([embedding_text(payload) for _, payload in points])
+    vectors = embeddings.tolist() if hasattr(embeddings, "tolist") else [list(v) for v in embeddings]
+    client.upsert(
+        collection_name=target,
+        points=[
+            models.PointStruct(id=point_id, vector=vector, payload={**payload, **extra_payload})
+            for (point_id, payload), vector in zip(points, vectors)
+        ],
+        wait=True
+    )
+
+def _copy_points(
+    client: QdrantClient,
+    source: str,
+    target: str,
+    encode_fn: Callable[[List[str]], Any],
+    batch_size: int,
+    skip_ids: Set[str],
+    extra_payload: Dict[str, Any],
+    progress: Optional[Callable[[int, int], None]],
+    total: int,
+    done: int
+) -> int:
+    """Scroll source, re-embed and upsert into target; returns updated done count"""
+    pending: List[models.Record] = []
+
+    def flush() -> None:
+        nonlocal done
+        if not pending:
+            return
+        _upsert_embedded(client, target, encode_fn, [(point.id, point.payload or {}) for point in pending], extra_payload)
+        done += len(pending)
+        pending.clear()
+        if progress:
+            progress(done, total)
+
+    offset = None
+    while True:
+        records, offset = client.scroll(
+            collection_name=source,
+            limit=REINDEX_SCROLL_SIZE,
+            offset=offset,
+            with_payload=True,
+            with_vectors=False
+        )
+        for record in records:
+            if str(record.id) in skip_ids or not embedding_text(record.payload or {}):
+                continue
+            skip_ids.add(str(record.id))
+            pending.append(record)
+            if len(pending) >= batch_size:
+                flush()
+        if offset is None:
+            break
+    flush()
+    return done
+
+
+def replay_outbox(
+    client: QdrantClient,
+    conn,
+    target: str,
+    encode_fn: Callable[[List[str]], Any],
+    since: datetime,
+    model_name: str,
+    batch_size: int = REINDEX_BATCH_SIZE
+) -> Dict[str, int]:
+    """
+    Apply the rag_outbox rows processed since `since` (latest per point) to
+    target - upserts re-embedded with the new model, deletes deleted.
+
+    Returns:
+        {"upserted": n, "deleted": n}
+    """
+    changes = outbox_changes_since(conn, since)
+    upserts = [
+        (row["point_id"], {"embed_text": row["embed_text"], **(row["payload"] or {})})
+        for row in changes if row["operation"] == "upsert"
+    ]
+    deletes = [row["point_id"] for row in changes if row["operation"] == "delete"]
+
+    extra_payload = {"embedding_model": model_name}
+    for start in range(0, len(upserts), batch_size):
+        _upsert_embedded(client, target, encode_fn, upserts[start:start + batch_size], extra_payload)
+    if deletes:
+        client.delete(collection_name=target, points_selector=models.PointIdsList(points=deletes), wait=True)
+    return {"upserted": len(upserts), "deleted": len(deletes)}
+
+
+def replay_and_swap(
+    client: QdrantClient,
+    conn,
+    alias: str,
+    target: str,
+    encode_fn: Callable[[List[str]], Any],
+    since: datetime,
+    model_name: str,
+    batch_size: int = REINDEX_BATCH_SIZE
+) -> Tuple[Optional[str], Dict[str, int]]:
+    """
+    Final outbox replay + alias swap with the outbox workers paused, so no
+    write lands in the old collection between the two.
+
+    Returns:
+        (previous collection behind the alias, replay_outbox() counts)
+    """
+    with outbox_paused(conn):
+        replayed = replay_outbox(client, conn, target, encode_fn, since, model_name, batch_size)
+        previous = swap_alias(client, alias, target)
+    return previous, replayed
+
+
+def reindex_collection(
+    client: QdrantClient,
+    source: str,
+    target: str,
+    encode_fn: Callable[[List[str]], Any],
+    vector_size: int,
+    model_name: str,
+    batch_size: int = REINDEX_BATCH_SIZE,
+    profile: Optional[str] = None,
+    quantization: Optional[str] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+    conn=None
+) -> Dict[str, Any]:
+    """
+    Build `target` from the payloads of `source` with a new embedding model.
+
+    Args:
+        client: Sync Qdrant client
+        source: Collection (or alias) currently serving
+        target: New versioned collection name (must not exist)
+        encode_fn: Batch encoder of the NEW model
+        vector_size: Output dimension of the new model
+        model_name: Stored in each payload as `embedding_model`
+        progress: Called with (points_done, points_total) after every batch
+        conn: Autocommit PostgreSQL connection - replays rag_outbox rows
+            processed during the copy (None = scroll catch-up only)
+
+    Returns:
+        {"source", "target", "points", "caught_up", "replayed", "since", "seconds"}
+        (`since` = outbox watermark for replay_and_swap(), None without conn)
+    """
+    if client.collection_exists(collection_name=target):
+        raise ValueError(f"Target collection '{target}' already exists")
+
+    started = time.perf_counter()
+    ensure_collection(client, target, vector_size, profile=profile, quantization=quantization)
+    total = client.count(collection_name=source, exact=True).count
+    extra_payload = {"embedding_model": model_name}
+    # Before the first scroll: rows processed earlier are already in source
+    since = outbox_clock(conn) if conn is not None else None
+
+    copied_ids: Set[str] = set()
+    done = _copy_points(client, source, target, encode_fn, batch_size, copied_ids, extra_payload, progress, total, 0)
+    first_pass = done
+
+    # Catch-up: points the outbox wrote to the source during the copy
+    total = max(total, client.count(collection_name=source, exact=True).count)
+    done = _copy_points(client, source, target, encode_fn, batch_size, copied_ids, extra_payload, progress, total, done)
+
+    # Updates / deletes of points the scroll had already passed
+    replayed = {"upserted": 0, "deleted": 0}
+    if since is not None:
+        replayed = replay_outbox(client, conn, target, encode_fn, since, model_name, batch_size)
+
+    return {
+        "source": source,
+        "target": target,
+        "points": done,
+        "caught_up": done - first_pass,
+        "replayed": replayed,
+        "since": since,
+        "seconds": round(time.perf_counter() - started, 1),
+    }
@@ -0,0 +1,124 @@
+"""
+RAG Multi-Query Retrieval Helpers
+=================================
+
+Pure helpers for the Slow Path multi-query retrieval stage:
+
+1. select_informative_notes - picks the K seller notes that cover the most
+   distinct content of the session (greedy coverage), always keeping the
+   most recent informative note
+2. merge_search_results - merges the per-query hit lists of one batched
+   Qdrant search, deduplicates points and packs contents into a char budget
+
+The Qdrant round trip itself lives in main.py (query_rag_multi) next to
+query_rag, so both share the same client, filters and fallback message.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+# Notes shorter than this (in content tokens) are acknowledgements
+# ("ok", "tak", "jasne") and never worth a retrieval query
+MIN_NOTE_TOKENS = 3
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _content_tokens(text: str) -> Set[str]:
+    """Lowercased word tokens longer than 2 chars (drops 'i', 'to', 'na', ...)"""
+    return {token for token in _TOKEN_RE.findall(text.lower()) if len(token) > 2}
+
+
+def select_informative_notes(notes: List[str], k: int = 4) -> List[str]:
+    """
+    Pick up to K notes that together cover the most distinct content.
+
+    Notes under MIN_NOTE_TOKENS content tokens (acknowledgements) are never
+    selected, so the most recent INFORMATIVE note is always selected (it
+    drives the current turn) - a trailing "ok" is skipped, not returned. The
+    rest are chosen greedily by how many NEW tokens they add, with a small
+    bonus for concrete numbers (prices, ranges, dates) and questions. When no
+    note is informative, only the last non-empty note is returned.
+
+    Args:
+        notes: Seller notes in chronological order
+        k: Maximum number of notes to return
+
+    Returns:
+        Selected notes in chronological order
+    """
+    candidates = [
+        (idx, note, _content_tokens(note))
+        for idx, note in enumerate(notes)
+        if note and len(_content_tokens(note)) >= MIN_NOTE_TOKENS
+    ]
+    if not candidates or k <= 0:
+        latest_note = next((note for note in reversed(notes) if note), None)
+        return [latest_note] if latest_note else []
+
+    latest = candidates[-1]
+    selected = [latest]
+    covered = set(latest[2])
+    remaining = candidates[:-1]
+
+    while remaining and len(selected) < k:
+        def gain(candidate) -> float:
+            _, note, tokens = candidate
+            bonus = 0.5 * bool(re.search(r"\d", note)) + 0.5 * ("?" in note)
+            return len(tokens - covered) + bonus
+
+        best = max(remaining, key=gain)
+        if not best[2] - covered:
+            break  # Nothing new left to cover
+        selected.append(best)
+        covered |= best[2]
+        remaining.remove(best)
+
+    return [note for _, note, _ in sorted(selected, key=lambda c: c[0])]
+
+
+def merge_search_results(
+    batch_results: Iterable[Iterable[Any]],
+    budget_chars: int = 4000,
+    separator: str = "\n---\n"
+) -> Optional[str]:
+    """
+    Merge hit lists from a batched search into one context string.
+
+    Points returned by several queries are kept once with their best score;
+    contents are packed by descending score until the char budget is used.
+
+    Args:
+        batch_results: One list of ScoredPoint-like hits (id, score, payload) per query
+        budget_chars: Maximum length of the merged context
+        separator: Separator between nugget contents (same as query_rag)
+
+    Returns:
+        Merged context, or None when no query returned a hit
+    """
+    best_hits: Dict[str, Any] = {}
+    for hits in batch_results:
+        for hit in hits:
+            key = str(hit.id)
+            if key not in best_hits or hit.score > best_hits[key].score:
+                best_hits[key] = hit
+
+    if not best_hits:
+        return None
+
+    parts: List[str] = []
+    used = 0
+    for hit in sorted(best_hits.values(), key=lambda h: h.score, reverse=True):
+        content = (hit.payload or {}).get("content", "")
+        if not content:
+            continue
+        cost = len(content) + (len(separator) if parts else 0)
+        if used + cost > budget_chars:
+            if not parts:
+                parts.append(content[:budget_chars])  # Always keep the best hit
+                used = budget_chars
+            continue
+        parts.append(content)
+        used += cost
+
+    return separator.join(parts) if parts else None
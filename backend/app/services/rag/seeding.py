@@ -0,0 +1,251 @@
+"""
+RAG Seeding Pipeline
+====================
+
+Pipelined, resumable bulk loader used by seed.py:
+
+1. Streaming input - iter_json_array() decodes one object at a time from a
+   (Markdown-wrapped) JSON array instead of materializing the whole file
+2. Batched encoding - one encoder call per batch (the caller may plug in
+   SentenceTransformer.encode_multi_process to use every core)
+3. Chunked concurrent upserts - a thread pool with at most `max_inflight`
+   requests in flight; encoding of batch N+1 overlaps the upsert of batch N
+4. Checkpoint file - the highest CONTIGUOUS completed batch is persisted
+   after every upsert, so an interrupted run resumes where it stopped
+   (batches are deterministic for the same input file and batch size)
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from qdrant_client import models
+
+logger = logging.getLogger(__name__)
+
+_READ_CHUNK = 64 * 1024
+
+
+def iter_json_array(path: str, skip_comment_lines: bool = True) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the objects of a top-level JSON array one by one.
+
+    Lines starting with '#' (Markdown headers of DATA_*.md files) are skipped
+    when skip_comment_lines is set.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    partial_line = ""  # Unterminated last line of the previous chunk
+    started = False
+
+    with open(path, "r", encoding="utf-8") as f:
+        def read_more() -> bool:
+            nonlocal buffer, partial_line
+            chunk = f.read(_READ_CHUNK)
+            if not chunk and not partial_line:
+                return False
+            if skip_comment_lines:
+                lines = (partial_line + chunk).splitlines(keepends=True)
+                # Filter whole lines only - a chunk boundary must not turn "...C#..." into a comment
+                partial_line = lines.pop() if chunk and lines and not lines[-1].endswith("\n") else ""
+                chunk = "".join(line for line in lines if not line.lstrip().startswith("#"))
+            buffer += chunk
+            return True
+
+        while True:
+            buffer = buffer.lstrip()
+            if not started:
+                if not buffer:
+                    if not read_more():
+                        raise ValueError(f"{path}: empty input")
+                    continue
+                if buffer[0] != "[":
+                    raise ValueError(f"{path}: expected a JSON array")
+                buffer = buffer[1:]
+                started = True
+                continue
+
+            if buffer.startswith(","):
+                buffer = buffer[1:]
+                continue
+            if buffer.startswith("]"):
+                return
+            try:
+                item, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                if not read_more():
+                    raise
+                continue
+            buffer = buffer[end:]
+            yield item
+
+
+def file_fingerprint(path: str) -> str:
+    """sha256 of a file - a checkpoint is only valid for the same input"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class SeedCheckpoint:
+    """
+    Resume marker persisted as JSON: {"fingerprint", "batch_size", "completed_batches"}.
+
+    `completed_batches` is a watermark - every batch below it is in Qdrant.
+    """
+
+    def __init__(self, path: str, fingerprint: str, batch_size: int):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.batch_size = batch_size
+        self.completed_batches = 0
+        self._done: Set[int] = set()
+
+    def load(self) -> int:
+        """Read the watermark (0 if missing or written for another input)"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return 0
+        if state.get("fingerprint") == self.fingerprint and state.get("batch_size") == self.batch_size:
+            self.completed_batches = int(state.get("completed_batches", 0))
+        return self.completed_batches
+
+    def mark_done(self, batch_index: int) -> None:
+        """Record a finished batch and advance the contiguous watermark"""
+        self._done.add(batch_index)
+        advanced = False
+        while self.completed_batches in self._done:
+            self._done.discard(self.completed_batches)
+            self.completed_batches += 1
+            advanced = True
+        if advanced:
+            self._save()
+
+    def _save(self) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "fingerprint": self.fingerprint,
+                "batch_size": self.batch_size,
+                "completed_batches": self.completed_batches,
+            }, f)
+        os.replace(tmp_path, self.path)  # Atomic - a crash never leaves a torn checkpoint
+
+    def clear(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+@dataclass
+class SeedStats:
+    """Result of one pipeline run"""
+    upserted: int = 0
+    skipped: int = 0
+    resumed_batches: int = 0
+    seconds: float = 0.0
+
+    @property
+    def items_per_second(self) -> float:
+        return self.upserted / self.seconds if self.seconds else 0.0
+
+
+def _batches(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    batch: List[Any] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def run_seed_pipeline(
+    items: Iterable[Dict[str, Any]],
+    to_point: Callable[[Dict[str, Any]], Optional[Tuple[str, str, Dict[str, Any]]]],
+    encode_fn: Callable[[List[str]], Any],
+    upsert_fn: Callable[[List[models.PointStruct]], Any],
+    batch_size: int = 64,
+    max_inflight: int = 4,
+    checkpoint: Optional[SeedCheckpoint] = None,
+    existing_ids: Optional[Set[str]] = None,
+    progress: Optional[Callable[[SeedStats], None]] = None
+) -> SeedStats:
+    """
+    Encode and upsert items in batches with bounded concurrent upserts.
+
+    Args:
+        items: Input objects (streamed)
+        to_point: item -> (point_id, text_to_embed, payload), or None to skip
+        encode_fn: Batch encoder
+        upsert_fn: Writes one chunk of points (called from worker threads)
+        batch_size: Items per encode + upsert chunk
+        max_inflight: Max concurrent upsert requests
+        checkpoint: Resume marker (batches below its watermark are skipped)
+        existing_ids: Point ids already in the collection (skipped, T3)
+        progress: Called after every completed upsert
+
+    Returns:
+        SeedStats
+    """
+    stats = SeedStats()
+    started = time.perf_counter()
+    resume_from = checkpoint.load() if checkpoint else 0
+    stats.resumed_batches = resume_from
+    existing_ids = existing_ids or set()
+
+    inflight: Dict[Future, Tuple[int, int]] = {}
+
+    def collect(block: bool) -> None:
+        if not inflight:
+            return
+        done, _ = wait(list(inflight), timeout=None if block else 0, return_when=FIRST_COMPLETED)
+        for future in done:
+            batch_index, count = inflight.pop(future)
+            future.result()  # Re-raise upsert errors - the checkpoint stays before this batch
+            stats.upserted += count
+            if checkpoint:
+                checkpoint.mark_done(batch_index)
+            stats.seconds = time.perf_counter() - started
+            if progress:
+                progress(stats)
+
+    with ThreadPoolExecutor(max_workers=max_inflight) as pool:
+        for batch_index, batch in enumerate(_batches(items, batch_size)):
+            if batch_index < resume_from:
+                continue
+
+            prepared = [point for point in (to_point(item) for item in batch) if point is not None]
+            fresh = [point for point in prepared if point[0] not in existing_ids]
+            stats.skipped += len(batch) - len(fresh)
+            if not fresh:
+                if checkpoint:
+                    checkpoint.mark_done(batch_index)
+                continue
+
+            embeddings = encode_fn([text for _, text, _ in fresh])
+            vectors = embeddings.tolist() if hasattr(embeddings, "tolist") else [list(v) for v in embeddings]
+            points = [
+                models.PointStruct(id=point_id, vector=vector, payload=payload)
+                for (point_id, _, payload), vector in zip(fresh, vectors)
+            ]
+
+            while len(inflight) >= max_inflight:
+                collect(block=True)  # Backpressure - never more than max_inflight requests
+            inflight[pool.submit(upsert_fn, points)] = (batch_index, len(points))
+            collect(block=False)
+
+        while inflight:
+            collect(block=True)
+
+    stats.seconds = time.perf_counter() - started
+    return stats
@@ -0,0 +1,247 @@
+"""
+RAG Knowledge File Sync
+=======================
+
+Incremental diff-sync of the knowledge JSON files (rag_nuggets_final.json,
+golden_standards_final.json) into Qdrant. Every synced point carries:
+
+- `sync_source`   - file the point came from (only these points can be
+                    deleted by a sync - admin / custom nuggets are never touched)
+- `content_hash`  - sha256 of the fields that affect the point
+
+A sync scrolls ALL managed points (payload fields only), compares hashes and
+produces a SyncPlan: added / changed items are queued as upserts, removed
+points as deletes, unchanged ones skipped. Writes go through rag_outbox like
+every other ingestion path, so the outbox worker embeds them, a running
+reindex replays them and the API refreshes its lexical / golden indexes.
+Running it twice in a row is a no-op once the worker has drained the queue.
+
+Point ids are stable per item: nuggets use the md5(id) UUID scheme of
+seed.py (already seeded points are adopted, not duplicated), golden
+standards use the outbox id (language + trigger_context).
+"""
+
+import json
+import uuid
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+from qdrant_client import QdrantClient, models
+
+from .outbox import enqueue_delete, enqueue_upsert, golden_standard_point_id, nugget_point_id
+from .reindex import embedding_text
+
+logger = logging.getLogger(__name__)
+
+NUGGET_HASH_FIELDS = ["title", "content", "keywords", "type", "tags", "archetype_filter", "language"]
+# embed_text is hashed too - points embedded from an older text get re-queued
+GOLDEN_HASH_FIELDS = ["trigger_context", "golden_response", "category", "tags", "language", "embed_text"]
+
+
+@dataclass
+class SyncItem:
+    """One item of a knowledge file, ready to upsert"""
+    point_id: str
+    content_hash: str
+    payload: Dict[str, Any]
+    label: str  # Human-readable (title / trigger) for the changeset report
+    embed_text: str
+
+
+@dataclass
+class SyncPlan:
+    """Changeset of one knowledge file against the collection"""
+    source: str
+    added: List[SyncItem] = field(default_factory=list)
+    changed: List[SyncItem] = field(default_factory=list)
+    removed: List[Dict[str, Any]] = field(default_factory=list)  # {"point_id", "label", "payload"}
+    unchanged: int = 0
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.changed or self.removed)
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            "added": len(self.added),
+            "changed": len(self.changed),
+            "removed": len(self.removed),
+            "unchanged": self.unchanged,
+        }
+
+
+def content_hash(item: Dict[str, Any], fields: List[str]) -> str:
+    """sha256 over the canonical JSON of the given fields"""
+    canonical = json.dumps({name: item.get(name) for name in fields}, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def seed_point_id(item_id: str) -> str:
+    """md5(id) UUID - the point id scheme of seed.py"""
+    return str(uuid.UUID(hashlib.md5(item_id.encode()).hexdigest()))
+
+
+# =============================================================================
+# File Items
+# =============================================================================
+
+def nugget_sync_items(nuggets: List[Dict[str, Any]], source: str, default_language: str = "pl") -> List[SyncItem]:
+    """Map rag_nuggets_final.json entries to SyncItems"""
+    items: Dict[str, SyncItem] = {}
+    for nugget in nuggets:
+        if not nugget.get("content"):
+            continue
+        payload = dict(nugget)
+        payload.setdefault("language", default_language)
+        payload.setdefault("title", "Untitled")
+        if isinstance(payload.get("archetype_filter"), str):
+            payload["archetype_filter"] = [payload["archetype_filter"]]
+
+        point_id = (
+            seed_point_id(str(nugget["id"])) if nugget.get("id")
+            else nugget_point_id(payload["title"], payload["content"], payload["language"])
+        )
+        digest = content_hash(payload, NUGGET_HASH_FIELDS)
+        payload.update({"sync_source": source, "content_hash": digest})
+        items[point_id] = SyncItem(point_id, digest, payload, payload["title"], embedding_text(payload))
+    return list(items.values())
+
+
+def golden_sync_items(standards: List[Dict[str, Any]], source: str, default_language: str = "pl") -> List[SyncItem]:
+    """Map golden_standards_final.json entries to SyncItems (payload mirrors the admin outbox payload)"""
+    items: Dict[str, SyncItem] = {}
+    for standard in standards:
+        trigger = " ".join((standard.get("trigger_context") or "").split())  # (T5)
+        response = standard.get("golden_response") or ""
+        if not trigger or not response:
+            continue
+        language = standard.get("language") or default_language
+        embed_text = f"{trigger} {response}"  # Same text as the bulk import
+        normalized = {**standard, "trigger_context": trigger, "language": language, "embed_text": embed_text}
+        digest = content_hash(normalized, GOLDEN_HASH_FIELDS)
+        category = standard.get("category") or "Inne"
+
+        point_id = golden_standard_point_id(trigger, language)
+        items[point_id] = SyncItem(point_id, digest, {
+            "title": f"Golden Standard: {category}",
+            "content": response,
+            "keywords": category.lower(),
+            "language": language,
+            "type": "golden_standard",
+            "tags": standard.get("tags", []),
+            "category": category,
+            "trigger_context": trigger,
+            "sync_source": source,
+            "content_hash": digest,
+        }, trigger, embed_text)
+    return list(items.values())
+
+
+# =============================================================================
+# Diff & Apply
+# =============================================================================
+
+def scan_collection(client: QdrantClient, collection_name: str, scroll_size: int = 512) -> Dict[str, Dict[str, Any]]:
+    """All point ids with their sync fields (no vectors, no 10k cap)"""
+    existing: Dict[str, Dict[str, Any]] = {}
+    offset = None
+    while True:
+        records, offset = client.scroll(
+            collection_name=collection_name,
+            limit=scroll_size,
+            offset=offset,
+            with_payload=models.PayloadSelectorInclude(
+                include=["sync_source", "content_hash", "title", "trigger_context", "language"]
+            ),
+            with_vectors=False
+        )
+        for record in records:
+            existing[str(record.id)] = record.payload or {}
+        if offset is None:
+            return existing
+
+
+def plan_sync(items: List[SyncItem], existing: Dict[str, Dict[str, Any]], source: str) -> SyncPlan:
+    """
+    Diff file items against scanned points.
+
+    A point counts as removed only if it is managed by this source
+    (`sync_source`) and its id is no longer produced by the file.
+    """
+    plan = SyncPlan(source=source)
+    wanted = {item.point_id for item in items}
+
+    for item in items:
+        stored = existing.get(item.point_id)
+        if stored is None:
+            plan.added.append(item)
+        elif stored.get("content_hash") != item.content_hash or stored.get("sync_source") != source:
+            plan.changed.append(item)  # Also adopts pre-sync seed.py points
+        else:
+            plan.unchanged += 1
+
+    for point_id, payload in existing.items():
+        if payload.get("sync_source") == source and point_id not in wanted:
+            plan.removed.append({
+                "point_id": point_id,
+                "label": payload.get("title") or payload.get("trigger_context") or point_id,
+                "payload": payload,
+            })
+    return plan
+
+
+def apply_sync(cursor, plan: SyncPlan) -> Tuple[int, int]:
+    """
+    Queue added/changed items as outbox upserts and removed points as outbox
+    deletes in the caller's transaction (the outbox worker embeds and writes
+    them to Qdrant after the commit).
+
+    Returns:
+        (upserted, deleted)
+    """
+    to_upsert = plan.added + plan.changed
+    for item in to_upsert:
+        enqueue_upsert(cursor, item.point_id, item.embed_text, item.payload)
+    for entry in plan.removed:
+        enqueue_delete(cursor, entry["point_id"])
+
+    logger.info(f"✓ Sync '{plan.source}' queued: {plan.summary()}")
+    return len(to_upsert), len(plan.removed)
+
+
+def sync_golden_standards_postgres(cursor, plan: SyncPlan) -> Dict[str, int]:
+    """
+    Mirror a golden standard SyncPlan into PostgreSQL in the caller's
+    transaction: upsert added/changed rows on (trigger_context, language),
+    delete rows of removed points.
+    """
+    upserted = 0
+    deleted = 0
+    for item in plan.added + plan.changed:
+        payload = item.payload
+        cursor.execute(
+            """
+            INSERT INTO golden_standards (category, trigger_context, golden_response, tags, language)
+            VALUES (%s, %s, %s, %s, %s)
+            ON CONFLICT (trigger_context, language) DO UPDATE
+            SET category = EXCLUDED.category,
+                golden_response = EXCLUDED.golden_response,
+                tags = EXCLUDED.tags,
+                updated_at = now()
+            """,
+            (payload["category"], payload["trigger_context"], payload["content"],
+             payload.get("tags") or [], payload["language"])
+        )
+        upserted += 1
+    for entry in plan.removed:
+        payload = entry["payload"]
+        if not payload.get("trigger_context"):
+            continue
+        cursor.execute(
+            "DELETE FROM golden_standards WHERE trigger_context = %s AND language = %s",
+            (payload["trigger_context"], payload.get("language", "pl"))
+        )
+        deleted += cursor.rowcount
+    return {"upserted": upserted, "deleted": deleted}
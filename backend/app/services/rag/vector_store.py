@@ -0,0 +1,181 @@
+"""
+RAG Vector Store - Qdrant Client Factory
+=========================================
+
+Single place that decides HOW the backend talks to Qdrant. Used by the
+FastAPI lifespan, seed.py and the import tooling so all of them agree on
+the storage mode.
+
+Storage modes (QDRANT_MODE):
+- remote: Qdrant server via QDRANT_HOST / QDRANT_PORT (default, Railway)
+- local:  embedded Qdrant persisted on disk under QDRANT_PATH
+          (single-showroom box, no separate service, no network hop)
+- memory: embedded Qdrant kept in RAM (tests, offline benchmarks)
+
+The API uses the async variant (AsyncQdrantClient, gRPC preferred for
+remote servers - protobuf payloads instead of JSON over REST); offline
+tooling keeps the synchronous QdrantClient.
+
+NOTE: Embedded (local) storage is guarded by a file lock - only ONE process
+can open a given QDRANT_PATH at a time. Stop the API before running
+seed.py / direct_import.py against the same path.
+"""
+
+import os
+import time
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Union
+
+from qdrant_client import AsyncQdrantClient, QdrantClient
+
+logger = logging.getLogger(__name__)
+
+QDRANT_MODE_REMOTE = "remote"
+QDRANT_MODE_LOCAL = "local"
+QDRANT_MODE_MEMORY = "memory"
+QDRANT_MODES = (QDRANT_MODE_REMOTE, QDRANT_MODE_LOCAL, QDRANT_MODE_MEMORY)
+
+QDRANT_MODE = os.getenv("QDRANT_MODE", QDRANT_MODE_REMOTE).lower()
+QDRANT_PATH = os.getenv("QDRANT_PATH", "./qdrant_data")
+QDRANT_HOST = os.getenv("QDRANT_HOST", "localhost")
+QDRANT_PORT = int(os.getenv("QDRANT_PORT", "6333"))
+QDRANT_GRPC_PORT = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
+QDRANT_PREFER_GRPC = os.getenv("QDRANT_PREFER_GRPC", "true").lower() in ("1", "true", "yes")
+
+
+def resolve_qdrant_mode(mode: Optional[str] = None) -> str:
+    """
+    Normalize and validate the storage mode.
+
+    Raises:
+        ValueError: If the mode is not one of QDRANT_MODES
+    """
+    resolved = (mode or QDRANT_MODE).lower()
+    if resolved not in QDRANT_MODES:
+        raise ValueError(f"Unknown QDRANT_MODE '{resolved}' (expected one of: {', '.join(QDRANT_MODES)})")
+    return resolved
+
+
+def create_qdrant_client(
+    mode: Optional[str] = None,
+    path: Optional[str] = None,
+    host: Optional[str] = None,
+    port: Optional[Union[int, str]] = None,
+) -> QdrantClient:
+    """
+    Create a QdrantClient for the configured storage mode.
+
+    Args:
+        mode: remote | local | memory (defaults to QDRANT_MODE)
+        path: On-disk location for local mode (defaults to QDRANT_PATH)
+        host: Server host or full URL for remote mode (defaults to QDRANT_HOST)
+        port: Server port for remote mode (defaults to QDRANT_PORT)
+
+    Returns:
+        Configured QdrantClient
+    """
+    resolved = resolve_qdrant_mode(mode)
+
+    if resolved == QDRANT_MODE_MEMORY:
+        return QdrantClient(location=":memory:")
+
+    if resolved == QDRANT_MODE_LOCAL:
+        local_path = path or QDRANT_PATH
+        os.makedirs(local_path, exist_ok=True)
+        return QdrantClient(path=local_path)
+
+    # (T8) Obsługa URL dla QdrantClient (dla Railway)
+    remote_host = host or QDRANT_HOST
+    if remote_host.startswith('http'):
+        return QdrantClient(url=remote_host)
+    return QdrantClient(host=remote_host, port=int(port or QDRANT_PORT))
+
+
+def create_async_qdrant_client(
+    mode: Optional[str] = None,
+    path: Optional[str] = None,
+    host: Optional[str] = None,
+    port: Optional[Union[int, str]] = None,
+    grpc_port: Optional[int] = None,
+    prefer_grpc: Optional[bool] = None,
+) -> AsyncQdrantClient:
+    """
+    Create an AsyncQdrantClient for the configured storage mode.
+
+    Remote servers are reached over gRPC (QDRANT_GRPC_PORT) unless
+    QDRANT_PREFER_GRPC=false; embedded modes ignore the transport settings.
+
+    Returns:
+        Configured AsyncQdrantClient
+    """
+    resolved = resolve_qdrant_mode(mode)
+
+    if resolved == QDRANT_MODE_MEMORY:
+        return AsyncQdrantClient(location=":memory:")
+
+    if resolved == QDRANT_MODE_LOCAL:
+        local_path = path or QDRANT_PATH
+        os.makedirs(local_path, exist_ok=True)
+        return AsyncQdrantClient(path=local_path)
+
+    use_grpc = QDRANT_PREFER_GRPC if prefer_grpc is None else prefer_grpc
+    remote_host = host or QDRANT_HOST
+    if remote_host.startswith('http'):
+        return AsyncQdrantClient(url=remote_host, grpc_port=grpc_port or QDRANT_GRPC_PORT, prefer_grpc=use_grpc)
+    return AsyncQdrantClient(
+        host=remote_host,
+        port=int(port or QDRANT_PORT),
+        grpc_port=grpc_port or QDRANT_GRPC_PORT,
+        prefer_grpc=use_grpc
+    )
+
+
+async def probe_qdrant(client: Optional[AsyncQdrantClient], timeout: float = 2.0) -> Dict[str, Any]:
+    """
+    Connection health probe - lists collections with a short timeout.
+
+    Returns:
+        {"status": "ok" | "unavailable", "latency_ms": float, ...}
+    """
+    if client is None:
+        return {"status": "unavailable", "error": "Qdrant client not initialized"}
+
+    started = time.perf_counter()
+    try:
+        response = await asyncio.wait_for(client.get_collections(), timeout=timeout)
+        return {
+            "status": "ok",
+            "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+            "collections": len(response.collections),
+        }
+    except Exception as e:
+        return {
+            "status": "unavailable",
+            "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+            "error": f"{type(e).__name__}: {e}",
+        }
+
+
+def describe_qdrant_target(
+    mode: Optional[str] = None,
+    path: Optional[str] = None,
+    host: Optional[str] = None,
+    port: Optional[Union[int, str]] = None,
+) -> str:
+    """Human-readable description of where Qdrant data lives (for logs); pass the create_qdrant_client arguments."""
+    resolved = resolve_qdrant_mode(mode)
+    if resolved == QDRANT_MODE_MEMORY:
+        return "embedded :memory:"
+    if resolved == QDRANT_MODE_LOCAL:
+        return f"embedded local path {os.path.abspath(path or QDRANT_PATH)}"
+    remote_host = host or QDRANT_HOST
+    if remote_host.startswith('http'):
+        return f"remote {remote_host}"
+    return f"remote {remote_host}:{port or QDRANT_PORT}"
+
+
+def is_embedded_mode(mode: Optional[str] = None) -> bool:
+    """True when Qdrant runs inside this process (local or memory)."""
+    return resolve_qdrant_mode(mode) != QDRANT_MODE_REMOTE
+
@@ -0,0 +1,80 @@
+"""
+Session Storage Layer
+=====================
+
+Storage of live sales sessions:
+
+1. Conversation store - conversation_log that scales with showroom traffic
+   - composite (session_id, timestamp) index for ordered history reads
+   - monthly range partitions (one-time migration, partitions created ahead)
+   - ended sessions packed into one compressed JSONB archive row each
+   - one reader for hot and archived messages
+
+2. Snapshot - cacheable GET /sessions/{id}
+   - cheap version lookup -> weak ETag / 304 before any payload is read
+   - keyset-paginated conversation, projected sections
+
+3. Registry - in-process set of existing session ids
+   - warmed at startup, kept coherent across workers via LISTEN / NOTIFY
+   - PostgreSQL only consulted on a miss; collision-free id allocation
+
+4. Actors - per-session mailbox serializing operations of one session
+   - sessions run in parallel, no global lock
+   - bounded mailboxes, MailboxFull for backpressure (HTTP 429)
+"""
+
+from .actors import (
+    SESSION_MAILBOX_SIZE,
+    MailboxFull,
+    SessionActors,
+)
+from .conversation import (
+    CONVERSATION_ARCHIVE_AFTER_DAYS,
+    CONVERSATION_SCHEMA_SQL,
+    archive_ended_conversations,
+    ensure_conversation_partitions,
+    ensure_conversation_schema,
+    load_conversation,
+    load_session_language,
+    migrate_conversation_log_to_partitions,
+)
+from .registry import (
+    SESSION_REGISTRY_CHANNEL,
+    SessionRegistry,
+    insert_new_session,
+)
+from .snapshot import (
+    SESSION_FIELDS,
+    etag_matches,
+    load_session_snapshot,
+    load_session_version,
+    parse_session_fields,
+    session_etag,
+)
+
+__all__ = [
+    # Conversation store
+    "CONVERSATION_ARCHIVE_AFTER_DAYS",
+    "CONVERSATION_SCHEMA_SQL",
+    "archive_ended_conversations",
+    "ensure_conversation_partitions",
+    "ensure_conversation_schema",
+    "load_conversation",
+    "load_session_language",
+    "migrate_conversation_log_to_partitions",
+    # Snapshot
+    "SESSION_FIELDS",
+    "etag_matches",
+    "load_session_snapshot",
+    "load_session_version",
+    "parse_session_fields",
+    "session_etag",
+    # Registry
+    "SESSION_REGISTRY_CHANNEL",
+    "SessionRegistry",
+    "insert_new_session",
+    # Actors
+    "SESSION_MAILBOX_SIZE",
+    "MailboxFull",
+    "SessionActors",
+]
@@ -0,0 +1,131 @@
+"""
+Session Actors
+==============
+
+One actor (bounded mailbox + drain task) per active session, so operations
+on the SAME session run strictly in arrival order while different sessions
+run fully in parallel - no global lock:
+
+- /sessions/send runs inside its session's actor: history read, note
+  insert, Fast Path and the Slow Path trigger of one note complete before
+  the next note of that session starts
+- Slow Path reads the history through the actor, i.e. after every note
+  queued before it has been written
+- a full mailbox rejects request-path operations (MailboxFull -> HTTP 429);
+  internal callers may wait for space instead (`block=True`)
+- actors exit after SESSION_ACTOR_IDLE_SECONDS without work
+
+Operations run to completion even if the caller stops waiting (a seller
+note must not be lost because the client disconnected).
+"""
+
+import os
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+SESSION_MAILBOX_SIZE = int(os.getenv("SESSION_MAILBOX_SIZE", "8"))
+SESSION_ACTOR_IDLE_SECONDS = float(os.getenv("SESSION_ACTOR_IDLE_SECONDS", "60"))
+
+Operation = Callable[[], Awaitable[Any]]
+
+
+class MailboxFull(Exception):
+    """The session already has `capacity` operations queued"""
+
+    def __init__(self, session_id: str, capacity: int):
+        super().__init__(f"Session {session_id} is busy ({capacity} operations queued)")
+        self.session_id = session_id
+        self.capacity = capacity
+
+
+class SessionActors:
+    """Per-session serialized execution of async operations (one event loop)"""
+
+    def __init__(self, mailbox_size: int = SESSION_MAILBOX_SIZE, idle_timeout: float = SESSION_ACTOR_IDLE_SECONDS):
+        self.mailbox_size = mailbox_size
+        self.idle_timeout = idle_timeout
+        self._actors: Dict[str, Tuple[asyncio.Queue, asyncio.Task]] = {}
+        self.processed = 0
+        self.rejected = 0
+
+    def __len__(self) -> int:
+        return len(self._actors)
+
+    def _mailbox(self, session_id: str) -> asyncio.Queue:
+        actor = self._actors.get(session_id)
+        if actor is not None and not actor[1].done():
+            return actor[0]
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.mailbox_size)
+        task = asyncio.create_task(self._drain(session_id, queue), name=f"session-actor-{session_id}")
+        self._actors[session_id] = (queue, task)
+        return queue
+
+    async def run(self, session_id: str, operation: Operation, block: bool = False) -> Any:
+        """
+        Queue `operation` behind the session's earlier operations and await
+        its result (exceptions propagate to the caller).
+
+        Raises:
+            MailboxFull: Mailbox at capacity and `block` is False
+        """
+        queue = self._mailbox(session_id)
+        future = asyncio.get_running_loop().create_future()
+        if block:
+            await queue.put((operation, future))
+        else:
+            try:
+                queue.put_nowait((operation, future))
+            except asyncio.QueueFull:
+                self.rejected += 1
+                raise MailboxFull(session_id, self.mailbox_size) from None
+        return await future
+
+    async def _drain(self, session_id: str, queue: asyncio.Queue) -> None:
+        while True:
+            try:
+                operation, future = await asyncio.wait_for(queue.get(), self.idle_timeout)
+            except asyncio.TimeoutError:
+                # No await between the emptiness check and the removal - a
+                # concurrent run() either queued before it or creates a new actor
+                if queue.empty():
+                    if self._actors.get(session_id, (None,))[0] is queue:
+                        del self._actors[session_id]
+                    return
+                continue
+
+            try:
+                result = await operation()
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.cancel()
+                raise
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+                else:
+                    logger.warning(f"⚠ Session {session_id} operation failed after its caller left: {e}")
+            else:
+                if not future.done():
+                    future.set_result(result)
+            finally:
+                self.processed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active_sessions": len(self._actors),
+            "queued": sum(queue.qsize() for queue, _ in self._actors.values()),
+            "mailbox_size": self.mailbox_size,
+            "processed": self.processed,
+            "rejected": self.rejected,
+        }
+
+    async def close(self) -> None:
+        """Cancel every actor (application shutdown)"""
+        tasks = [task for _, task in self._actors.values()]
+        self._actors.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
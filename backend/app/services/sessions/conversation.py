@@ -0,0 +1,361 @@
+"""
+Conversation Store
+==================
+
+Storage layout for conversation_log that stays fast over years of traffic:
+
+1. Composite index (session_id, timestamp, log_id) - every history read
+   (`WHERE session_id = ? ORDER BY timestamp`) is one ordered index range
+   scan, no sort.
+2. Monthly range partitions on timestamp - migrate_conversation_log_to_partitions()
+   converts the plain table once: the existing heap is ATTACHED as
+   conversation_log_legacy (no copy), new months get their own partition,
+   created CONVERSATION_PARTITIONS_AHEAD months in advance; a DEFAULT
+   partition catches anything outside them.
+3. Cold archive - sessions ended more than CONVERSATION_ARCHIVE_AFTER_DAYS
+   ago are packed into ONE JSONB document each (conversation_archive,
+   TOAST-compressed) and their rows leave the hot partitions.
+
+load_conversation() reads both places, so callers never care where a
+session's messages live.
+"""
+
+import os
+import re
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from psycopg2.extras import RealDictCursor
+
+logger = logging.getLogger(__name__)
+
+CONVERSATION_PARTITIONS_AHEAD = 2
+CONVERSATION_ARCHIVE_AFTER_DAYS = int(os.getenv("CONVERSATION_ARCHIVE_AFTER_DAYS", "90"))  # 0 disables archival
+CONVERSATION_ARCHIVE_BATCH_SIZE = 200  # Sessions per transaction
+
+CONVERSATION_SCHEMA_SQL = """
+CREATE INDEX IF NOT EXISTS idx_conversation_log_session_time ON conversation_log(session_id, timestamp, log_id);
+
+-- messages: [{log_id, timestamp, role, content, language}] in conversation order
+CREATE TABLE IF NOT EXISTS conversation_archive (
+    session_id TEXT PRIMARY KEY REFERENCES sessions(session_id) ON DELETE CASCADE,
+    messages JSONB NOT NULL,
+    message_count INT NOT NULL,
+    first_timestamp TIMESTAMP WITH TIME ZONE NOT NULL,
+    last_timestamp TIMESTAMP WITH TIME ZONE NOT NULL,
+    archived_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+);
+
+ALTER TABLE sessions ADD COLUMN IF NOT EXISTS conversation_archived_at TIMESTAMP WITH TIME ZONE NULL;
+CREATE INDEX IF NOT EXISTS idx_sessions_archive_pending ON sessions(ended_at) WHERE conversation_archived_at IS NULL;
+"""
+
+# Same columns / constraints as the seed.py table, so the old heap can be attached as a partition
+_PARTITIONED_TABLE_SQL = """
+CREATE TABLE conversation_log (
+    log_id INT NOT NULL DEFAULT nextval('conversation_log_log_id_seq'),
+    session_id TEXT NOT NULL REFERENCES sessions(session_id),
+    timestamp TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+    role TEXT NOT NULL CHECK (role IN ('Sprzedawca','FastPath','FastPath-Questions')),
+    content TEXT NOT NULL,
+    language TEXT NOT NULL CHECK (language IN ('pl','en')),
+    PRIMARY KEY (log_id, timestamp)
+) PARTITION BY RANGE (timestamp);
+"""
+
+_RANGE_UPPER_RE = re.compile(r"TO \('([^']+)'\)")
+
+
+def ensure_conversation_schema(conn) -> None:
+    """Composite history index + archive table (idempotent, plain or partitioned table)"""
+    with conn.cursor() as cursor:
+        cursor.execute(CONVERSATION_SCHEMA_SQL)
+    if not conn.autocommit:
+        conn.commit()
+
+
+def _month_start(value: datetime, offset: int = 0) -> datetime:
+    index = value.year * 12 + value.month - 1 + offset
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def _is_partitioned(cursor) -> bool:
+    cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass('conversation_log')")
+    row = cursor.fetchone()
+    return bool(row) and row[0] == "p"
+
+
+# =============================================================================
+# Partitioning
+# =============================================================================
+
+def migrate_conversation_log_to_partitions(conn) -> bool:
+    """
+    Convert a plain conversation_log into a monthly range-partitioned table
+    - ONE transaction under an ACCESS EXCLUSIVE lock, no row copy: the old
+    heap becomes partition conversation_log_legacy for everything before
+    the month after its newest row (and the current month).
+
+    Args:
+        conn: psycopg2 connection with autocommit DISABLED
+
+    Returns:
+        False if the table was already partitioned
+    """
+    try:
+        with conn.cursor() as cursor:
+            if _is_partitioned(cursor):
+                conn.rollback()
+                return False
+
+            cursor.execute("LOCK TABLE conversation_log IN ACCESS EXCLUSIVE MODE")
+            cursor.execute("SELECT GREATEST(MAX(timestamp), now()) FROM conversation_log")
+            legacy_until = _month_start(cursor.fetchone()[0].astimezone(timezone.utc), 1)
+
+            cursor.execute("ALTER TABLE conversation_log RENAME TO conversation_log_legacy")
+            cursor.execute("ALTER INDEX conversation_log_pkey RENAME TO conversation_log_legacy_pkey")
+            cursor.execute("DROP INDEX IF EXISTS idx_conversation_log_session")  # Covered by the composite index
+            # Free the name for the partitioned index (the legacy one gets attached to it)
+            cursor.execute("ALTER INDEX IF EXISTS idx_conversation_log_session_time RENAME TO conversation_log_legacy_session_time_idx")
+            # The parent's key includes the partition column; a partition cannot
+            # carry a second primary key, so swap (log_id) for (log_id, timestamp)
+            # here and ATTACH reuses it instead of trying to add one
+            cursor.execute(
+                """
+                ALTER TABLE conversation_log_legacy
+                    DROP CONSTRAINT conversation_log_legacy_pkey,
+                    ADD CONSTRAINT conversation_log_legacy_pkey PRIMARY KEY (log_id, timestamp)
+                """
+            )
+            cursor.execute(_PARTITIONED_TABLE_SQL)
+            cursor.execute("ALTER SEQUENCE conversation_log_log_id_seq OWNED BY conversation_log.log_id")
+            cursor.execute(
+                "ALTER TABLE conversation_log ATTACH PARTITION conversation_log_legacy FOR VALUES FROM (MINVALUE) TO (%s)",
+                (legacy_until,)
+            )
+            cursor.execute("CREATE TABLE conversation_log_default PARTITION OF conversation_log DEFAULT")
+            cursor.execute(CONVERSATION_SCHEMA_SQL)
+            _create_month_partitions(cursor, CONVERSATION_PARTITIONS_AHEAD)
+        conn.commit()
+        logger.info(f"✓ conversation_log partitioned (legacy partition up to {legacy_until.date()})")
+        return True
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def _create_month_partitions(cursor, months_ahead: int) -> List[str]:
+    # Months already covered by the attached legacy heap are skipped
+    cursor.execute(
+        """
+        SELECT pg_get_expr(c.relpartbound, c.oid)
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'conversation_log'::regclass AND c.relname = 'conversation_log_legacy'
+        """
+    )
+    row = cursor.fetchone()
+    match = _RANGE_UPPER_RE.search(row[0]) if row else None
+    covered_until = datetime.fromisoformat(match.group(1)) if match else None
+
+    created = []
+    now = datetime.now(timezone.utc)
+    for offset in range(months_ahead + 1):
+        start, end = _month_start(now, offset), _month_start(now, offset + 1)
+        if covered_until is not None and start < covered_until:
+            continue
+        name = f"conversation_log_y{start.year}m{start.month:02d}"
+        cursor.execute("SELECT to_regclass(%s) IS NOT NULL", (name,))
+        if cursor.fetchone()[0]:
+            continue
+        cursor.execute(
+            f"CREATE TABLE {name} PARTITION OF conversation_log FOR VALUES FROM (%s) TO (%s)",
+            (start, end)
+        )
+        created.append(name)
+    return created
+
+
+def ensure_conversation_partitions(conn, months_ahead: int = CONVERSATION_PARTITIONS_AHEAD) -> List[str]:
+    """
+    Create the monthly partitions for the current month and `months_ahead`
+    months after it (no-op on a plain, not yet migrated table).
+
+    Returns:
+        Names of the partitions created
+    """
+    try:
+        with conn.cursor() as cursor:
+            if not _is_partitioned(cursor):
+                created = []
+            else:
+                created = _create_month_partitions(cursor, months_ahead)
+        if not conn.autocommit:
+            conn.commit()
+        return created
+    except Exception:
+        if not conn.autocommit:
+            conn.rollback()
+        raise
+
+
+# =============================================================================
+# Cold Archive
+# =============================================================================
+
+def archive_ended_conversations(
+    conn,
+    older_than_days: int = CONVERSATION_ARCHIVE_AFTER_DAYS,
+    batch_size: int = CONVERSATION_ARCHIVE_BATCH_SIZE
+) -> Dict[str, int]:
+    """
+    Pack the messages of one batch of sessions ended more than
+    `older_than_days` ago into conversation_archive and delete them from
+    conversation_log - ONE statement. Call repeatedly until "sessions" == 0.
+
+    Messages written after a session was archived stay hot; load_conversation
+    returns them after the archived ones.
+
+    Returns:
+        {"sessions": n, "messages": n}
+    """
+    try:
+        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            cursor.execute(
+                """
+                WITH targets AS (
+                    SELECT session_id
+                    FROM sessions
+                    WHERE conversation_archived_at IS NULL
+                      AND ended_at < now() - make_interval(days => %(days)s)
+                    ORDER BY ended_at
+                    LIMIT %(batch_size)s
+                    FOR UPDATE SKIP LOCKED
+                ),
+                moved AS (
+                    DELETE FROM conversation_log c
+                    USING targets t
+                    WHERE c.session_id = t.session_id
+                    RETURNING c.session_id, c.log_id, c.timestamp, c.role, c.content, c.language
+                ),
+                packed AS (
+                    INSERT INTO conversation_archive (session_id, messages, message_count, first_timestamp, last_timestamp)
+                    SELECT session_id,
+                           jsonb_agg(
+                               jsonb_build_object('log_id', log_id, 'timestamp', timestamp, 'role', role,
+                                                  'content', content, 'language', language)
+                               ORDER BY timestamp, log_id
+                           ),
+                           COUNT(*), MIN(timestamp), MAX(timestamp)
+                    FROM moved
+                    GROUP BY session_id
+                    ON CONFLICT (session_id) DO UPDATE
+                    SET messages = conversation_archive.messages || EXCLUDED.messages,
+                        message_count = conversation_archive.message_count + EXCLUDED.message_count,
+                        last_timestamp = GREATEST(conversation_archive.last_timestamp, EXCLUDED.last_timestamp),
+                        archived_at = now()
+                ),
+                marked AS (
+                    UPDATE sessions s
+                    SET conversation_archived_at = now()
+                    FROM targets t
+                    WHERE s.session_id = t.session_id
+                )
+                SELECT (SELECT COUNT(*) FROM targets) AS sessions, (SELECT COUNT(*) FROM moved) AS messages
+                """,
+                {"days": older_than_days, "batch_size": batch_size}
+            )
+            row = cursor.fetchone()
+        if not conn.autocommit:
+            conn.commit()
+        return {"sessions": row["sessions"], "messages": row["messages"]}
+    except Exception:
+        if not conn.autocommit:
+            conn.rollback()
+        raise
+
+
+# =============================================================================
+# Read Path
+# =============================================================================
+
+def load_conversation(
+    cursor,
+    session_id: str,
+    after: Optional[Tuple[datetime, int]] = None,
+    limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Conversation of a session in (timestamp, log_id) order - archived and
+    hot messages merged; the hot part is an index range scan on
+    (session_id, timestamp, log_id).
+
+    Args:
+        cursor: psycopg2 cursor
+        session_id: Session to read
+        after: (timestamp, log_id) keyset - only messages after it
+        limit: Max messages (None = all)
+
+    Returns:
+        [{"log_id", "session_id", "timestamp", "role", "content", "language"}]
+    """
+    params: Dict[str, Any] = {"session_id": session_id, "limit": limit}
+    keyset_sql = ""
+    if after is not None:
+        params["after_timestamp"], params["after_id"] = after
+        keyset_sql = "AND (timestamp, log_id) > (%(after_timestamp)s, %(after_id)s)"
+    limit_sql = "LIMIT %(limit)s" if limit is not None else ""
+
+    cursor.execute(
+        f"""
+        SELECT log_id, session_id, timestamp, role, content, language
+        FROM (
+            SELECT * FROM (
+                SELECT (m->>'log_id')::int AS log_id, a.session_id,
+                       (m->>'timestamp')::timestamptz AS timestamp,
+                       m->>'role' AS role, m->>'content' AS content, m->>'language' AS language
+                FROM conversation_archive a
+                CROSS JOIN LATERAL jsonb_array_elements(a.messages) m
+                WHERE a.session_id = %(session_id)s
+            ) archived
+            WHERE true {keyset_sql}
+            UNION ALL
+            (SELECT log_id, session_id, timestamp, role, content, language
+             FROM conversation_log
+             WHERE session_id = %(session_id)s {keyset_sql}
+             ORDER BY timestamp, log_id
+             {limit_sql})
+        ) messages
+        ORDER BY timestamp, log_id
+        {limit_sql}
+        """,
+        params
+    )
+    return [dict(row) for row in cursor.fetchall()]
+
+
+def load_session_language(cursor, session_id: str, latest: bool = False) -> Optional[str]:
+    """Language of a session's first (or latest) message, hot or archived"""
+    order = "DESC" if latest else "ASC"
+    cursor.execute(
+        f"""
+        SELECT language FROM (
+            (SELECT language, timestamp, log_id FROM conversation_log
+             WHERE session_id = %(session_id)s
+             ORDER BY timestamp {order}, log_id {order}
+             LIMIT 1)
+            UNION ALL
+            (SELECT m->>'language', (m->>'timestamp')::timestamptz, (m->>'log_id')::int
+             FROM conversation_archive a, jsonb_array_elements(a.messages) m
+             WHERE a.session_id = %(session_id)s)
+        ) candidates
+        ORDER BY timestamp {order}, log_id {order}
+        LIMIT 1
+        """,
+        {"session_id": session_id}
+    )
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return row["language"] if isinstance(row, dict) else row[0]
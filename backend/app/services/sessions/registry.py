@@ -0,0 +1,138 @@
+"""
+Session Registry
+================
+
+In-process set of session ids known to exist, so existence checks
+(WebSocket handshake, validate_session_id) and id generation skip
+PostgreSQL:
+
+- warmed from `sessions` at startup (and after every listener reconnect)
+- new sessions are inserted with pg_notify(SESSION_REGISTRY_CHANNEL) in
+  the SAME statement; every API worker LISTENs and adds the id
+- sessions are never deleted, so a hit is authoritative; only a miss
+  (e.g. a notification still in flight) is confirmed against PostgreSQL
+
+A plain set instead of a Bloom filter: session ids are 9 characters and a
+showroom creates thousands per year, and an exact set needs no false
+positive handling.
+"""
+
+import select
+import logging
+import threading
+from datetime import datetime
+from typing import Callable, Iterable
+
+logger = logging.getLogger(__name__)
+
+SESSION_REGISTRY_CHANNEL = "session_registry"
+SESSION_ID_MAX_ATTEMPTS = 20
+
+
+class SessionRegistry:
+    """Thread-safe set of existing session ids"""
+
+    def __init__(self):
+        self._ids = set()
+        self._lock = threading.Lock()
+        self.warmed = False
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._ids  # set lookups are atomic under the GIL
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, session_id: str) -> None:
+        with self._lock:
+            self._ids.add(session_id)
+
+    def add_many(self, session_ids: Iterable[str]) -> None:
+        with self._lock:
+            self._ids.update(session_ids)
+
+    def warm(self, conn, chunk_size: int = 10000) -> int:
+        """Load every session id; returns the registry size"""
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT session_id FROM sessions")
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                self.add_many(row[0] for row in rows)
+        if not conn.autocommit:
+            conn.rollback()
+        self.warmed = True
+        return len(self._ids)
+
+    def exists(self, conn, session_id: str) -> bool:
+        """Registry hit, or a confirmed PostgreSQL row (then remembered)"""
+        if session_id in self._ids:
+            return True
+        if conn is None:
+            return False
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sessions WHERE session_id = %s", (session_id,))
+            found = cursor.fetchone() is not None
+        if found:
+            self.add(session_id)
+        return found
+
+    # -------------------------------------------------------------------------
+    # Cross-worker notifications
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def listen(conn) -> None:
+        """Subscribe an AUTOCOMMIT connection to session creations"""
+        with conn.cursor() as cursor:
+            cursor.execute(f"LISTEN {SESSION_REGISTRY_CHANNEL}")
+
+    def drain_notifications(self, conn, timeout: float = 5.0) -> int:
+        """Block up to `timeout` seconds for notifications; returns ids added"""
+        if select.select([conn], [], [], timeout) == ([], [], []):
+            return 0
+        conn.poll()
+        session_ids = [notify.payload for notify in conn.notifies if notify.channel == SESSION_REGISTRY_CHANNEL]
+        conn.notifies.clear()
+        self.add_many(session_ids)
+        return len(session_ids)
+
+
+def insert_new_session(
+    cursor,
+    registry: SessionRegistry,
+    id_factory: Callable[[], str],
+    created_at: datetime,
+    max_attempts: int = SESSION_ID_MAX_ATTEMPTS
+) -> str:
+    """
+    Insert a session under a fresh id and announce it to the other workers.
+
+    Ids already in the registry are skipped without a round trip; an id
+    another worker took in the meantime (ON CONFLICT) is remembered and
+    the next candidate tried, so there are no duplicate-key failures.
+
+    Returns:
+        The new session_id
+    """
+    for _ in range(max_attempts):
+        session_id = id_factory()
+        if session_id in registry:
+            continue
+        cursor.execute(
+            """
+            WITH inserted AS (
+                INSERT INTO sessions (session_id, created_at) VALUES (%s, %s)
+                ON CONFLICT (session_id) DO NOTHING
+                RETURNING session_id
+            )
+            SELECT session_id, pg_notify(%s, session_id) FROM inserted
+            """,
+            (session_id, created_at, SESSION_REGISTRY_CHANNEL)
+        )
+        inserted = cursor.fetchone() is not None
+        registry.add(session_id)
+        if inserted:
+            return session_id
+    raise RuntimeError(f"No free session id after {max_attempts} attempts")
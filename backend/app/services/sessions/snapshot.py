@@ -0,0 +1,162 @@
+"""
+Session Snapshot
+================
+
+Versioned, paginated reads behind GET /api/v1/sessions/{session_id}:
+
+- version - one index lookup (newest conversation row, archive size,
+  sessions.latest_slow_path_id) that changes whenever the session gains a
+  message or an analysis; the ETag is derived from it plus the request
+  variant, so unchanged sessions are answered with 304 before any payload
+  is read or serialized
+- pagination - opaque keyset cursor on (timestamp, log_id) over the merged
+  hot + archived conversation
+- projection - SESSION_FIELDS sections; `slow_path_status` is the latest
+  analysis without its json_output (the bulk of a payload), for polling
+"""
+
+import json
+import base64
+import hashlib
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..analytics import load_latest_slow_path
+from .conversation import load_conversation
+
+logger = logging.getLogger(__name__)
+
+SESSION_FIELDS = ("conversation_log", "slow_path_log", "slow_path_status")
+SESSION_DEFAULT_FIELDS = ("conversation_log", "slow_path_log")
+SESSION_PAGE_MAX_LIMIT = 500
+
+
+def parse_session_fields(fields: Optional[str]) -> Tuple[str, ...]:
+    """Comma separated projection -> SESSION_FIELDS subset (None / '' = SESSION_DEFAULT_FIELDS)"""
+    if not fields:
+        return SESSION_DEFAULT_FIELDS
+    requested = tuple(dict.fromkeys(part.strip() for part in fields.split(",") if part.strip()))
+    unknown = [field for field in requested if field not in SESSION_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields {unknown}; allowed: {', '.join(SESSION_FIELDS)}")
+    return requested
+
+
+# =============================================================================
+# Cursor Encoding
+# =============================================================================
+
+def encode_conversation_cursor(entry: Dict[str, Any]) -> str:
+    """Opaque keyset cursor pointing after a conversation entry"""
+    raw = json.dumps({"t": entry["timestamp"].isoformat(), "id": entry["log_id"]})
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_conversation_cursor(cursor: str) -> Tuple[datetime, int]:
+    """(timestamp, log_id) of a cursor; ValueError if invalid"""
+    try:
+        state = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(state["t"]), int(state["id"])
+    except (KeyError, TypeError, ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+
+# =============================================================================
+# Version / ETag
+# =============================================================================
+
+def load_session_version(cursor, session_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Cheap change marker of a session (no message or analysis payload read).
+
+    Returns:
+        {"last_log_id", "last_timestamp", "archived_count", "slow_path_log_id"}
+        or None if the session does not exist
+    """
+    cursor.execute(
+        """
+        SELECT hot.log_id AS last_log_id, hot.timestamp AS last_timestamp,
+               COALESCE(a.message_count, 0) AS archived_count,
+               s.latest_slow_path_id AS slow_path_log_id
+        FROM sessions s
+        LEFT JOIN LATERAL (
+            SELECT log_id, timestamp
+            FROM conversation_log
+            WHERE session_id = s.session_id
+            ORDER BY timestamp DESC, log_id DESC
+            LIMIT 1
+        ) hot ON true
+        LEFT JOIN conversation_archive a ON a.session_id = s.session_id
+        WHERE s.session_id = %s
+        """,
+        (session_id,)
+    )
+    row = cursor.fetchone()
+    return dict(row) if row else None
+
+
+def session_etag(version: Dict[str, Any], variant: Sequence[Any]) -> str:
+    """Weak ETag of a session version + the request variant (fields, cursor, limit)"""
+    last_timestamp = version["last_timestamp"].isoformat() if version["last_timestamp"] else ""
+    raw = "|".join(str(part) for part in (
+        version["last_log_id"], last_timestamp, version["archived_count"], version["slow_path_log_id"], *variant
+    ))
+    return f'W/"{hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check (weak comparison, lists and '*' supported)"""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    return "*" in candidates or any(
+        (candidate[2:] if candidate.startswith("W/") else candidate) == opaque for candidate in candidates
+    )
+
+
+# =============================================================================
+# Snapshot
+# =============================================================================
+
+def load_session_snapshot(
+    cursor,
+    session_id: str,
+    fields: Sequence[str] = SESSION_DEFAULT_FIELDS,
+    after: Optional[str] = None,
+    limit: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Projected session payload with one page of the conversation.
+
+    Args:
+        cursor: psycopg2 RealDictCursor
+        fields: SESSION_FIELDS subset (parse_session_fields)
+        after: next_cursor of the previous page
+        limit: Conversation entries per page (None = the whole remaining log)
+
+    Returns:
+        Requested sections + "next_cursor" (only with conversation_log)
+    """
+    data: Dict[str, Any] = {}
+    if "conversation_log" in fields:
+        page_size = None if limit is None else max(1, min(limit, SESSION_PAGE_MAX_LIMIT))
+        keyset = decode_conversation_cursor(after) if after else None
+        entries: List[Dict[str, Any]] = load_conversation(
+            cursor, session_id, after=keyset, limit=None if page_size is None else page_size + 1
+        )
+        has_more = page_size is not None and len(entries) > page_size
+        entries = entries[:page_size] if page_size is not None else entries
+        data["conversation_log"] = entries
+        data["next_cursor"] = encode_conversation_cursor(entries[-1]) if has_more else None
+
+    if "slow_path_log" in fields or "slow_path_status" in fields:
+        slow_path_log = load_latest_slow_path(cursor, session_id)
+        if "slow_path_log" in fields:
+            data["slow_path_log"] = slow_path_log
+        if "slow_path_status" in fields:
+            data["slow_path_status"] = None if slow_path_log is None else {
+                key: value for key, value in slow_path_log.items() if key != "json_output"
+            }
+    return data
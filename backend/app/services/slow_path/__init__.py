@@ -0,0 +1,45 @@
+"""
+Slow Path Orchestration
+=======================
+
+Decisions taken around the Opus Magnum analysis (the LLM call itself lives
+in main.py):
+
+1. Gating - whether a new note is worth a new analysis
+   - no previous analysis / error / keyword triggers / pending note count
+   - acknowledgements / typo fixes skipped, embedding distance from the analyzed window
+   - fails open; retry_slowpath forces the analysis
+
+2. Result cache - content-addressed reuse of stored analyses
+   - key: hash of history, journey stage, language, prompt version
+   - stored on the slow_path_logs row (cache_key), next to the last
+     conversation_log.log_id the analysis read (analyzed_log_id)
+"""
+
+from .cache import (
+    SLOW_PATH_CACHE_SCHEMA_SQL,
+    ensure_slow_path_cache_schema,
+    load_cached_slow_path,
+    slow_path_cache_key,
+)
+from .gating import (
+    SLOW_PATH_GATE_ENABLED,
+    SlowPathGateDecision,
+    decide_slow_path,
+    evaluate_slow_path_gate,
+    significant_term_category,
+)
+
+__all__ = [
+    # Gating
+    "SLOW_PATH_GATE_ENABLED",
+    "SlowPathGateDecision",
+    "decide_slow_path",
+    "evaluate_slow_path_gate",
+    "significant_term_category",
+    # Result cache
+    "SLOW_PATH_CACHE_SCHEMA_SQL",
+    "ensure_slow_path_cache_schema",
+    "load_cached_slow_path",
+    "slow_path_cache_key",
+]
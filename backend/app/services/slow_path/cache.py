@@ -0,0 +1,66 @@
+"""
+Slow Path Result Cache
+======================
+
+Content-addressed reuse of Opus Magnum analyses: the key is a hash of
+everything the analysis depends on that the session controls (formatted
+history, journey stage, language, prompt + model version) and is stored on
+the slow_path_logs row itself (`cache_key`). A retry or duplicate trigger
+over an unchanged history finds the stored analysis with one index lookup
+and delivers it without a model call.
+
+Only primary-model results are cached (a Gemini fallback is retried);
+compacted analyses (slow_path_archives) are simply cache misses.
+"""
+
+import json
+import hashlib
+import logging
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+SLOW_PATH_CACHE_SCHEMA_SQL = """
+ALTER TABLE slow_path_logs ADD COLUMN IF NOT EXISTS cache_key TEXT;
+-- Last conversation_log.log_id the analysis read (gating: notes after it are new)
+ALTER TABLE slow_path_logs ADD COLUMN IF NOT EXISTS analyzed_log_id BIGINT;
+CREATE INDEX IF NOT EXISTS idx_slow_path_logs_cache_key ON slow_path_logs(session_id, cache_key)
+    WHERE cache_key IS NOT NULL;
+"""
+
+
+def ensure_slow_path_cache_schema(conn) -> None:
+    """slow_path_logs.cache_key (+ lookup index) and analyzed_log_id (idempotent)"""
+    with conn.cursor() as cursor:
+        cursor.execute(SLOW_PATH_CACHE_SCHEMA_SQL)
+    if not conn.autocommit:
+        conn.commit()
+
+
+def slow_path_cache_key(session_history: str, journey_stage: str, language: str, prompt_version: str) -> str:
+    """sha256 over the analysis inputs (hex)"""
+    raw = json.dumps([prompt_version, language, journey_stage, session_history], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def load_cached_slow_path(cursor, session_id: str, cache_key: str) -> Optional[Dict[str, Any]]:
+    """
+    Newest successful analysis stored under `cache_key`.
+
+    Returns:
+        {"log_id", "timestamp", "json_output"} or None
+    """
+    cursor.execute(
+        """
+        SELECT log_id, timestamp, json_output
+        FROM slow_path_logs
+        WHERE session_id = %s AND cache_key = %s AND status = 'Success'
+        ORDER BY log_id DESC
+        LIMIT 1
+        """,
+        (session_id, cache_key)
+    )
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return {"log_id": row[0], "timestamp": row[1], "json_output": row[2]}
@@ -0,0 +1,237 @@
+"""
+Slow Path Trigger Gate
+======================
+
+Cheap local decision whether a new seller note changes the session enough
+to be worth a full Opus Magnum analysis (671B model, 20-90s):
+
+1. no previous successful analysis      -> run
+2. no seller note after the last one the analysis read -> skip (duplicate trigger)
+3. objection / price / competitor terms -> run
+4. SLOW_PATH_GATE_MAX_PENDING_NOTES notes since the analysis -> run
+5. only acknowledgements ("ok", "tak") or typo fixes (near-copy of the
+   previous note, "*correction") -> skip; short substantive notes
+   ("Żona decyduje") go on to the embedding rule
+6. embedding distance of the new notes from the analyzed window
+   >= SLOW_PATH_GATE_MIN_DISTANCE       -> run, else skip
+
+Every doubt (no embedding model, database error) runs the analysis;
+retry_slowpath bypasses the gate (force).
+"""
+
+import os
+import re
+import logging
+from difflib import SequenceMatcher
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SLOW_PATH_GATE_ENABLED = os.getenv("SLOW_PATH_GATE_ENABLED", "true").lower() in ("1", "true", "yes")
+SLOW_PATH_GATE_MIN_DISTANCE = float(os.getenv("SLOW_PATH_GATE_MIN_DISTANCE", "0.35"))
+SLOW_PATH_GATE_MAX_PENDING_NOTES = int(os.getenv("SLOW_PATH_GATE_MAX_PENDING_NOTES", "4"))
+SLOW_PATH_GATE_WINDOW = 8  # Analyzed seller notes the new ones are compared with
+
+# Notes made only of these tokens are acknowledgements
+ACKNOWLEDGEMENT_TOKENS = frozenset({
+    "ok", "okay", "okej", "oki", "k", "tak", "no", "nie", "aha", "mhm", "hmm", "jasne", "dobrze", "dobra",
+    "spoko", "super", "świetnie", "swietnie", "git", "zgoda", "rozumiem", "dzięki", "dzieki", "dziękuję",
+    "dziekuje", "yes", "yep", "sure", "fine", "great", "thanks", "thx", "got", "it", "noted", "right",
+})
+# A note this similar to the previous one (character ratio) is a typo fix
+TYPO_FIX_SIMILARITY = 0.85
+MAX_TYPO_FIX_TOKENS = 2  # "*cenę" style corrections
+
+# Token prefixes (lowercased) that always justify a new analysis
+SIGNIFICANT_TERMS: Dict[str, Sequence[str]] = {
+    "price": (
+        "cena", "ceny", "cenę", "cenie", "cenow", "koszt", "drog", "tani", "rabat", "zniżk", "znizk",
+        "promocj", "leasing", "rat", "budżet", "budzet", "kredyt", "dopłat", "doplat", "price", "cost",
+        "expensiv", "cheap", "discount", "budget", "financ", "lease", "pln", "zł",
+    ),
+    "objection": (
+        "obaw", "wątpi", "watpi", "martw", "boi", "ryzyk", "problem", "zastrzeż", "zastrzez",
+        "zasięg", "zasieg", "ładowa", "ladowa", "awari", "serwis", "rezygn", "zastanow", "później",
+        "pozniej", "concern", "worr", "doubt", "risk", "hesita", "range", "charging", "later",
+    ),
+    "competitor": (
+        "bmw", "audi", "mercedes", "volvo", "toyot", "lexus", "porsche", "taycan", "polestar",
+        "hyundai", "ioniq", "kia", "byd", "skod", "volkswagen", "xpeng", "ford",
+        "mustang", "cupra", "konkurenc", "competit",
+    ),
+}
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_DIGIT_RE = re.compile(r"\d{3,}")
+
+
+@dataclass
+class SlowPathGateDecision:
+    """Outcome of the gate for one trigger"""
+    run: bool
+    reason: str
+    new_notes: int = 0
+    distance: Optional[float] = None  # Cosine distance of the most novel new note
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        if self.distance is not None:
+            data["distance"] = round(self.distance, 3)
+        return data
+
+
+def _tokens(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def is_trivial_note(note: str, previous: Optional[str] = None) -> bool:
+    """
+    Acknowledgement ("ok", "tak, jasne") or typo fix ("*cenę", near-copy of
+    the previous note). Short substantive notes are NOT trivial - the
+    embedding distance rule decides them.
+    """
+    tokens = _tokens(note)
+    if all(token in ACKNOWLEDGEMENT_TOKENS for token in tokens):
+        return True
+    if note.lstrip().startswith("*") and len(tokens) <= MAX_TYPO_FIX_TOKENS:
+        return True
+    if previous:
+        ratio = SequenceMatcher(None, note.lower().strip(), previous.lower().strip()).ratio()
+        return ratio >= TYPO_FIX_SIMILARITY
+    return False
+
+
+def significant_term_category(notes: Sequence[str]) -> Optional[str]:
+    """First SIGNIFICANT_TERMS category mentioned in the notes (amounts count as price)"""
+    for note in notes:
+        tokens = _tokens(note)
+        for category, prefixes in SIGNIFICANT_TERMS.items():
+            if any(token.startswith(prefix) for token in tokens for prefix in prefixes):
+                return category
+        if _DIGIT_RE.search(note):
+            return "price"
+    return None
+
+
+def novelty_distance(new_vectors: np.ndarray, analyzed_vectors: np.ndarray) -> float:
+    """Max over new notes of (1 - best cosine similarity to an analyzed note)"""
+    def normalize(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+        return matrix / np.where(norms == 0, 1.0, norms)
+
+    similarities = normalize(new_vectors) @ normalize(analyzed_vectors).T
+    return float(np.max(1.0 - similarities.max(axis=1)))
+
+
+# =============================================================================
+# Session State
+# =============================================================================
+
+def load_gate_state(cursor, session_id: str, window: int = SLOW_PATH_GATE_WINDOW) -> Dict[str, Any]:
+    """
+    Latest analysis status + the seller notes around it (no json_output read).
+    Notes after the analysis' analyzed_log_id are new (the analysis row is
+    written 20-90s after its history read); rows without it fall back to
+    the analysis timestamp.
+
+    Returns:
+        {"last_status", "new_notes": [...], "analyzed_notes": [...]} (chronological)
+    """
+    cursor.execute(
+        """
+        SELECT l.timestamp, l.status, l.analyzed_log_id
+        FROM sessions s
+        JOIN LATERAL (
+            SELECT timestamp, status, analyzed_log_id FROM slow_path_logs WHERE log_id = s.latest_slow_path_id
+            UNION ALL
+            (SELECT timestamp, status, analyzed_log_id FROM slow_path_logs
+             WHERE s.latest_slow_path_id IS NULL AND session_id = s.session_id
+             ORDER BY log_id DESC
+             LIMIT 1)
+        ) l ON true
+        WHERE s.session_id = %s
+        LIMIT 1
+        """,
+        (session_id,)
+    )
+    latest = cursor.fetchone()
+    last_timestamp, last_status, analyzed_log_id = latest if latest else (None, None, None)
+
+    # Live sessions are never archived - the hot table holds every note
+    cursor.execute(
+        """
+        SELECT content, timestamp, log_id
+        FROM conversation_log
+        WHERE session_id = %s AND role = 'Sprzedawca'
+        ORDER BY timestamp DESC, log_id DESC
+        LIMIT %s
+        """,
+        (session_id, window + SLOW_PATH_GATE_MAX_PENDING_NOTES)
+    )
+    rows = list(reversed(cursor.fetchall()))
+    if last_timestamp is None:
+        return {"last_status": None, "new_notes": [row[0] for row in rows], "analyzed_notes": []}
+    if analyzed_log_id is not None:
+        is_new = [row[2] > analyzed_log_id for row in rows]
+    else:
+        is_new = [row[1] > last_timestamp for row in rows]
+    return {
+        "last_status": last_status,
+        "new_notes": [row[0] for row, new in zip(rows, is_new) if new],
+        "analyzed_notes": [row[0] for row, new in zip(rows, is_new) if not new][-window:],
+    }
+
+
+def decide_slow_path(
+    state: Dict[str, Any],
+    encode_fn: Optional[Callable[[List[str]], Any]] = None,
+    min_distance: float = SLOW_PATH_GATE_MIN_DISTANCE,
+    max_pending_notes: int = SLOW_PATH_GATE_MAX_PENDING_NOTES
+) -> SlowPathGateDecision:
+    """Apply the gate rules (module docstring) to a load_gate_state() result"""
+    new_notes = [note for note in state["new_notes"] if note]
+    pending = len(new_notes)
+    if state["last_status"] != "Success":
+        return SlowPathGateDecision(True, "first_analysis" if state["last_status"] is None else "previous_error", pending)
+    if not new_notes:
+        return SlowPathGateDecision(False, "no_new_notes")
+
+    category = significant_term_category(new_notes)
+    if category:
+        return SlowPathGateDecision(True, f"keyword:{category}", pending)
+    if pending >= max_pending_notes:
+        return SlowPathGateDecision(True, "message_count", pending)
+
+    # Each new note is compared with the note right before it (typo fixes)
+    previous = (state["analyzed_notes"][-1:] or [None]) + new_notes[:-1]
+    substantive = [note for note, before in zip(new_notes, previous) if not is_trivial_note(note, before)]
+    if not substantive:
+        return SlowPathGateDecision(False, "trivial", pending)
+    if encode_fn is None or not state["analyzed_notes"]:
+        return SlowPathGateDecision(True, "no_baseline", pending)
+
+    vectors = np.asarray(encode_fn(substantive + state["analyzed_notes"]), dtype=np.float32)
+    distance = novelty_distance(vectors[:len(substantive)], vectors[len(substantive):])
+    if distance >= min_distance:
+        return SlowPathGateDecision(True, "novel_content", pending, distance)
+    return SlowPathGateDecision(False, "similar_content", pending, distance)
+
+
+def evaluate_slow_path_gate(
+    conn,
+    session_id: str,
+    encode_fn: Optional[Callable[[List[str]], Any]] = None
+) -> SlowPathGateDecision:
+    """Gate decision for the session's current state (fails open)"""
+    if not SLOW_PATH_GATE_ENABLED:
+        return SlowPathGateDecision(True, "gate_disabled")
+    try:
+        with conn.cursor() as cursor:
+            state = load_gate_state(cursor, session_id)
+        return decide_slow_path(state, encode_fn)
+    except Exception as e:
+        logger.warning(f"⚠ Slow Path gate failed for {session_id} - running the analysis: {e}")
+        return SlowPathGateDecision(True, "gate_error")
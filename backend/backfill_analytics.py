@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Analytics Backfill: roll up Slow Path results written before the rollups
+=========================================================================
+Extracts playbook titles / DISC type / purchase temperature from
+slow_path_logs.json_output into the analytics columns and adds the rows to
+the daily dashboard rollups, in batches (one transaction each). Only rows
+not rolled up yet are touched, so the command can be interrupted and
+re-run at any time; new Slow Path results are rolled up by the API itself.
+
+Usage:
+    python backfill_analytics.py                   # Roll up pending rows
+    python backfill_analytics.py --batch-size 2000
+    python backfill_analytics.py --rebuild         # Empty the rollups and recompute everything
+                                                   # (refused once Slow Path history was compacted)
+"""
+import sys
+import io
+import os
+import time
+import argparse
+
+import psycopg2
+from dotenv import load_dotenv
+
+from app.services.analytics import (
+    backfill_analytics,
+    ensure_analytics_schema,
+    reset_analytics_rollups,
+)
+
+# Fix Windows console encoding
+sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+
+load_dotenv()
+
+parser = argparse.ArgumentParser(description='Backfill analytics columns and daily rollups from slow_path_logs')
+parser.add_argument('--batch-size', type=int, default=500, help='Rows per transaction')
+parser.add_argument('--rebuild', action='store_true', help='Truncate the rollups and recompute them from all rows')
+args = parser.parse_args()
+
+print("=" * 70)
+print("ANALYTICS BACKFILL: slow_path_logs → daily rollups")
+print("=" * 70)
+print()
+
+conn = psycopg2.connect(
+    user=os.getenv('POSTGRES_USER', 'postgres'),
+    password=os.getenv('POSTGRES_PASSWORD', 'postgres'),
+    host=os.getenv('POSTGRES_HOST', 'localhost'),
+    port=os.getenv('POSTGRES_PORT', '5432'),
+    database=os.getenv('POSTGRES_DB', 'ultra_db')
+)
+
+try:
+    ensure_analytics_schema(conn)
+    if args.rebuild:
+        reset_analytics_rollups(conn)
+        print("Rollups emptied - recomputing from all rows")
+
+    started = time.perf_counter()
+    total_rows = 0
+    total_plays = 0
+    while True:
+        result = backfill_analytics(conn, batch_size=args.batch_size)
+        if not result["rows"]:
+            break
+        total_rows += result["rows"]
+        total_plays += result["playbook_uses"]
+        elapsed = time.perf_counter() - started
+        print(f"\r  {total_rows} rows rolled up ({total_rows / elapsed:.0f} rows/s)", end='', flush=True)
+
+    print()
+    print()
+    print(f"✅ {total_rows} rows rolled up ({total_plays} playbook uses) in {time.perf_counter() - started:.1f}s")
+
+except Exception as e:
+    print()
+    print(f"ERROR: {e}")
+    sys.exit(1)
+finally:
+    conn.close()
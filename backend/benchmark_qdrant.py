@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Qdrant Collection Benchmark: default layout vs tuned layout
+============================================================
+Builds two throw-away collections with identical synthetic data
+(384-dim vectors, `language` / `type` payloads like the RAG nuggets):
+
+- baseline: default VectorParams only (what seed.py used to create)
+- tuned:    payload indexes + int8 quantization + HNSW profile
+
+Then runs the same language-filtered searches query_rag issues and reports
+latency percentiles, recall@k against exact search and memory:
+
+- RAM MiB: MEASURED growth of the resident set after loading and warming up
+  each layout (Qdrant server telemetry `memory.resident_bytes` in remote
+  mode, this process in embedded mode; allocator noise of a few MiB)
+- est. MiB: arithmetic estimate of the vector storage (estimate_vector_memory)
+
+Usage:
+    python benchmark_qdrant.py                              # remote Qdrant from .env
+    python benchmark_qdrant.py --points 50000 --queries 500
+    python benchmark_qdrant.py --profile fast
+
+NOTE: Run against a Qdrant SERVER. Embedded local/:memory: mode always
+does exact search, so both layouts will measure the same.
+"""
+import sys
+import io
+import os
+import time
+import argparse
+import statistics
+from typing import List, Optional, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+from qdrant_client import QdrantClient, models
+
+from app.services.rag import (
+    HNSW_PROFILES,
+    QDRANT_MODES,
+    build_search_params,
+    create_qdrant_client,
+    describe_qdrant_target,
+    ensure_collection,
+    estimate_vector_memory,
+    is_embedded_mode,
+)
+
+# Fix Windows console encoding
+sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+
+load_dotenv()
+
+parser = argparse.ArgumentParser(description='Benchmark default vs tuned Qdrant collection layout')
+parser.add_argument('--points', type=int, default=20000, help='Synthetic points per collection')
+parser.add_argument('--queries', type=int, default=200, help='Number of search queries')
+parser.add_argument('--top-k', type=int, default=3, help='Results per query (query_rag uses 3)')
+parser.add_argument('--dim', type=int, default=384, help='Vector dimension')
+parser.add_argument('--profile', choices=sorted(HNSW_PROFILES), default='balanced')
+parser.add_argument('--vectors-on-disk', action=argparse.BooleanOptionalAction, default=True,
+                    help='Tuned layout keeps float32 originals on disk, only int8 copies in RAM')
+parser.add_argument('--qdrant-mode', choices=QDRANT_MODES, default=os.getenv('QDRANT_MODE', 'remote'))
+parser.add_argument('--qdrant-path', default=os.getenv('QDRANT_PATH', './qdrant_data'))
+args = parser.parse_args()
+
+BASELINE_COLLECTION = "bench_rag_baseline"
+TUNED_COLLECTION = "bench_rag_tuned"
+LANGUAGES = ["pl", "en"]
+TYPES = ["product", "objection", "financing", "golden_standard"]
+UPSERT_BATCH = 1000
+
+
+def fill_collection(client: QdrantClient, name: str, vectors: np.ndarray) -> None:
+    """Upsert synthetic points in batches"""
+    for start in range(0, len(vectors), UPSERT_BATCH):
+        batch = vectors[start:start + UPSERT_BATCH]
+        client.upsert(
+            collection_name=name,
+            points=[
+                models.PointStruct(
+                    id=start + i,
+                    vector=vec.tolist(),
+                    payload={
+                        "language": LANGUAGES[(start + i) % len(LANGUAGES)],
+                        "type": TYPES[(start + i) % len(TYPES)],
+                    }
+                )
+                for i, vec in enumerate(batch)
+            ],
+            wait=True
+        )
+
+
+def wait_until_green(client: QdrantClient, name: str, timeout: float = 300.0) -> None:
+    """Wait for background indexing / quantization to finish"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if client.get_collection(name).status == models.CollectionStatus.GREEN:
+            return
+        time.sleep(0.5)
+    print(f"   ⚠️ {name} still optimizing after {timeout:.0f}s - numbers may be pessimistic")
+
+
+def run_queries(client: QdrantClient, name: str, queries: np.ndarray, search_params=None) -> Tuple[List[float], List[List[int]]]:
+    """Run language-filtered searches, return per-query latency (ms) and hit ids"""
+    latencies = []
+    hits = []
+    for i, query in enumerate(queries):
+        language_filter = models.Filter(
+            must=[models.FieldCondition(key="language", match=models.MatchValue(value=LANGUAGES[i % len(LANGUAGES)]))]
+        )
+        started = time.perf_counter()
+        results = client.search(
+            collection_name=name,
+            query_vector=query.tolist(),
+            query_filter=language_filter,
+            search_params=search_params,
+            limit=args.top_k
+        )
+        latencies.append((time.perf_counter() - started) * 1000)
+        hits.append([hit.id for hit in results])
+    return latencies, hits
+
+
+def measure_resident_bytes(client: QdrantClient) -> Optional[int]:
+    """Resident set of the process holding the vectors (None = not reported)"""
+    if is_embedded_mode(args.qdrant_mode):
+        try:
+            with open("/proc/self/statm") as statm:
+                return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, AttributeError):  # Not Linux
+            return None
+    try:
+        memory = client.http.service_api.telemetry(details_level=0).result.memory
+    except Exception:
+        return None
+    return memory.resident_bytes if memory is not None else None
+
+
+def format_mib(value: Optional[int]) -> str:
+    return "n/a" if value is None else f"{value / 1024 / 1024:.1f}"
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+print("=" * 70)
+print("QDRANT BENCHMARK: default vs tuned collection")
+print("=" * 70)
+print()
+
+client = create_qdrant_client(args.qdrant_mode, path=args.qdrant_path)
+print(f"Target: {describe_qdrant_target(args.qdrant_mode, args.qdrant_path)}")
+print(f"Points: {args.points}, queries: {args.queries}, top_k: {args.top_k}, profile: {args.profile}")
+print()
+
+rng = np.random.default_rng(42)
+vectors = rng.standard_normal((args.points, args.dim)).astype(np.float32)
+vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+queries = rng.standard_normal((args.queries, args.dim)).astype(np.float32)
+
+try:
+    for name in (BASELINE_COLLECTION, TUNED_COLLECTION):
+        if client.collection_exists(name):
+            client.delete_collection(name)
+
+    print("Building collections...")
+    client.create_collection(
+        collection_name=BASELINE_COLLECTION,
+        vectors_config=models.VectorParams(size=args.dim, distance=models.Distance.COSINE)
+    )
+    ensure_collection(client, TUNED_COLLECTION, args.dim, profile=args.profile, quantization="int8",
+                      vectors_on_disk=args.vectors_on_disk)
+
+    # Layouts loaded one after the other: each one's resident growth is measured
+    # after its warm-up queries (first queries page in the searched structures)
+    measured = {}
+    resident_before = measure_resident_bytes(client)
+    for name, search_params in (
+        (BASELINE_COLLECTION, None),
+        (TUNED_COLLECTION, build_search_params(args.profile, "int8")),
+    ):
+        started = time.perf_counter()
+        fill_collection(client, name, vectors)
+        wait_until_green(client, name)
+        run_queries(client, name, queries[:10], search_params)
+        resident_after = measure_resident_bytes(client)
+        measured[name] = (
+            resident_after - resident_before
+            if resident_before is not None and resident_after is not None else None
+        )
+        resident_before = resident_after
+        print(f"   {name}: loaded in {time.perf_counter() - started:.1f}s")
+    print()
+
+    exact_params = models.SearchParams(exact=True)
+    _, exact_hits = run_queries(client, BASELINE_COLLECTION, queries, exact_params)
+    base_latency, base_hits = run_queries(client, BASELINE_COLLECTION, queries)
+    tuned_latency, tuned_hits = run_queries(client, TUNED_COLLECTION, queries, build_search_params(args.profile, "int8"))
+
+    def recall(found: List[List[int]]) -> float:
+        matched = sum(len(set(f) & set(e)) for f, e in zip(found, exact_hits))
+        total = sum(len(e) for e in exact_hits) or 1
+        return matched / total
+
+    base_memory = estimate_vector_memory(args.points, args.dim, quantization="none", vectors_on_disk=False)
+    tuned_memory = estimate_vector_memory(args.points, args.dim, quantization="int8", vectors_on_disk=args.vectors_on_disk)
+
+    print(f"{'':<12}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}{'recall':>10}{'RAM MiB':>10}{'est. MiB':>10}")
+    print("-" * 72)
+    for label, name, latency, hits, memory in (
+        ("baseline", BASELINE_COLLECTION, base_latency, base_hits, base_memory),
+        ("tuned", TUNED_COLLECTION, tuned_latency, tuned_hits, tuned_memory),
+    ):
+        print(f"{label:<12}{percentile(latency, 0.50):>10.2f}{percentile(latency, 0.95):>10.2f}"
+              f"{statistics.mean(latency):>10.2f}{recall(hits):>10.3f}"
+              f"{format_mib(measured[name]):>10}{format_mib(memory['resident_bytes']):>10}")
+    print()
+    print("RAM MiB  = MEASURED resident growth while loading + warming up the layout")
+    print("           (n/a: server telemetry without memory stats, or not Linux in embedded mode)")
+    print("est. MiB = ESTIMATE of resident vector storage only (float32 originals and/or int8")
+    print("           copies; --no-vectors-on-disk keeps the originals in RAM next to the int8 copies)")
+
+finally:
+    for name in (BASELINE_COLLECTION, TUNED_COLLECTION):
+        try:
+            client.delete_collection(name)
+        except Exception:
+            pass
+    client.close()
+
+print()
+print("=" * 70)
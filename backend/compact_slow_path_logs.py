@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Slow Path Retention: compact superseded analyses into per-session archives
+==========================================================================
+Points every session at its newest analysis (sessions.latest_slow_path_id),
+then moves analyses that a newer one superseded and that are older than
+N days into slow_path_archives, in batches (one transaction each). The API
+runs the same compaction periodically (SLOW_PATH_RETENTION_DAYS); use this
+for a first run on a large table or a different cut-off.
+
+Usage:
+    python compact_slow_path_logs.py                      # SLOW_PATH_RETENTION_DAYS (default 30)
+    python compact_slow_path_logs.py --older-than-days 7
+    python compact_slow_path_logs.py --batch-size 5000
+"""
+import sys
+import io
+import os
+import time
+import argparse
+
+import psycopg2
+from dotenv import load_dotenv
+
+# Fix Windows console encoding
+sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+
+load_dotenv()
+
+from app.services.analytics import (  # noqa: E402 - reads SLOW_PATH_RETENTION_DAYS from .env
+    SLOW_PATH_RETENTION_DAYS,
+    backfill_latest_slow_path_ids,
+    compact_slow_path_history,
+    ensure_slow_path_history_schema,
+)
+
+parser = argparse.ArgumentParser(description='Compact superseded Slow Path analyses into per-session archives')
+parser.add_argument('--older-than-days', type=int, default=SLOW_PATH_RETENTION_DAYS, help='Keep every analysis younger than this')
+parser.add_argument('--batch-size', type=int, default=1000, help='Rows per transaction')
+args = parser.parse_args()
+
+if args.older_than_days <= 0:
+    print("ERROR: --older-than-days must be positive")
+    sys.exit(1)
+
+print("=" * 70)
+print(f"SLOW PATH RETENTION: superseded analyses older than {args.older_than_days} days → archives")
+print("=" * 70)
+print()
+
+conn = psycopg2.connect(
+    user=os.getenv('POSTGRES_USER', 'postgres'),
+    password=os.getenv('POSTGRES_PASSWORD', 'postgres'),
+    host=os.getenv('POSTGRES_HOST', 'localhost'),
+    port=os.getenv('POSTGRES_PORT', '5432'),
+    database=os.getenv('POSTGRES_DB', 'ultra_db')
+)
+
+try:
+    ensure_slow_path_history_schema(conn)
+    pointers = backfill_latest_slow_path_ids(conn)
+    print(f"Latest pointers set for {pointers} sessions")
+
+    started = time.perf_counter()
+    total_rows = 0
+    while True:
+        result = compact_slow_path_history(conn, args.older_than_days, args.batch_size)
+        if not result["compacted"]:
+            break
+        total_rows += result["compacted"]
+        elapsed = time.perf_counter() - started
+        print(f"\r  {total_rows} analyses archived ({total_rows / elapsed:.0f} rows/s)", end='', flush=True)
+
+    print()
+    print()
+    print(f"✅ {total_rows} analyses archived in {time.perf_counter() - started:.1f}s")
+    print("   Run VACUUM (ANALYZE) slow_path_logs to return the space to the table")
+
+except Exception as e:
+    print()
+    print(f"ERROR: {e}")
+    sys.exit(1)
+finally:
+    conn.close()
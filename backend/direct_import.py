@@ -12,6 +12,8 @@ Usage:
     python direct_import.py                     # Import from default locations
     python direct_import.py --datatoupload      # Import from datatoupload/ folder
     python direct_import.py --folder <path>     # Import from custom folder
+    python direct_import.py --qdrant-mode local --qdrant-path ./qdrant_data
+                                                # Import into embedded on-disk Qdrant
 
 Requirements:
     - sentence-transformers (for embeddings)
@@ -21,17 +23,28 @@ Requirements:
 import json
 import sys
 import io
-import uuid
 import glob
 import argparse
 from datetime import datetime, timezone
 from pathlib import Path
 import psycopg2
-from qdrant_client import QdrantClient, models
+from qdrant_client import models
 from sentence_transformers import SentenceTransformer
 from dotenv import load_dotenv
 import os
 
+from app.services.rag import (
+    QDRANT_COLLECTION_ALIAS,
+    QDRANT_MODES,
+    create_qdrant_client,
+    describe_qdrant_target,
+    ensure_collection,
+    golden_standard_point_id,
+    nugget_point_id,
+    resolve_alias,
+    seed_point_id,
+)
+
 # Fix Windows console encoding
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
 
@@ -42,6 +55,10 @@ load_dotenv()
 parser = argparse.ArgumentParser(description='Import RAG nuggets and Golden Standards to databases')
 parser.add_argument('--datatoupload', action='store_true', help='Import from datatoupload/ folder')
 parser.add_argument('--folder', type=str, help='Custom folder path to import from')
+parser.add_argument('--qdrant-mode', choices=QDRANT_MODES, default=os.getenv('QDRANT_MODE', 'remote'),
+                    help='Qdrant storage mode: remote server, embedded local path or in-memory')
+parser.add_argument('--qdrant-path', type=str, default=os.getenv('QDRANT_PATH', './qdrant_data'),
+                    help='On-disk location for --qdrant-mode local')
 args = parser.parse_args()
 
 # Initialize SentenceTransformer (same as main.py)
@@ -60,7 +77,6 @@ POSTGRES_CONFIG = {
 
 QDRANT_HOST = 'localhost'
 QDRANT_PORT = 6333
-QDRANT_COLLECTION = 'ultra_rag_v1'
 
 print("=" * 70)
 print("ULTRA v4.0 - DIRECT DATABASE IMPORT (Tesla-Gotham Enhanced)")
@@ -71,8 +87,12 @@ print()
 print("Connecting to databases...")
 try:
     db_conn = psycopg2.connect(**POSTGRES_CONFIG)
-    qdrant_client = QdrantClient(host=QDRANT_HOST, port=QDRANT_PORT)
-    print("✅ Connected to PostgreSQL and Qdrant")
+    qdrant_client = create_qdrant_client(args.qdrant_mode, path=args.qdrant_path, host=QDRANT_HOST, port=QDRANT_PORT)
+    # Collection behind the API alias (a versioned one after a blue/green reindex)
+    QDRANT_COLLECTION = resolve_alias(qdrant_client, QDRANT_COLLECTION_ALIAS) or 'ultra_rag_v1'
+    ensure_collection(qdrant_client, QDRANT_COLLECTION, 384)
+    print(f"✅ Connected to PostgreSQL and Qdrant ({describe_qdrant_target(args.qdrant_mode, args.qdrant_path, QDRANT_HOST, QDRANT_PORT)})")
+    print(f"   Collection: {QDRANT_COLLECTION} (alias '{QDRANT_COLLECTION_ALIAS}')")
 except Exception as e:
     print(f"❌ Failed to connect to databases: {e}")
     print("Make sure PostgreSQL and Qdrant are running.")
@@ -94,8 +114,8 @@ def import_nugget(nugget: dict, idx: int) -> bool:
         content_to_embed = f"{title} {content}"
         embedding = embedding_model.encode(content_to_embed).tolist()
 
-        # Create point for Qdrant
-        point_id = str(uuid.uuid4())
+        # Create point for Qdrant (stable id - re-running the import overwrites, never duplicates)
+        point_id = seed_point_id(str(nugget["id"])) if nugget.get("id") else nugget_point_id(title[:200], content, "pl")
         payload = {
             "title": title[:200],  # Truncate long titles
             "content": content,
@@ -154,8 +174,8 @@ def import_golden_standard(standard: dict, idx: int, cursor) -> bool:
         embedding_content = f"{trigger} {response}"
         embedding = embedding_model.encode(embedding_content).tolist()
 
-        # Add to Qdrant
-        point_id = str(uuid.uuid4())
+        # Add to Qdrant (same id as admin / sync writes of this trigger)
+        point_id = golden_standard_point_id(trigger, "pl")
         qdrant_client.upsert(
             collection_name=QDRANT_COLLECTION,
             points=[models.PointStruct(
@@ -414,6 +434,7 @@ print()
 
 # Close connections
 db_conn.close()
+qdrant_client.close()
 
 print("=" * 70)
 print("IMPORT COMPLETED!")
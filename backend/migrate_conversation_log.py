@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Conversation Log Migration: monthly partitions + cold archive
+=============================================================
+One-time conversion of conversation_log into a monthly range-partitioned
+table (the existing rows are attached as partition conversation_log_legacy,
+nothing is copied), followed by archival of sessions ended more than N days
+ago into conversation_archive (one JSONB document per session), in batches.
+
+The API keeps the partitions and the archive current afterwards
+(CONVERSATION_MAINTENANCE_INTERVAL); run this during a quiet period - the
+conversion holds an exclusive lock on conversation_log while the legacy
+partition is validated.
+
+Usage:
+    python migrate_conversation_log.py                         # Partition + archive (CONVERSATION_ARCHIVE_AFTER_DAYS)
+    python migrate_conversation_log.py --archive-after-days 30
+    python migrate_conversation_log.py --skip-archive          # Partition only
+"""
+import sys
+import io
+import os
+import time
+import argparse
+
+import psycopg2
+from dotenv import load_dotenv
+
+# Fix Windows console encoding
+sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+
+load_dotenv()
+
+from app.services.sessions import (  # noqa: E402 - reads CONVERSATION_ARCHIVE_AFTER_DAYS from .env
+    CONVERSATION_ARCHIVE_AFTER_DAYS,
+    archive_ended_conversations,
+    ensure_conversation_partitions,
+    ensure_conversation_schema,
+    migrate_conversation_log_to_partitions,
+)
+
+parser = argparse.ArgumentParser(description='Partition conversation_log by month and archive ended sessions')
+parser.add_argument('--archive-after-days', type=int, default=CONVERSATION_ARCHIVE_AFTER_DAYS, help='Archive sessions ended longer ago than this')
+parser.add_argument('--batch-size', type=int, default=200, help='Sessions per transaction')
+parser.add_argument('--skip-archive', action='store_true', help='Only convert to partitions')
+args = parser.parse_args()
+
+print("=" * 70)
+print("CONVERSATION LOG MIGRATION: monthly partitions + cold archive")
+print("=" * 70)
+print()
+
+conn = psycopg2.connect(
+    user=os.getenv('POSTGRES_USER', 'postgres'),
+    password=os.getenv('POSTGRES_PASSWORD', 'postgres'),
+    host=os.getenv('POSTGRES_HOST', 'localhost'),
+    port=os.getenv('POSTGRES_PORT', '5432'),
+    database=os.getenv('POSTGRES_DB', 'ultra_db')
+)
+
+try:
+    ensure_conversation_schema(conn)
+    started = time.perf_counter()
+    if migrate_conversation_log_to_partitions(conn):
+        print(f"✅ conversation_log partitioned in {time.perf_counter() - started:.1f}s")
+    else:
+        print("conversation_log already partitioned")
+    created = ensure_conversation_partitions(conn)
+    if created:
+        print(f"   New partitions: {', '.join(created)}")
+
+    if args.skip_archive or args.archive_after_days <= 0:
+        print("Archival skipped")
+        sys.exit(0)
+
+    started = time.perf_counter()
+    total_sessions = 0
+    total_messages = 0
+    while True:
+        result = archive_ended_conversations(conn, args.archive_after_days, args.batch_size)
+        if not result["sessions"]:
+            break
+        total_sessions += result["sessions"]
+        total_messages += result["messages"]
+        print(f"\r  {total_sessions} sessions archived ({total_messages} messages)", end='', flush=True)
+
+    print()
+    print()
+    print(f"✅ {total_sessions} sessions ({total_messages} messages) archived in {time.perf_counter() - started:.1f}s")
+
+except Exception as e:
+    print()
+    print(f"ERROR: {e}")
+    sys.exit(1)
+finally:
+    conn.close()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Qdrant Collection Migration: payload indexes + int8 quantization + HNSW profile
+================================================================================
+Applies the tuned collection layout (app/services/rag/collection.py) to an
+EXISTING RAG collection. Safe to run repeatedly - every step is idempotent.
+
+Usage:
+    python migrate_qdrant_collection.py                        # balanced profile, int8
+    python migrate_qdrant_collection.py --profile accurate
+    python migrate_qdrant_collection.py --quantization none
+    python migrate_qdrant_collection.py --collection ultra_rag_v1 --qdrant-mode local
+"""
+import sys
+import io
+import os
+import argparse
+
+from dotenv import load_dotenv
+
+from app.services.rag import (
+    HNSW_PROFILES,
+    QDRANT_MODES,
+    create_qdrant_client,
+    describe_qdrant_target,
+    estimate_vector_memory,
+    migrate_collection,
+)
+
+# Fix Windows console encoding
+sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+
+load_dotenv()
+
+parser = argparse.ArgumentParser(description='Apply payload indexes, quantization and HNSW profile to a Qdrant collection')
+parser.add_argument('--collection', default='ultra_rag_v1', help='Collection to migrate')
+parser.add_argument('--profile', choices=sorted(HNSW_PROFILES), default=os.getenv('QDRANT_HNSW_PROFILE', 'balanced'),
+                    help='HNSW profile (m / ef_construct / ef)')
+parser.add_argument('--quantization', choices=['int8', 'none'], default=os.getenv('QDRANT_QUANTIZATION', 'int8'),
+                    help='Scalar quantization of stored vectors')
+parser.add_argument('--qdrant-mode', choices=QDRANT_MODES, default=os.getenv('QDRANT_MODE', 'remote'))
+parser.add_argument('--qdrant-path', default=os.getenv('QDRANT_PATH', './qdrant_data'))
+args = parser.parse_args()
+
+print("=" * 70)
+print("QDRANT MIGRATION: Collection tuning")
+print("=" * 70)
+print()
+
+client = create_qdrant_client(args.qdrant_mode, path=args.qdrant_path)
+print(f"Connected to Qdrant ({describe_qdrant_target(args.qdrant_mode, args.qdrant_path)})")
+
+try:
+    if not client.collection_exists(args.collection):
+        print(f"ERROR: Collection '{args.collection}' does not exist - run seed.py first")
+        sys.exit(1)
+
+    summary = migrate_collection(client, args.collection, profile=args.profile, quantization=args.quantization)
+
+    print()
+    print("Applied settings:")
+    print("-" * 70)
+    for key, value in summary.items():
+        print(f"  {key:<20} {value}")
+
+    info = client.get_collection(args.collection)
+    points_count = info.points_count or 0
+    vector_size = info.config.params.vectors.size  # type: ignore[union-attr]
+    memory = estimate_vector_memory(points_count, vector_size, quantization=args.quantization)
+    print()
+    print(f"Collection status: {info.status} ({points_count} points)")
+    print(f"Estimated resident vector memory: {memory['resident_bytes'] / 1024:.1f} KiB "
+          f"(float32 only: {memory['float32_bytes'] / 1024:.1f} KiB)")
+    print()
+    print("Migration completed! Qdrant re-optimizes segments in the background.")
+
+except Exception as e:
+    print(f"ERROR: {e}")
+    sys.exit(1)
+finally:
+    client.close()
+
+print()
+print("=" * 70)
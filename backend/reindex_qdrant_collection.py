@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Qdrant Blue/Green Reindex: re-embed the RAG knowledge base without downtime
+===========================================================================
+Builds a new versioned collection from the payloads of the collection behind
+the alias (QDRANT_COLLECTION_ALIAS, default `ultra_rag`), re-embedding every
+point with --model, then atomically swaps the alias. The API keeps serving
+the old collection until the swap.
+
+After a MODEL change restart the API with the same EMBEDDING_MODEL_NAME right
+after the swap (queries fall back to lexical RAG until then if the vector
+size changed). The old collection is kept for rollback unless --drop-old.
+
+Admin writes keep flowing through the RAG outbox during the copy: every
+outbox row processed since the copy started (updates and deletes included)
+is replayed into the new collection, and once more right before the swap
+with the outbox workers paused (PostgreSQL advisory lock).
+
+Usage:
+    python reindex_qdrant_collection.py                                   # same model, fresh layout
+    python reindex_qdrant_collection.py --model intfloat/multilingual-e5-small
+    python reindex_qdrant_collection.py --no-swap                         # build only, swap later
+    python reindex_qdrant_collection.py --swap-to ultra_rag__..._20261019t120000 --replay-since 2026-10-19T12:00:00+00:00
+    python reindex_qdrant_collection.py --swap-to ultra_rag_v1            # rollback
+"""
+import sys
+import io
+import os
+import time
+import argparse
+from datetime import datetime
+
+import psycopg2
+from dotenv import load_dotenv
+
+from app.services.rag import (
+    HNSW_PROFILES,
+    QDRANT_COLLECTION_ALIAS,
+    QDRANT_MODES,
+    create_qdrant_client,
+    describe_qdrant_target,
+    reindex_collection,
+    replay_and_swap,
+    resolve_alias,
+    swap_alias,
+    versioned_collection_name,
+)
+
+# Fix Windows console encoding
+sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+
+load_dotenv()
+
+parser = argparse.ArgumentParser(description='Re-embed the RAG collection into a new versioned collection and swap the alias')
+parser.add_argument('--model', default=os.getenv('EMBEDDING_MODEL_NAME', 'paraphrase-multilingual-MiniLM-L12-v2'),
+                    help='SentenceTransformer model for the new collection')
+parser.add_argument('--alias', default=QDRANT_COLLECTION_ALIAS, help='Alias the API reads from')
+parser.add_argument('--source', default=None, help='Source collection (default: collection behind the alias)')
+parser.add_argument('--base-name', default='ultra_rag', help='Prefix of the versioned collection name')
+parser.add_argument('--batch-size', type=int, default=128, help='Points per encode + upsert batch')
+parser.add_argument('--profile', choices=sorted(HNSW_PROFILES), default=os.getenv('QDRANT_HNSW_PROFILE', 'balanced'))
+parser.add_argument('--quantization', choices=['int8', 'none'], default=os.getenv('QDRANT_QUANTIZATION', 'int8'))
+parser.add_argument('--no-swap', action='store_true', help='Build the new collection but leave the alias untouched')
+parser.add_argument('--swap-to', default=None, help='Only swap the alias to an existing collection (no reindex)')
+parser.add_argument('--replay-since', default=None,
+                    help='With --swap-to: replay outbox rows processed since this ISO timestamp (printed by --no-swap)')
+parser.add_argument('--drop-old', action='store_true', help='Delete the previous collection after the swap')
+parser.add_argument('--qdrant-mode', choices=QDRANT_MODES, default=os.getenv('QDRANT_MODE', 'remote'))
+parser.add_argument('--qdrant-path', default=os.getenv('QDRANT_PATH', './qdrant_data'))
+args = parser.parse_args()
+
+print("=" * 70)
+print("QDRANT REINDEX: Blue/green re-embedding")
+print("=" * 70)
+print()
+
+client = create_qdrant_client(args.qdrant_mode, path=args.qdrant_path)
+print(f"Connected to Qdrant ({describe_qdrant_target(args.qdrant_mode, args.qdrant_path)})")
+
+# Outbox replay (writes made while the copy ran); without PostgreSQL only the
+# scroll catch-up runs
+try:
+    conn = psycopg2.connect(
+        user=os.getenv('POSTGRES_USER', 'postgres'),
+        password=os.getenv('POSTGRES_PASSWORD', 'postgres'),
+        host=os.getenv('POSTGRES_HOST', 'localhost'),
+        port=os.getenv('POSTGRES_PORT', '5432'),
+        database=os.getenv('POSTGRES_DB', 'ultra_db')
+    )
+    conn.autocommit = True
+    print("Connected to PostgreSQL (RAG outbox replay enabled)")
+except psycopg2.OperationalError as e:
+    conn = None
+    print(f"WARNING: PostgreSQL unavailable - outbox writes during the copy are NOT replayed: {e}")
+
+
+def load_encoder():
+    print(f"Loading embedding model: {args.model}")
+    from sentence_transformers import SentenceTransformer
+    model = SentenceTransformer(args.model)
+    return model, lambda texts: model.encode(texts, batch_size=args.batch_size)
+
+
+def finish_swap(target: str, encode_fn=None, since=None) -> None:
+    if conn is not None and encode_fn is not None and since is not None:
+        previous, replayed = replay_and_swap(
+            client, conn, args.alias, target, encode_fn, since, args.model, args.batch_size
+        )
+        print(f"Final outbox replay (workers paused): {replayed['upserted']} upserted, {replayed['deleted']} deleted")
+    else:
+        previous = swap_alias(client, args.alias, target)
+    print(f"Alias '{args.alias}': {previous or '(new)'} → {target}")
+    if args.drop_old and previous and previous != target:
+        client.delete_collection(collection_name=previous)
+        print(f"Dropped previous collection '{previous}'")
+    elif previous and previous != target:
+        print(f"Previous collection '{previous}' kept - rollback: --swap-to {previous}")
+
+
+try:
+    if args.swap_to:
+        if not client.collection_exists(args.swap_to):
+            print(f"ERROR: Collection '{args.swap_to}' does not exist")
+            sys.exit(1)
+        if args.replay_since:
+            _, encode_fn = load_encoder()
+            finish_swap(args.swap_to, encode_fn, datetime.fromisoformat(args.replay_since))
+        else:
+            finish_swap(args.swap_to)
+        sys.exit(0)
+
+    source = args.source or resolve_alias(client, args.alias) or 'ultra_rag_v1'
+    if not client.collection_exists(source):
+        print(f"ERROR: Source collection '{source}' does not exist - run seed.py first")
+        sys.exit(1)
+
+    model, encode_fn = load_encoder()
+    vector_size = model.get_sentence_embedding_dimension()
+    target = versioned_collection_name(args.base_name, args.model)
+
+    print(f"Source:  {source}")
+    print(f"Target:  {target} ({vector_size}-dim, profile={args.profile}, quantization={args.quantization})")
+    print()
+
+    started = time.perf_counter()
+
+    def report(done: int, total: int) -> None:
+        elapsed = time.perf_counter() - started
+        rate = done / elapsed if elapsed > 0 else 0.0
+        eta = (total - done) / rate if rate > 0 else 0.0
+        percent = 100 * done / total if total else 100
+        print(f"\r  {done}/{total} points ({percent:.0f}%)  {rate:.1f} pts/s  ETA {eta:.0f}s", end='', flush=True)
+
+    summary = reindex_collection(
+        client,
+        source,
+        target,
+        encode_fn=encode_fn,
+        vector_size=vector_size,
+        model_name=args.model,
+        batch_size=args.batch_size,
+        profile=args.profile,
+        quantization=args.quantization,
+        progress=report,
+        conn=conn
+    )
+    print()
+    print()
+    print(f"Reindexed {summary['points']} points in {summary['seconds']}s "
+          f"({summary['caught_up']} written during the copy and caught up)")
+    if summary['since'] is not None:
+        print(f"Outbox replay: {summary['replayed']['upserted']} upserted, "
+              f"{summary['replayed']['deleted']} deleted since {summary['since'].isoformat()}")
+
+    if args.no_swap:
+        replay_hint = f" --replay-since {summary['since'].isoformat()}" if summary['since'] is not None else ""
+        print(f"Alias NOT swapped - when ready: --swap-to {target}{replay_hint}")
+    else:
+        finish_swap(target, encode_fn, summary['since'])
+
+    print()
+    print("Reindex completed!")
+
+except Exception as e:
+    print()
+    print(f"ERROR: {e}")
+    sys.exit(1)
+finally:
+    client.close()
+    if conn is not None:
+        conn.close()
@@ -1,15 +1,34 @@
 import json
 import os
 import sys
+import argparse
 from typing import Dict, Any, List
-import uuid
-import hashlib
 
 import psycopg2
 from psycopg2.extras import execute_batch
-from qdrant_client import QdrantClient, models
 from sentence_transformers import SentenceTransformer
 
+from app.services.rag import (
+    GOLDEN_LISTING_SCHEMA_SQL,
+    OUTBOX_SCHEMA_SQL,
+    QDRANT_COLLECTION_ALIAS,
+    SeedCheckpoint,
+    SeedStats,
+    create_qdrant_client,
+    describe_qdrant_target,
+    ensure_collection,
+    file_fingerprint,
+    iter_json_array,
+    run_seed_pipeline,
+    resolve_alias,
+    seed_point_id,
+    swap_alias,
+)
+from app.services.feedback import FEEDBACK_CLUSTER_SCHEMA_SQL, FEEDBACK_SEARCH_SCHEMA_SQL
+from app.services.analytics import ANALYTICS_SCHEMA_SQL, SLOW_PATH_HISTORY_SCHEMA_SQL
+from app.services.sessions import CONVERSATION_SCHEMA_SQL
+from app.services.slow_path import SLOW_PATH_CACHE_SCHEMA_SQL
+
 # --- Konfiguracja ---
 # Zmienne środowiskowe (zgodnie z PEGT Moduł 5 i 7)
 # Load from .env file
@@ -24,16 +43,21 @@ DB_NAME = os.environ.get("POSTGRES_DB", "ultra_db")
 
 QDRANT_HOST = os.environ.get("QDRANT_HOST", "localhost")
 QDRANT_PORT = os.environ.get("QDRANT_PORT", 6333)
+# Tryb przechowywania: remote (serwer) | local (wbudowany, na dysku) | memory
+QDRANT_MODE = os.environ.get("QDRANT_MODE", "remote")
+QDRANT_PATH = os.environ.get("QDRANT_PATH", "./qdrant_data")
 
 # Konfiguracja modelu (zgodnie z PEGT Moduł 2 i 11)
 EMBEDDING_MODEL_NAME = "paraphrase-multilingual-MiniLM-L12-v2"
 # Wymiar wektora dla tego modelu to 384
 VECTOR_DIMENSION = 384 
-QDRANT_COLLECTION_NAME = "ultra_rag_v1"
+QDRANT_COLLECTION_NAME = "ultra_rag_v1"  # Gdy alias QDRANT_COLLECTION_ALIAS jeszcze nie istnieje
 
 # Ścieżki do plików danych (zgodnie z listą plików)
 RAG_DATA_FILE = "DATA_01_RAG.md" # Plik .md zawiera JSON
 GOLDEN_STANDARDS_FILE = "DATA_02_Golden_Standards.md" # Plik .md zawiera JSON
+# Postęp seedowania Qdrant (wznawianie przerwanych uruchomień)
+SEED_CHECKPOINT_FILE = ".seed_checkpoint.json"
 
 def load_json_from_md(file_path: str) -> List[Dict[str, Any]]:
     """Wczytuje listę obiektów JSON z pliku .md"""
@@ -143,6 +167,40 @@ CREATE INDEX idx_feedback_logs_created ON feedback_logs(created_at DESC);
             CREATE INDEX IF NOT EXISTS idx_golden_standards_created ON golden_standards(created_at DESC);
             """)
             print("Tabela 'golden_standards' sprawdzona/stworzona.")
+
+            # Indeksy stronicowania / wyszukiwania listy admina (keyset + pg_trgm)
+            cur.execute(GOLDEN_LISTING_SCHEMA_SQL)
+            print("Indeksy listy 'golden_standards' (keyset, trigram) sprawdzone/stworzone.")
+
+            # Kolejka outbox dla zapisów do Qdrant (panel admina)
+            cur.execute(OUTBOX_SCHEMA_SQL)
+            print("Tabela 'rag_outbox' sprawdzona/stworzona.")
+
+            # Klastry feedbacku AI Dojo (materializowane grupy dla panelu admina)
+            cur.execute(FEEDBACK_CLUSTER_SCHEMA_SQL)
+            print("Tabele 'feedback_clusters' / 'feedback_cluster_members' sprawdzone/stworzone.")
+
+            # Indeks trigramowy (pg_trgm) do wyszukiwania notatek feedbacku
+            cur.execute(FEEDBACK_SEARCH_SCHEMA_SQL)
+            print("Indeksy wyszukiwania 'feedback_logs' sprawdzone/stworzone.")
+
+            # Kolumny analityczne slow_path_logs + dzienne agregaty dashboardu
+            cur.execute(ANALYTICS_SCHEMA_SQL)
+            print("Agregaty analityczne sprawdzone/stworzone (stare wiersze: backfill_analytics.py).")
+
+            # Wskaźnik najnowszej analizy w sessions + archiwa starych analiz
+            cur.execute(SLOW_PATH_HISTORY_SCHEMA_SQL)
+            print("Kolumna 'sessions.latest_slow_path_id' i tabela 'slow_path_archives' sprawdzone/stworzone.")
+
+            # Klucz cache wyników Slow Path (hash historii, etapu, języka i wersji promptu)
+            cur.execute(SLOW_PATH_CACHE_SCHEMA_SQL)
+            print("Kolumny 'slow_path_logs.cache_key' / 'analyzed_log_id' i indeks sprawdzone/stworzone.")
+
+            # Indeks historii rozmowy + archiwum zakończonych sesji
+            # (partycje miesięczne: migrate_conversation_log.py - blokuje tabelę)
+            cur.execute(CONVERSATION_SCHEMA_SQL)
+            print("Tabela 'conversation_archive' i indeks historii rozmowy sprawdzone/stworzone.")
+            print("Partycjonowanie 'conversation_log': uruchom migrate_conversation_log.py w czasie przerwy.")
             
             # Przygotowanie danych do załadowania
             # Używamy ON CONFLICT... DO NOTHING, aby uniknąć błędów duplikatów
@@ -183,40 +241,44 @@ CREATE INDEX idx_feedback_logs_created ON feedback_logs(created_at DESC);
             conn.close()
             print("Połączenie z PostgreSQL zamknięte.")
 
-def seed_qdrant(rag_data: List[Dict[str, Any]]):
-    """Ładuje wiedzę RAG (z embeddingami) do bazy Qdrant."""
+def seed_qdrant(
+    rag_file: str,
+    batch_size: int = 64,
+    max_inflight: int = 4,
+    multi_process: bool = False,
+    checkpoint_path: str = SEED_CHECKPOINT_FILE,
+    restart: bool = False
+):
+    """
+    Ładuje wiedzę RAG (z embeddingami) do bazy Qdrant.
+
+    Potok: strumieniowe czytanie JSON → batchowe embeddingi → równoległe
+    upserty (max `max_inflight` żądań naraz) → checkpoint po każdym batchu.
+    Przerwane uruchomienie wznawia się od ostatniego zapisanego batcha.
+    """
     print("\n--- Rozpoczynanie seedowania Qdrant ---")
+    client = None
+    pool = None
     try:
-        # (T8) Obsługa URL dla QdrantClient (dla Railway)
-        if QDRANT_HOST.startswith('http'):
-            client = QdrantClient(url=QDRANT_HOST)
-        else:
-            client = QdrantClient(host=QDRANT_HOST, port=QDRANT_PORT)
-        print(f"Połączono z Qdrant ({QDRANT_HOST}:{QDRANT_PORT if not QDRANT_HOST.startswith('http') else ''}).")
+        # (T8) Obsługa URL / trybu wbudowanego - wspólna fabryka z main.py
+        client = create_qdrant_client(QDRANT_MODE, path=QDRANT_PATH, host=QDRANT_HOST, port=QDRANT_PORT)
+        print(f"Połączono z Qdrant ({describe_qdrant_target(QDRANT_MODE, QDRANT_PATH, QDRANT_HOST, QDRANT_PORT)}).")
+
+        # Kolekcja za aliasem API (po reindeksacji blue/green to kolekcja wersjonowana)
+        aliased = resolve_alias(client, QDRANT_COLLECTION_ALIAS)
+        collection_name = aliased or QDRANT_COLLECTION_NAME
+        print(f"Kolekcja docelowa: '{collection_name}' (alias '{QDRANT_COLLECTION_ALIAS}').")
 
         # (K10) Logika idempotentna dla kolekcji (sprawdź, czy istnieje)
-        try:
-            client.get_collection(collection_name=QDRANT_COLLECTION_NAME)
-            print(f"Kolekcja '{QDRANT_COLLECTION_NAME}' już istnieje. Dodawanie nuggetów...")
-        except Exception:
-            client.create_collection(
-                collection_name=QDRANT_COLLECTION_NAME,
-                vectors_config=models.VectorParams(
-                    size=VECTOR_DIMENSION,
-                    distance=models.Distance.COSINE
-                )
-            )
-            print(f"Kolekcja '{QDRANT_COLLECTION_NAME}' utworzona.")
+        if ensure_collection(client, collection_name, VECTOR_DIMENSION):
+            print(f"Kolekcja '{collection_name}' utworzona.")
+        else:
+            print(f"Kolekcja '{collection_name}' już istnieje. Dodawanie nuggetów...")
 
-        # (K9) Walidacja struktury nuggetów przed przetwarzaniem
-        REQUIRED_FIELDS = ['id', 'type', 'title', 'content', 'tags', 'language']
-        for item in rag_data:
-            for field in REQUIRED_FIELDS:
-                if field not in item:
-                    print(f"BŁĄD: Nugget {item.get('id', 'UNKNOWN')} brakuje pola '{field}'")
-                    sys.exit(1)
-            if 'archetype_filter' in item and isinstance(item['archetype_filter'], str):
-                item['archetype_filter'] = [item['archetype_filter']]
+        # Świeże wdrożenie: API (już uruchomione) czyta przez alias - tworzymy go tutaj
+        if aliased is None:
+            swap_alias(client, QDRANT_COLLECTION_ALIAS, collection_name)
+            print(f"Alias '{QDRANT_COLLECTION_ALIAS}' → '{collection_name}' utworzony.")
 
         # (T4) Komunikaty przed ładowaniem modelu
         print(f"Pobieranie modelu '{EMBEDDING_MODEL_NAME}' (pierwszy raz może potrwać kilka minut)...")
@@ -225,89 +287,112 @@ def seed_qdrant(rag_data: List[Dict[str, Any]]):
         # Ładowanie modelu Sentence Transformer (zgodnie z PEGT Moduł 2)
         model = SentenceTransformer(EMBEDDING_MODEL_NAME)
         print("Model załadowany.")
+
+        if multi_process:
+            # Jeden proces enkodera na rdzeń CPU / GPU
+            pool = model.start_multi_process_pool()
+            encode_fn = lambda texts: model.encode_multi_process(texts, pool, batch_size=batch_size)
+            print("Enkodowanie wieloprocesowe włączone.")
+        else:
+            encode_fn = lambda texts: model.encode(texts, batch_size=batch_size)
         
-        # (T3) Pobieranie listy istniejących ID z Qdrant
+        # (T3) Pobieranie listy istniejących ID z Qdrant (pełny scroll, bez limitu 10 000)
         print("Pobieranie listy istniejących ID z Qdrant...")
-        try:
-            existing_points = client.scroll(collection_name=QDRANT_COLLECTION_NAME, with_payload=False, limit=10000)[0]
-            existing_ids = {point.id for point in existing_points}
-            print(f"Znaleziono {len(existing_ids)} istniejących nuggetów.")
-        except Exception as e:
-            print(f"Nowa kolekcja, brak istniejących ID. {e}")
-            existing_ids = set()
-        
-        points_to_upsert = []
-        
-        print(f"Przygotowywanie {len(rag_data)} nuggetów RAG do załadowania...")
-        
-        # Iterujemy i tworzymy punkty
-        for i, item in enumerate(rag_data):
-            # 1. Generowanie embeddingu (zgodnie z PEGT Moduł 2)
-            embedding_result = model.encode(item['content'])
-            # Convert to list of floats - handle both numpy arrays and tensors
-            vector: List[float] = embedding_result.tolist() if hasattr(embedding_result, 'tolist') else list(embedding_result)  # type: ignore[union-attr]
-            
-            # 2. Przygotowanie metadanych (payload)
+        existing_ids = set()
+        offset = None
+        while True:
+            records, offset = client.scroll(
+                collection_name=collection_name, with_payload=False, limit=1000, offset=offset
+            )
+            existing_ids.update(str(record.id) for record in records)
+            if offset is None:
+                break
+        print(f"Znaleziono {len(existing_ids)} istniejących nuggetów.")
+
+        # (K9) Walidacja struktury nuggetów - wykonywana strumieniowo, per nugget
+        REQUIRED_FIELDS = ['id', 'type', 'title', 'content', 'tags']
+
+        def to_point(item: Dict[str, Any]):
+            for field in REQUIRED_FIELDS:
+                if field not in item:
+                    raise ValueError(f"Nugget {item.get('id', 'UNKNOWN')} brakuje pola '{field}'")
+            # Przygotowanie metadanych (payload)
             payload = item.copy()
-            
+            if isinstance(payload.get('archetype_filter'), str):
+                payload['archetype_filter'] = [payload['archetype_filter']]
             # Add default language if missing
-            if 'language' not in payload:
-                payload['language'] = 'pl'
-            
-            # 3. Convert string ID to UUID for Qdrant
+            payload.setdefault('language', 'pl')
             # Qdrant requires UUID or integer, so we hash the string ID
-            point_id = item['id']
-            id_hash = hashlib.md5(point_id.encode()).hexdigest()
-            uuid_id = str(uuid.UUID(id_hash))
-            
-            # (T3) Sprawdzenie, czy nugget już istnieje
-            if uuid_id in existing_ids:
-                continue  # Pomiń ten nugget, już istnieje
-            
-            points_to_upsert.append(
-                models.PointStruct(
-                    id=uuid_id,
-                    vector=vector,
-                    payload=payload
-                )
-            )
-            
-            if (i + 1) % 10 == 0 or (i + 1) == len(rag_data):
-                print(f"Przetworzono {i + 1}/{len(rag_data)} nuggetów...")
-
-        # Wgranie punktów do Qdrant (w trybie batch)
-        print(f"Wysyłanie {len(points_to_upsert)} punktów do Qdrant...")
-        client.upsert(
-            collection_name=QDRANT_COLLECTION_NAME,
-            points=points_to_upsert,
-            wait=True # Czekaj na zakończenie operacji
+            # (same scheme as sync_knowledge.py - synced points are adopted)
+            return seed_point_id(item['id']), item['content'], payload
+
+        def upsert_chunk(points):
+            client.upsert(collection_name=collection_name, points=points, wait=True)
+
+        checkpoint = SeedCheckpoint(checkpoint_path, file_fingerprint(rag_file), batch_size)
+        if restart:
+            checkpoint.clear()
+        elif checkpoint.load():
+            print(f"Wznawianie od checkpointu: {checkpoint.completed_batches} batchy już załadowanych.")
+
+        def report(stats: SeedStats):
+            print(f"Załadowano {stats.upserted} nuggetów ({stats.items_per_second:.1f} /s)...")
+
+        stats = run_seed_pipeline(
+            iter_json_array(rag_file),
+            to_point,
+            encode_fn,
+            upsert_chunk,
+            batch_size=batch_size,
+            max_inflight=max_inflight,
+            checkpoint=checkpoint,
+            existing_ids=existing_ids,
+            progress=report
         )
-        print("Seedowanie Qdrant zakończone pomyślnie.")
+
+        # Pełny przebieg - checkpoint nie jest już potrzebny
+        checkpoint.clear()
+        print(f"Seedowanie Qdrant zakończone pomyślnie: {stats.upserted} załadowanych, "
+              f"{stats.skipped} pominiętych, {stats.seconds:.1f}s ({stats.items_per_second:.1f} nuggetów/s).")
         
     except Exception as e:
         print(f"KRYTYCZNY BŁĄD seedowania Qdrant: {e}")
         print("Upewnij się, że Qdrant jest uruchomiony i dostępny.")
+        print("(Tryb local: zatrzymaj API - ścieżka QDRANT_PATH może być otwarta tylko przez jeden proces.)")
+        print(f"Postęp zapisany w '{checkpoint_path}' - uruchom ponownie, aby wznowić.")
+    finally:
+        if pool is not None:
+            SentenceTransformer.stop_multi_process_pool(pool)
+        if client is not None:
+            client.close()
 
 def main():
+    parser = argparse.ArgumentParser(description="Seed PostgreSQL (Golden Standards) and Qdrant (RAG nuggets)")
+    parser.add_argument("--rag-file", default=RAG_DATA_FILE, help="Plik z nuggetami RAG (JSON lub .md z JSON)")
+    parser.add_argument("--batch-size", type=int, default=64, help="Nuggety na batch embeddingów + upsert")
+    parser.add_argument("--max-inflight", type=int, default=4, help="Maks. równoległych żądań upsert do Qdrant")
+    parser.add_argument("--multi-process", action="store_true", help="encode_multi_process na wszystkich rdzeniach")
+    parser.add_argument("--checkpoint", default=SEED_CHECKPOINT_FILE, help="Plik checkpointu (wznawianie)")
+    parser.add_argument("--restart", action="store_true", help="Ignoruj checkpoint i zacznij od początku")
+    parser.add_argument("--skip-postgres", action="store_true", help="Tylko Qdrant")
+    args = parser.parse_args()
+
     print("--- Rozpoczynanie Skryptu Seedującego ULTRA v3.0 ---")
     
-    # Krok 1: Wczytaj dane Golden Standards
-    standards_data = load_json_from_md(GOLDEN_STANDARDS_FILE)
-    
-    # Krok 2: Wczytaj dane RAG
-    rag_data = load_json_from_md(RAG_DATA_FILE)
-    
-    # Fix RAG data - add default language to all nuggets
-    for item in rag_data:
-        if 'language' not in item:
-            item['language'] = 'pl'
-            print(f"Added default language 'pl' to nugget {item.get('id', 'unknown')}")
-    
-    # Krok 3: Seeduj PostgreSQL
-    seed_postgresql(standards_data)
+    # Krok 1-2: Wczytaj i seeduj Golden Standards (mały plik - w całości)
+    if not args.skip_postgres:
+        standards_data = load_json_from_md(GOLDEN_STANDARDS_FILE)
+        seed_postgresql(standards_data)
     
-    # Krok 4: Seeduj Qdrant
-    seed_qdrant(rag_data)
+    # Krok 3: Seeduj Qdrant (plik RAG czytany strumieniowo)
+    seed_qdrant(
+        args.rag_file,
+        batch_size=args.batch_size,
+        max_inflight=args.max_inflight,
+        multi_process=args.multi_process,
+        checkpoint_path=args.checkpoint,
+        restart=args.restart
+    )
     
     print("\n--- Seedowanie zakończone ---")
 
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Knowledge Sync: incremental diff-sync of the knowledge JSON files
+=================================================================
+Compares rag_nuggets_final.json / golden_standards_final.json against the
+content hashes stored in the Qdrant payloads and applies ONLY the changes:
+new and edited items are queued as upserts, items removed from a file as
+deletes (rag_outbox + golden_standards rows, one transaction). The API's
+outbox worker embeds and applies them, so a running reindex replays them and
+the lexical / golden indexes pick them up. Unchanged items cost nothing, so a
+daily refresh takes seconds and re-running it is a no-op.
+
+Only points previously written by this command (`sync_source` payload) can
+be deleted - nuggets added in the admin panel are never touched. Points
+seeded by seed.py are adopted on the first run.
+
+Usage:
+    python sync_knowledge.py                    # Sync both files, print changeset
+    python sync_knowledge.py --dry-run          # Only print the changeset
+    python sync_knowledge.py --nuggets ../rag_nuggets_final.json --golden none
+    python sync_knowledge.py --skip-postgres    # Do not mirror golden_standards rows
+    python sync_knowledge.py --qdrant-mode local --qdrant-path ./qdrant_data
+"""
+import sys
+import io
+import os
+import json
+import time
+import argparse
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from app.services.rag import (
+    QDRANT_COLLECTION_ALIAS,
+    QDRANT_MODES,
+    apply_sync,
+    create_qdrant_client,
+    describe_qdrant_target,
+    ensure_outbox_table,
+    golden_sync_items,
+    nugget_sync_items,
+    plan_sync,
+    resolve_alias,
+    scan_collection,
+    sync_golden_standards_postgres,
+)
+
+# Fix Windows console encoding
+sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+
+load_dotenv()
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+parser = argparse.ArgumentParser(description='Diff-sync knowledge JSON files into Qdrant and PostgreSQL')
+parser.add_argument('--nuggets', default=str(ROOT_DIR / 'rag_nuggets_final.json'),
+                    help="RAG nuggets JSON file ('none' to skip)")
+parser.add_argument('--golden', default=str(ROOT_DIR / 'golden_standards_final.json'),
+                    help="Golden standards JSON file ('none' to skip)")
+parser.add_argument('--dry-run', action='store_true', help='Print the changeset without writing anything')
+parser.add_argument('--skip-postgres', action='store_true', help='Do not mirror golden standards into PostgreSQL')
+parser.add_argument('--show', type=int, default=10, help='Items listed per change type')
+parser.add_argument('--qdrant-mode', choices=QDRANT_MODES, default=os.getenv('QDRANT_MODE', 'remote'))
+parser.add_argument('--qdrant-path', default=os.getenv('QDRANT_PATH', './qdrant_data'))
+args = parser.parse_args()
+
+print("=" * 70)
+print("KNOWLEDGE SYNC: JSON files → Qdrant / PostgreSQL")
+print("=" * 70)
+print()
+
+
+def load_items(path: str):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, list):
+        raise ValueError(f"{path} does not contain a JSON list")
+    return data
+
+
+def print_plan(plan) -> None:
+    summary = plan.summary()
+    print(f"📄 {plan.source}: +{summary['added']} added, ~{summary['changed']} changed, "
+          f"-{summary['removed']} removed, ={summary['unchanged']} unchanged")
+    for marker, entries in (('+', plan.added), ('~', plan.changed)):
+        for item in entries[:args.show]:
+            print(f"   {marker} {item.label[:70]}")
+        if len(entries) > args.show:
+            print(f"   {marker} ... and {len(entries) - args.show} more")
+    for entry in plan.removed[:args.show]:
+        print(f"   - {str(entry['label'])[:70]}")
+    if len(plan.removed) > args.show:
+        print(f"   - ... and {len(plan.removed) - args.show} more")
+
+
+client = create_qdrant_client(args.qdrant_mode, path=args.qdrant_path)
+print(f"Connected to Qdrant ({describe_qdrant_target(args.qdrant_mode, args.qdrant_path)})")
+
+try:
+    started = time.perf_counter()
+    collection = resolve_alias(client, QDRANT_COLLECTION_ALIAS) or 'ultra_rag_v1'
+    if not client.collection_exists(collection):
+        print(f"ERROR: Collection '{collection}' does not exist - run seed.py first")
+        sys.exit(1)
+    print(f"Collection: {collection}")
+
+    existing = scan_collection(client, collection)
+    print(f"Scanned {len(existing)} existing points")
+    print()
+
+    plans = []
+    if args.nuggets.lower() != 'none':
+        source = Path(args.nuggets).name
+        plans.append(plan_sync(nugget_sync_items(load_items(args.nuggets), source), existing, source))
+    golden_plan = None
+    if args.golden.lower() != 'none':
+        source = Path(args.golden).name
+        golden_plan = plan_sync(golden_sync_items(load_items(args.golden), source), existing, source)
+        plans.append(golden_plan)
+
+    for plan in plans:
+        print_plan(plan)
+    print()
+
+    if args.dry_run or all(plan.is_empty for plan in plans):
+        print("Dry run - nothing written." if args.dry_run else "Everything up to date - nothing to do.")
+        sys.exit(0)
+
+    import psycopg2
+    conn = psycopg2.connect(
+        user=os.getenv('POSTGRES_USER', 'postgres'),
+        password=os.getenv('POSTGRES_PASSWORD', 'postgres'),
+        host=os.getenv('POSTGRES_HOST', 'localhost'),
+        port=os.getenv('POSTGRES_PORT', '5432'),
+        database=os.getenv('POSTGRES_DB', 'ultra_db')
+    )
+    try:
+        ensure_outbox_table(conn)
+        with conn.cursor() as cursor:
+            # Outbox rows and golden_standards rows commit together
+            for plan in plans:
+                if plan.is_empty:
+                    continue
+                upserted, deleted = apply_sync(cursor, plan)
+                print(f"✅ {plan.source}: {upserted} upserts, {deleted} deletes queued in rag_outbox")
+
+            if golden_plan is not None and not golden_plan.is_empty and not args.skip_postgres:
+                result = sync_golden_standards_postgres(cursor, golden_plan)
+                print(f"✅ golden_standards: {result['upserted']} upserted, {result['deleted']} deleted in PostgreSQL")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    print("   The API outbox worker embeds and applies the queued changes to Qdrant")
+
+    print()
+    print(f"Sync completed in {time.perf_counter() - started:.1f}s")
+
+except Exception as e:
+    print(f"ERROR: {e}")
+    sys.exit(1)
+finally:
+    client.close()
@@ -0,0 +1,44 @@
+"""Tests for the Slow Path trigger gate (app.services.slow_path.gating)"""
+
+import numpy as np
+
+from app.services.slow_path.gating import decide_slow_path, is_trivial_note
+
+
+def state(new_notes, analyzed_notes=("Klient jeździ dużo w trasie po kraju",)):
+    return {"last_status": "Success", "new_notes": list(new_notes), "analyzed_notes": list(analyzed_notes)}
+
+
+def test_acknowledgements_are_trivial():
+    assert is_trivial_note("ok")
+    assert is_trivial_note("Tak, jasne!")
+    assert is_trivial_note("dzięki")
+
+
+def test_short_substantive_notes_are_not_trivial():
+    assert not is_trivial_note("Żona decyduje")
+    assert not is_trivial_note("Ma trójkę dzieci")
+
+
+def test_typo_fixes_are_trivial():
+    assert is_trivial_note("*trójkę")
+    assert is_trivial_note("Ma trójkę dzieci", previous="Ma trujkę dzieci")
+    assert not is_trivial_note("Ma trójkę dzieci", previous="Klient jeździ dużo w trasie po kraju")
+
+
+def test_only_acknowledgements_skip_the_analysis():
+    decision = decide_slow_path(state(["ok", "tak"]))
+    assert (decision.run, decision.reason) == (False, "trivial")
+
+
+def test_short_substantive_note_goes_to_embedding_rule():
+    def encode(texts):
+        return np.array([[1.0, 0.0] if "Żona" in text else [0.0, 1.0] for text in texts])
+
+    decision = decide_slow_path(state(["Żona decyduje"]), encode_fn=encode)
+    assert (decision.run, decision.reason) == (True, "novel_content")
+
+
+def test_first_note_is_compared_with_last_analyzed_note():
+    decision = decide_slow_path(state(["Klient jezdzi dużo w trasie po kraju"]))
+    assert decision.reason == "trivial"
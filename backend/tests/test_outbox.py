@@ -0,0 +1,95 @@
+"""Tests for the RAG outbox consumer (app.services.rag.outbox)"""
+
+import asyncio
+
+from qdrant_client import AsyncQdrantClient, models
+
+from app.services.rag.outbox import drain_outbox_batch
+
+COLLECTION = "outbox_test"
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.conn.statements.append((" ".join(sql.split()), params))
+
+    def fetchone(self):
+        return {"pg_try_advisory_xact_lock_shared": True}
+
+    def fetchall(self):
+        return self.conn.rows
+
+
+class FakeConn:
+    """Claim transaction stand-in: serves `rows`, records the status updates"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+        self.commits = 0
+
+    def cursor(self, cursor_factory=None):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+    def marked_done(self):
+        return [params[-1] for sql, params in self.statements if "SET status = 'done'" in sql]
+
+    def marked_failed(self):
+        return [params[-1] for sql, params in self.statements if "attempts = attempts + 1" in sql]
+
+
+def upsert_row(outbox_id, point_id, text):
+    return {"outbox_id": outbox_id, "point_id": point_id, "operation": "upsert",
+            "embed_text": text, "payload": {"content": text, "type": "nugget"}}
+
+
+def encode(texts):
+    if "poison" in texts:
+        raise ValueError("cannot embed")
+    return [[1.0, float(len(text))] for text in texts]
+
+
+async def drain(rows):
+    client = AsyncQdrantClient(location=":memory:")
+    await client.create_collection(COLLECTION, vectors_config=models.VectorParams(size=2, distance=models.Distance.COSINE))
+    conn = FakeConn(rows)
+    stats = await drain_outbox_batch(conn, client, COLLECTION, encode)
+    count = (await client.count(COLLECTION, exact=True)).count
+    await client.close()
+    return stats, conn, count
+
+
+def test_poison_row_does_not_fail_healthy_rows():
+    healthy = "3c0c4b8e-8f43-4b3a-9a51-0a0c1f7f1a01"
+    poison = "3c0c4b8e-8f43-4b3a-9a51-0a0c1f7f1a02"
+    stats, conn, count = asyncio.run(drain([upsert_row(1, healthy, "ok text"), upsert_row(2, poison, "poison")]))
+
+    assert (stats["upserted"], stats["failed"]) == (1, 1)
+    assert count == 1
+    assert conn.marked_done() == [[1]]
+    assert conn.marked_failed() == [[2]]
+    assert conn.commits == 1
+
+
+def test_healthy_batch_is_written_in_one_pass():
+    rows = [upsert_row(i, f"3c0c4b8e-8f43-4b3a-9a51-0a0c1f7f1a0{i}", f"text {i}") for i in range(1, 4)]
+    stats, conn, count = asyncio.run(drain(rows))
+
+    assert (stats["upserted"], stats["failed"], count) == (3, 0, 3)
+    assert conn.marked_done() == [[1, 2, 3]]
+    assert conn.marked_failed() == []
@@ -0,0 +1,79 @@
+"""Tests for the pure Slow Path retrieval helpers (app.services.rag.retrieval)"""
+
+from types import SimpleNamespace
+
+from app.services.rag.retrieval import merge_search_results, select_informative_notes
+
+
+def hit(point_id, score, content):
+    return SimpleNamespace(id=point_id, score=score, payload={"content": content})
+
+
+# =============================================================================
+# merge_search_results
+# =============================================================================
+
+def test_merge_truncated_best_hit_uses_whole_budget():
+    merged = merge_search_results([[hit(1, 0.9, "a" * 5000), hit(2, 0.8, "b" * 3000)]], budget_chars=4000)
+    assert merged == "a" * 4000
+
+
+def test_merge_truncated_best_hit_blocks_small_hits():
+    merged = merge_search_results([[hit(1, 0.9, "a" * 5000), hit(2, 0.8, "short")]], budget_chars=4000)
+    assert len(merged) == 4000
+
+
+def test_merge_packs_by_score_within_budget():
+    merged = merge_search_results(
+        [[hit(1, 0.5, "low"), hit(2, 0.9, "high")], [hit(3, 0.7, "x" * 100)]],
+        budget_chars=20,
+        separator="|"
+    )
+    assert merged == "high|low"
+
+
+def test_merge_keeps_best_score_of_duplicate_points():
+    merged = merge_search_results(
+        [[hit(1, 0.2, "dup"), hit(2, 0.5, "other")], [hit(1, 0.9, "dup")]],
+        separator="|"
+    )
+    assert merged == "dup|other"
+
+
+def test_merge_without_hits_returns_none():
+    assert merge_search_results([[], []]) is None
+    assert merge_search_results([[hit(1, 0.9, "")]]) is None
+
+
+# =============================================================================
+# select_informative_notes
+# =============================================================================
+
+def test_select_keeps_latest_informative_note():
+    notes = [
+        "Klient pyta o zasięg zimą",
+        "Rozważa leasing na firmę",
+        "Ma dwójkę dzieci i psa",
+    ]
+    selected = select_informative_notes(notes, k=2)
+    assert selected[-1] == "Ma dwójkę dzieci i psa"
+    assert len(selected) == 2
+
+
+def test_select_skips_trailing_acknowledgement():
+    notes = ["Klient pyta o zasięg zimą", "ok"]
+    assert select_informative_notes(notes, k=2) == ["Klient pyta o zasięg zimą"]
+
+
+def test_select_without_informative_notes_returns_last_note():
+    assert select_informative_notes(["tak", "ok", ""], k=3) == ["ok"]
+    assert select_informative_notes([], k=3) == []
+
+
+def test_select_preserves_chronological_order():
+    notes = [
+        "Pierwsza notatka o cenie 300000 zł",
+        "Druga notatka o ładowaniu w domu",
+        "Trzecia notatka o zasięgu trasy",
+    ]
+    assert select_informative_notes(notes, k=3) == notes
@@ -0,0 +1,44 @@
+"""Tests for the knowledge file diff-sync (app.services.rag.sync)"""
+
+from app.services.rag.sync import apply_sync, golden_sync_items, nugget_sync_items, plan_sync
+
+
+class RecordingCursor:
+    """Stands in for a psycopg2 cursor - records outbox inserts"""
+
+    def __init__(self):
+        self.calls = []
+        self._next_id = 0
+
+    def execute(self, sql, params=None):
+        self.calls.append((" ".join(sql.split()), params))
+
+    def fetchone(self):
+        self._next_id += 1
+        return (self._next_id,)
+
+
+GOLDEN = [{"trigger_context": "Za  drogo", "golden_response": "Policzmy TCO", "category": "Cena"}]
+
+
+def test_golden_items_embed_trigger_and_response():
+    item = golden_sync_items(GOLDEN, "golden.json")[0]
+    assert item.embed_text == "Za drogo Policzmy TCO"
+
+
+def test_golden_hash_changes_with_embed_text():
+    item = golden_sync_items(GOLDEN, "golden.json")[0]
+    existing = {item.point_id: {"sync_source": "golden.json", "content_hash": "response-only-hash"}}
+    assert plan_sync([item], existing, "golden.json").changed == [item]
+
+
+def test_apply_sync_queues_through_outbox():
+    nugget = nugget_sync_items([{"id": "n1", "title": "T", "content": "Body"}], "nuggets.json")[0]
+    plan = plan_sync([nugget], {"gone": {"sync_source": "nuggets.json", "title": "Old"}}, "nuggets.json")
+    cursor = RecordingCursor()
+
+    assert apply_sync(cursor, plan) == (1, 1)
+    operations = [sql.split("VALUES")[1] for sql, _ in cursor.calls]
+    assert "'upsert'" in operations[0] and "'delete'" in operations[1]
+    assert cursor.calls[0][1][:2] == (nugget.point_id, "Body")
+    assert cursor.calls[1][1] == ("gone",)
@@ -37,6 +37,7 @@ export default function OpusMagnumPanel() {
     slow_path_error,
     setAppStatus,
     current_language,
+    current_stage,
   } = useStore();
 
   // Tesla-Gotham v4.0: Burning House Score State
@@ -82,7 +83,7 @@ export default function OpusMagnumPanel() {
     setAppStatus('slow_path_loading');
 
     try {
-      await api.retrySlowPath(session_id);
+      await api.retrySlowPath(session_id, current_stage);
     } catch (error) {
       console.error('Retry Slow Path failed:', error);
     }
@@ -6,7 +6,7 @@
  * Shows trigger context, response, category, and tags
  */
 
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { MagnifyingGlassIcon, TagIcon, FolderIcon } from '@heroicons/react/24/outline';
 import { useStore } from '../../store/useStore';
 import { api } from '../../utils/api';
@@ -25,46 +25,70 @@ export default function GoldenStandardsTab() {
   const { current_language } = useStore();
 
   const [standards, setStandards] = useState<GoldenStandard[]>([]);
+  const [total, setTotal] = useState<number | null>(null);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [searchQuery, setSearchQuery] = useState('');
   const [selectedCategory, setSelectedCategory] = useState<string>('all');
+  const [categoryOptions, setCategoryOptions] = useState<string[]>([]);
+  const requestId = useRef(0);
 
-  // Load standards on mount and language change
+  // Search and category are filtered server-side - every change reloads from page one
+  const filters = () => ({
+    search: searchQuery.trim() || undefined,
+    category: selectedCategory === 'all' ? undefined : selectedCategory,
+  });
+
+  // Reload on language / filter change (search debounced)
   useEffect(() => {
-    loadStandards();
-  }, [current_language]);
+    const timer = setTimeout(loadStandards, searchQuery ? 300 : 0);
+    return () => clearTimeout(timer);
+  }, [current_language, searchQuery, selectedCategory]);
 
   const loadStandards = async () => {
+    const id = ++requestId.current;
     setLoading(true);
+    setNextCursor(null);
     try {
-      const response = await api.listGoldenStandards(current_language);
+      const response = await api.listGoldenStandards(current_language, filters());
+      if (id !== requestId.current) return; // A newer filter already reloaded
       if (response.status === 'success' && response.data) {
         setStandards(response.data.standards || []);
+        setTotal(response.data.total ?? null);
+        setNextCursor(response.data.next_cursor || null);
+        if (response.data.categories) {
+          setCategoryOptions(response.data.categories);
+        }
       }
     } catch (error) {
       console.error('Failed to load golden standards:', error);
     } finally {
-      setLoading(false);
+      if (id === requestId.current) setLoading(false);
     }
   };
 
-  // Filter standards by search query and category
-  const filteredStandards = standards.filter((std) => {
-    const matchesSearch =
-      searchQuery === '' ||
-      std.trigger_context.toLowerCase().includes(searchQuery.toLowerCase()) ||
-      std.golden_response.toLowerCase().includes(searchQuery.toLowerCase()) ||
-      std.tags.some(tag => tag.toLowerCase().includes(searchQuery.toLowerCase()));
-
-    const matchesCategory =
-      selectedCategory === 'all' ||
-      std.category === selectedCategory;
-
-    return matchesSearch && matchesCategory;
-  });
+  // Append the next page (keyset cursor, same filters)
+  const loadMoreStandards = async () => {
+    if (!nextCursor) return;
+    const id = requestId.current;
+    setLoadingMore(true);
+    try {
+      const response = await api.listGoldenStandards(current_language, { ...filters(), cursor: nextCursor });
+      if (id !== requestId.current) return;
+      if (response.status === 'success' && response.data) {
+        setStandards((previous) => [...previous, ...(response.data.standards || [])]);
+        setNextCursor(response.data.next_cursor || null);
+      }
+    } catch (error) {
+      console.error('Failed to load more golden standards:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
 
-  // Get unique categories
-  const categories = ['all', ...new Set(standards.map(s => s.category).filter(Boolean))];
+  // Every category of the language (first page of the listing)
+  const categories = ['all', ...categoryOptions];
 
   return (
     <div className="space-y-6">
@@ -79,7 +103,7 @@ export default function GoldenStandardsTab() {
           </div>
           <div className="text-right">
             <div className="text-3xl font-bold text-accent-light dark:text-accent-dark">
-              {standards.length}
+              {total ?? standards.length}
             </div>
             <div className="text-sm text-text-secondary-light dark:text-text-secondary-dark">
               Total Standards
@@ -96,7 +120,7 @@ export default function GoldenStandardsTab() {
               type="text"
               value={searchQuery}
               onChange={(e) => setSearchQuery(e.target.value)}
-              placeholder="Szukaj w kontekście, odpowiedziach, tagach..."
+              placeholder="Szukaj w kontekście i odpowiedziach..."
               className="w-full pl-10 pr-4 py-2 rounded bg-bg-light dark:bg-bg-dark border border-border-light dark:border-border-dark focus:outline-none focus:ring-2 focus:ring-accent-light dark:focus:ring-accent-dark text-sm"
             />
           </div>
@@ -121,7 +145,7 @@ export default function GoldenStandardsTab() {
         {/* Filter results count */}
         {(searchQuery || selectedCategory !== 'all') && (
           <div className="mt-3 text-sm text-text-secondary-light dark:text-text-secondary-dark">
-            Znaleziono: <span className="font-semibold">{filteredStandards.length}</span> z {standards.length}
+            Znaleziono: <span className="font-semibold">{total ?? standards.length}</span>
           </div>
         )}
       </div>
@@ -132,7 +156,7 @@ export default function GoldenStandardsTab() {
           <div className="p-12 text-center text-text-secondary-light dark:text-text-secondary-dark">
             Ładowanie...
           </div>
-        ) : filteredStandards.length === 0 ? (
+        ) : standards.length === 0 ? (
           <div className="p-12 text-center">
             <div className="text-6xl mb-4">📭</div>
             <div className="text-text-secondary-light dark:text-text-secondary-dark">
@@ -144,7 +168,7 @@ export default function GoldenStandardsTab() {
           </div>
         ) : (
           <div className="divide-y divide-border-light dark:divide-border-dark max-h-[calc(100vh-400px)] overflow-y-auto">
-            {filteredStandards.map((standard) => (
+            {standards.map((standard) => (
               <div
                 key={standard.id}
                 className="p-6 hover:bg-bg-light dark:hover:bg-bg-dark transition"
@@ -213,6 +237,17 @@ export default function GoldenStandardsTab() {
                 </div>
               </div>
             ))}
+            {nextCursor && (
+              <div className="p-4 text-center">
+                <button
+                  onClick={loadMoreStandards}
+                  disabled={loadingMore}
+                  className="px-4 py-2 rounded border border-border-light dark:border-border-dark hover:bg-bg-light dark:hover:bg-bg-dark transition text-sm disabled:opacity-50"
+                >
+                  {loadingMore ? 'Ładowanie...' : `Załaduj więcej (${standards.length} z ${total ?? '?'})`}
+                </button>
+              </div>
+            )}
           </div>
         )}
       </div>
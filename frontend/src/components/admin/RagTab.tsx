@@ -7,8 +7,8 @@
  * - Form to add new nuggets (title, content, keywords, language)
  */
 
-import { useState, useEffect } from 'react';
-import { TrashIcon, PlusIcon, ArrowUpTrayIcon } from '@heroicons/react/24/outline';
+import { useState, useEffect, useRef } from 'react';
+import { TrashIcon, PlusIcon, ArrowUpTrayIcon, MagnifyingGlassIcon } from '@heroicons/react/24/outline';
 import { useTranslation } from '../../utils/i18n';
 import { api } from '../../utils/api';
 import { useStore } from '../../store/useStore';
@@ -28,8 +28,14 @@ export default function RagTab() {
 
   // State
   const [nuggets, setNuggets] = useState<RAGNugget[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [deleting, setDeleting] = useState<string | null>(null);
+  const [searchQuery, setSearchQuery] = useState('');
+  const [selectedType, setSelectedType] = useState('');
+  const [typeOptions, setTypeOptions] = useState<string[]>([]);
+  const requestId = useRef(0);
 
   // Form state
   const [formData, setFormData] = useState({
@@ -50,22 +56,55 @@ export default function RagTab() {
     errors: string[];
   } | null>(null);
 
-  // Load nuggets on mount and language change
+  // Search and type are filtered server-side - every change reloads from page one
+  const filters = () => ({
+    search: searchQuery.trim() || undefined,
+    type: selectedType || undefined,
+  });
+
+  // Reload on language / filter change (search debounced)
   useEffect(() => {
-    loadNuggets();
-  }, [current_language]);
+    const timer = setTimeout(loadNuggets, searchQuery ? 300 : 0);
+    return () => clearTimeout(timer);
+  }, [current_language, searchQuery, selectedType]);
 
   const loadNuggets = async () => {
+    const id = ++requestId.current;
     setLoading(true);
+    setNextCursor(null);
     try {
-      const response = await api.listRAGNuggets(current_language);
+      const response = await api.listRAGNuggets(current_language, filters());
+      if (id !== requestId.current) return; // A newer filter already reloaded
       if (response.status === 'success' && response.data) {
         setNuggets(response.data.nuggets || []);
+        setNextCursor(response.data.next_cursor || null);
+        if (response.data.types) {
+          setTypeOptions(response.data.types);
+        }
       }
     } catch (error) {
       console.error('Failed to load RAG nuggets:', error);
     } finally {
-      setLoading(false);
+      if (id === requestId.current) setLoading(false);
+    }
+  };
+
+  // Append the next page (Qdrant scroll cursor, same filters)
+  const loadMoreNuggets = async () => {
+    if (!nextCursor) return;
+    const id = requestId.current;
+    setLoadingMore(true);
+    try {
+      const response = await api.listRAGNuggets(current_language, { ...filters(), cursor: nextCursor });
+      if (id !== requestId.current) return;
+      if (response.status === 'success' && response.data) {
+        setNuggets((previous) => [...previous, ...(response.data.nuggets || [])]);
+        setNextCursor(response.data.next_cursor || null);
+      }
+    } catch (error) {
+      console.error('Failed to load more RAG nuggets:', error);
+    } finally {
+      setLoadingMore(false);
     }
   };
 
@@ -209,6 +248,30 @@ export default function RagTab() {
               </label>
             </div>
           </div>
+
+          {/* Filters */}
+          <div className="grid grid-cols-2 gap-2 mt-3">
+            <div className="relative">
+              <MagnifyingGlassIcon className="absolute left-3 top-1/2 transform -translate-y-1/2 w-4 h-4 text-text-secondary-light dark:text-text-secondary-dark" />
+              <input
+                type="text"
+                value={searchQuery}
+                onChange={(e) => setSearchQuery(e.target.value)}
+                placeholder={t('common.search')}
+                className="w-full pl-9 pr-3 py-2 rounded bg-bg-light dark:bg-bg-dark border border-border-light dark:border-border-dark focus:outline-none focus:ring-2 focus:ring-accent-light dark:focus:ring-accent-dark text-sm"
+              />
+            </div>
+            <select
+              value={selectedType}
+              onChange={(e) => setSelectedType(e.target.value)}
+              className="w-full px-3 py-2 rounded bg-bg-light dark:bg-bg-dark border border-border-light dark:border-border-dark focus:outline-none focus:ring-2 focus:ring-accent-light dark:focus:ring-accent-dark text-sm"
+            >
+              <option value="">{t('common.all_types')}</option>
+              {typeOptions.map((type) => (
+                <option key={type} value={type}>{type}</option>
+              ))}
+            </select>
+          </div>
         </div>
 
         <div className="flex-1 overflow-y-auto">
@@ -257,6 +320,17 @@ export default function RagTab() {
                   )}
                 </div>
               ))}
+              {nextCursor && (
+                <div className="p-4 text-center">
+                  <button
+                    onClick={loadMoreNuggets}
+                    disabled={loadingMore}
+                    className="px-4 py-2 rounded border border-border-light dark:border-border-dark hover:bg-bg-light dark:hover:bg-bg-dark transition text-sm disabled:opacity-50"
+                  >
+                    {loadingMore ? `${t('common.loading')}...` : t('common.load_more')}
+                  </button>
+                </div>
+              )}
             </div>
           )}
         </div>
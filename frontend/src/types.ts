@@ -331,6 +331,19 @@ export interface IFastPathResponse {
   confidence_score: number;
   /** Explanation of confidence level */
   confidence_reason: string;
+  /** Where the answer came from: Gemini, a curated Golden Standard, or an error fallback */
+  source?: 'llm' | 'golden_standard' | 'error';
+  /** Golden Standard id when source === 'golden_standard' */
+  golden_standard_id?: number | null;
+  /** False when the Slow Path trigger gate kept the current analysis */
+  slow_path_queued?: boolean;
+  /** Why the Slow Path was (not) queued */
+  slow_path_gate?: {
+    run: boolean;
+    reason: string;
+    new_notes: number;
+    distance: number | null;
+  };
 }
 
 /**
@@ -407,8 +420,12 @@ export interface IRAGNugget {
  * @see IGlobalAPIResponse for wrapper structure
  */
 export interface IRAGListResponse {
-  /** All RAG entries with IDs and payloads */
+  /** One page of RAG entries with IDs and (projected) payloads */
   nuggets: IRAGNugget[];
+  /** Pass back as `cursor` for the next page (null on the last page) */
+  next_cursor: string | null;
+  /** Approximate number of matches (first page only) */
+  total: number | null;
 }
 
 
@@ -9,6 +9,28 @@
 import axios, { type AxiosInstance, type AxiosError } from 'axios';
 import type { IGlobalAPIResponse } from '../types';
 
+/**
+ * Paging / filtering options of the admin knowledge listings
+ * (next_cursor of the previous page, server-side search, projected fields)
+ */
+export interface IAdminListOptions {
+  cursor?: string | null;
+  limit?: number;
+  search?: string;
+  type?: string;
+  category?: string;
+  fields?: string[];
+}
+
+const adminListParams = (options: IAdminListOptions) => ({
+  cursor: options.cursor || undefined,
+  limit: options.limit,
+  search: options.search || undefined,
+  type: options.type || undefined,
+  category: options.category || undefined,
+  fields: options.fields?.length ? options.fields.join(',') : undefined,
+});
+
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000/api/v1';
 
 /**
@@ -103,8 +125,11 @@ export const api = {
     return response.data;
   },
   
-  async retrySlowPath(sessionId: string) {
-    const response = await apiClient.post('/sessions/retry_slowpath', { session_id: sessionId });
+  async retrySlowPath(sessionId: string, journeyStage?: string) {
+    const response = await apiClient.post('/sessions/retry_slowpath', {
+      session_id: sessionId,
+      journey_stage: journeyStage,
+    });
     return response.data;
   },
   
@@ -159,13 +184,17 @@ export const api = {
     return response.data;
   },
 
-  async listGoldenStandards(language: string) {
-    const response = await apiClient.get(`/admin/golden-standards/list?language=${language}`);
+  async listGoldenStandards(language: string, options: IAdminListOptions = {}) {
+    const response = await apiClient.get('/admin/golden-standards/list', {
+      params: { language, ...adminListParams(options) },
+    });
     return response.data;
   },
 
-  async listRAGNuggets(language: string) {
-    const response = await apiClient.get(`/admin/rag/list?language=${language}`);
+  async listRAGNuggets(language: string, options: IAdminListOptions = {}) {
+    const response = await apiClient.get('/admin/rag/list', {
+      params: { language, ...adminListParams(options) },
+    });
     return response.data;
   },
   
@@ -262,7 +262,8 @@ export default function Conversation() {
           setSuggestedQuestions([]);
         }
 
-        setAppStatus('slow_path_loading'); // Slow Path starts automatically
+        // Slow Path starts automatically unless the trigger gate kept the current analysis
+        setAppStatus(data.slow_path_queued === false ? 'idle' : 'slow_path_loading');
       } else {
         // Error - rollback optimistic message
         setAppStatus('error');
@@ -351,7 +352,7 @@ export default function Conversation() {
           setSuggestedQuestions(response.data.suggested_questions);
         }
 
-        setAppStatus('slow_path_loading');
+        setAppStatus(response.data.slow_path_queued === false ? 'idle' : 'slow_path_loading');
       } else {
         setAppStatus('error');
       }
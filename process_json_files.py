@@ -2,41 +2,84 @@
 # -*- coding: utf-8 -*-
 """
 Tesla Knowledge Base JSON Processor
-Consolidates 9 source JSON files into 2 output files with conflict detection
+Consolidates the source JSON files into 2 output files with conflict detection
+
+Pipeline:
+1. Source files are parsed in parallel (one worker process per file) with a
+   streaming JSON decoder - each worker also prepares the dedup key and the
+   MinHash signature of every entry, so the parent only merges results
+2. Exact duplicates are removed by normalized content
+3. Near-duplicates are clustered with MinHash + LSH banding over word
+   shingles (roughly linear instead of comparing every pair); the first
+   entry of each cluster is kept. Entries quoting different numbers are
+   never merged - those are left for conflict detection
+4. Conflict topics are precompiled once (one alternation regex per topic)
+
+Entry ids are deterministic (uuid5 of the source file + source key: the
+original id, else the title / trigger_context), so re-running the script
+yields the same ids and an edited entry keeps its id - sync_knowledge.py
+updates it in place instead of deleting and re-adding it.
+
+Usage:
+    python process_json_files.py                              # sources under ./datatoupload
+    python process_json_files.py --data-dir /data/kb --output-dir /data/out
+    python process_json_files.py --golden-sources a.json b.json --rag-sources c.json
+    python process_json_files.py --similarity 0.9 --workers 4
+    python process_json_files.py --no-near-dup                # exact dedup only
 """
 
+import os
+import re
 import json
 import uuid
-import re
+import zlib
+import random
+import argparse
 from pathlib import Path
+from datetime import datetime
+from functools import lru_cache
 from collections import defaultdict
-from typing import List, Dict, Any, Tuple
-
-# Configuration
-BASE_DIR = Path(r"c:\Users\barto\OneDrive\Pulpit\decoder")
-DATA_DIR = BASE_DIR / "datatoupload"
-
-# Input files mapping
-GOLDEN_STANDARDS_SOURCES = [
-    DATA_DIR / "gol1.json",
-    DATA_DIR / "gol2.json",
-    DATA_DIR / "gol3.json",
-    BASE_DIR / "sample_golden_standards.json"
+from multiprocessing import Pool
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Defaults (overridable from the command line)
+BASE_DIR = Path(__file__).resolve().parent
+DATA_DIR_NAME = "datatoupload"
+
+DEFAULT_GOLDEN_SOURCES = [
+    f"{DATA_DIR_NAME}/gol1.json",
+    f"{DATA_DIR_NAME}/gol2.json",
+    f"{DATA_DIR_NAME}/gol3.json",
+    "sample_golden_standards.json"
 ]
 
-RAG_NUGGETS_SOURCES = [
-    DATA_DIR / "nugget1.json",
-    DATA_DIR / "nugget2.json",
-    DATA_DIR / "nugget3.json",
-    BASE_DIR / "sample_rag_nuggets.json",
-    DATA_DIR / "nugget4.json",  # Needs adaptation
-    DATA_DIR / "gol4.json"       # Needs adaptation
+DEFAULT_RAG_SOURCES = [
+    f"{DATA_DIR_NAME}/nugget1.json",
+    f"{DATA_DIR_NAME}/nugget2.json",
+    f"{DATA_DIR_NAME}/nugget3.json",
+    "sample_rag_nuggets.json",
+    f"{DATA_DIR_NAME}/nugget4.json",  # Needs adaptation
+    f"{DATA_DIR_NAME}/gol4.json"       # Needs adaptation
 ]
 
-# Output files
-OUTPUT_GOLDEN = BASE_DIR / "golden_standards_final.json"
-OUTPUT_RAG = BASE_DIR / "rag_nuggets_final.json"
-OUTPUT_REPORT = BASE_DIR / "conflict_report.md"
+DEFAULT_ADAPT_FILES = ["nugget4.json", "gol4.json"]
+
+OUTPUT_GOLDEN_NAME = "golden_standards_final.json"
+OUTPUT_RAG_NAME = "rag_nuggets_final.json"
+OUTPUT_REPORT_NAME = "conflict_report.md"
+
+# Near-duplicate detection
+SHINGLE_SIZE = 3          # Words per shingle
+DEFAULT_NUM_PERM = 64     # MinHash signature length
+DEFAULT_LSH_ROWS = 4      # Signature rows per LSH band (16 bands of 4 -> high recall at 0.85)
+DEFAULT_SIMILARITY = 0.85 # Estimated Jaccard needed to merge two entries
+MINHASH_SEED = 1          # Fixed - signatures must match across worker processes
+_MERSENNE_PRIME = (1 << 61) - 1
+
+# Namespace of the deterministic entry ids
+ENTRY_ID_NAMESPACE = uuid.UUID("6f1c7a52-3b8e-4d2a-9c41-5e0b7d9a2f10")
+
+_READ_CHUNK = 64 * 1024
 
 # Conflict detection patterns
 CONFLICT_PATTERNS = [
@@ -91,27 +134,58 @@ CONFLICT_PATTERNS = [
 ]
 
 
-def generate_uuid() -> str:
-    """Generate UUID v4"""
-    return str(uuid.uuid4())
+def compile_conflict_patterns(configs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Compile every topic once: one alternation for the topic, one value regex"""
+    return [
+        {
+            "name": config["name"],
+            "topic": re.compile("|".join(f"(?:{p})" for p in config["patterns"]), re.IGNORECASE),
+            "value": re.compile(config["value_regex"], re.IGNORECASE),
+            "field": config["field"]
+        }
+        for config in configs
+    ]
+
+
+COMPILED_CONFLICT_PATTERNS = compile_conflict_patterns(CONFLICT_PATTERNS)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_TITLE_WORD_RE = re.compile(r'\b(?:Model\s+[A-Z0-9]+|[A-ZŁŚĆŹĄĘŃÓ][a-złśćźąęń]+|\d+\s*(?:km|kW|zł|%|s|kg))\b')
+_TECH_TERM_RE = re.compile(r'\b(?:Tesla|FSD|Autopilot|Supercharger|WLTP|LFP|NCA|OTA|TCO|leasing|zasięg|bateria)\b', re.IGNORECASE)
+_SHINGLE_WORD_RE = re.compile(r'\w+', re.UNICODE)
+_NUMBER_RE = re.compile(r'\d+(?:[.,]\d+)?')
+
+
+def entry_id(source_file: str, source_key: str) -> str:
+    """Deterministic UUID of an entry (stable across runs and content edits)"""
+    return str(uuid.uuid5(ENTRY_ID_NAMESPACE, f"{source_file}\x1f{source_key}"))
+
+
+def source_key(entry: Dict[str, Any], normalized: str) -> str:
+    """Identity of an entry inside its source file: original id, else title / trigger"""
+    for field in ('_original_id', 'title', 'trigger_context'):
+        value = str(entry.get(field) or '').strip()
+        if value:
+            return f"{field}:{_WHITESPACE_RE.sub(' ', value)}"
+    return f"content:{normalized}"  # Nothing stable to key on
 
 
 def extract_title_from_content(content: str, max_words: int = 10, max_chars: int = 70) -> str:
     """Extract title from content (first N words or chars)"""
     # Remove extra whitespace
-    cleaned = re.sub(r'\s+', ' ', content.strip())
-    
+    cleaned = _WHITESPACE_RE.sub(' ', content.strip())
+
     # Try word-based extraction first
     words = cleaned.split()
     if len(words) <= max_words:
         title = cleaned[:max_chars]
     else:
         title = ' '.join(words[:max_words])
-    
+
     # Truncate to max_chars
     if len(title) > max_chars:
         title = title[:max_chars].rsplit(' ', 1)[0]  # Cut at last word boundary
-    
+
     return title.strip()
 
 
@@ -122,13 +196,11 @@ def extract_keywords(content: str, max_keywords: int = 6) -> str:
         'i', 'w', 'z', 'na', 'do', 'dla', 'po', 'od', 'ze', 'o', 'oraz', 'to', 'jest',
         'się', 'że', 'jak', 'przy', 'ma', 'co', 'przez', 'lub', 'gdy', 'bez', 'może'
     }
-    
-    # Extract potential keywords (capitalized words, numbers with units, Model names)
-    words = re.findall(r'\b(?:Model\s+[A-Z0-9]+|[A-ZŁŚĆŹĄĘŃÓ][a-złśćźąęń]+|\d+\s*(?:km|kW|zł|%|s|kg))\b', content)
-    
-    # Also extract important technical terms
-    tech_terms = re.findall(r'\b(?:Tesla|FSD|Autopilot|Supercharger|WLTP|LFP|NCA|OTA|TCO|leasing|zasięg|bateria)\b', content, re.IGNORECASE)
-    
+
+    # Potential keywords (capitalized words, numbers with units, Model names) + technical terms
+    words = _TITLE_WORD_RE.findall(content)
+    tech_terms = _TECH_TERM_RE.findall(content)
+
     # Combine and deduplicate
     keywords = []
     seen = set()
@@ -139,29 +211,59 @@ def extract_keywords(content: str, max_keywords: int = 6) -> str:
             seen.add(word_lower)
             if len(keywords) >= max_keywords:
                 break
-    
+
     return ', '.join(keywords[:max_keywords]) if keywords else 'Tesla, informacja'
 
 
-def load_json_file(file_path: Path) -> List[Dict[str, Any]]:
-    """Load JSON file and return list of objects"""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            if not isinstance(data, list):
-                data = [data]
-            return data
-    except Exception as e:
-        print(f"Error loading {file_path}: {e}")
-        return []
+def iter_json_values(file_path: Path) -> Iterator[Any]:
+    """
+    Stream the objects of a JSON file: the elements of a top-level array
+    (decoded one at a time) or the single top-level value.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    in_array = None  # Unknown until the first non-blank character
+
+    with open(file_path, 'r', encoding='utf-8') as f:
+        while True:
+            buffer = buffer.lstrip()
+            if in_array is None and buffer:
+                in_array = buffer[0] == '['
+                if in_array:
+                    buffer = buffer[1:]
+                    continue
+            if in_array:
+                if buffer.startswith(','):
+                    buffer = buffer[1:]
+                    continue
+                if buffer.startswith(']'):
+                    return
+            if buffer:
+                try:
+                    value, end = decoder.raw_decode(buffer)
+                except json.JSONDecodeError:
+                    value, end = None, -1
+                if end >= 0:
+                    buffer = buffer[end:]
+                    yield value
+                    if not in_array:
+                        return
+                    continue
+            chunk = f.read(_READ_CHUNK)
+            if not chunk:
+                if buffer:
+                    decoder.raw_decode(buffer)  # Re-raise the real decode error
+                if in_array:
+                    raise ValueError(f"{file_path}: unterminated JSON array")
+                return
+            buffer += chunk
 
 
 def adapt_nugget4_gol4(entry: Dict[str, Any], source_file: str) -> Dict[str, Any]:
     """Adapt nugget4.json and gol4.json to Format B"""
     content = entry.get('content', '')
-    
+
     adapted = {
-        'id': generate_uuid(),
         'title': extract_title_from_content(content),
         'content': content,
         'keywords': extract_keywords(content),
@@ -169,18 +271,17 @@ def adapt_nugget4_gol4(entry: Dict[str, Any], source_file: str) -> Dict[str, Any
         'tags': entry.get('tags', []),
         'archetype_filter': entry.get('archetype_filter', [])
     }
-    
+
     # Add metadata for tracking
     adapted['_source_file'] = source_file
     adapted['_original_id'] = entry.get('id', '')
-    
+
     return adapted
 
 
-def add_uuid_to_entry(entry: Dict[str, Any], source_file: str) -> Dict[str, Any]:
-    """Add UUID to existing entry"""
-    entry_copy = entry.copy()
-    entry_copy['id'] = generate_uuid()
+def tag_entry(entry: Dict[str, Any], source_file: str) -> Dict[str, Any]:
+    """Copy an entry with tracking metadata (the id is assigned after normalization)"""
+    entry_copy = {k: v for k, v in entry.items() if k != 'id'}
     entry_copy['_source_file'] = source_file
     entry_copy['_original_id'] = entry.get('id', '')
     return entry_copy
@@ -192,51 +293,216 @@ def normalize_entry(entry: Dict[str, Any]) -> str:
     return json.dumps(normalized, sort_keys=True, ensure_ascii=False)
 
 
-def deduplicate_entries(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def entry_text(entry: Dict[str, Any]) -> str:
+    """Text compared for near-duplicates (nugget content or trigger + response)"""
+    if entry.get('content'):
+        return str(entry['content'])
+    return f"{entry.get('trigger_context', '')} {entry.get('golden_response', '')}"
+
+
+@lru_cache(maxsize=4)
+def _minhash_params(num_perm: int) -> Tuple[Tuple[int, int], ...]:
+    rng = random.Random(MINHASH_SEED)
+    return tuple((rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME)) for _ in range(num_perm))
+
+
+def minhash_signature(text: str, num_perm: int = DEFAULT_NUM_PERM) -> Tuple[int, ...]:
+    """MinHash of the word shingles of a text (crc32 - identical in every process)"""
+    words = _SHINGLE_WORD_RE.findall(text.lower())
+    if len(words) < SHINGLE_SIZE:
+        words = words + [''] * (SHINGLE_SIZE - len(words))
+    shingles = {
+        zlib.crc32(' '.join(words[i:i + SHINGLE_SIZE]).encode('utf-8'))
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    }
+    return tuple(
+        min((a * shingle + b) % _MERSENNE_PRIME for shingle in shingles)
+        for a, b in _minhash_params(num_perm)
+    )
+
+
+def estimated_jaccard(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+    """Share of equal MinHash slots - an unbiased estimate of the Jaccard similarity"""
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+
+def load_source_file(job: Tuple[str, bool, bool, int]) -> Dict[str, Any]:
+    """
+    Worker: stream one source file and prepare its records.
+
+    Returns:
+        {"file", "records": [{"entry", "key", "signature", "numbers"}], "error"}
+    """
+    path_str, adapt, near_dup, num_perm = job
+    file_path = Path(path_str)
+    records = []
+    seen_keys: Dict[str, int] = {}
+    try:
+        for entry in iter_json_values(file_path):
+            if not isinstance(entry, dict):
+                continue
+            prepared = adapt_nugget4_gol4(entry, file_path.name) if adapt else tag_entry(entry, file_path.name)
+            key = normalize_entry(prepared)
+            identity = source_key(prepared, key)
+            # Repeated keys (e.g. two entries titled alike) are told apart by occurrence
+            seen_keys[identity] = seen_keys.get(identity, 0) + 1
+            if seen_keys[identity] > 1:
+                identity = f"{identity}#{seen_keys[identity]}"
+            prepared['id'] = entry_id(file_path.name, identity)
+            text = entry_text(prepared)
+            records.append({
+                'entry': prepared,
+                'key': key,
+                'signature': minhash_signature(text, num_perm) if near_dup else None,
+                'numbers': sorted(set(_NUMBER_RE.findall(text)))
+            })
+    except (OSError, ValueError) as e:
+        return {'file': file_path.name, 'records': records, 'error': str(e)}
+    return {'file': file_path.name, 'records': records, 'error': None}
+
+
+def load_sources(
+    sources: List[Path],
+    adapt_files: List[str],
+    workers: int,
+    near_dup: bool,
+    num_perm: int
+) -> List[Dict[str, Any]]:
+    """Load source files in parallel; records keep the order of `sources`"""
+    jobs = []
+    for file_path in sources:
+        if not file_path.exists():
+            print(f"⚠️  File not found: {file_path}")
+            continue
+        jobs.append((str(file_path), file_path.name in adapt_files, near_dup, num_perm))
+
+    if workers > 1 and len(jobs) > 1:
+        with Pool(processes=min(workers, len(jobs))) as pool:
+            results = pool.map(load_source_file, jobs)
+    else:
+        results = [load_source_file(job) for job in jobs]
+
+    records = []
+    for (_, adapt, _, _), result in zip(jobs, results):
+        if result['error']:
+            print(f"Error loading {result['file']}: {result['error']}")
+        print(f"Loading: {result['file']}")
+        print(f"  Loaded {len(result['records'])} entries {'(adapted)' if adapt else ''}")
+        records.extend(result['records'])
+    return records
+
+
+def deduplicate_entries(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Remove exact duplicates, keeping first occurrence"""
-    seen = {}
+    seen = set()
     unique = []
-    
-    for entry in entries:
-        norm = normalize_entry(entry)
-        if norm not in seen:
-            seen[norm] = entry
-            unique.append(entry)
+
+    for record in records:
+        if record['key'] not in seen:
+            seen.add(record['key'])
+            unique.append(record)
         else:
+            entry = record['entry']
             print(f"  Duplicate removed: {entry.get('title', entry.get('trigger_context', 'Unknown'))[:50]}...")
-    
-    print(f"Deduplication: {len(entries)} → {len(unique)} entries ({len(entries) - len(unique)} duplicates removed)")
+
+    print(f"Deduplication: {len(records)} → {len(unique)} entries ({len(records) - len(unique)} duplicates removed)")
     return unique
 
 
+def cluster_near_duplicates(
+    records: List[Dict[str, Any]],
+    similarity: float = DEFAULT_SIMILARITY,
+    rows: int = DEFAULT_LSH_ROWS
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Merge near-duplicates found with LSH banding over MinHash signatures.
+
+    Only records sharing a band bucket are compared, and a candidate pair is
+    merged when its estimated Jaccard reaches `similarity` AND both quote the
+    same numbers. The first record of a cluster is kept.
+
+    Returns:
+        (kept_records, clusters) - clusters: [{"kept": entry, "removed": [(entry, similarity)]}]
+    """
+    if not records:
+        return records, []
+
+    num_perm = len(records[0]['signature'])
+    bands = max(1, num_perm // rows)
+    buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = defaultdict(list)
+    parent = list(range(len(records)))
+    best_similarity: Dict[int, float] = {}
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for index, record in enumerate(records):
+        signature = record['signature']
+        compared = set()
+        for band in range(bands):
+            bucket = buckets[(band, signature[band * rows:(band + 1) * rows])]
+            for other in bucket:
+                if other in compared:
+                    continue
+                compared.add(other)
+                if records[other]['numbers'] != record['numbers']:
+                    continue  # Different facts - a conflict, not a duplicate
+                score = estimated_jaccard(signature, records[other]['signature'])
+                if score >= similarity:
+                    root_a, root_b = find(index), find(other)
+                    if root_a != root_b:
+                        parent[max(root_a, root_b)] = min(root_a, root_b)  # Earliest record stays the root
+                    best_similarity[index] = max(best_similarity.get(index, 0.0), score)
+            bucket.append(index)
+
+    members: Dict[int, List[int]] = defaultdict(list)
+    for index in range(len(records)):
+        members[find(index)].append(index)
+
+    kept = []
+    clusters = []
+    for index, record in enumerate(records):
+        if find(index) != index:
+            continue
+        kept.append(record)
+        removed = [(records[i]['entry'], best_similarity.get(i, similarity)) for i in members[index] if i != index]
+        if removed:
+            clusters.append({'kept': record['entry'], 'removed': removed})
+
+    print(f"Near-duplicates: {len(records)} → {len(kept)} entries "
+          f"({len(records) - len(kept)} merged into {len(clusters)} clusters)")
+    return kept, clusters
+
+
 def detect_conflicts(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Detect semantic conflicts based on patterns"""
+    """Detect semantic conflicts based on the precompiled topic patterns"""
     conflicts = []
-    
-    for pattern_config in CONFLICT_PATTERNS:
-        pattern_name = pattern_config['name']
-        patterns = pattern_config['patterns']
-        value_regex = pattern_config['value_regex']
+    texts: Dict[str, List[str]] = {}
+
+    for pattern_config in COMPILED_CONFLICT_PATTERNS:
         field = pattern_config['field']
-        
+        if field not in texts:
+            # Lowercase every entry once per field, not once per topic
+            texts[field] = [
+                str(entry.get(field, '') or entry.get('trigger_context', '') or entry.get('golden_response', '')).lower()
+                for entry in entries
+            ]
+
         # Find all entries matching this topic
         matching_entries = []
-        for entry in entries:
-            text = entry.get(field, '') or entry.get('trigger_context', '') or entry.get('golden_response', '')
-            text = str(text).lower()
-            
-            for pattern in patterns:
-                if re.search(pattern, text, re.IGNORECASE):
-                    # Extract value
-                    matches = re.findall(value_regex, text, re.IGNORECASE)
-                    if matches:
-                        matching_entries.append({
-                            'entry': entry,
-                            'values': matches,
-                            'text': text[:200]
-                        })
-                    break
-        
+        for entry, text in zip(entries, texts[field]):
+            if pattern_config['topic'].search(text):
+                matches = pattern_config['value'].findall(text)
+                if matches:
+                    matching_entries.append({
+                        'entry': entry,
+                        'values': matches,
+                        'text': text[:200]
+                    })
+
         # Check for conflicting values
         if len(matching_entries) >= 2:
             # Group by distinct values
@@ -244,65 +510,97 @@ def detect_conflicts(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
             for item in matching_entries:
                 for value in item['values']:
                     value_groups[value].append(item['entry'])
-            
+
             # If we have different values, it's a conflict
             if len(value_groups) > 1:
                 conflicts.append({
-                    'topic': pattern_name,
+                    'topic': pattern_config['name'],
                     'value_groups': dict(value_groups),
                     'all_entries': [item['entry'] for item in matching_entries]
                 })
-    
+
     return conflicts
 
 
-def generate_conflict_report(conflicts: List[Dict[str, Any]]) -> str:
+def _entry_label(entry: Dict[str, Any]) -> str:
+    return str(entry.get('title') or entry.get('trigger_context') or 'Brak tytułu')[:80]
+
+
+def generate_near_duplicate_section(clusters: List[Dict[str, Any]]) -> List[str]:
+    """Markdown section listing merged near-duplicate clusters"""
+    if not clusters:
+        return []
+
+    lines = [
+        "## Scalone prawie-duplikaty",
+        "",
+        f"**Liczba klastrów:** {len(clusters)} (zachowano pierwszy wpis z każdego klastra)",
+        ""
+    ]
+    for i, cluster in enumerate(clusters, 1):
+        kept = cluster['kept']
+        lines.extend([
+            f"### Klaster #{i}: {_entry_label(kept)}",
+            f"- **Zachowano:** `{kept.get('id')}` (`{kept.get('_source_file', 'unknown')}`)",
+        ])
+        for entry, score in cluster['removed']:
+            lines.append(
+                f"- **Usunięto:** `{entry.get('_source_file', 'unknown')}` - {_entry_label(entry)} "
+                f"(podobieństwo ≈ {score:.2f})"
+            )
+        lines.append("")
+    lines.extend(["---", ""])
+    return lines
+
+
+def generate_conflict_report(conflicts: List[Dict[str, Any]], near_duplicates: Optional[List[Dict[str, Any]]] = None) -> str:
     """Generate Markdown conflict report"""
+    near_duplicate_lines = generate_near_duplicate_section(near_duplicates or [])
     if not conflicts:
-        return "# Raport Konfliktów\n\n✅ **Nie wykryto konfliktów merytorycznych.**\n"
-    
+        return "\n".join(["# Raport Konfliktów", "", "✅ **Nie wykryto konfliktów merytorycznych.**", ""] + near_duplicate_lines)
+
     report_lines = [
         "# Raport Konfliktów Merytorycznych",
         "",
-        f"**Data wygenerowania:** {Path(__file__).stat().st_mtime}",
+        f"**Data wygenerowania:** {datetime.now().strftime('%Y-%m-%d %H:%M')}",
         f"**Liczba wykrytych konfliktów:** {len(conflicts)}",
         "",
         "---",
         ""
     ]
-    
+
     for i, conflict in enumerate(conflicts, 1):
         topic = conflict['topic']
         value_groups = conflict['value_groups']
-        
+
         report_lines.extend([
             f"## Konflikt #{i}: {topic}",
             "",
             f"**Wykryto {len(value_groups)} różnych wartości dla tego samego faktu:**",
             ""
         ])
-        
+
         for value, entries in value_groups.items():
             report_lines.extend([
                 f"### Wartość: `{value}`",
                 f"**Liczba wpisów:** {len(entries)}",
                 ""
             ])
-            
+
             for entry in entries:
-                entry_id = entry.get('id', 'unknown')
+                entry_id_value = entry.get('id', 'unknown')
                 source_file = entry.get('_source_file', 'unknown')
                 original_id = entry.get('_original_id', '')
-                
+
                 # Get relevant content excerpt
-                content = (entry.get('content') or 
-                          entry.get('golden_response') or 
+                content = (entry.get('content') or
+                          entry.get('golden_response') or
                           entry.get('trigger_context', ''))[:300]
-                
+
                 title = entry.get('title', entry.get('trigger_context', 'Brak tytułu'))[:80]
-                
+
                 report_lines.extend([
-                    f"- **ID:** `{entry_id}`",
+                    f"- **ID:** `{entry_id_value}`",
                     f"  - **Plik źródłowy:** `{source_file}`",
                     f"  - **Oryginalne ID:** `{original_id}`" if original_id else "",
                     f"  - **Tytuł/Kontekst:** {title}",
@@ -312,9 +610,10 @@ def generate_conflict_report(conflicts: List[Dict[str, Any]]) -> str:
                     f"    ```",
                     ""
                 ])
-        
+
         report_lines.extend(["---", ""])
-    
+
+    report_lines.extend(near_duplicate_lines)
     report_lines.extend([
         "",
         "## Instrukcje",
@@ -327,68 +626,28 @@ def generate_conflict_report(conflicts: List[Dict[str, Any]]) -> str:
         "**UWAGA:** NIE importuj plików do Qdrant przed rozwiązaniem wszystkich konfliktów!",
         ""
     ])
-    
+
     return '\n'.join(report_lines)
 
 
-def process_golden_standards() -> Tuple[List[Dict[str, Any]], int]:
-    """Process golden standards files"""
-    print("\n=== Processing Golden Standards (Format A) ===")
-    all_entries = []
-    
-    for file_path in GOLDEN_STANDARDS_SOURCES:
-        if not file_path.exists():
-            print(f"⚠️  File not found: {file_path}")
-            continue
-        
-        print(f"Loading: {file_path.name}")
-        entries = load_json_file(file_path)
-        
-        # Add UUID to each entry
-        for entry in entries:
-            entry_with_uuid = add_uuid_to_entry(entry, file_path.name)
-            all_entries.append(entry_with_uuid)
-        
-        print(f"  Loaded {len(entries)} entries")
-    
-    # Deduplicate
-    print("\nDeduplicating golden standards...")
-    unique_entries = deduplicate_entries(all_entries)
-    
-    return unique_entries, len(all_entries)
-
-
-def process_rag_nuggets() -> Tuple[List[Dict[str, Any]], int]:
-    """Process RAG nuggets files"""
-    print("\n=== Processing RAG Nuggets (Format B) ===")
-    all_entries = []
-    
-    for file_path in RAG_NUGGETS_SOURCES:
-        if not file_path.exists():
-            print(f"⚠️  File not found: {file_path}")
-            continue
-        
-        print(f"Loading: {file_path.name}")
-        entries = load_json_file(file_path)
-        
-        # Check if adaptation needed
-        needs_adaptation = file_path.name in ['nugget4.json', 'gol4.json']
-        
-        for entry in entries:
-            if needs_adaptation:
-                adapted = adapt_nugget4_gol4(entry, file_path.name)
-                all_entries.append(adapted)
-            else:
-                entry_with_uuid = add_uuid_to_entry(entry, file_path.name)
-                all_entries.append(entry_with_uuid)
-        
-        print(f"  Loaded {len(entries)} entries {'(adapted)' if needs_adaptation else ''}")
-    
-    # Deduplicate
-    print("\nDeduplicating RAG nuggets...")
-    unique_entries = deduplicate_entries(all_entries)
-    
-    return unique_entries, len(all_entries)
+def process_collection(
+    title: str,
+    sources: List[Path],
+    args: argparse.Namespace
+) -> Tuple[List[Dict[str, Any]], int, List[Dict[str, Any]]]:
+    """Load, deduplicate and near-dedup one collection"""
+    print(f"\n=== Processing {title} ===")
+    near_dup = not args.no_near_dup
+    records = load_sources(sources, args.adapt, args.workers, near_dup, args.num_perm)
+
+    print(f"\nDeduplicating {title}...")
+    unique = deduplicate_entries(records)
+
+    clusters = []
+    if near_dup:
+        unique, clusters = cluster_near_duplicates(unique, args.similarity, args.lsh_rows)
+
+    return [record['entry'] for record in unique], len(records), clusters
 
 
 def clean_metadata(entry: Dict[str, Any]) -> Dict[str, Any]:
@@ -396,52 +655,105 @@ def clean_metadata(entry: Dict[str, Any]) -> Dict[str, Any]:
     return {k: v for k, v in entry.items() if not k.startswith('_')}
 
 
+def resolve_sources(paths: List[str], base_dir: Path, data_dir: Path) -> List[Path]:
+    """Resolve source paths: absolute as-is, `datatoupload/...` under --data-dir, others under --base-dir"""
+    resolved = []
+    for raw in paths:
+        path = Path(raw)
+        if path.is_absolute():
+            resolved.append(path)
+        elif path.parts and path.parts[0] == DATA_DIR_NAME:
+            resolved.append(data_dir.joinpath(*path.parts[1:]))
+        else:
+            resolved.append(base_dir / path)
+    return resolved
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Consolidate knowledge base JSON sources with dedup and conflict detection')
+    parser.add_argument('--base-dir', type=Path, default=BASE_DIR, help='Root for relative source paths (default: script directory)')
+    parser.add_argument('--data-dir', type=Path, default=None, help=f'Directory of the {DATA_DIR_NAME}/ sources (default: BASE_DIR/{DATA_DIR_NAME})')
+    parser.add_argument('--output-dir', type=Path, default=None, help='Directory for the output files (default: BASE_DIR)')
+    parser.add_argument('--golden-sources', nargs='+', default=DEFAULT_GOLDEN_SOURCES, help='Golden standard source files (Format A)')
+    parser.add_argument('--rag-sources', nargs='+', default=DEFAULT_RAG_SOURCES, help='RAG nugget source files (Format B)')
+    parser.add_argument('--adapt', nargs='*', default=DEFAULT_ADAPT_FILES, help='Source file names converted to Format B')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Parallel file loader processes (1 = in-process)')
+    parser.add_argument('--similarity', type=float, default=DEFAULT_SIMILARITY, help='Near-duplicate Jaccard threshold (0-1)')
+    parser.add_argument('--num-perm', type=int, default=DEFAULT_NUM_PERM, help='MinHash signature length')
+    parser.add_argument('--lsh-rows', type=int, default=DEFAULT_LSH_ROWS, help='Signature rows per LSH band')
+    parser.add_argument('--no-near-dup', action='store_true', help='Only remove exact duplicates')
+    args = parser.parse_args()
+
+    args.base_dir = args.base_dir.resolve()
+    args.data_dir = (args.data_dir or args.base_dir / DATA_DIR_NAME).resolve()
+    args.output_dir = (args.output_dir or args.base_dir).resolve()
+    if not 0 < args.similarity <= 1:
+        parser.error('--similarity must be in (0, 1]')
+    if args.lsh_rows < 1 or args.num_perm < args.lsh_rows:
+        parser.error('--num-perm must be >= --lsh-rows >= 1')
+    return args
+
+
 def main():
     """Main processing function"""
+    args = parse_args()
+    output_golden = args.output_dir / OUTPUT_GOLDEN_NAME
+    output_rag = args.output_dir / OUTPUT_RAG_NAME
+    output_report = args.output_dir / OUTPUT_REPORT_NAME
+
     print("=" * 80)
     print("Tesla Knowledge Base Consolidation Script")
     print("=" * 80)
-    
+    print(f"Base dir:   {args.base_dir}")
+    print(f"Data dir:   {args.data_dir}")
+    print(f"Output dir: {args.output_dir}")
+
     # Process both collections
-    golden_entries, golden_total = process_golden_standards()
-    rag_entries, rag_total = process_rag_nuggets()
-    
+    golden_entries, golden_total, golden_clusters = process_collection(
+        "Golden Standards (Format A)", resolve_sources(args.golden_sources, args.base_dir, args.data_dir), args
+    )
+    rag_entries, rag_total, rag_clusters = process_collection(
+        "RAG Nuggets (Format B)", resolve_sources(args.rag_sources, args.base_dir, args.data_dir), args
+    )
+
     # Detect conflicts in both collections
     print("\n=== Detecting Conflicts ===")
     print("Analyzing golden standards...")
     golden_conflicts = detect_conflicts(golden_entries)
     print(f"  Found {len(golden_conflicts)} conflict groups in golden standards")
-    
+
     print("Analyzing RAG nuggets...")
     rag_conflicts = detect_conflicts(rag_entries)
     print(f"  Found {len(rag_conflicts)} conflict groups in RAG nuggets")
-    
+
     all_conflicts = golden_conflicts + rag_conflicts
-    
+    near_duplicates = golden_clusters + rag_clusters
+
     # Generate conflict report
     print("\n=== Generating Conflict Report ===")
-    report = generate_conflict_report(all_conflicts)
-    
-    with open(OUTPUT_REPORT, 'w', encoding='utf-8') as f:
+    report = generate_conflict_report(all_conflicts, near_duplicates)
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    with open(output_report, 'w', encoding='utf-8') as f:
         f.write(report)
-    print(f"✅ Conflict report saved: {OUTPUT_REPORT}")
+    print(f"✅ Conflict report saved: {output_report}")
     print(f"   Total conflicts: {len(all_conflicts)}")
-    
+
     # Clean metadata and save final files
     print("\n=== Saving Final JSON Files ===")
-    
+
     golden_clean = [clean_metadata(e) for e in golden_entries]
-    with open(OUTPUT_GOLDEN, 'w', encoding='utf-8') as f:
+    with open(output_golden, 'w', encoding='utf-8') as f:
         json.dump(golden_clean, f, ensure_ascii=False, indent=2)
-    print(f"✅ Golden standards saved: {OUTPUT_GOLDEN}")
+    print(f"✅ Golden standards saved: {output_golden}")
     print(f"   Entries: {len(golden_clean)} (from {golden_total} original)")
-    
+
     rag_clean = [clean_metadata(e) for e in rag_entries]
-    with open(OUTPUT_RAG, 'w', encoding='utf-8') as f:
+    with open(output_rag, 'w', encoding='utf-8') as f:
         json.dump(rag_clean, f, ensure_ascii=False, indent=2)
-    print(f"✅ RAG nuggets saved: {OUTPUT_RAG}")
+    print(f"✅ RAG nuggets saved: {output_rag}")
     print(f"   Entries: {len(rag_clean)} (from {rag_total} original)")
-    
+
     # Summary
     print("\n" + "=" * 80)
     print("PROCESSING COMPLETE")
@@ -450,15 +762,16 @@ def main():
 Summary:
   Golden Standards: {len(golden_clean)} entries (removed {golden_total - len(golden_clean)} duplicates)
   RAG Nuggets:      {len(rag_clean)} entries (removed {rag_total - len(rag_clean)} duplicates)
+  Near-dup Clusters: {len(near_duplicates)}
   Conflicts Found:  {len(all_conflicts)} topic groups
-  
+
 Output Files:
-  ✓ {OUTPUT_GOLDEN.name}
-  ✓ {OUTPUT_RAG.name}
-  ✓ {OUTPUT_REPORT.name}
+  ✓ {output_golden.name}
+  ✓ {output_rag.name}
+  ✓ {output_report.name}
 
 ⚠️  CRITICAL NEXT STEPS:
-  1. Review {OUTPUT_REPORT.name} for all conflicts
+  1. Review {output_report.name} for all conflicts
   2. Manually resolve conflicts by editing the JSON files
   3. DO NOT import to Qdrant until conflicts are resolved!
     """)